@@ -0,0 +1,84 @@
+"""
+    Fixtures shared by the benchmarks
+
+    The size of synthetic data is configurable through environment variables:
+        - EDGAR_BENCH_ROWS      rows per generated index object
+        - EDGAR_BENCH_OBJECTS   number of generated index objects
+        - EDGAR_BENCH_YEARS     years of daily and quarterly objects in the synthetic repo tree
+        - EDGAR_BENCH_LATENCY   latency of the EDGAR stub server in seconds
+        - EDGAR_BENCH_BANDWIDTH bandwidth of the EDGAR stub server in bytes per second
+        - EDGAR_BENCH_MEMORY_YEARS years of daily objects in the repo tree measured by the memory benchmark
+        - EDGAR_BENCH_CODEC_OBJECTS number of objects encoded by the codec benchmarks
+        - EDGAR_BENCH_ACCESSIONS number of accessions stored in the accession set benchmarks
+        - EDGAR_BENCH_LEDGER_ROWS number of ledger events scanned by the ledger benchmarks
+
+    Results are stored as JSON by `make dev.bench` and compared with `make dev.bench.compare`
+"""
+import os
+import pytest, tempfile
+from datetime import date
+from pathlib import Path
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.date.holidays import us_holidays
+from edgar.utils.repo.repo_format import RepoFormat
+from edgar.tests.synthetic import master_index
+
+BENCH_ROWS: int = int(os.environ.get('EDGAR_BENCH_ROWS', 50000))
+BENCH_OBJECTS: int = int(os.environ.get('EDGAR_BENCH_OBJECTS', 16))
+BENCH_YEARS: int = int(os.environ.get('EDGAR_BENCH_YEARS', 10))
+BENCH_LATENCY: float = float(os.environ.get('EDGAR_BENCH_LATENCY', 0.0))
+BENCH_BANDWIDTH: int = int(os.environ.get('EDGAR_BENCH_BANDWIDTH', 0)) or None
+
+
+@pytest.fixture(scope='session')
+def repo_format() -> RepoFormat:
+    return RepoFormat(
+        {DatePeriodType.DAY: 'master{y:04}{m:02}{d:02}.idx', DatePeriodType.QUARTER : 'master.idx'},
+        ['{t}', '{y}', 'QTR{q}']
+    )
+
+
+@pytest.fixture(scope='session')
+def index_fs() -> tempfile.TemporaryDirectory:
+    """
+        A repository with BENCH_OBJECTS quarterly objects of BENCH_ROWS rows each
+    """
+    temp: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory(suffix='_bench_index_fs')
+    for i in range(BENCH_OBJECTS):
+        (year, quarter) = (2000 + i // 4, i % 4 + 1)
+        qdir: Path = Path(temp.name) / 'Q' / str(year) / 'QTR{0}'.format(quarter)
+        qdir.mkdir(parents=True)
+        (qdir / 'master.idx').write_text(
+            master_index(date(year, quarter * 3 - 2, 1), 90, BENCH_ROWS, seed=i, daily=False))
+    yield temp
+    temp.cleanup()
+
+
+@pytest.fixture(scope='session')
+def edgar_tree(repo_format: RepoFormat) -> tempfile.TemporaryDirectory:
+    """
+        A repository with daily objects for every business day and quarterly
+        objects for BENCH_YEARS years ending with 2020
+    """
+    temp: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory(suffix='_bench_edgar_tree')
+    root: Path = Path(temp.name)
+    first_year: int = 2021 - BENCH_YEARS
+
+    cur_date: Date = Date(date(first_year, 1, 1))
+    holidays: us_holidays = None
+    while cur_date.year() < 2021:
+        if holidays is None or cur_date.format('{m}{d}') == '11':
+            holidays = us_holidays(cur_date.year())
+            for q in range(1, 5):
+                qdir: Path = root / 'Q' / str(cur_date.year()) / 'QTR{0}'.format(q)
+                qdir.mkdir(parents=True)
+                (qdir / 'master.idx').write_text(str(qdir))
+                (root / 'D' / str(cur_date.year()) / 'QTR{0}'.format(q)).mkdir(parents=True)
+
+        if not (cur_date.is_weekend() or cur_date in holidays):
+            name: str = cur_date.format(repo_format.name_spec[DatePeriodType.DAY])
+            (root / cur_date.format('D/{y}/QTR{q}') / name).write_text(name)
+        cur_date += 1
+
+    yield temp
+    temp.cleanup()
@@ -0,0 +1,173 @@
+"""
+    A local HTTP server that imitates the EDGAR index archive
+
+    The server answers GET and HEAD requests for
+        /Archives/edgar/daily-index/YYYY/QTRn/masterYYYYMMDD.idx
+        /Archives/edgar/full-index/YYYY/QTRn/master.idx
+    with generated master index objects, and for
+        /Archives/edgar/full-index/YYYY/QTRn/master.gz
+    with the gzip compressed quarterly objects, and for
+        /Archives/edgar/daily-index/YYYY/QTRn/index.json
+        /Archives/edgar/full-index/YYYY/QTRn/index.json
+    with listings of the objects published on business days, and for
+        /Archives/edgar/data/CIK/ACCESSION.txt
+    with generated filing documents. Latency (seconds before the response)
+    and bandwidth (bytes per second) can be injected to imitate a remote server.
+"""
+import gzip
+import json
+import re
+import threading
+import time
+from datetime import date, timedelta
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from edgar.utils.date.date_utils import Date
+from edgar.utils.date.holidays import us_holidays
+from edgar.tests.synthetic import master_index
+
+DAILY_PATH = re.compile(r'^/Archives/edgar/daily-index/(\d{4})/QTR[1-4]/master(\d{4})(\d{2})(\d{2})\.idx$')
+QUARTER_PATH = re.compile(r'^/Archives/edgar/full-index/(\d{4})/QTR([1-4])/master\.idx$')
+QUARTER_GZ_PATH = re.compile(r'^(/Archives/edgar/full-index/\d{4}/QTR[1-4]/master)\.gz$')
+LISTING_PATH = re.compile(r'^/Archives/edgar/(daily|full)-index/(\d{4})/QTR([1-4])/index\.json$')
+FILING_PATH = re.compile(r'^/Archives/edgar/data/(\d+)/(\d{10}-\d{2}-\d{6})\.txt$')
+CHUNK_SIZE: int = 16384
+FILING_SIZE: int = 32768
+
+
+def listing(kind: str, year: int, quarter: int, daily_rows: int) -> bytes:
+    """
+        Lists the business days of the quarter up to today
+    """
+    first: date = date(year, quarter * 3 - 2, 1)
+    if kind == 'full':
+        names: List[str] = ['master.idx', 'master.gz']
+    else:
+        holidays: us_holidays = us_holidays(year)
+        days: List[date] = [first + timedelta(days=i) for i in range(92)]
+        names = ['master{0:%Y%m%d}.idx'.format(d) for d in days
+                 if d.month in range(first.month, first.month + 3) and d < date.today()
+                 and d.isoweekday() < 6 and Date(d) not in holidays]
+    size: int = daily_rows * 140 * (63 if kind == 'full' else 1)
+    items: List[Dict] = [{'name': name, 'type': 'file', 'href': name, 'size': '{0} KB'.format(size // 1024),
+        'last-modified': '{0:%m/%d/%Y} 10:00:00 PM'.format(first)} for name in names]
+    return json.dumps({'directory': {'name': '{0}-index/{1}/QTR{2}/'.format(kind, year, quarter),
+        'item': items}}).encode()
+
+
+@lru_cache(maxsize=512)
+def generate(path: str, daily_rows: int) -> Optional[bytes]:
+    """
+        Generates the index object for the path. Quarterly objects have
+        the rows of about 63 daily objects
+    """
+    m = DAILY_PATH.match(path)
+    if m:
+        the_date: date = date(int(m.group(2)), int(m.group(3)), int(m.group(4)))
+        return master_index(the_date, 1, daily_rows, seed=the_date.toordinal()).encode()
+
+    m = QUARTER_PATH.match(path)
+    if m:
+        first: date = date(int(m.group(1)), int(m.group(2)) * 3 - 2, 1)
+        return master_index(first, 90, daily_rows * 63, seed=first.toordinal(), daily=False).encode()
+
+    m = QUARTER_GZ_PATH.match(path)
+    if m:
+        return gzip.compress(generate(m.group(1) + '.idx', daily_rows), 6)
+
+    m = LISTING_PATH.match(path)
+    if m:
+        return listing(m.group(1), int(m.group(2)), int(m.group(3)), daily_rows)
+
+    m = FILING_PATH.match(path)
+    if m:
+        header: bytes = '<SEC-DOCUMENT>{0}.txt\n<SEC-HEADER>CIK {1}\n'.format(m.group(2), m.group(1)).encode()
+        return header + b'x' * (FILING_SIZE - len(header))
+
+    return None
+
+
+class EdgarStubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_HEAD(self) -> None:
+        self.respond(body=False)
+
+    def do_GET(self) -> None:
+        self.respond(body=True)
+
+    def respond(self, body: bool) -> None:
+        stub: 'EdgarStubServer' = self.server.stub
+        if stub.latency > 0:
+            time.sleep(stub.latency)
+
+        content: Optional[bytes] = generate(self.path, stub.daily_rows)
+        if content is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        if not body:
+            return
+
+        for pos in range(0, len(content), CHUNK_SIZE):
+            chunk: bytes = content[pos:pos + CHUNK_SIZE]
+            self.wfile.write(chunk)
+            if stub.bandwidth:
+                time.sleep(len(chunk) / stub.bandwidth)
+        stub.served(len(content))
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class EdgarStubServer:
+    """
+        The stub server running in a background thread
+
+        Parameters
+        ----------
+        latency: float
+            the delay in seconds before each response
+        bandwidth: int
+            the transfer rate in bytes per second, unlimited if None
+        daily_rows: int
+            the number of rows in a daily index object
+    """
+    def __init__(self, latency: float = 0.0, bandwidth: int = None, daily_rows: int = 500) -> None:
+        self.latency: float = latency
+        self.bandwidth: int = bandwidth
+        self.daily_rows: int = daily_rows
+        self.requests: int = 0
+        self.bytes_sent: int = 0
+        self.__lock = threading.Lock()
+        self.__server: ThreadingHTTPServer = None
+        self.__thread: threading.Thread = None
+
+    def served(self, size: int) -> None:
+        with self.__lock:
+            self.requests += 1
+            self.bytes_sent += size
+
+    @property
+    def base_url(self) -> str:
+        return 'http://{0}:{1}/Archives/edgar/'.format(*self.__server.server_address[:2])
+
+    def __enter__(self) -> 'EdgarStubServer':
+        self.__server = ThreadingHTTPServer(('127.0.0.1', 0), EdgarStubHandler)
+        self.__server.daemon_threads = True
+        self.__server.stub = self
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
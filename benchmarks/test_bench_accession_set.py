@@ -0,0 +1,53 @@
+"""
+    Accession lookups in the memory-mapped set against a Python set
+
+    The number of stored accessions is set by EDGAR_BENCH_ACCESSIONS, as many
+    accessions are looked up, half of them stored
+"""
+import os, tempfile
+import pytest
+from pathlib import Path
+from typing import List, Set
+import numpy as np
+from edgar.utils.filing.accession_set import AccessionSet, decode_accession
+
+BENCH_ACCESSIONS: int = int(os.environ.get('EDGAR_BENCH_ACCESSIONS', 1000000))
+
+
+@pytest.fixture(scope='module')
+def accessions() -> List[str]:
+    rng: np.random.Generator = np.random.default_rng(0)
+    codes: np.ndarray = rng.choice(10 ** 15, 2 * BENCH_ACCESSIONS, replace=False)
+    return [decode_accession(int(code)) for code in codes]
+
+
+@pytest.fixture(scope='module')
+def accession_set(accessions: List[str]) -> AccessionSet:
+    with tempfile.TemporaryDirectory(suffix='_bench_accessions') as temp:
+        with AccessionSet.build(Path(temp) / 'accessions', accessions[:BENCH_ACCESSIONS]) as stored:
+            yield stored
+
+
+def test_build(benchmark, accessions: List[str]):
+    with tempfile.TemporaryDirectory(suffix='_bench_accessions') as temp:
+        def run() -> int:
+            with AccessionSet.build(Path(temp) / 'accessions', accessions[:BENCH_ACCESSIONS]) as stored:
+                return len(stored)
+        assert benchmark.pedantic(run, rounds=3) == BENCH_ACCESSIONS
+
+
+def test_contains_many(benchmark, accession_set: AccessionSet, accessions: List[str]):
+    found: np.ndarray = benchmark.pedantic(lambda: accession_set.contains_many(accessions), rounds=3)
+    assert found.sum() == BENCH_ACCESSIONS
+
+
+def test_contains(benchmark, accession_set: AccessionSet, accessions: List[str]):
+    found: int = benchmark.pedantic(lambda: sum(a in accession_set for a in accessions), rounds=1)
+    assert found == BENCH_ACCESSIONS
+
+
+def test_python_set(benchmark, accessions: List[str]):
+    def run() -> int:
+        stored: Set[str] = set(accessions[:BENCH_ACCESSIONS])
+        return sum(a in stored for a in accessions)
+    assert benchmark.pedantic(run, rounds=3) == BENCH_ACCESSIONS
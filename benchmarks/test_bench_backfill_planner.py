@@ -0,0 +1,32 @@
+"""
+    Backfill plans of many ranges: `Date.backfill` per range against the vectorized planner
+"""
+import random
+from datetime import date
+from typing import List, Tuple
+import numpy as np
+import pytest
+from edgar.utils.backfill.backfill_planner import BackfillPlan, plan_backfills
+from edgar.utils.date.date_utils import Date
+
+RANGES: int = 10000
+
+
+@pytest.fixture(scope='module')
+def ranges() -> List[Tuple[Date, Date]]:
+    rnd: random.Random = random.Random(7)
+    first: int = date(1993, 1, 1).toordinal()
+    starts: List[int] = [first + rnd.randrange(9000) for _ in range(RANGES)]
+    return [(Date(date.fromordinal(s)), Date(date.fromordinal(s + rnd.randrange(1, 3000)))) for s in starts]
+
+
+def test_backfill_per_range(benchmark, ranges: List[Tuple[Date, Date]]):
+    periods: int = benchmark(lambda: sum(len(list(to_date.backfill(from_date))) for (from_date, to_date) in ranges))
+    assert periods > RANGES
+
+
+def test_plan_backfills(benchmark, ranges: List[Tuple[Date, Date]]):
+    from_ords: np.ndarray = np.array([r[0].ordinal() for r in ranges])
+    to_ords: np.ndarray = np.array([r[1].ordinal() for r in ranges])
+    plan: BackfillPlan = benchmark(plan_backfills, from_ords, to_ords)
+    assert len(plan) > RANGES
@@ -0,0 +1,46 @@
+"""
+    Reading one month of daily objects from the EDGAR stub server directly
+    compared with reading them through a warm disk cache
+"""
+import pytest, tempfile
+from pathlib import Path
+from typing import List
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.repo.cache_repo_fs import CacheRepoFS
+from edgar.utils.repo.http_repo_fs import HttpRepoFS
+from edgar.utils.repo.http_tools import get_index_macro
+from edgar.utils.repo.repo_format import RepoFormat, RepoFormatter
+from edgar.utils.repo.repo_fs import RepoFS
+from edgar_stub import EdgarStubServer
+from conftest import BENCH_LATENCY, BENCH_BANDWIDTH
+
+DAYS: List[Date] = [Date('2021-03-01').add_days(i) for i in range(31)]
+
+
+@pytest.fixture(scope='module')
+def stub() -> EdgarStubServer:
+    with EdgarStubServer(latency=BENCH_LATENCY, bandwidth=BENCH_BANDWIDTH) as server:
+        yield server
+
+
+@pytest.fixture
+def source(stub: EdgarStubServer, repo_format: RepoFormat) -> HttpRepoFS:
+    formatter: RepoFormatter = RepoFormatter(RepoFormat(repo_format.name_spec, ['{index}', '{y}', 'QTR{q}']))
+    formatter['index'] = get_index_macro()
+    return HttpRepoFS(stub.base_url, formatter)
+
+
+def read_month(repo: RepoFS) -> int:
+    return sum(len(chunk) for the_date in DAYS if not the_date.is_weekend()
+        for chunk in repo.find(DatePeriodType.DAY, the_date).inp(65536))
+
+
+def test_read_origin(benchmark, source: HttpRepoFS):
+    assert benchmark(read_month, source) > 0
+
+
+def test_read_cached(benchmark, source: HttpRepoFS, repo_format: RepoFormat):
+    with tempfile.TemporaryDirectory(suffix='_bench_cache') as temp:
+        cache: CacheRepoFS = CacheRepoFS(source, Path(temp), RepoFormatter(repo_format))
+        expected: int = read_month(cache)
+        assert benchmark(read_month, cache) == expected
@@ -0,0 +1,32 @@
+"""
+    Date math and holiday lookups
+"""
+from typing import List
+from edgar.utils.date.date_utils import Date
+from edgar.utils.date.holidays import us_holidays
+
+
+def test_diff_days(benchmark):
+    (from_date, to_date) = (Date('2000-01-01'), Date('2020-12-31'))
+    benchmark(to_date.diff_days, from_date)
+
+
+def test_quarter_dates(benchmark):
+    the_date: Date = Date('2020-08-17')
+    benchmark(the_date.quarter_dates)
+
+
+def test_backfill_20_years(benchmark):
+    (from_date, to_date) = (Date('2000-01-10'), Date('2020-12-20'))
+    periods: List = benchmark(lambda: list(to_date.backfill(from_date)))
+    assert len(periods) == 84
+
+
+def test_holidays_year(benchmark):
+    benchmark(us_holidays, 2020)
+
+
+def test_holidays_lookup(benchmark):
+    holidays: us_holidays = us_holidays(2020)
+    days: List[Date] = [Date('2020-01-01').add_days(i) for i in range(0, 366, 7)]
+    benchmark(lambda: sum(1 for d in days if d in holidays))
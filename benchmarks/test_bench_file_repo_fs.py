@@ -0,0 +1,56 @@
+"""
+    Scanning a synthetic repository tree of BENCH_YEARS years
+"""
+import tempfile
+from pathlib import Path
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.repo.file_repo_fs import FileRepoFS
+from edgar.utils.repo.repo_format import RepoFormat
+from conftest import BENCH_YEARS
+
+
+def test_open(benchmark, edgar_tree: tempfile.TemporaryDirectory, repo_format: RepoFormat):
+    benchmark(FileRepoFS, Path(edgar_tree.name), repo_format)
+
+
+def test_refresh(benchmark, edgar_tree: tempfile.TemporaryDirectory, repo_format: RepoFormat):
+    fs: FileRepoFS = FileRepoFS(Path(edgar_tree.name), repo_format)
+    benchmark(fs.refresh)
+
+
+def test_iterate_missing(benchmark, edgar_tree: tempfile.TemporaryDirectory, repo_format: RepoFormat):
+    fs: FileRepoFS = FileRepoFS(Path(edgar_tree.name), repo_format)
+    (from_date, to_date) = (Date('{0}-01-01'.format(2021 - BENCH_YEARS)), Date('2021-03-31'))
+    missing = benchmark(lambda: list(fs.iterate_missing(from_date, to_date)))
+    assert len(missing) > 0
+
+
+def test_refresh_watch(benchmark, edgar_tree: tempfile.TemporaryDirectory, repo_format: RepoFormat):
+    fs: FileRepoFS = FileRepoFS(Path(edgar_tree.name), repo_format, watch=True)
+    fs.refresh()
+    obj: Path = Path(edgar_tree.name) / 'D' / '2020' / 'QTR4' / 'master20201226.idx'
+
+    def touch():
+        # One change per refresh
+        if obj.exists():
+            obj.unlink()
+        else:
+            obj.touch()
+        fs.refresh()
+
+    benchmark(touch)
+    fs.close()
+    obj.unlink(missing_ok=True)
+
+
+def test_walk_all(benchmark, edgar_tree: tempfile.TemporaryDirectory, repo_format: RepoFormat):
+    fs: FileRepoFS = FileRepoFS(Path(edgar_tree.name), repo_format)
+    objects = benchmark(lambda: list(fs.objects()))
+    assert len(objects) > 0
+
+
+def test_walk_quarter(benchmark, edgar_tree: tempfile.TemporaryDirectory, repo_format: RepoFormat):
+    fs: FileRepoFS = FileRepoFS(Path(edgar_tree.name), repo_format)
+    (from_date, to_date) = (Date('2020-04-01'), Date('2020-06-30'))
+    objects = benchmark(lambda: list(fs.walk(DatePeriodType.DAY, from_date, to_date)))
+    assert len(objects) > 60
@@ -0,0 +1,43 @@
+"""
+    Throughput of the filing fetcher against the EDGAR stub server. With a
+    latency L, one worker manages 1/L requests per second, so the rate limit
+    is only reached with enough workers in flight
+"""
+import pytest, tempfile
+from datetime import date
+from pathlib import Path
+from typing import List
+from edgar.utils.filing.filing_fetcher import FilingFetcher
+from edgar.utils.filing.filing_repo import FilingRepo
+from edgar.utils.filing.rate_limiter import TokenBucket
+from edgar.utils.index.master_index import IndexRow
+from edgar_stub import EdgarStubServer
+
+LATENCY: float = 0.02
+RATE: float = 200
+ROWS: List[IndexRow] = [IndexRow(1000 + i, 'ACME INC', '8-K', date(2021, 3, 1).toordinal() - i % 30,
+    'edgar/data/{0}/{0:010}-21-{1:06}.txt'.format(1000 + i, i)) for i in range(40)]
+
+
+@pytest.fixture(scope='module')
+def stub() -> EdgarStubServer:
+    with EdgarStubServer(latency=LATENCY) as server:
+        yield server
+
+
+@pytest.mark.parametrize('workers', [1, 8])
+def test_fetch(benchmark, stub: EdgarStubServer, workers: int):
+    def setup():
+        return (tempfile.TemporaryDirectory(suffix='_bench_filings'),), {}
+
+    def fetch(temp: tempfile.TemporaryDirectory) -> None:
+        fetcher: FilingFetcher = FilingFetcher(FilingRepo(Path(temp.name)), stub.base_url.replace('edgar/', ''),
+            TokenBucket(RATE), workers=workers)
+        assert fetcher.add(ROWS) == len(ROWS)
+        assert fetcher.run().fetched == len(ROWS)
+        temp.cleanup()
+
+    benchmark.pedantic(fetch, setup=setup, rounds=3)
+    # No stats are collected with --benchmark-disable
+    if benchmark.stats is not None:
+        benchmark.extra_info['filings_per_second'] = len(ROWS) / benchmark.stats.stats.mean
@@ -0,0 +1,46 @@
+"""
+    Resolving what exists remotely for one quarter: one HEAD per object
+    compared with one index.json listing per directory
+"""
+import pytest
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.repo.http_repo_fs import HttpRepoFS
+from edgar.utils.repo.http_tools import get_index_macro
+from edgar.utils.repo.repo_format import RepoFormat, RepoFormatter
+from edgar_stub import EdgarStubServer
+from conftest import BENCH_LATENCY
+
+(FROM_DATE, TO_DATE) = (Date('2020-04-01'), Date('2020-06-30'))
+
+
+@pytest.fixture(scope='module')
+def stub() -> EdgarStubServer:
+    with EdgarStubServer(latency=BENCH_LATENCY) as server:
+        yield server
+
+
+@pytest.fixture
+def source(stub: EdgarStubServer, repo_format: RepoFormat) -> HttpRepoFS:
+    formatter: RepoFormatter = RepoFormatter(RepoFormat(repo_format.name_spec, ['{index}', '{y}', 'QTR{q}']))
+    formatter['index'] = get_index_macro()
+    return HttpRepoFS(stub.base_url, formatter)
+
+
+def test_exists_head(benchmark, source: HttpRepoFS):
+    def head():
+        found = 0
+        for i in range(TO_DATE.diff_days(FROM_DATE)):
+            the_date: Date = Date('2020-04-01').add_days(i)
+            if not the_date.is_weekend() and source.find(DatePeriodType.DAY, the_date).exists():
+                found += 1
+        return found
+
+    assert benchmark(head) > 0
+
+
+def test_exists_listing(benchmark, source: HttpRepoFS):
+    def listing():
+        source.refresh()
+        return source.find_missing(FROM_DATE, TO_DATE)
+
+    assert benchmark(listing) == []
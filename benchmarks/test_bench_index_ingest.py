@@ -0,0 +1,28 @@
+"""
+    Throughput of the parallel index ingest by the number of workers
+"""
+import pytest, tempfile
+from pathlib import Path
+from edgar.utils.index.index_ingest import IndexIngest
+from edgar.utils.repo.file_repo_fs import FileRepoFS
+from edgar.utils.repo.repo_format import RepoFormat
+from conftest import BENCH_ROWS, BENCH_OBJECTS
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4, 8])
+def test_ingest_workers(benchmark, index_fs: tempfile.TemporaryDirectory, repo_format: RepoFormat, workers: int):
+    fs: FileRepoFS = FileRepoFS(Path(index_fs.name), repo_format)
+    objects = list(fs.objects())
+    ingest: IndexIngest = IndexIngest(max_workers=workers)
+
+    def run() -> int:
+        rows: int = 0
+        for (_, columns) in ingest.ingest(objects):
+            with columns:
+                rows += len(columns)
+        return rows
+
+    rows: int = benchmark.pedantic(run, rounds=3, iterations=1)
+    assert rows == BENCH_ROWS * BENCH_OBJECTS
+    benchmark.extra_info['workers'] = workers
+    benchmark.extra_info['rows'] = rows
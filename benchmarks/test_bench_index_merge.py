@@ -0,0 +1,17 @@
+"""
+    Date-ordered merge of index objects with external sort runs
+"""
+import tempfile
+from pathlib import Path
+from edgar.utils.date.date_utils import Date
+from edgar.utils.index.index_merge import IndexMerge
+from edgar.utils.repo.file_repo_fs import FileRepoFS
+from edgar.utils.repo.repo_format import RepoFormat
+from conftest import BENCH_ROWS
+
+
+def test_merge_year(benchmark, index_fs: tempfile.TemporaryDirectory, repo_format: RepoFormat):
+    merge: IndexMerge = IndexMerge(FileRepoFS(Path(index_fs.name), repo_format), run_rows=BENCH_ROWS // 4)
+    rows: int = benchmark.pedantic(lambda: sum(1 for _ in merge.rows(Date('2000-01-01'), Date('2000-12-31'))),
+        rounds=3, iterations=1)
+    assert rows > 0
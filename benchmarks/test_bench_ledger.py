@@ -0,0 +1,68 @@
+"""
+    Ledger writes and scans
+
+    The number of events scanned is set by EDGAR_BENCH_LEDGER_ROWS
+"""
+import os, tempfile, tracemalloc
+import pytest
+from typing import Iterable, Tuple
+from pathlib import Path
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.db.sqlite_db_driver import SqliteDbDriver
+from edgar.utils.repo.db_repo_ledger import DbRepoLedger
+
+RECORDS: int = 1000
+
+BENCH_LEDGER_ROWS: int = int(os.environ.get('EDGAR_BENCH_LEDGER_ROWS', 200000))
+
+
+def test_record_memory(benchmark):
+    ledger: DbRepoLedger = DbRepoLedger(SqliteDbDriver(':memory:'))
+    the_date: Date = Date('2020-08-17')
+
+    def write() -> None:
+        for _ in range(RECORDS):
+            ledger.record(the_date, DatePeriodType.DAY)
+    benchmark(write)
+
+
+def test_record_file(benchmark):
+    with tempfile.TemporaryDirectory(suffix='_bench_ledger') as temp:
+        ledger: DbRepoLedger = DbRepoLedger(SqliteDbDriver(str(Path(temp) / 'ledger.db')))
+        the_date: Date = Date('2020-08-17')
+
+        def write() -> None:
+            for _ in range(RECORDS):
+                ledger.record(the_date, DatePeriodType.DAY)
+        benchmark.pedantic(write, rounds=5, iterations=1)
+        del ledger
+
+
+@pytest.fixture(scope='module')
+def history() -> Tuple[DbRepoLedger, SqliteDbDriver]:
+    driver: SqliteDbDriver = SqliteDbDriver(':memory:')
+    ledger: DbRepoLedger = DbRepoLedger(driver)
+    the_date: Date = Date('2020-08-17')
+    with driver.transaction():
+        for _ in range(BENCH_LEDGER_ROWS):
+            ledger.record(the_date, DatePeriodType.DAY)
+    return (ledger, driver)
+
+
+@pytest.mark.parametrize('streamed', [False, True])
+def test_scan_history(benchmark, history: Tuple[DbRepoLedger, SqliteDbDriver], streamed: bool):
+    """
+        Counts the records of a long ledger history read all at once or streamed
+    """
+    (_, driver) = history
+
+    def scan() -> int:
+        tracemalloc.start()
+        rows: Iterable = driver.iter_rows(DbRepoLedger.TABLE_NAME, ['event_name'])
+        count: int = sum(1 for row in (rows if streamed else list(rows)) if row[0] == 'record')
+        (_, peak) = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        benchmark.extra_info['peak_bytes'] = peak
+        return count
+
+    assert benchmark.pedantic(scan, rounds=3) == BENCH_LEDGER_ROWS
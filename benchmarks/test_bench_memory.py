@@ -0,0 +1,46 @@
+"""
+    Memory footprint of the FileRepoFS index for a repository with a daily
+    object for every day of EDGAR_BENCH_MEMORY_YEARS years
+"""
+import os
+import tempfile
+import tracemalloc
+import pytest
+from datetime import date, timedelta
+from pathlib import Path
+from edgar.utils.date.date_utils import Date
+from edgar.utils.repo.file_repo_fs import FileRepoFS
+from edgar.utils.repo.repo_format import RepoFormat
+
+BENCH_MEMORY_YEARS: int = int(os.environ.get('EDGAR_BENCH_MEMORY_YEARS', 30))
+
+
+@pytest.fixture(scope='module')
+def dense_tree() -> tempfile.TemporaryDirectory:
+    temp: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory(suffix='_bench_dense_tree')
+    root: Path = Path(temp.name)
+    cur_date: date = date(2021 - BENCH_MEMORY_YEARS, 1, 1)
+    while cur_date.year < 2021:
+        qdir: Path = root / 'D' / str(cur_date.year) / 'QTR{0}'.format((cur_date.month - 1) // 3 + 1)
+        qdir.mkdir(parents=True, exist_ok=True)
+        (qdir / 'master{0:%Y%m%d}.idx'.format(cur_date)).touch()
+        cur_date += timedelta(days=1)
+    yield temp
+    temp.cleanup()
+
+
+def test_index_memory(benchmark, dense_tree: tempfile.TemporaryDirectory, repo_format: RepoFormat):
+    def refresh() -> int:
+        tracemalloc.start()
+        fs: FileRepoFS = FileRepoFS(Path(dense_tree.name), repo_format)
+        fs.refresh()
+        (size, _) = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert fs.find_missing(Date('2020-01-01'), Date('2020-12-31')) == []
+        return size
+
+    size: int = benchmark.pedantic(refresh, rounds=3)
+    objects: int = (date(2021, 1, 1) - date(2021 - BENCH_MEMORY_YEARS, 1, 1)).days
+    benchmark.extra_info['objects'] = objects
+    benchmark.extra_info['bytes'] = size
+    benchmark.extra_info['bytes_per_object'] = size / objects
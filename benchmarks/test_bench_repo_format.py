@@ -0,0 +1,30 @@
+"""
+    Rendering and parsing of object paths
+"""
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.repo.repo_format import RepoFormat, RepoFormatter, RepoObjectPath
+
+
+def test_formatter_format(benchmark, repo_format: RepoFormat):
+    formatter: RepoFormatter = RepoFormatter(repo_format)
+    the_date: Date = Date('2020-08-17')
+    path = benchmark(formatter.format, DatePeriodType.DAY, the_date)
+    assert path == ['D', '2020', 'QTR3', 'master20200817.idx']
+
+
+def test_path_from_date(benchmark, repo_format: RepoFormat):
+    the_date: Date = Date('2020-08-17')
+    path: RepoObjectPath = benchmark(RepoObjectPath.from_date, DatePeriodType.DAY, the_date, repo_format)
+    assert str(path) == 'D/2020/QTR3/master20200817.idx'
+
+
+def test_path_parse_date(benchmark, repo_format: RepoFormat):
+    def parse() -> Date:
+        return RepoObjectPath.from_uri('D/2020/QTR3/master20200817.idx', repo_format).date()
+    assert benchmark(parse) == Date('2020-08-17')
+
+
+def test_path_parse_period_type(benchmark, repo_format: RepoFormat):
+    def parse() -> DatePeriodType:
+        return RepoObjectPath.from_uri('Q/2020/QTR3/master.idx', repo_format).date_period_type()
+    assert benchmark(parse) == DatePeriodType.QUARTER
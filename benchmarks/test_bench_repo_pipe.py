@@ -0,0 +1,115 @@
+"""
+    End-to-end sync from the EDGAR stub server into a file repository
+"""
+import pytest, tempfile
+from pathlib import Path
+from typing import Tuple
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.db.sqlite_db_driver import SqliteDbDriver
+from edgar.utils.repo.db_repo_ledger import DbRepoLedger
+from edgar.utils.repo.file_repo_fs import FileRepoFS
+from edgar.utils.repo.http_repo_fs import HttpRepoFS
+from edgar.utils.repo.http_tools import get_index_macro
+from edgar.utils.repo.repo_format import RepoFormat, RepoFormatter
+from edgar.utils.repo.repo_pipe import FanOutPipe, PipeBranch, RepoPipe
+from edgar_stub import EdgarStubServer, generate
+from conftest import BENCH_LATENCY, BENCH_BANDWIDTH
+
+
+class PeriodLedger(DbRepoLedger):
+    def __init__(self, beg_date: Date, end_date: Date) -> None:
+        super().__init__(SqliteDbDriver(':memory:'))
+        self.__period = (beg_date, end_date)
+
+    def next_period(self) -> Tuple[Date, Date]:
+        return self.__period
+
+
+@pytest.fixture(scope='module')
+def stub() -> EdgarStubServer:
+    with EdgarStubServer(latency=BENCH_LATENCY, bandwidth=BENCH_BANDWIDTH) as server:
+        yield server
+
+
+def test_sync_quarter(benchmark, stub: EdgarStubServer, repo_format: RepoFormat):
+    formatter: RepoFormatter = RepoFormatter(RepoFormat(repo_format.name_spec, ['{index}', '{y}', 'QTR{q}']))
+    formatter['index'] = get_index_macro()
+    source: HttpRepoFS = HttpRepoFS(stub.base_url, formatter)
+
+    def setup():
+        sink_dir = tempfile.TemporaryDirectory(suffix='_bench_sink')
+        ledger: PeriodLedger = PeriodLedger(Date('2021-01-01'), Date('2021-03-31'))
+        return ((ledger, sink_dir),), {}
+
+    def sync(args) -> None:
+        (ledger, sink_dir) = args
+        sink: FileRepoFS = FileRepoFS(Path(sink_dir.name), repo_format)
+        RepoPipe(ledger, source, sink).sync()
+        assert sink.find(DatePeriodType.QUARTER, Date('2021-01-01')).exists()
+        assert [r[0] for r in ledger.dump(100)].count('record') == 62
+        sink_dir.cleanup()
+
+    benchmark.pedantic(sync, setup=setup, rounds=3)
+    benchmark.extra_info['requests'] = stub.requests
+    benchmark.extra_info['bytes'] = stub.bytes_sent
+
+
+@pytest.mark.parametrize('compressed', [False, True])
+def test_sync_quarterly(benchmark, stub: EdgarStubServer, repo_format: RepoFormat, compressed: bool):
+    """
+        Syncs a closed quarter as its plain quarterly object or as the gzip
+        compressed variant inflated on the fly
+    """
+    formatter: RepoFormatter = RepoFormatter(RepoFormat(repo_format.name_spec, ['{index}', '{y}', 'QTR{q}'],
+        {DatePeriodType.QUARTER: 'master.gz'} if compressed else None))
+    formatter['index'] = get_index_macro()
+    source: HttpRepoFS = HttpRepoFS(stub.base_url, formatter)
+
+    def setup():
+        sink_dir = tempfile.TemporaryDirectory(suffix='_bench_sink')
+        sink: FileRepoFS = FileRepoFS(Path(sink_dir.name), repo_format)
+        return ((sink, sink_dir),), {}
+
+    def sync(args) -> None:
+        (sink, sink_dir) = args
+        sent: int = stub.bytes_sent
+        obj = sink.create(DatePeriodType.QUARTER, Date('2020-10-01'))
+        obj.out(source.find(DatePeriodType.QUARTER, Date('2020-10-01')).inp(65536), override=True)
+        assert obj.path.read_bytes() == generate('/Archives/edgar/full-index/2020/QTR4/master.idx', stub.daily_rows)
+        benchmark.extra_info['bytes'] = stub.bytes_sent - sent
+        sink_dir.cleanup()
+
+    benchmark.pedantic(sync, setup=setup, rounds=3)
+
+
+@pytest.mark.parametrize('fan_out', [False, True])
+def test_sync_quarter_three_sinks(benchmark, stub: EdgarStubServer, repo_format: RepoFormat, fan_out: bool):
+    """
+        Mirrors a quarter to three sinks with three pipes, i.e. three downloads
+        of every object, or with one fan-out pipe
+    """
+    formatter: RepoFormatter = RepoFormatter(RepoFormat(repo_format.name_spec, ['{index}', '{y}', 'QTR{q}']))
+    formatter['index'] = get_index_macro()
+    source: HttpRepoFS = HttpRepoFS(stub.base_url, formatter)
+
+    def setup():
+        sink_dirs = [tempfile.TemporaryDirectory(suffix='_bench_sink') for _ in range(3)]
+        ledgers = [PeriodLedger(Date('2021-01-01'), Date('2021-03-31')) for _ in range(3)]
+        return ((ledgers, sink_dirs),), {}
+
+    def sync(args) -> None:
+        (ledgers, sink_dirs) = args
+        sinks = [FileRepoFS(Path(d.name), repo_format) for d in sink_dirs]
+        requests: int = stub.requests
+        if fan_out:
+            FanOutPipe(source, [PipeBranch(ledger, sink) for (ledger, sink) in zip(ledgers, sinks)]).sync()
+        else:
+            for (ledger, sink) in zip(ledgers, sinks):
+                RepoPipe(ledger, source, sink).sync()
+        for ledger in ledgers:
+            assert [r[0] for r in ledger.dump(100)].count('record') == 62
+        benchmark.extra_info['requests'] = stub.requests - requests
+        for d in sink_dirs:
+            d.cleanup()
+
+    benchmark.pedantic(sync, setup=setup, rounds=3)
@@ -0,0 +1,41 @@
+"""
+    Storing and parsing index objects in one pass through `ParseStage`
+    compared with storing them first and parsing the stored copies
+"""
+import tempfile
+from pathlib import Path
+from typing import List
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.index.master_index import IndexRow, iter_lines, parse_master_index
+from edgar.utils.repo.file_repo_fs import FileRepoFS
+from edgar.utils.repo.repo_format import RepoFormat, RepoObjectPath
+from edgar.utils.repo.repo_stage import ParseStage, apply_stages, commit_stages
+from conftest import BENCH_OBJECTS
+
+DATES: List[Date] = [Date('{0}-{1:02}-01'.format(2000 + i // 4, (i % 4) * 3 + 1)) for i in range(BENCH_OBJECTS)]
+
+
+def store(index_fs: tempfile.TemporaryDirectory, repo_format: RepoFormat, one_pass: bool) -> int:
+    source: FileRepoFS = FileRepoFS(Path(index_fs.name), repo_format)
+    rows: List[IndexRow] = []
+    with tempfile.TemporaryDirectory(suffix='_bench_stage') as temp:
+        sink: FileRepoFS = FileRepoFS(Path(temp), repo_format)
+        for the_date in DATES:
+            chunks = source.find(DatePeriodType.QUARTER, the_date).inp(65536)
+            if one_pass:
+                path: RepoObjectPath = RepoObjectPath.from_date(DatePeriodType.QUARTER, the_date, repo_format)
+                stages = [ParseStage(lambda _, batch: rows.extend(batch))]
+                sink.create(DatePeriodType.QUARTER, the_date).out(apply_stages(chunks, stages, path))
+                commit_stages(stages, path)
+            else:
+                sink.create(DatePeriodType.QUARTER, the_date).out(chunks)
+                rows.extend(parse_master_index(iter_lines(sink.find(DatePeriodType.QUARTER, the_date).inp(65536))))
+    return len(rows)
+
+
+def test_store_then_parse(benchmark, index_fs: tempfile.TemporaryDirectory, repo_format: RepoFormat):
+    assert benchmark.pedantic(store, args=(index_fs, repo_format, False), rounds=3) > 0
+
+
+def test_store_parse_one_pass(benchmark, index_fs: tempfile.TemporaryDirectory, repo_format: RepoFormat):
+    assert benchmark.pedantic(store, args=(index_fs, repo_format, True), rounds=3) > 0
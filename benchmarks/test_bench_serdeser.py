@@ -0,0 +1,71 @@
+"""
+    Binary codecs against the JSON helpers
+
+    The number of objects is set by EDGAR_BENCH_CODEC_OBJECTS
+"""
+import json, os
+import pytest
+from datetime import date
+from typing import List
+from edgar.utils.date.date_utils import Date, DatePeriod, DatePeriodType
+from edgar.utils.repo.db_repo_ledger import EventObject
+from edgar.utils.repo.serdeser import DateCodec, DatePeriodCodec, EventObjectCodec, dataclass_json_dump
+
+BENCH_CODEC_OBJECTS: int = int(os.environ.get('EDGAR_BENCH_CODEC_OBJECTS', 1000000))
+
+FIRST_ORDINAL: int = date(1993, 1, 1).toordinal()
+
+
+@pytest.fixture(scope='module')
+def dates() -> List[Date]:
+    return [Date(date.fromordinal(FIRST_ORDINAL + i % 10000)) for i in range(BENCH_CODEC_OBJECTS)]
+
+
+@pytest.fixture(scope='module')
+def periods(dates: List[Date]) -> List[DatePeriod]:
+    return [DatePeriod(DatePeriodType.DAY, d, d) for d in dates]
+
+
+@pytest.fixture(scope='module')
+def events() -> List[EventObject]:
+    return [EventObject(str(DatePeriodType.DAY), str(date.fromordinal(FIRST_ORDINAL + i % 10000)), '', 1600000000 + i)
+        for i in range(BENCH_CODEC_OBJECTS)]
+
+
+def test_dates_binary(benchmark, dates: List[Date]):
+    codec: DateCodec = DateCodec()
+    decoded: List[Date] = benchmark.pedantic(lambda: codec.decode_many(codec.encode_many(dates)), rounds=3)
+    assert len(decoded) == len(dates)
+
+
+def test_dates_json(benchmark, dates: List[Date]):
+    def run() -> List[Date]:
+        return [Date(s) for s in json.loads(json.dumps([str(d) for d in dates]))]
+    decoded: List[Date] = benchmark.pedantic(run, rounds=3)
+    assert len(decoded) == len(dates)
+
+
+def test_periods_binary(benchmark, periods: List[DatePeriod]):
+    codec: DatePeriodCodec = DatePeriodCodec()
+    decoded: List[DatePeriod] = benchmark.pedantic(lambda: codec.decode_many(codec.encode_many(periods)), rounds=3)
+    assert len(decoded) == len(periods)
+
+
+def test_periods_json(benchmark, periods: List[DatePeriod]):
+    def run() -> List[DatePeriod]:
+        return [DatePeriod.from_string(s) for s in json.loads(json.dumps([str(p) for p in periods]))]
+    decoded: List[DatePeriod] = benchmark.pedantic(run, rounds=3)
+    assert len(decoded) == len(periods)
+
+
+def test_events_binary(benchmark, events: List[EventObject]):
+    codec: EventObjectCodec = EventObjectCodec()
+    decoded: List[EventObject] = benchmark.pedantic(lambda: codec.decode_many(codec.encode_many(events)), rounds=3)
+    assert decoded[-1] == events[-1]
+
+
+def test_events_json(benchmark, events: List[EventObject]):
+    def run() -> List[EventObject]:
+        return [EventObject(**e) for e in json.loads(dataclass_json_dump(events))]
+    decoded: List[EventObject] = benchmark.pedantic(run, rounds=3)
+    assert decoded[-1] == events[-1]
@@ -0,0 +1,31 @@
+"""
+    Repeat reads of a hot quarterly object from disk compared with reads
+    through the memory tier of `TieredRepoFS`
+"""
+import tempfile
+from pathlib import Path
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.repo.file_repo_fs import FileRepoFS
+from edgar.utils.repo.memory_repo_fs import MemoryRepoFS
+from edgar.utils.repo.repo_format import RepoFormat, RepoFormatter
+from edgar.utils.repo.repo_fs import RepoFS
+from edgar.utils.repo.tiered_repo_fs import TieredRepoFS
+
+HOT_DATE: Date = Date('2000-02-01')
+
+
+def read_hot(repo: RepoFS) -> int:
+    return sum(len(chunk) for chunk in repo.find(DatePeriodType.QUARTER, HOT_DATE).inp(65536))
+
+
+def test_read_disk(benchmark, index_fs: tempfile.TemporaryDirectory, repo_format: RepoFormat):
+    disk: FileRepoFS = FileRepoFS(Path(index_fs.name), repo_format)
+    assert benchmark(read_hot, disk) > 0
+
+
+def test_read_memory_tier(benchmark, index_fs: tempfile.TemporaryDirectory, repo_format: RepoFormat):
+    disk: FileRepoFS = FileRepoFS(Path(index_fs.name), repo_format)
+    tiered: TieredRepoFS = TieredRepoFS(MemoryRepoFS(RepoFormatter(repo_format)), [disk])
+    expected: int = read_hot(tiered)
+    assert benchmark(read_hot, tiered) == expected
+    assert tiered.stats()[1].hits == 1
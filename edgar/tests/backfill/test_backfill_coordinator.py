@@ -0,0 +1,122 @@
+import pytest, tempfile, os, threading
+from pathlib import Path
+from typing import Dict, List
+from unittest import mock
+from edgar.utils.backfill.backfill_coordinator import BackfillCoordinator, Shard, plan_shards
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.db.sqlite_db_driver import SqliteDbDriver
+from edgar.utils.repo.file_repo_fs import FileRepoFS
+from edgar.utils.repo.repo_format import RepoFormat
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now: float = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def db_path(dir_empty: tempfile.TemporaryDirectory) -> str:
+    return os.path.join(dir_empty.name, 'ledger.db')
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+def coordinator(db_path: str, worker: str, clock: Clock) -> BackfillCoordinator:
+    return BackfillCoordinator(SqliteDbDriver(db_path), worker, lease_seconds=60, clock=clock)
+
+
+def mock_find(period_type: DatePeriodType, the_date: Date):
+    obj = mock.MagicMock()
+    obj.inp.return_value = iter([str(period_type), ' ', str(the_date)])
+    return obj
+
+
+class TestPlanShards:
+    @pytest.mark.parametrize("from_date, to_date, quarters, expected", [
+        ('2020-01-01', '2020-12-31', 2, [('2020-01-01', '2020-06-30'), ('2020-07-01', '2020-12-31')]),
+        ('2019-11-15', '2020-05-10', 4, [('2019-11-15', '2020-05-10')]),
+        ('2019-11-15', '2020-05-10', 2, [('2019-11-15', '2020-03-31'), ('2020-04-01', '2020-05-10')]),
+        ('2020-02-03', '2020-02-03', 4, [('2020-02-03', '2020-02-03')]),
+    ])
+    def test_plan_shards(self, from_date: str, to_date: str, quarters: int, expected: List) -> None:
+        shards: List[Shard] = plan_shards(Date(from_date), Date(to_date), quarters)
+        assert [(str(s.beg_date), str(s.end_date)) for s in shards] == expected
+
+
+class TestBackfillCoordinator:
+    def test_plan_idempotent(self, db_path: str, clock: Clock) -> None:
+        assert coordinator(db_path, 'a', clock).plan(Date('2018-01-01'), Date('2020-12-31'), 4) == 3
+        assert coordinator(db_path, 'b', clock).plan(Date('2018-01-01'), Date('2020-12-31'), 4) == 0
+        assert coordinator(db_path, 'b', clock).status() == (0, 0, 3)
+
+    def test_acquire_distinct(self, db_path: str, clock: Clock) -> None:
+        (a, b) = (coordinator(db_path, 'a', clock), coordinator(db_path, 'b', clock))
+        a.plan(Date('2019-01-01'), Date('2020-12-31'), 4)
+        shard_a: Shard = a.acquire()
+        shard_b: Shard = b.acquire()
+        assert shard_a != shard_b
+        assert coordinator(db_path, 'c', clock).acquire() is None
+        assert a.acquire() == shard_a
+        assert a.status() == (0, 2, 0)
+
+    def test_expired_lease(self, db_path: str, clock: Clock) -> None:
+        (a, b) = (coordinator(db_path, 'a', clock), coordinator(db_path, 'b', clock))
+        a.plan(Date('2020-01-01'), Date('2020-12-31'), 4)
+        shard: Shard = a.acquire()
+        assert b.acquire() is None
+
+        # Worker a dies
+        clock.now += 61
+        assert b.acquire() == shard
+        assert not a.renew(shard, force=True)
+        assert not a.complete(shard)
+        assert b.complete(shard)
+        assert b.status() == (1, 0, 0)
+
+    def test_renew(self, db_path: str, clock: Clock) -> None:
+        (a, b) = (coordinator(db_path, 'a', clock), coordinator(db_path, 'b', clock))
+        a.plan(Date('2020-01-01'), Date('2020-12-31'), 4)
+        shard: Shard = a.acquire()
+        clock.now += 40
+        assert a.renew(shard)
+        clock.now += 40
+        assert b.acquire() is None
+
+    def test_release(self, db_path: str, clock: Clock) -> None:
+        (a, b) = (coordinator(db_path, 'a', clock), coordinator(db_path, 'b', clock))
+        a.plan(Date('2020-01-01'), Date('2020-12-31'), 4)
+        shard: Shard = a.acquire()
+        a.release(shard)
+        assert a.acquire() is None
+        assert b.acquire() == shard
+
+    def test_run_workers(self, db_path: str, edgar_fs: tempfile.TemporaryDirectory,
+            dir_empty: tempfile.TemporaryDirectory, repo_format: RepoFormat) -> None:
+        sink_root: Path = Path(dir_empty.name) / 'sink'
+        sink_root.mkdir()
+        coordinator(db_path, 'planner', Clock()).plan(Date('2019-01-01'), Date('2020-12-31'), 1)
+        synced: Dict[str, int] = {}
+
+        def worker(name: str) -> None:
+            source = mock.MagicMock()
+            source.find.side_effect = mock_find
+            sink: FileRepoFS = FileRepoFS(sink_root, repo_format)
+            synced[name] = BackfillCoordinator(SqliteDbDriver(db_path), name).run(source, sink)
+
+        threads: List[threading.Thread] = [threading.Thread(target=worker, args=(str(i),)) for i in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sum(synced.values()) == 8
+        records: List = SqliteDbDriver(db_path).select_rows('repo_ledger', {'event_name': 'record'})
+        assert len(records) == len({(r[1], r[2]) for r in records})
+        assert len([r for r in records if r[2] == 'Q']) == 8
+        assert coordinator(db_path, 'planner', Clock()).status() == (8, 0, 0)
@@ -0,0 +1,47 @@
+import random
+import numpy as np
+import pytest
+from datetime import date
+from typing import List
+from edgar.utils.backfill.backfill_planner import BackfillPlan, PERIOD_DTYPE, plan_backfills, quarter_ordinals, \
+    quarter_starts
+from edgar.utils.date.date_utils import Date, DatePeriodType
+
+
+class TestBackfillPlanner:
+    def test_quarter_ordinals(self) -> None:
+        dates: List[Date] = [Date('1993-01-01'), Date('1999-12-31'), Date('2020-04-01'), Date('2020-06-30')]
+        qords: np.ndarray = quarter_ordinals(np.array([d.ordinal() for d in dates]))
+        assert qords.tolist() == [d.quarter_ordinal() for d in dates]
+        assert quarter_starts(qords).tolist() == [d.quarter_dates()[0].ordinal() for d in dates]
+
+    def test_matches_backfill(self) -> None:
+        rnd: random.Random = random.Random(42)
+        first: int = date(1993, 1, 1).toordinal()
+        ranges: List = []
+        for _ in range(500):
+            beg: int = first + rnd.randrange(10000)
+            ranges.append((Date(date.fromordinal(beg)), Date(date.fromordinal(beg + rnd.randrange(-30, 2000)))))
+
+        plan: BackfillPlan = plan_backfills([r[0] for r in ranges], [r[1] for r in ranges])
+        assert plan.periods.dtype == PERIOD_DTYPE
+        for (i, (from_date, to_date)) in enumerate(ranges):
+            assert [str(p) for p in plan.owner(i)] == [str(p) for p in to_date.backfill(from_date)]
+        assert len(plan) == sum(len(list(to_date.backfill(from_date))) for (from_date, to_date) in ranges)
+
+    def test_arrays(self) -> None:
+        plan: BackfillPlan = plan_backfills(
+            np.array([Date('2020-01-10').ordinal(), Date('2020-01-01').ordinal()]),
+            np.array([Date('2020-07-20').ordinal(), Date('2019-01-01').ordinal()]))
+        assert ''.join(str(DatePeriodType(t)) for t in plan.periods['period_type']) == 'DQD'
+        assert plan.periods['owner'].tolist() == [0, 0, 0]
+        assert len(plan.owner(1)) == 0
+        assert plan[1].num_days == 91
+        assert (plan[0].start_date, plan[2].end_date) == (Date('2020-01-10'), Date('2020-07-20'))
+
+    def test_empty(self) -> None:
+        assert len(plan_backfills([], [])) == 0
+
+    def test_shape_mismatch(self) -> None:
+        with pytest.raises(ValueError):
+            plan_backfills([Date('2020-01-10')], [])
@@ -79,6 +79,6 @@ def edgar_fs() -> tempfile.TemporaryDirectory:
                     file: Path = dir / dt.format('master{y}{m:02}{d:02}.idx')
                     with file.open(mode = "w", buffering = 2048) as fd:
                         fd.write(str(file))
-                    dt.add_days(1)
+                    dt = dt.add_days(1)
     return temp
 
@@ -1,8 +1,9 @@
 import pytest
 
-from edgar.utils.date.date_utils import Date, DatePeriod, DatePeriodException, ONE_DAY, DatePeriodType
+from edgar.utils.date.date_utils import Date, DatePeriod, DatePeriodException, ONE_DAY, DatePeriodType, \
+    quarter_bounds, quarter_of, quarter_ordinal, quarter_range
 from datetime import date, timedelta
-from typing import Dict
+from typing import Dict, List
 
 class TestDatePeriodType(object):
     def test_str_day(self):
@@ -108,6 +109,9 @@ class TestDate(object):
         ("2020-01-01", "2020-05-20", 1),
         ("2020-01-01", "2020-07-20", 2),
         ("2020-01-01", "2020-12-20", 3),
+        ("2019-11-01", "2020-01-20", 1),
+        ("2000-01-10", "2020-12-20", 83),
+        ("2020-05-01", "2019-05-01", -4),
     ])
     def test_diff_quarters(self, from_date_str: str, to_date_str: str, expected_result: int):
         to_date: Date = Date(to_date_str)
@@ -169,6 +173,9 @@ class TestDate(object):
         ("2020-01-02", "2020-10-20", "DQQD"),
         ("2020-01-01", "2020-06-30",   "QQ"),
         ("2020-01-10", "2020-06-20",   "DD"),
+        ("2019-11-15", "2020-02-10",   "DD"),
+        ("2019-10-01", "2021-03-31", "QQQQQQ"),
+        ("2018-12-31", "2020-01-01", "DQQQQD"),
     ])
     def test_backfill_diff_quarters(self, from_date_str, to_date_str, elems):
         to_date: Date = Date(to_date_str)
@@ -210,6 +217,29 @@ class TestDate(object):
         date_obj: Date = Date(date_str)
         date_new: Date = date_obj.add_days(days)
         assert str(date_new) == expected_result
+        assert str(date_obj) == date_str
+
+    def test_backfill_long_span(self) -> None:
+        (from_date, to_date) = (Date('1993-01-05'), Date('2020-12-20'))
+        periods: List[DatePeriod] = list(to_date.backfill(from_date))
+        assert len(periods) == 112
+        assert (periods[0].start_date, periods[-1].end_date) == (from_date, to_date)
+        assert all(p.end_date.add_days(1) == n.start_date for (p, n) in zip(periods, periods[1:]))
+        assert sum(p.num_days for p in periods) == to_date.diff_days(from_date)
+        # The dates passed in are left as they are
+        assert (str(from_date), str(to_date)) == ('1993-01-05', '2020-12-20')
+
+    @pytest.mark.parametrize("year, quarter, first, last", [
+        (2020, 1, "2020-01-01", "2020-03-31"),
+        (2020, 4, "2020-10-01", "2020-12-31"),
+        (1999, 4, "1999-10-01", "1999-12-31"),
+    ])
+    def test_quarter_ordinal(self, year: int, quarter: int, first: str, last: str) -> None:
+        qord: int = quarter_ordinal(year, quarter)
+        assert quarter_of(qord) == (year, quarter)
+        assert quarter_bounds(qord) == (Date(first), Date(last))
+        assert Date(first).quarter_ordinal() == qord == Date(last).quarter_ordinal()
+        assert quarter_range(Date(first), Date(last)) == range(qord, qord + 1)
 
     @pytest.mark.parametrize("from_date_str, to_date_str, days", [
         ("2020-01-01", "2020-01-01",  1),
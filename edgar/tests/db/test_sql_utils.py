@@ -1,4 +1,5 @@
-from edgar.utils.db.sql_utils import insert_sql, table_sql
+import pytest
+from edgar.utils.db.sql_utils import insert_sql, insert_param_sql, select_sql, table_sql
 
 def test_insert_sql():
     sql: str = insert_sql('mytable', {'a': 1, 'b': 'test'})
@@ -6,4 +7,42 @@ def test_insert_sql():
 
 def test_table_sql():
     sql: str = table_sql('mytable', {'a': 'int', 'b': 'varchar(200)'})
-    assert sql == 'CREATE TABLE IF NOT EXISTS mytable(a int, b varchar(200))'
\ No newline at end of file
+    assert sql == 'CREATE TABLE IF NOT EXISTS mytable(a int, b varchar(200))'
+
+def test_insert_param_sql():
+    sql: str = insert_param_sql('mytable', ['a', 'b'])
+    assert sql == "INSERT INTO mytable(a, b) VALUES(?, ?)"
+
+def test_select_sql():
+    assert select_sql('mytable') == ('SELECT * FROM mytable', [])
+    assert select_sql('mytable', {'a': 1, 'b': ['x', 'y']}) == \
+        ('SELECT * FROM mytable WHERE a = ? AND b IN (?, ?)', [1, 'x', 'y'])
+
+def test_select_sql_columns():
+    assert select_sql('mytable', columns=['a', 'b']) == ('SELECT a, b FROM mytable', [])
+    assert select_sql('mytable', {'a >=': 1, 'a <': 5, 'b like': 'x%'}, ['b']) == \
+        ('SELECT b FROM mytable WHERE a >= ? AND a < ? AND b LIKE ?', [1, 5, 'x%'])
+
+def test_select_sql_order_by():
+    assert select_sql('mytable', {'a': 1}, order_by=['rowid']) == \
+        ('SELECT * FROM mytable WHERE a = ? ORDER BY rowid', [1])
+    assert select_sql('mytable', columns=['a'], order_by=['b', 'a']) == ('SELECT a FROM mytable ORDER BY b, a', [])
+    with pytest.raises(ValueError):
+        select_sql('mytable', order_by=['a; DROP TABLE mytable'])
+
+def test_select_sql_bad_operator():
+    with pytest.raises(ValueError):
+        select_sql('mytable', {'a; DROP TABLE mytable': 1})
+    with pytest.raises(ValueError):
+        select_sql('mytable', {'a >': [1, 2]})
+
+@pytest.mark.parametrize('where, columns', [
+    ({'1=1)--': 1}, None),
+    ({'a=1 OR 1=1 --': 1}, None),
+    ({'': 1}, None),
+    ({'a': 1}, ['*,(SELECT sql FROM sqlite_master)']),
+    ({'a': 1}, ['a', 'b FROM mytable --']),
+])
+def test_select_sql_bad_column(where, columns):
+    with pytest.raises(ValueError):
+        select_sql('mytable', where, columns)
@@ -1,5 +1,5 @@
-import pytest
-from typing import List
+import pytest, sqlite3
+from typing import Iterator, List
 from sqlite3 import Error
 from edgar.utils.db.sqlite_db_driver import SqliteDbDriver
 
@@ -25,4 +25,70 @@ class TestSqliteDbDriver:
     def test_insert_row_fail(self, db_driver: SqliteDbDriver) -> None:
         assert db_driver.create_table('mytable', {'a': 'int', 'b': 'varchar(200)'})
         with pytest.raises(Error):
-            db_driver.insert_row('wrong', {'a': 10000, 'b': 'hello driver'})
\ No newline at end of file
+            db_driver.insert_row('wrong', {'a': 10000, 'b': 'hello driver'})
+
+    def test_insert_row_quotes(self, db_driver: SqliteDbDriver) -> None:
+        assert db_driver.create_table('mytable', {'a': 'int', 'b': 'varchar(200)'})
+        assert db_driver.insert_row('mytable', {'a': 1, 'b': "FileExistsError('it''s there')"})
+        assert db_driver.fetch_rows('mytable')[0][1] == "FileExistsError('it''s there')"
+
+    def test_select_rows(self, db_driver: SqliteDbDriver) -> None:
+        assert db_driver.create_table('mytable', {'a': 'int', 'b': 'varchar(200)'})
+        for (a, b) in [(1, 'x'), (2, 'y'), (3, 'x'), (4, 'z')]:
+            db_driver.insert_row('mytable', {'a': a, 'b': b})
+        assert db_driver.select_rows('mytable', {'b': 'x'}) == [(1, 'x'), (3, 'x')]
+        assert db_driver.select_rows('mytable', {'b': ['y', 'z']}) == [(2, 'y'), (4, 'z')]
+        assert db_driver.select_rows('mytable', {'a': 3, 'b': 'y'}) == []
+        assert len(db_driver.select_rows('mytable')) == 4
+
+    def test_select_rows_order_by(self, tmp_path) -> None:
+        db_driver: SqliteDbDriver = SqliteDbDriver(str(tmp_path / 'test.db'))
+        assert db_driver.create_table('mytable', {'a': 'int', 'b': 'varchar(200)'})
+        for (a, b) in [(1, 'z'), (2, 'y'), (3, 'x'), (4, 'y')]:
+            db_driver.insert_row('mytable', {'a': a, 'b': b})
+        # An index may change the scan order
+        with sqlite3.connect(str(tmp_path / 'test.db')) as con:
+            con.execute('CREATE INDEX mytable_b ON mytable(b)')
+        assert db_driver.select_rows('mytable', {'b': ['x', 'y', 'z']}, order_by=['rowid']) == \
+            [(1, 'z'), (2, 'y'), (3, 'x'), (4, 'y')]
+        db_driver.close()
+
+    def test_iter_rows(self, db_driver: SqliteDbDriver) -> None:
+        assert db_driver.create_table('mytable', {'a': 'int', 'b': 'varchar(200)'})
+        for a in range(10):
+            db_driver.insert_row('mytable', {'a': a, 'b': 'x' if a % 2 else 'y'})
+        rows: Iterator = db_driver.iter_rows('mytable', batch_size=3)
+        assert next(rows) == (0, 'y')
+        assert len(list(rows)) == 9
+        assert list(db_driver.iter_rows('mytable', ['b', 'a'], {'a >=': 6, 'b': 'x'}, batch_size=1)) == \
+            [('x', 7), ('x', 9)]
+        assert list(db_driver.iter_rows('mytable', ['a'], {'a': [1, 2], 'b !=': 'x'})) == [(2,)]
+        assert list(db_driver.iter_rows('mytable', where={'a >': 100})) == []
+
+    def test_iter_rows_closed(self, db_driver: SqliteDbDriver) -> None:
+        assert db_driver.create_table('mytable', {'a': 'int', 'b': 'varchar(200)'})
+        for a in range(5):
+            db_driver.insert_row('mytable', {'a': a, 'b': 'x'})
+        rows: Iterator = db_driver.iter_rows('mytable', batch_size=2)
+        assert next(rows) == (0, 'x')
+        # Rows are written while a scan is suspended, and the scan can be dropped
+        db_driver.insert_row('mytable', {'a': 5, 'b': 'y'})
+        rows.close()
+        assert len(db_driver.select_rows('mytable')) == 6
+
+    def test_transaction_rollback(self, db_driver: SqliteDbDriver) -> None:
+        assert db_driver.create_table('mytable', {'a': 'int', 'b': 'varchar(200)'})
+        with pytest.raises(ValueError):
+            with db_driver.transaction():
+                db_driver.insert_row('mytable', {'a': 1, 'b': 'x'})
+                raise ValueError()
+        with db_driver.transaction():
+            db_driver.insert_row('mytable', {'a': 2, 'b': 'y'})
+        assert db_driver.fetch_rows('mytable') == [(2, 'y')]
+
+    def test_autocommit(self, tmp_path) -> None:
+        path: str = str(tmp_path / 'test.db')
+        (writer, reader) = (SqliteDbDriver(path), SqliteDbDriver(path))
+        assert writer.create_table('mytable', {'a': 'int', 'b': 'varchar(200)'})
+        writer.insert_row('mytable', {'a': 1, 'b': 'x'})
+        assert reader.fetch_rows('mytable') == [(1, 'x')]
@@ -0,0 +1,113 @@
+import tempfile
+
+from pathlib import Path
+from typing import List
+import numpy as np
+import pytest
+from edgar.utils.filing.accession_set import AccessionSet, decode_accession, encode_accession, \
+    encode_accessions, is_accession
+from edgar.utils.filing.filing_repo import ACCESSION_SET, FilingRepo
+
+ACCESSIONS: List[str] = ['0001564590-21-005399', '0000002045-20-000003', '0001564590-21-007000']
+
+
+class TestAccessionSet:
+    def setup_method(self) -> None:
+        self.__dir = tempfile.TemporaryDirectory(suffix='_accessions')
+        self.__path = Path(self.__dir.name) / 'accessions'
+
+    def teardown_method(self) -> None:
+        self.__dir.cleanup()
+
+    def test_encode(self) -> None:
+        assert encode_accession('0001564590-21-005399') == 156459021005399
+        assert decode_accession(156459021005399) == '0001564590-21-005399'
+        assert encode_accessions(ACCESSIONS).tolist() == [encode_accession(a) for a in ACCESSIONS]
+        assert encode_accessions([]).tolist() == []
+        assert is_accession('9999999999-99-999999')
+        for bad in ['0001564590-21-00539', '0001564590+21-005399', '000156459a-21-005399', '000156459²-21-005399']:
+            assert not is_accession(bad)
+            with pytest.raises(ValueError):
+                encode_accession(bad)
+            with pytest.raises(ValueError):
+                encode_accessions(ACCESSIONS + [bad])
+
+    def test_contains(self) -> None:
+        with AccessionSet.build(self.__path, ACCESSIONS + ACCESSIONS[:1]) as accessions:
+            assert len(accessions) == 3
+            assert accessions.codes().tolist() == sorted(encode_accession(a) for a in ACCESSIONS)
+            for accession in ACCESSIONS:
+                assert accession in accessions
+            assert '0001564590-21-005398' not in accessions
+            assert 'edgar/data/1000045' not in accessions
+            assert accessions.contains_many(ACCESSIONS + ['0001564590-21-005398']).tolist() == \
+                [True, True, True, False]
+            # Batches with strings that are not accession numbers are looked up one by one
+            assert accessions.contains_many(['0001564590-21-005399', 'nope']).tolist() == [True, False]
+            assert accessions.contains_many(encode_accessions(ACCESSIONS[:2])).tolist() == [True, True]
+
+    def test_empty(self) -> None:
+        with AccessionSet.build(self.__path, []) as accessions:
+            assert len(accessions) == 0
+            assert ACCESSIONS[0] not in accessions
+            assert accessions.contains_many(ACCESSIONS).tolist() == [False] * 3
+
+    def test_many(self) -> None:
+        rng: np.random.Generator = np.random.default_rng(7)
+        codes: np.ndarray = rng.choice(10 ** 12, 20000, replace=False).astype(np.uint64)
+        with AccessionSet.build(self.__path, codes[:10000]) as accessions:
+            found: np.ndarray = accessions.contains_many(codes)
+            assert found[:10000].all()
+            assert not found[10000:].any()
+            assert all(decode_accession(int(code)) in accessions for code in codes[:100])
+            assert not any(decode_accession(int(code)) in accessions for code in codes[10000:10100])
+
+    def test_replace(self) -> None:
+        old: AccessionSet = AccessionSet.build(self.__path, ACCESSIONS[:1])
+        with AccessionSet.build(self.__path, ACCESSIONS) as new:
+            # Readers keep the version they opened
+            assert len(old) == 1 and ACCESSIONS[1] not in old
+            assert ACCESSIONS[1] in new
+        old.close()
+        assert [p.name for p in Path(self.__dir.name).iterdir()] == ['accessions']
+
+    def test_not_a_set(self) -> None:
+        self.__path.write_bytes(b'0' * 64)
+        with pytest.raises(ValueError):
+            AccessionSet(self.__path)
+
+
+class TestFilingRepoAccessionSet:
+    def setup_method(self) -> None:
+        self.__dir = tempfile.TemporaryDirectory(suffix='_filings')
+        self.__repo = FilingRepo(Path(self.__dir.name))
+
+    def teardown_method(self) -> None:
+        self.__dir.cleanup()
+
+    def test_record(self) -> None:
+        self.__repo.create(1000045, ACCESSIONS[0]).out(iter(['<SEC-DOCUMENT>']))
+        with self.__repo.accession_set() as stored:
+            assert len(stored) == 1 and ACCESSIONS[0] in stored
+        assert (Path(self.__dir.name) / ACCESSION_SET).exists()
+
+        self.__repo.create(2045, ACCESSIONS[1]).out(iter(['<SEC-DOCUMENT>']))
+        with self.__repo.accession_set() as stored:
+            # Not recorded yet
+            assert ACCESSIONS[1] not in stored
+        with self.__repo.record([ACCESSIONS[1], 'nope']) as stored:
+            assert stored.contains_many(ACCESSIONS).tolist() == [True, True, False]
+
+        self.__repo.create(1000045, ACCESSIONS[2]).out(iter(['<SEC-DOCUMENT>']))
+        with self.__repo.accession_set(rebuild=True) as stored:
+            assert len(stored) == 3
+        assert sorted(self.__repo.accessions()) == sorted(ACCESSIONS)
+
+    def test_record_merge(self) -> None:
+        self.__repo.create(1000045, ACCESSIONS[1]).out(iter(['<SEC-DOCUMENT>']))
+        self.__repo.accession_set().close()
+        with self.__repo.record([ACCESSIONS[2], ACCESSIONS[1], ACCESSIONS[0], ACCESSIONS[2]]) as stored:
+            assert len(stored) == 3
+            assert stored.codes().tolist() == sorted(encode_accessions(ACCESSIONS).tolist())
+        with self.__repo.record([]) as stored:
+            assert len(stored) == 3
@@ -0,0 +1,139 @@
+import pytest, tempfile, threading
+
+from datetime import date
+from pathlib import Path
+from typing import Dict, List
+from unittest import mock
+from edgar.utils.filing.filing_fetcher import FetchStats, FilingFetcher
+from edgar.utils.filing.filing_repo import FilingRepo
+from edgar.utils.filing.rate_limiter import TokenBucket
+from edgar.utils.index.master_index import IndexRow
+
+BASE_URL: str = 'https://www.sec.gov/Archives/'
+
+
+def index_row(cik: int, accession: str, filed: str) -> IndexRow:
+    return IndexRow(cik, 'ACME INC', '10-K', date.fromisoformat(filed).toordinal(),
+        'edgar/data/{0}/{1}.txt'.format(cik, accession))
+
+
+ROWS: List[IndexRow] = [
+    index_row(1000045, '0001564590-21-005399', '2021-02-11'),
+    index_row(1000045, '0001564590-21-007000', '2021-03-01'),
+    index_row(2045, '0000002045-20-000003', '2020-11-30'),
+    index_row(3045, '0000003045-21-000001', '2021-01-15'),
+]
+
+
+class FakeSession:
+    def __init__(self, status: Dict[str, List[int]] = None) -> None:
+        self.urls: List[str] = []
+        self.status: Dict[str, List[int]] = status or {}
+        self.lock: threading.Lock = threading.Lock()
+
+    def get(self, url: str, **kwargs) -> mock.Mock:
+        with self.lock:
+            self.urls.append(url)
+            codes: List[int] = self.status.get(url, [200])
+            code: int = codes.pop(0) if len(codes) > 1 else codes[0]
+        return mock.Mock(status_code=code, **{'iter_content.return_value': [url.encode()]})
+
+
+class TestFilingFetcher:
+    def setup_method(self) -> None:
+        self.__dir = tempfile.TemporaryDirectory(suffix='_filings')
+        self.__repo = FilingRepo(Path(self.__dir.name))
+
+    def teardown_method(self) -> None:
+        self.__dir.cleanup()
+
+    def fetcher(self, session: FakeSession, workers: int = 1) -> FilingFetcher:
+        return FilingFetcher(self.__repo, BASE_URL, TokenBucket(1000, burst=100), workers=workers,
+            backoff=0, session=session)
+
+    def test_recent_first(self) -> None:
+        session: FakeSession = FakeSession()
+        fetcher: FilingFetcher = self.fetcher(session)
+        assert fetcher.add(ROWS) == 4
+        assert fetcher.run() == FetchStats(4, 0, 0)
+        assert session.urls == [BASE_URL + ROWS[i].filename for i in [1, 0, 3, 2]]
+        assert self.__repo.path(2045, '0000002045-20-000003').read_bytes() == (BASE_URL + ROWS[2].filename).encode()
+
+    def test_dedupe_and_resume(self) -> None:
+        self.__repo.create(1000045, '0001564590-21-005399').out(iter(['stored']))
+        session: FakeSession = FakeSession()
+        fetcher: FilingFetcher = self.fetcher(session)
+        assert fetcher.add(ROWS + ROWS[1:2]) == 3
+        assert fetcher.run(limit=2) == FetchStats(2, 0, 0)
+        assert len(fetcher) == 1
+        assert fetcher.add(ROWS) == 0
+
+        # A new run picks up what the previous one has stored
+        resumed: FilingFetcher = self.fetcher(session)
+        assert resumed.add(ROWS) == 1
+        assert resumed.run() == FetchStats(1, 0, 0)
+        assert len(session.urls) == 3
+        assert sorted(self.__repo.accessions()) == sorted(row.accession for row in ROWS)
+        with self.__repo.accession_set() as stored:
+            assert len(stored) == 4
+            assert all(row.accession in stored for row in ROWS)
+
+    def test_retry(self) -> None:
+        session: FakeSession = FakeSession({
+            BASE_URL + ROWS[0].filename: [429, 503, 200],
+            BASE_URL + ROWS[1].filename: [404],
+            BASE_URL + ROWS[2].filename: [500],
+        })
+        fetcher: FilingFetcher = self.fetcher(session, workers=3)
+        fetcher.add(ROWS)
+        assert fetcher.run() == FetchStats(2, 2, 5)
+        assert self.__repo.exists(1000045, '0001564590-21-005399')
+        assert not self.__repo.exists(1000045, '0001564590-21-007000')
+        # Failed filings are queued again
+        assert fetcher.add(ROWS) == 2
+
+    def test_connection_error(self) -> None:
+        session: FakeSession = FakeSession()
+        get = session.get
+        calls: List[int] = []
+        def flaky(url: str, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                raise ConnectionError('reset')
+            return get(url, **kwargs)
+        session.get = flaky
+        fetcher: FilingFetcher = self.fetcher(session)
+        fetcher.add(ROWS[:1])
+        assert fetcher.run() == FetchStats(1, 0, 1)
+
+    def test_rate_limited(self) -> None:
+        limiter = mock.Mock()
+        fetcher: FilingFetcher = FilingFetcher(self.__repo, BASE_URL, limiter, workers=2, session=FakeSession())
+        fetcher.add(ROWS)
+        fetcher.run()
+        assert limiter.acquire.call_count == 4
+
+    def test_record_every(self) -> None:
+        fetcher: FilingFetcher = FilingFetcher(self.__repo, BASE_URL, TokenBucket(1000, burst=100), workers=1,
+            session=FakeSession(), record_every=2)
+        fetcher.add(ROWS)
+        with mock.patch.object(self.__repo, 'record', wraps=self.__repo.record) as record:
+            assert fetcher.run() == FetchStats(4, 0, 0)
+        # Recorded during the run, nothing is left for its end
+        assert [len(c[1][0]) for c in record.mock_calls] == [2, 2]
+        with self.__repo.accession_set() as stored:
+            assert len(stored) == 4
+
+    def test_record_interrupted(self) -> None:
+        fetcher: FilingFetcher = self.fetcher(FakeSession())
+        fetcher.add(ROWS)
+        join = threading.Thread.join
+        def interrupted(thread: threading.Thread, *args) -> None:
+            join(thread, *args)
+            raise KeyboardInterrupt()
+
+        with mock.patch.object(threading.Thread, 'join', interrupted):
+            with pytest.raises(KeyboardInterrupt):
+                fetcher.run()
+        with self.__repo.accession_set() as stored:
+            assert all(row.accession in stored for row in ROWS)
@@ -0,0 +1,46 @@
+import tempfile
+
+from pathlib import Path
+from unittest import mock
+from edgar.utils.filing.filing_repo import FilingRepo, filing_shard
+from edgar.utils.repo.file_repo_dir import FileRepoDir
+
+
+class TestFilingRepo:
+    def setup_method(self) -> None:
+        self.__dir = tempfile.TemporaryDirectory(suffix='_filings')
+        self.__repo = FilingRepo(Path(self.__dir.name))
+
+    def teardown_method(self) -> None:
+        self.__dir.cleanup()
+
+    def test_shard(self) -> None:
+        assert filing_shard(1000045, '0001564590-21-005399') == ['045', '1000045', '21']
+        assert filing_shard(7, '0000000007-98-000001') == ['007', '7', '98']
+        assert self.__repo.path(1000045, '0001564590-21-005399') == \
+            Path(self.__dir.name) / '045' / '1000045' / '21' / '0001564590-21-005399.txt'
+
+    def test_create(self) -> None:
+        assert not self.__repo.exists(1000045, '0001564590-21-005399')
+        self.__repo.create(1000045, '0001564590-21-005399').out(iter([b'<SEC-DOCUMENT>']))
+        self.__repo.create(1000045, '0001564590-20-000001').out(iter(['<SEC-DOCUMENT>']))
+        self.__repo.create(2045, '0000002045-21-000003').out(iter(['<SEC-DOCUMENT>']))
+        assert self.__repo.exists(1000045, '0001564590-21-005399')
+        assert self.__repo.path(1000045, '0001564590-21-005399').read_bytes() == b'<SEC-DOCUMENT>'
+
+        # Temporary and lock files are not filings
+        assert sorted(self.__repo.filings()) == [
+            (2045, '0000002045-21-000003'), (1000045, '0001564590-20-000001'), (1000045, '0001564590-21-005399')]
+        assert sorted(self.__repo.accessions()) == [
+            '0000002045-21-000003', '0001564590-20-000001', '0001564590-21-005399']
+
+    def test_shards_reused(self) -> None:
+        repo: FilingRepo = FilingRepo(Path(self.__dir.name), open_shards=2)
+        with mock.patch('edgar.utils.filing.filing_repo.FileRepoDir', wraps=FileRepoDir) as opened:
+            for (cik, accession) in [(1000045, '0001564590-21-005399'), (1000045, '0001564590-21-005400'),
+                    (2045, '0000002045-21-000003'), (7, '0000000007-21-000001'), (1000045, '0001564590-21-005401')]:
+                repo.create(cik, accession).out(iter(['<SEC-DOCUMENT>']))
+        # The first shard is reopened once the third one pushes it out
+        assert [str(c[1][0].relative_to(repo.root)) for c in opened.mock_calls] == [
+            '045/1000045/21', '045/2045/21', '007/7/21', '045/1000045/21']
+        assert len(list(repo.filings())) == 5
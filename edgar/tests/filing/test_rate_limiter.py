@@ -0,0 +1,52 @@
+import threading
+
+from typing import List
+from edgar.utils.filing.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.waits: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.waits.append(round(seconds, 6))
+        self.now += seconds
+
+
+class TestTokenBucket:
+    def test_pace(self) -> None:
+        clock: FakeClock = FakeClock()
+        bucket: TokenBucket = TokenBucket(10, clock=clock, sleep=clock.sleep)
+        assert [round(bucket.acquire(), 6) for _ in range(4)] == [0.0, 0.1, 0.1, 0.1]
+        assert round(clock.now, 6) == 100.3
+
+    def test_burst(self) -> None:
+        clock: FakeClock = FakeClock()
+        bucket: TokenBucket = TokenBucket(10, burst=3, clock=clock, sleep=clock.sleep)
+        assert [round(bucket.acquire(), 6) for _ in range(5)] == [0.0, 0.0, 0.0, 0.1, 0.1]
+        # Idle time refills the bucket up to the burst only
+        clock.now += 10
+        assert [round(bucket.acquire(), 6) for _ in range(4)] == [0.0, 0.0, 0.0, 0.1]
+
+    def test_threads(self) -> None:
+        # Waiting callers reserve consecutive slots
+        clock: FakeClock = FakeClock()
+        lock: threading.Lock = threading.Lock()
+        waits: List[float] = []
+        bucket: TokenBucket = TokenBucket(10, clock=clock, sleep=lambda s: None)
+
+        def take() -> None:
+            wait: float = bucket.acquire()
+            with lock:
+                waits.append(round(wait, 6))
+
+        threads: List[threading.Thread] = [threading.Thread(target=take) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sorted(waits) == [0.0, 0.1, 0.2, 0.3, 0.4]
@@ -0,0 +1,75 @@
+import tempfile
+
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from datetime import date
+from pathlib import Path
+from typing import List
+import pytest
+from edgar.utils.index.index_ingest import IndexIngest
+from edgar.utils.index.master_index import iter_lines, parse_master_index
+from edgar.utils.repo.file_repo_fs import FileRepoFS
+from edgar.utils.repo.repo_format import RepoFormat
+from edgar.tests.synthetic import master_index
+
+
+class TestIndexIngest:
+    def test_ingest(self, dir_empty: tempfile.TemporaryDirectory, repo_format: RepoFormat) -> None:
+        root: Path = Path(dir_empty.name)
+        texts: List[str] = []
+        for q in range(1, 4):
+            quarter: Path = root / 'Q' / '2020' / 'QTR{0}'.format(q)
+            quarter.mkdir(parents=True)
+            texts.append(master_index(date(2020, q * 3 - 2, 1), 90, 20 * q, seed=q, daily=False))
+            (quarter / 'master.idx').write_text(texts[-1])
+
+        fs: FileRepoFS = FileRepoFS(root, repo_format)
+        results = list(IndexIngest(max_workers=2).ingest(fs.objects()))
+
+        assert [obj.subpath(4) for (obj, _) in results] == \
+            [['Q', '2020', 'QTR{0}'.format(q), 'master.idx'] for q in range(1, 4)]
+        for ((_, columns), text) in zip(results, texts):
+            with columns:
+                assert list(columns) == list(parse_master_index(iter_lines([text])))
+
+    def test_ingest_close(self, dir_empty: tempfile.TemporaryDirectory, repo_format: RepoFormat) -> None:
+        quarter: Path = Path(dir_empty.name) / 'Q' / '2020' / 'QTR1'
+        quarter.mkdir(parents=True)
+        (quarter / 'master.idx').write_text(master_index(date(2020, 1, 1), 90, 10, daily=False))
+
+        fs: FileRepoFS = FileRepoFS(Path(dir_empty.name), repo_format)
+        [(_, columns)] = list(IndexIngest(max_workers=1).ingest(fs.objects()))
+        with columns:
+            assert len(columns) == 10
+        with pytest.raises(ValueError):
+            columns[0]
+        # Closing again is harmless
+        columns.close()
+
+    def test_ingest_nothing(self, dir_empty: tempfile.TemporaryDirectory, repo_format: RepoFormat) -> None:
+        fs: FileRepoFS = FileRepoFS(Path(dir_empty.name), repo_format)
+        assert list(IndexIngest(max_workers=1).ingest(fs.objects())) == []
+
+    def test_ingest_window(self, dir_empty: tempfile.TemporaryDirectory, repo_format: RepoFormat) -> None:
+        root: Path = Path(dir_empty.name)
+        for q in range(1, 5):
+            quarter: Path = root / 'Q' / '2020' / 'QTR{0}'.format(q)
+            quarter.mkdir(parents=True)
+            (quarter / 'master.idx').write_text(master_index(date(2020, q * 3 - 2, 1), 90, 10, seed=q, daily=False))
+
+        submitted: List[str] = []
+
+        class CountingIngest(IndexIngest):
+            def executor(self) -> Executor:
+                pool: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+                submit = pool.submit
+                pool.submit = lambda fn, *args: submitted.append(args[0]) or submit(fn, *args)
+                return pool
+
+        fs: FileRepoFS = FileRepoFS(root, repo_format)
+        results = CountingIngest(max_workers=1).ingest(fs.objects())
+        next(results)
+        # Objects are submitted two per worker ahead of the consumer
+        assert len(submitted) == 2
+        assert len(list(results)) == 3
+        assert len(submitted) == 4
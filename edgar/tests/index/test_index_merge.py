@@ -0,0 +1,72 @@
+import tempfile
+
+from datetime import date
+from pathlib import Path
+from typing import List
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.index.index_merge import IndexMerge, merge_runs, read_run, sort_key, spool_runs
+from edgar.utils.index.master_index import IndexRow, iter_lines, parse_master_index
+from edgar.utils.repo.file_repo_fs import FileRepoFS
+from edgar.utils.repo.repo_format import RepoFormat
+from edgar.tests.synthetic import master_index
+
+CLOSED_DAYS: List[date] = [date(2020, 3, 30), date(2020, 3, 31)]
+OPEN_DAYS: List[date] = [date(2020, 4, 1), date(2020, 4, 2)]
+
+
+def rows(text: str) -> List[IndexRow]:
+    return list(parse_master_index(iter_lines([text])))
+
+
+class TestIndexMerge:
+    def setup_method(self) -> None:
+        self.__dir = tempfile.TemporaryDirectory(suffix='_index_merge')
+        self.__root = Path(self.__dir.name)
+        self.__rows: List[IndexRow] = []
+
+        dailies: List[str] = []
+        for (i, day) in enumerate(CLOSED_DAYS + OPEN_DAYS):
+            dailies.append(master_index(day, 1, 30, seed=i))
+            self.write('D/{0}/QTR{1}/master{2:%Y%m%d}.idx'.format(day.year, (day.month - 1) // 3 + 1, day), dailies[-1])
+            self.__rows.extend(rows(dailies[-1]))
+
+        # The quarterly object repeats the dailies of the closed quarter, dates as YYYY-MM-DD
+        earlier: str = master_index(date(2020, 1, 1), 80, 200, seed=9, daily=False)
+        self.__rows.extend(rows(earlier))
+        repeated: str = ''.join(line.replace('|{0:%Y%m%d}|'.format(day), '|{0}|'.format(day)) + '\n'
+            for (day, text) in zip(CLOSED_DAYS, dailies) for line in text.split('-' * 80 + '\n')[1].splitlines())
+        self.write('Q/2020/QTR1/master.idx', earlier + repeated)
+
+    def teardown_method(self) -> None:
+        self.__dir.cleanup()
+
+    def write(self, uri: str, text: str) -> None:
+        path: Path = self.__root / 'repo' / uri
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+    def merge(self, **kwargs) -> IndexMerge:
+        return IndexMerge(FileRepoFS(self.__root / 'repo', RepoFormat(
+            {DatePeriodType.DAY: 'master{y:04}{m:02}{d:02}.idx', DatePeriodType.QUARTER: 'master.idx'}, ['{t}', '{y}', 'QTR{q}'])), **kwargs)
+
+    def test_rows(self) -> None:
+        merged: List[IndexRow] = list(self.merge(run_rows=64).rows(Date('2020-01-01'), Date('2020-04-30')))
+        assert merged == sorted(self.__rows, key=sort_key)
+        assert len(merged) == 320
+
+    def test_range(self) -> None:
+        merged: List[IndexRow] = list(self.merge().rows(Date('2020-03-31'), Date('2020-04-01')))
+        assert merged == sorted([r for r in self.__rows if date(2020, 3, 31).toordinal() <= r.date_filed
+            <= date(2020, 4, 1).toordinal()], key=sort_key)
+        assert {r.filing_date() for r in merged} == {date(2020, 3, 31), date(2020, 4, 1)}
+
+    def test_runs(self) -> None:
+        spool: Path = Path(self.__dir.name)
+        runs: List[Path] = spool_runs(self.__rows, spool, 100)
+        assert len(runs) == 4
+        assert list(read_run(runs[0])) == sorted(self.__rows[:100], key=sort_key)
+
+    def test_duplicate_accessions(self) -> None:
+        row: IndexRow = self.__rows[0]
+        other: IndexRow = row._replace(cik=row.cik + 1, filename='edgar/data/{0}/{1}.txt'.format(row.cik + 1, row.accession))
+        assert list(merge_runs([[row], [other], [row]])) == [min(row, other, key=sort_key)]
@@ -0,0 +1,54 @@
+import pytest
+
+from datetime import date
+from typing import List
+from edgar.utils.index.master_index import IndexColumns, IndexRow, date_ordinal, iter_lines, \
+    parse_master_index, parse_master_index_bytes
+from edgar.tests.synthetic import master_index
+
+
+class TestMasterIndex:
+    @pytest.mark.parametrize("value, expected", [
+        ('2021-02-11',  date(2021, 2, 11)),
+        ('20210211',    date(2021, 2, 11)),
+        (b'20171231',   date(2017, 12, 31)),
+    ])
+    def test_date_ordinal(self, value, expected: date) -> None:
+        assert date_ordinal(value) == expected.toordinal()
+
+    @pytest.mark.parametrize("chunks, expected", [
+        (['ab\ncd', '\nef'],        ['ab', 'cd', 'ef']),
+        (['a', 'b', '\r\n', 'c\n'], ['ab', 'c']),
+        ([b'x\ny'],                 ['x', 'y']),
+    ])
+    def test_iter_lines(self, chunks, expected: List[str]) -> None:
+        assert list(iter_lines(chunks)) == expected
+
+    def test_parse_master_index(self) -> None:
+        text: str = master_index(date(2021, 1, 4), 1, 50, daily=True)
+        rows: List[IndexRow] = list(parse_master_index(iter_lines([text])))
+
+        assert len(rows) == 50
+        assert all(r.date_filed == date(2021, 1, 4).toordinal() for r in rows)
+        assert rows[0].filename.endswith(rows[0].accession + '.txt')
+        assert [r.cik for r in rows] == sorted(r.cik for r in rows)
+
+    def test_parse_bytes_same_as_text(self) -> None:
+        text: str = master_index(date(2020, 1, 1), 90, 200, daily=False)
+        columns: IndexColumns = parse_master_index_bytes(text.encode())
+        assert list(columns) == list(parse_master_index(iter_lines([text])))
+
+    def test_columns_buffer_round_trip(self) -> None:
+        text: str = master_index(date(2020, 4, 1), 90, 100, daily=False)
+        columns: IndexColumns = parse_master_index_bytes(text.encode())
+
+        buffer: bytearray = bytearray(columns.nbytes())
+        assert columns.write_to(buffer) == len(buffer)
+
+        view: IndexColumns = IndexColumns.from_buffer(buffer)
+        assert len(view) == 100
+        assert list(view) == list(columns)
+
+    def test_columns_buffer_bad_magic(self) -> None:
+        with pytest.raises(ValueError):
+            IndexColumns.from_buffer(bytearray(IndexColumns.HEADER.size))
@@ -0,0 +1,70 @@
+import pytest
+import tempfile
+
+from pathlib import Path
+from typing import List
+from edgar.utils.metrics import metrics
+from edgar.utils.metrics.metrics_registry import MetricsRegistry, Summary
+from edgar.utils.db.sqlite_db_driver import SqliteDbDriver
+from edgar.utils.repo.file_repo_fs import FileRepoFS
+from edgar.utils.repo.repo_format import RepoFormat
+from edgar.utils.date.date_utils import Date
+
+
+@pytest.fixture
+def registry() -> MetricsRegistry:
+    registry: MetricsRegistry = MetricsRegistry()
+    prev = metrics.set_sink(registry)
+    yield registry
+    metrics.set_sink(prev)
+
+
+class TestMetrics:
+    def test_disabled(self) -> None:
+        assert not metrics.enabled()
+        assert metrics.span('x') is metrics.NULL_SPAN
+        chunks: List[str] = ['a', 'b']
+        assert metrics.timed_iter(chunks, 'x') is chunks
+        assert metrics.counted_iter(chunks, 'x') is chunks
+
+    def test_incr(self, registry: MetricsRegistry) -> None:
+        metrics.incr('objects_total', period='D')
+        metrics.incr('objects_total', 2, period='D')
+        metrics.incr('objects_total', period='Q')
+        assert registry.counter('objects_total', period='D') == 3
+        assert registry.counter('objects_total', period='Q') == 1
+        assert registry.counter('objects_total') == 0
+
+    def test_span(self, registry: MetricsRegistry) -> None:
+        for _ in range(3):
+            with metrics.span('work_seconds', step='a'):
+                pass
+        summary: Summary = registry.summary('work_seconds', step='a')
+        assert summary.count == 3
+        assert summary.sum >= 0
+
+    def test_counted_iter(self, registry: MetricsRegistry) -> None:
+        assert list(metrics.counted_iter([b'abc', b'de'], 'bytes')) == [b'abc', b'de']
+        assert registry.summary('bytes').sum == 5
+
+    def test_timed_iter(self, registry: MetricsRegistry) -> None:
+        assert list(metrics.timed_iter(iter(range(5)), 'scan_seconds')) == list(range(5))
+        assert registry.summary('scan_seconds').count == 1
+
+    def test_sqlite_rows_written(self, registry: MetricsRegistry) -> None:
+        db_driver: SqliteDbDriver = SqliteDbDriver(':memory:')
+        db_driver.create_table('mytable', {'a': 'int'})
+        for i in range(4):
+            db_driver.insert_row('mytable', {'a': i})
+        db_driver.fetch_rows('mytable')
+        assert registry.counter('db_rows_written_total', table='mytable') == 4
+        assert registry.counter('db_rows_read_total', table='mytable') == 4
+
+    def test_file_repo_fs(self, registry: MetricsRegistry, edgar_fs: tempfile.TemporaryDirectory,
+            repo_format: RepoFormat) -> None:
+        fs: FileRepoFS = FileRepoFS(Path(edgar_fs.name), repo_format)
+        missing: List[str] = fs.find_missing(Date('2018-01-20'), Date('2018-02-10'))
+        assert registry.summary('repo_refresh_seconds').count == 1
+        assert registry.counter('repo_stat_calls_total') > 0
+        assert registry.counter('repo_missing_total', period='Q') == 1
+        assert registry.counter('repo_missing_total', period='D') == len(missing) - 1
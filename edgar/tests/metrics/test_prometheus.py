@@ -0,0 +1,28 @@
+from edgar.utils.metrics.metrics_registry import MetricsRegistry
+from edgar.utils.metrics.prometheus import prometheus_text
+
+
+class TestPrometheus:
+    def test_empty(self) -> None:
+        assert prometheus_text(MetricsRegistry()) == ''
+
+    def test_text(self) -> None:
+        registry: MetricsRegistry = MetricsRegistry()
+        registry.incr('pipe_objects_total', period='D')
+        registry.incr('pipe_objects_total', period='Q')
+        registry.observe('http_bytes', 100)
+        registry.observe('http_bytes', 50)
+        registry.observe('db_insert_seconds', 0.5, table='repo"ledger')
+
+        assert prometheus_text(registry).split('\n') == [
+            '# TYPE edgar_pipe_objects_total counter',
+            'edgar_pipe_objects_total{period="D"} 1.0',
+            'edgar_pipe_objects_total{period="Q"} 1.0',
+            '# TYPE edgar_db_insert_seconds summary',
+            'edgar_db_insert_seconds_count{table="repo\\"ledger"} 1.0',
+            'edgar_db_insert_seconds_sum{table="repo\\"ledger"} 0.5',
+            '# TYPE edgar_http_bytes summary',
+            'edgar_http_bytes_count 2.0',
+            'edgar_http_bytes_sum 150.0',
+            '',
+        ]
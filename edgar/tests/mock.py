@@ -1,5 +1,9 @@
-from typing import List
+from typing import Dict, Iterator, List
 from collections import deque
+import time
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.repo.repo_format import RepoFormatter
+from edgar.utils.repo.repo_fs import RepoFS, RepoObject, RepoURI
 
 class CallTracker:
     def __init__(self) -> None:
@@ -16,3 +20,53 @@ class CallTracker:
             for i, a in enumerate(c[1]):
                 assert a == e[1][i], "{0} is not equal to {1}".format(a, e[1][i])
 
+
+class OriginObject(RepoObject):
+    def __init__(self, origin: 'OriginFS', key: str) -> None:
+        self.__origin = origin
+        self.__key = key
+
+    def exists(self) -> bool:
+        return self.__key in self.__origin.content
+
+    def as_uri(self) -> str:
+        return 'origin://' + self.__key
+
+    def inp(self, bufsize: int = 2048) -> Iterator[bytes]:
+        self.__origin.downloads.append(self.__key)
+        data: bytes = self.__origin.content.get(self.__key, b'')
+        for i in range(0, len(data), bufsize):
+            time.sleep(self.__origin.delay)
+            yield data[i:i + bufsize]
+
+    def out(self, iter: Iterator[str], override: bool = False) -> None:
+        self.__origin.content[self.__key] = b''.join(c.encode() if isinstance(c, str) else c for c in iter)
+
+    def subpath(self, levels: int) -> List[str]:
+        return self.__key.split('/')[-levels:]
+
+
+class OriginFS(RepoFS):
+    def __init__(self, formatter: RepoFormatter, delay: float = 0) -> None:
+        self.__formatter = formatter
+        self.content: Dict[str, bytes] = {}
+        self.downloads: List[str] = []
+        self.delay = delay
+
+    def key(self, period_type: DatePeriodType, the_date: Date) -> str:
+        return '/'.join(self.__formatter.format(period_type, the_date))
+
+    def iterate_missing(self, from_date: Date, to_date: Date) -> Iterator[RepoURI]:
+        return iter([])
+
+    def find_missing(self, from_date: Date, to_date: Date) -> List[str]:
+        return []
+
+    def find(self, period_type: DatePeriodType, the_date: Date) -> RepoObject:
+        return OriginObject(self, self.key(period_type, the_date))
+
+    def create(self, period_type: DatePeriodType, the_date: Date) -> RepoObject:
+        return self.find(period_type, the_date)
+
+    def refresh(self) -> None:
+        pass
@@ -0,0 +1,169 @@
+import os, tempfile, threading
+import pytest
+
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List
+from unittest import mock
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.repo.cache_repo_fs import CacheRepoFS, CacheRepoObject
+from edgar.utils.repo.file_repo_sync import lock_path
+from edgar.utils.repo.repo_format import RepoFormat, RepoFormatter
+from edgar.tests.mock import OriginFS
+
+
+def timestamp(s: str) -> float:
+    return datetime.fromisoformat(s).timestamp()
+
+
+class TestCacheRepoFS:
+    def setup_method(self) -> None:
+        self.__dir = tempfile.TemporaryDirectory(suffix='_cache')
+        self.__formatter = RepoFormatter(RepoFormat(
+            {DatePeriodType.DAY: 'master{y}{m:02}{d:02}.idx', DatePeriodType.QUARTER: 'master.idx'},
+            ['{t}', '{y}', 'QTR{q}']))
+        self.__origin = OriginFS(self.__formatter)
+        self.__now = timestamp('2021-05-10T12:00:00')
+
+    def teardown_method(self) -> None:
+        self.__dir.cleanup()
+
+    def cache(self, **kwargs) -> CacheRepoFS:
+        return CacheRepoFS(self.__origin, Path(self.__dir.name), self.__formatter, clock=lambda: self.__now, **kwargs)
+
+    def put(self, period_type: DatePeriodType, date_str: str, data: bytes) -> None:
+        self.__origin.content[self.__origin.key(period_type, Date(date_str))] = data
+
+    def test_read_through(self) -> None:
+        self.put(DatePeriodType.DAY, '2021-05-03', b'x' * 5000)
+        cache: CacheRepoFS = self.cache()
+        obj: CacheRepoObject = cache.find(DatePeriodType.DAY, Date('2021-05-03'))
+        assert not obj.cached()
+
+        assert b''.join(obj.inp(1024)) == b'x' * 5000
+        assert obj.cached()
+        assert obj.path == Path(self.__dir.name) / 'D' / '2021' / 'QTR2' / 'master20210503.idx'
+        assert obj.subpath(2) == ['QTR2', 'master20210503.idx']
+        assert b''.join(cache.find(DatePeriodType.DAY, Date('2021-05-03')).inp(1024)) == b'x' * 5000
+        assert self.__origin.downloads == ['D/2021/QTR2/master20210503.idx']
+        assert (len(cache), cache.size) == (1, 5000)
+        assert [p.name for p in obj.path.parent.iterdir() if p.name.endswith('.tmp')] == []
+
+    def test_not_cached_if_missing(self) -> None:
+        cache: CacheRepoFS = self.cache()
+        obj: CacheRepoObject = cache.find(DatePeriodType.DAY, Date('2021-05-04'))
+        assert b''.join(obj.inp()) == b''
+        assert not obj.path.exists()
+        assert not obj.exists()
+
+    def test_streamed_on_miss(self) -> None:
+        read: List[int] = []
+        def inp(obj, bufsize: int = 2048) -> Iterator[bytes]:
+            for i in range(5):
+                read.append(i)
+                yield bytes([65 + i]) * 1000
+
+        obj: CacheRepoObject = self.cache().find(DatePeriodType.DAY, Date('2021-05-03'))
+        with mock.patch('edgar.tests.mock.OriginObject.inp', inp):
+            chunks = obj.inp(1024)
+            # The first chunk is passed on before the origin is read to the end
+            assert next(chunks) == b'A' * 1000
+            assert read == [0]
+            assert not obj.cached()
+
+            # The rest is cached when the reader stops early
+            chunks.close()
+        assert read == [0, 1, 2, 3, 4]
+        assert obj.path.read_bytes() == b''.join(bytes([65 + i]) * 1000 for i in range(5))
+        assert not lock_path(obj.path).exists()
+        assert [p.name for p in obj.path.parent.iterdir() if p.name.endswith('.tmp')] == []
+
+    def test_single_flight(self) -> None:
+        self.__origin.delay = 0.01
+        self.put(DatePeriodType.DAY, '2021-05-03', b'y' * 8192)
+        cache: CacheRepoFS = self.cache()
+        results: List[bytes] = []
+
+        def read() -> None:
+            results.append(b''.join(cache.find(DatePeriodType.DAY, Date('2021-05-03')).inp(1024)))
+
+        threads: List[threading.Thread] = [threading.Thread(target=read) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results == [b'y' * 8192] * 4
+        assert len(self.__origin.downloads) == 1
+
+    def test_lru_eviction(self) -> None:
+        for day in ['2021-05-03', '2021-05-04', '2021-05-05']:
+            self.put(DatePeriodType.DAY, day, b'z' * 1000)
+        cache: CacheRepoFS = self.cache(max_bytes=2500)
+        objs: List[CacheRepoObject] = [cache.find(DatePeriodType.DAY, Date(d))
+            for d in ['2021-05-03', '2021-05-04', '2021-05-05']]
+
+        b''.join(objs[0].inp())
+        b''.join(objs[1].inp())
+        b''.join(objs[0].inp())
+        # A lock file left behind by a process that died goes with its object
+        lock_path(objs[1].path).touch()
+        b''.join(objs[2].inp())
+        assert [o.cached() for o in objs] == [True, False, True]
+        assert (len(cache), cache.size) == (2, 2000)
+        assert not lock_path(objs[1].path).exists()
+
+        # The order survives reopening the cache
+        os.utime(objs[2].path, ns=(objs[0].path.stat().st_atime_ns - 1, objs[2].path.stat().st_mtime_ns))
+        reopened: CacheRepoFS = self.cache(max_bytes=2500)
+        b''.join(reopened.find(DatePeriodType.DAY, Date('2021-05-04')).inp())
+        assert [o.cached() for o in objs] == [True, True, False]
+
+    @pytest.mark.parametrize("period_type, date_str, cached_at, now, expected", [
+        (DatePeriodType.DAY,     '2021-05-03', '2021-05-03T23:00:00', '2030-01-01T00:00:00', True),
+        (DatePeriodType.QUARTER, '2021-05-03', '2021-05-10T01:00:00', '2021-05-10T12:00:00', True),
+        (DatePeriodType.QUARTER, '2021-05-03', '2021-05-09T01:00:00', '2021-05-10T12:00:00', False),
+        (DatePeriodType.QUARTER, '2021-02-03', '2021-03-31T23:00:00', '2021-05-10T12:00:00', False),
+        (DatePeriodType.QUARTER, '2021-02-03', '2021-04-01T01:00:00', '2030-01-01T00:00:00', True),
+    ])
+    def test_is_fresh(self, period_type, date_str, cached_at, now, expected) -> None:
+        self.__now = timestamp(now)
+        assert self.cache().is_fresh(period_type, Date(date_str), timestamp(cached_at)) == expected
+
+    def test_stale_refetched(self) -> None:
+        self.put(DatePeriodType.QUARTER, '2021-05-03', b'old')
+        cache: CacheRepoFS = self.cache()
+        obj: CacheRepoObject = cache.find(DatePeriodType.QUARTER, Date('2021-05-03'))
+        assert b''.join(obj.inp()) == b'old'
+
+        self.put(DatePeriodType.QUARTER, '2021-05-03', b'new!')
+        self.__now += 3600
+        assert b''.join(obj.inp()) == b'old'
+        self.__now += 86400
+        assert b''.join(obj.inp()) == b'new!'
+        assert (len(cache), cache.size) == (1, 4)
+        assert len(self.__origin.downloads) == 2
+
+    def test_stale_served_if_origin_lost(self) -> None:
+        self.put(DatePeriodType.QUARTER, '2021-05-03', b'old')
+        cache: CacheRepoFS = self.cache()
+        obj: CacheRepoObject = cache.find(DatePeriodType.QUARTER, Date('2021-05-03'))
+        assert b''.join(obj.inp()) == b'old'
+
+        del self.__origin.content[self.__origin.key(DatePeriodType.QUARTER, Date('2021-05-03'))]
+        self.__now += 2 * 86400
+        assert b''.join(obj.inp()) == b'old'
+        assert (len(cache), cache.size) == (1, 3)
+        assert len(self.__origin.downloads) == 2
+
+    def test_stale_served_if_origin_fails(self) -> None:
+        self.put(DatePeriodType.QUARTER, '2021-05-03', b'old')
+        cache: CacheRepoFS = self.cache()
+        obj: CacheRepoObject = cache.find(DatePeriodType.QUARTER, Date('2021-05-03'))
+        assert b''.join(obj.inp()) == b'old'
+
+        self.__now += 2 * 86400
+        with mock.patch('edgar.tests.mock.OriginObject.inp', side_effect=ConnectionError('reset')):
+            assert b''.join(obj.inp()) == b'old'
+            # Without a cached copy the failure is raised
+            with pytest.raises(ConnectionError):
+                b''.join(cache.find(DatePeriodType.QUARTER, Date('2021-08-03')).inp())
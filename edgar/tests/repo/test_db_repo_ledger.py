@@ -1,7 +1,7 @@
 from datetime import datetime
 import pytest
 
-from edgar.utils.repo.db_repo_ledger import DbRepoLedger
+from edgar.utils.repo.db_repo_ledger import DbRepoLedger, EventObject
 from edgar.utils.date.date_utils import Date, DatePeriodType
 from edgar.utils.db.sqlite_db_driver import SqliteDbDriver
 
@@ -22,4 +22,14 @@ class TestDbRepoLedger:
         assert rows[0][1] == '2021-11-11'
         assert rows[0][2] == 'D'
         assert rows[0][3] >= beg_ts
-        assert rows[0][3] <= end_ts        
\ No newline at end of file
+        assert rows[0][3] <= end_ts        
+
+    def test_events(self, ledger: DbRepoLedger) -> None:
+        ledger.start(Date('2021-11-10'))
+        ledger.record(Date('2021-11-11'), DatePeriodType.DAY)
+        ledger.error(Date('2021-11-12'), 'failed')
+        events = list(ledger.events(batch_size=2))
+        assert [e.event_name for e in events] == ['start', 'record', 'error']
+        assert isinstance(events[1], EventObject) and events[1].event_data == 'D'
+        assert [e.event_date for e in ledger.events({'event_date >': '2021-11-10'})] == ['2021-11-11', '2021-11-12']
+        assert [e.event_data for e in ledger.events({'event_name': 'error'})] == ['failed']
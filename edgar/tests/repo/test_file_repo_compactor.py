@@ -0,0 +1,111 @@
+import sqlite3, tempfile
+import pytest
+
+from datetime import date, datetime
+from pathlib import Path
+from typing import List
+from unittest import mock
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.db.sqlite_db_driver import SqliteDbDriver
+from edgar.utils.repo.db_repo_ledger import DbRepoLedger
+from edgar.utils.repo.file_repo_compactor import CompactionError, FileRepoCompactor
+from edgar.utils.repo.file_repo_fs import COMPACTED_MARKER, FileRepoFS
+from edgar.utils.repo.repo_format import RepoFormat
+from edgar.tests.synthetic import master_index
+
+DAYS: List[str] = ['2020-01-02', '2020-01-03', '2020-01-06']
+
+
+def rows(index: str) -> str:
+    return index.split('-' * 80 + '\n')[1]
+
+
+class TestFileRepoCompactor:
+    def setup_method(self) -> None:
+        self.__dir = tempfile.TemporaryDirectory(suffix='_compactor')
+        self.__root = Path(self.__dir.name) / 'repo'
+        self.__now = datetime(2020, 5, 10).timestamp()
+        self.__format = RepoFormat(
+            {DatePeriodType.DAY: 'master{y:04}{m:02}{d:02}.idx', DatePeriodType.QUARTER: 'master.idx'},
+            ['{t}', '{y}', 'QTR{q}'])
+        self.__ledger = DbRepoLedger(SqliteDbDriver(':memory:'))
+
+        dailies: List[str] = [master_index(date.fromisoformat(d), 1, 20, seed=i) for (i, d) in enumerate(DAYS)]
+        for (d, index) in zip(DAYS, dailies):
+            path: Path = self.__root / 'D' / '2020' / 'QTR1' / 'master{0}.idx'.format(d.replace('-', ''))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(index)
+        self.__quarterly = self.__root / 'Q' / '2020' / 'QTR1' / 'master.idx'
+        self.__quarterly.parent.mkdir(parents=True)
+        self.__quarterly.write_text(dailies[0] + ''.join(rows(index) for index in dailies[1:]))
+
+    def teardown_method(self) -> None:
+        self.__dir.cleanup()
+
+    def compactor(self, fs: FileRepoFS, **kwargs) -> FileRepoCompactor:
+        return FileRepoCompactor(fs, self.__ledger, clock=lambda: self.__now, **kwargs)
+
+    def test_compact(self) -> None:
+        fs: FileRepoFS = FileRepoFS(self.__root, self.__format)
+        assert 'D/2020/QTR1/master20200107.idx' in fs.find_missing(Date('2020-01-01'), Date('2020-01-31'))
+
+        assert self.compactor(fs).compact(Date('2020-02-15')) == 3
+        assert [p.name for p in (self.__root / 'D' / '2020' / 'QTR1').iterdir()] == [COMPACTED_MARKER]
+        assert fs.is_compacted(Date('2020-03-31')) and not fs.is_compacted(Date('2020-04-01'))
+        assert fs.find(DatePeriodType.DAY, Date('2020-01-02')) is None
+        assert [row[:3] for row in self.__ledger.dump()] == [('compact', '2020-01-01', '3')]
+
+        missing: List[str] = fs.find_missing(Date('2020-01-01'), Date('2020-04-30'))
+        assert missing[:2] == ['Q/2020/QTR2/master.idx', 'D/2020/QTR2/master20200401.idx']
+        assert not [uri for uri in missing if 'QTR1' in uri]
+
+        # Compacting again is a no-op
+        assert self.compactor(fs).compact(Date('2020-01-01')) == 0
+        assert len(self.__ledger.dump()) == 1
+
+    def test_ledger_failure(self) -> None:
+        fs: FileRepoFS = FileRepoFS(self.__root, self.__format)
+        with mock.patch.object(self.__ledger, 'compact', side_effect=sqlite3.OperationalError('locked')):
+            with pytest.raises(sqlite3.OperationalError):
+                self.compactor(fs).compact(Date('2020-02-15'))
+        assert not fs.is_compacted(Date('2020-01-01'))
+
+        # A rerun records the compaction
+        assert self.compactor(fs).compact(Date('2020-02-15')) == 3
+        assert [row[:3] for row in self.__ledger.dump()] == [('compact', '2020-01-01', '3')]
+
+    def test_archive(self) -> None:
+        fs: FileRepoFS = FileRepoFS(self.__root, self.__format)
+        archive: Path = Path(self.__dir.name) / 'archive'
+        assert self.compactor(fs, archive=archive).compact(Date('2020-01-01')) == 3
+        assert sorted(p.name for p in (archive / 'D' / '2020' / 'QTR1').iterdir()) == \
+            ['master20200102.idx', 'master20200103.idx', 'master20200106.idx']
+
+    def test_not_covered(self) -> None:
+        self.__quarterly.write_text(self.__quarterly.read_text().rsplit('\n', 2)[0] + '\n')
+        fs: FileRepoFS = FileRepoFS(self.__root, self.__format)
+        compactor: FileRepoCompactor = self.compactor(fs)
+        assert [obj.path.name for obj in compactor.uncovered(Date('2020-01-01'))] == ['master20200106.idx']
+
+        with pytest.raises(CompactionError):
+            compactor.compact(Date('2020-01-01'))
+        assert not fs.is_compacted(Date('2020-01-01'))
+        assert len(list((self.__root / 'D' / '2020' / 'QTR1').iterdir())) == 3
+
+        # The quarter before has no quarterly object
+        assert compactor.compact_range(Date('2019-10-01'), Date('2020-12-31')) == []
+        assert [row[:2] for row in self.__ledger.dump()] == [('error', '2019-10-01'), ('error', '2020-01-01')]
+
+    def test_missing_quarterly(self) -> None:
+        self.__quarterly.unlink()
+        fs: FileRepoFS = FileRepoFS(self.__root, self.__format)
+        assert len(self.compactor(fs).uncovered(Date('2020-01-01'))) == 3
+        with pytest.raises(CompactionError):
+            self.compactor(fs).compact(Date('2020-01-01'))
+
+    def test_open_quarter(self) -> None:
+        self.__now = datetime(2020, 3, 31, 12).timestamp()
+        fs: FileRepoFS = FileRepoFS(self.__root, self.__format)
+        with pytest.raises(CompactionError):
+            self.compactor(fs).compact(Date('2020-01-01'))
+        assert self.compactor(fs).compact_range(Date('2020-01-01'), Date('2020-12-31')) == []
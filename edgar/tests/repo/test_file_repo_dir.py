@@ -39,6 +39,32 @@ class TestFileRepoDir:
             assert (lambda x: (x == 0 and name not in dir) or (x == 1 and name in dir))(i)
             dir.refresh()
   
+    def test_refresh_removed(self, dir_prepped: tempfile.TemporaryDirectory) -> None:
+        dir: FileRepoDir = FileRepoDir(Path(dir_prepped.name))
+        (dir.path / str(YEAR_LIST[0])).rmdir()
+        dir.refresh()
+        assert len(dir) == len(YEAR_LIST) - 1
+        assert str(YEAR_LIST[0]) not in dir
+
+    def test_lazy_children(self, test_fs: tempfile.TemporaryDirectory) -> None:
+        dir: FileRepoDir = FileRepoDir(Path(test_fs.name))
+        assert dir.is_loaded()
+
+        qdir: FileRepoDir = dir['Q']
+        ddir: FileRepoDir = dir['D']
+        assert not qdir.is_loaded() and not ddir.is_loaded()
+
+        obj: FileRepoObject = dir.get(['Q', '2020', 'QTR1', 'file-0.txt'])
+        assert obj is not None
+        assert qdir.is_loaded() and qdir['2020'].is_loaded()
+        assert not qdir['2019'].is_loaded()
+        assert not ddir.is_loaded()
+
+    def test_object_name_with_space(self, dir_empty: tempfile.TemporaryDirectory) -> None:
+        dir: FileRepoDir = FileRepoDir(Path(dir_empty.name))
+        obj: FileRepoObject = dir.new_object('master 1.idx')
+        assert obj.path == dir.path / 'master 1.idx'
+
     def test_new_object_success(self, dir_empty: tempfile.TemporaryDirectory, fake: Faker) -> None:
         name: str = fake.file_name()
         dir: FileRepoDir = FileRepoDir(Path(dir_empty.name))
@@ -128,3 +154,39 @@ class TestFileRepoDir:
         assert c[1][0].subpath(4) == ['Q', str(max(YEAR_LIST)), 'QTR4', 'file-2.txt']
         assert len(mock.mock_calls) == 1
 
+
+    def test_names_sorted(self, dir_prepped: tempfile.TemporaryDirectory) -> None:
+        dir: FileRepoDir = FileRepoDir(Path(dir_prepped.name))
+        dir.new_dir('2000')
+        dir.new_object('2019-note.txt')
+        assert dir.names() == sorted([str(y) for y in YEAR_LIST] + ['2000', '2019-note.txt'])
+        del dir['2019']
+        assert '2019' not in dir.names()
+        assert dir.names() == sorted(dir.names())
+
+    def test_walk_all(self, test_fs: tempfile.TemporaryDirectory) -> None:
+        dir: FileRepoDir = FileRepoDir(Path(test_fs.name))
+        paths: List[List[str]] = [o.subpath(4) for o in dir.walk()]
+        assert len(paths) == 2 * len(YEAR_LIST) * 4 * FILE_PER_DIR
+        assert paths == sorted(paths)
+
+    @pytest.mark.parametrize("lo, hi, first, last, count", [
+        (['Q', '2018', 'QTR2'], ['Q', '2019', 'QTR1', 'file-1.txt'],
+            ['Q', '2018', 'QTR2', 'file-0.txt'], ['Q', '2019', 'QTR1', 'file-1.txt'], 3 * FILE_PER_DIR + 2),
+        (['D', '2020', 'QTR4', 'file-2.txt'], None,
+            ['D', '2020', 'QTR4', 'file-2.txt'], ['Q', '2020', 'QTR4', 'file-2.txt'], 1 + len(YEAR_LIST) * 4 * FILE_PER_DIR),
+        (None, ['D', '2017'],
+            ['D', '2017', 'QTR1', 'file-0.txt'], ['D', '2017', 'QTR4', 'file-2.txt'], 4 * FILE_PER_DIR),
+    ])
+    def test_walk_range(self, test_fs: tempfile.TemporaryDirectory, lo: List[str], hi: List[str],
+            first: List[str], last: List[str], count: int) -> None:
+        dir: FileRepoDir = FileRepoDir(Path(test_fs.name))
+        paths: List[List[str]] = [o.subpath(4) for o in dir.walk(lo, hi)]
+        assert (paths[0], paths[-1], len(paths)) == (first, last, count)
+
+    def test_walk_prunes(self, test_fs: tempfile.TemporaryDirectory) -> None:
+        dir: FileRepoDir = FileRepoDir(Path(test_fs.name))
+        list(dir.walk(['Q', '2020', 'QTR1'], ['Q', '2020', 'QTR2']))
+        assert not dir['D'].is_loaded()
+        assert not dir['Q']['2019'].is_loaded()
+        assert not dir['Q']['2020']['QTR3'].is_loaded()
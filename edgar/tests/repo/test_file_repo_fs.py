@@ -102,3 +102,30 @@ class TestFileRepoFS:
         assert obj is not None
         assert obj.subpath(4) == path
 
+
+    def test_find_missing_after_create(self, edgar_fs: tempfile.TemporaryDirectory, repo_format: RepoFormat) -> None:
+        root: Path = Path(edgar_fs.name)
+        fs: FileRepoFS = FileRepoFS(root, repo_format)
+        missing: List[str] = fs.find_missing(Date('2020-06-01'), Date('2020-06-04'))
+        assert 'D/2020/QTR2/master20200602.idx' in missing
+
+        fs.create(DatePeriodType.DAY, Date('2020-06-02')).out(iter(['data']))
+        missing = fs.find_missing(Date('2020-06-01'), Date('2020-06-04'))
+        assert 'D/2020/QTR2/master20200602.idx' not in missing
+        assert 'D/2020/QTR2/master20200601.idx' in missing
+
+    @pytest.mark.parametrize("period_type, from_date, to_date, count", [
+        (DatePeriodType.DAY,     Date('2017-12-30'), Date('2018-01-10'), 12),
+        (DatePeriodType.DAY,     Date('2018-01-20'), Date('2018-03-31'), 6),
+        (DatePeriodType.QUARTER, Date('2017-01-01'), Date('2018-12-31'), 2),
+        (DatePeriodType.QUARTER, Date('2019-01-01'), Date('2019-12-31'), 0),
+    ])
+    def test_walk(self, edgar_fs: tempfile.TemporaryDirectory, repo_format: RepoFormat,
+            period_type: DatePeriodType, from_date: Date, to_date: Date, count: int) -> None:
+        fs: FileRepoFS = FileRepoFS(Path(edgar_fs.name), repo_format)
+        objects: List[FileRepoObject] = list(fs.walk(period_type, from_date, to_date))
+        assert len(objects) == count
+        if period_type == DatePeriodType.DAY:
+            dates: List[Date] = [RepoObjectPath.from_uri('/'.join(o.subpath(4)), repo_format).date() for o in objects]
+            assert dates == sorted(dates)
+            assert all(from_date <= d <= to_date for d in dates)
@@ -0,0 +1,122 @@
+import pytest, tempfile, os
+
+from pathlib import Path
+from faker import Faker
+from typing import List
+from unittest import mock
+from edgar.utils.repo.file_repo_dir import FileRepoDir
+from edgar.utils.repo.file_repo_object import FileRepoObject
+from edgar.utils.repo.file_repo_map import FileRepoMap, LineIndex, sidecar_path
+
+
+@pytest.fixture
+def lines(fake: Faker) -> List[str]:
+    return [fake.sentence() + '\n' for _ in range(200)]
+
+
+@pytest.fixture
+def obj(dir_empty: tempfile.TemporaryDirectory, lines: List[str]) -> FileRepoObject:
+    dir: FileRepoDir = FileRepoDir(Path(dir_empty.name))
+    obj: FileRepoObject = FileRepoObject(dir, 'master.idx')
+    obj.path.write_text(''.join(lines))
+    return obj
+
+
+class TestLineIndex:
+    @pytest.mark.parametrize("content, expected", [
+        (b'',           0),
+        (b'a',          1),
+        (b'a\n',        1),
+        (b'a\nb',       2),
+        (b'a\n\nb\n',   3),
+    ])
+    def test_build(self, content: bytes, expected: int) -> None:
+        index: LineIndex = LineIndex.build(content)
+        assert len(index) == expected
+        assert index.span(0, expected) == (0, len(content))
+
+
+class TestFileRepoMap:
+    @pytest.mark.parametrize("row", [0, 1, 150, 199, -1])
+    def test_line(self, obj: FileRepoObject, lines: List[str], row: int) -> None:
+        with obj.map() as m:
+            assert len(m) == len(lines)
+            view: memoryview = m.line(row)
+            assert bytes(view).decode() == lines[row]
+            view.release()
+
+    def test_line_out_of_range(self, obj: FileRepoObject) -> None:
+        with obj.map() as m:
+            with pytest.raises(IndexError):
+                m.line(200)
+
+    def test_lines(self, obj: FileRepoObject, lines: List[str]) -> None:
+        with obj.map() as m:
+            view: memoryview = m.lines(10, 20)
+            assert bytes(view).decode() == ''.join(lines[10:20])
+            view.release()
+
+    def test_byte_range(self, obj: FileRepoObject, lines: List[str]) -> None:
+        with obj.map() as m:
+            view: memoryview = m.byte_range(5, 50)
+            assert bytes(view).decode() == ''.join(lines)[5:50]
+            view.release()
+
+    def test_sidecar_persisted(self, obj: FileRepoObject, lines: List[str]) -> None:
+        with obj.map() as m:
+            assert len(m) == len(lines)
+
+        sidecar: Path = sidecar_path(obj.path)
+        assert sidecar.exists()
+
+        stat: os.stat_result = obj.path.stat()
+        index: LineIndex = LineIndex.load(sidecar, stat.st_size, stat.st_mtime_ns)
+        assert index is not None
+        assert len(index) == len(lines)
+
+    def test_sidecar_stale(self, obj: FileRepoObject, lines: List[str]) -> None:
+        with obj.map() as m:
+            assert len(m) == len(lines)
+
+        with obj.path.open('a') as f:
+            f.write('one more line\n')
+
+        with obj.map() as m:
+            assert len(m) == len(lines) + 1
+            view: memoryview = m.line(-1)
+            assert bytes(view) == b'one more line\n'
+            view.release()
+
+    @pytest.mark.parametrize('cut', [3, LineIndex.HEADER.size + 5, LineIndex.HEADER.size + 16])
+    def test_sidecar_truncated(self, obj: FileRepoObject, lines: List[str], cut: int) -> None:
+        with obj.map() as m:
+            assert len(m) == len(lines)
+        sidecar: Path = sidecar_path(obj.path)
+        sidecar.write_bytes(sidecar.read_bytes()[:cut])
+
+        stat: os.stat_result = obj.path.stat()
+        assert LineIndex.load(sidecar, stat.st_size, stat.st_mtime_ns) is None
+        # The sidecar is rebuilt
+        with obj.map() as m:
+            assert len(m) == len(lines)
+        assert len(LineIndex.load(sidecar, stat.st_size, stat.st_mtime_ns)) == len(lines)
+
+    def test_sidecar_read_only(self, obj: FileRepoObject, lines: List[str]) -> None:
+        with mock.patch('tempfile.mkstemp', side_effect=PermissionError('read-only')):
+            with obj.map() as m:
+                assert len(m) == len(lines)
+        assert not sidecar_path(obj.path).exists()
+
+    def test_sidecar_not_listed(self, obj: FileRepoObject) -> None:
+        with obj.map() as m:
+            len(m)
+
+        dir: FileRepoDir = FileRepoDir(obj.path.parent)
+        assert [name for (name, _) in dir] == ['master.idx']
+
+    def test_empty_file(self, dir_empty: tempfile.TemporaryDirectory) -> None:
+        path: Path = Path(dir_empty.name) / 'empty.idx'
+        path.touch()
+        with FileRepoMap(path, persist=False) as m:
+            assert len(m) == 0
+            assert m.size() == 0
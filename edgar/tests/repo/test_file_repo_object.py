@@ -1,9 +1,9 @@
-import pytest, tempfile, unittest
+import pytest, tempfile, unittest, multiprocessing
 
 from pathlib import Path
 from faker import Faker
 from unittest.mock import MagicMock
-from typing import List
+from typing import Iterator, List
 from edgar.utils.repo.file_repo_dir import FileRepoDir
 from edgar.utils.repo.file_repo_object import FileRepoObject
 from edgar.tests.globals import YEAR_LIST
@@ -101,3 +101,48 @@ class TestFileRepoObject:
         with pytest.raises(FileNotFoundError):
             for _ in obj.inp(512):
                 assert False
+
+    def test_out_bytes(self, dir_empty: tempfile.TemporaryDirectory, fake: Faker) -> None:
+        dir: FileRepoDir = FileRepoDir(Path(dir_empty.name))
+        obj: FileRepoObject = FileRepoObject(dir, fake.file_name(extension = 'idx'))
+        obj.out(iter([b'abc', 'def', b'\n']))
+
+        with open(obj.path, "r") as f:
+            assert f.read() == 'abcdef\n'
+
+    def test_out_failure(self, dir_empty: tempfile.TemporaryDirectory) -> None:
+        def content() -> Iterator[str]:
+            yield 'abc'
+            raise ConnectionError('lost')
+
+        dir: FileRepoDir = FileRepoDir(Path(dir_empty.name))
+        obj: FileRepoObject = FileRepoObject(dir, 'master.idx')
+        obj.out(iter(['old']))
+        with pytest.raises(ConnectionError):
+            obj.out(content(), override=True)
+
+        assert obj.path.read_text() == 'old'
+        assert [p.name for p in obj.path.parent.iterdir() if p.suffix == '.tmp'] == []
+
+    @pytest.mark.parametrize("override", [True, False])
+    def test_out_processes(self, dir_empty: tempfile.TemporaryDirectory, override: bool) -> None:
+        ctx = multiprocessing.get_context('spawn')
+        with ctx.Pool(4) as pool:
+            results: List[str] = pool.starmap(write_object,
+                [(dir_empty.name, 'master.idx', i, override) for i in range(8)])
+
+        content: str = (Path(dir_empty.name) / 'master.idx').read_text()
+        assert content in [str(i) * 100000 for i in range(8)]
+        assert results.count('ok') == (8 if override else 1)
+        assert results.count('exists') == (0 if override else 7)
+        dir: FileRepoDir = FileRepoDir(Path(dir_empty.name))
+        assert dir.names() == ['master.idx']
+
+
+def write_object(root: str, name: str, i: int, override: bool) -> str:
+    obj: FileRepoObject = FileRepoObject(FileRepoDir(Path(root)), name)
+    try:
+        obj.out((str(i) * 1000 for _ in range(100)), override=override)
+    except FileExistsError:
+        return 'exists'
+    return 'ok'
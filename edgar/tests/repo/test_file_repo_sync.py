@@ -0,0 +1,120 @@
+import errno, pytest, tempfile, os, threading, time
+
+from pathlib import Path
+from typing import List
+from edgar.utils.repo.file_repo_dir import FileRepoDir
+from edgar.utils.repo.file_repo_sync import FileSyncer, FsyncPolicy, object_lock, lock_path
+
+
+@pytest.fixture
+def fsyncs(monkeypatch: pytest.MonkeyPatch) -> List[int]:
+    calls: List[int] = []
+    real_fsync = os.fsync
+    def fsync(fd: int) -> None:
+        calls.append(fd)
+        real_fsync(fd)
+    monkeypatch.setattr(os, 'fsync', fsync)
+    return calls
+
+
+class TestFileSyncer:
+    @pytest.mark.parametrize("policy, on_write, on_flush", [
+        (FsyncPolicy.NONE,   0, 0),
+        (FsyncPolicy.FILE,   3, 0),
+        (FsyncPolicy.ALWAYS, 6, 0),
+        (FsyncPolicy.BATCH,  3, 1),
+    ])
+    def test_policy(self, dir_empty: tempfile.TemporaryDirectory, fsyncs: List[int],
+            policy: FsyncPolicy, on_write: int, on_flush: int) -> None:
+        dir: FileRepoDir = FileRepoDir(Path(dir_empty.name), syncer=FileSyncer(policy))
+        for name in ('a', 'b', 'c'):
+            dir.new_object(name).out(iter(['data']))
+        assert len(fsyncs) == on_write
+        dir.syncer.flush()
+        assert len(fsyncs) == on_write + on_flush
+        assert len(dir.syncer) == 0
+
+    def test_new_dirs(self, dir_empty: tempfile.TemporaryDirectory) -> None:
+        dir: FileRepoDir = FileRepoDir(Path(dir_empty.name), syncer=FileSyncer(FsyncPolicy.BATCH))
+        dir.new_dir('D').new_dir('2021').new_object('x').out(iter(['data']))
+        assert dir['D'].syncer is dir.syncer
+        assert len(dir.syncer) == 3
+        dir.syncer.flush()
+        assert len(dir.syncer) == 0
+
+
+class TestObjectLock:
+    def test_lock_file_hidden(self, dir_empty: tempfile.TemporaryDirectory) -> None:
+        dir: FileRepoDir = FileRepoDir(Path(dir_empty.name))
+        with object_lock(dir.path / 'x'):
+            assert lock_path(dir.path / 'x').exists()
+            dir.refresh()
+            assert len(dir) == 0
+
+    def test_lock_file_removed(self, dir_empty: tempfile.TemporaryDirectory) -> None:
+        dir: FileRepoDir = FileRepoDir(Path(dir_empty.name))
+        dir.new_object('x').out(iter(['data']))
+        assert sorted(os.listdir(dir.path)) == ['x']
+
+    def test_exclusive(self, dir_empty: tempfile.TemporaryDirectory) -> None:
+        path: Path = Path(dir_empty.name) / 'x'
+        order: List[str] = []
+
+        def writer() -> None:
+            with object_lock(path):
+                order.append('second')
+
+        with object_lock(path):
+            thread: threading.Thread = threading.Thread(target=writer)
+            thread.start()
+            time.sleep(0.05)
+            order.append('first')
+        thread.join()
+        assert order == ['first', 'second']
+
+    def test_exclusive_across_removal(self, dir_empty: tempfile.TemporaryDirectory) -> None:
+        # Writers waiting on a lock file removed by its holder lock the next one
+        path: Path = Path(dir_empty.name) / 'x'
+        inside: List[int] = []
+        overlaps: List[int] = []
+
+        def writer() -> None:
+            for _ in range(50):
+                with object_lock(path):
+                    inside.append(1)
+                    if len(inside) > 1:
+                        overlaps.append(1)
+                    time.sleep(0.0005)
+                    inside.pop()
+
+        threads: List[threading.Thread] = [threading.Thread(target=writer) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert overlaps == []
+        assert not lock_path(path).exists()
+
+
+class TestObjectWrite:
+    def test_umask(self, dir_empty: tempfile.TemporaryDirectory) -> None:
+        dir: FileRepoDir = FileRepoDir(Path(dir_empty.name))
+        # The umask of the process when the object is written applies
+        for (umask, mode) in [(0o027, 0o640), (0o002, 0o664)]:
+            previous: int = os.umask(umask)
+            try:
+                dir.new_object('x').out(iter(['data']), override=True)
+            finally:
+                os.umask(previous)
+            assert (dir.path / 'x').stat().st_mode & 0o777 == mode
+
+    def test_no_hard_links(self, dir_empty: tempfile.TemporaryDirectory, monkeypatch: pytest.MonkeyPatch) -> None:
+        def link(*args) -> None:
+            raise PermissionError(errno.EPERM, 'Operation not permitted')
+        monkeypatch.setattr(os, 'link', link)
+        dir: FileRepoDir = FileRepoDir(Path(dir_empty.name))
+        dir.new_object('x').out(iter(['data']))
+        assert (dir.path / 'x').read_text() == 'data'
+        assert sorted(os.listdir(dir.path)) == ['x']
+        with pytest.raises(FileExistsError):
+            dir.new_object('x').out(iter(['other']))
@@ -0,0 +1,118 @@
+import pytest, tempfile, os, sys
+
+from pathlib import Path
+from typing import List
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.repo.repo_format import RepoFormat
+from edgar.utils.repo.file_repo_fs import FileRepoFS
+from edgar.utils.repo.file_repo_watcher import FileRepoWatcher, WatchEvent, \
+    IN_CREATE, IN_DELETE, IN_MOVED_FROM, IN_MOVED_TO, IN_Q_OVERFLOW
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith('linux'), reason='inotify is Linux only')
+
+DAILY: str = 'D/2018/QTR1/master20180129.idx'
+
+
+@pytest.fixture
+def watch_fs(edgar_fs: tempfile.TemporaryDirectory, repo_format: RepoFormat) -> FileRepoFS:
+    fs: FileRepoFS = FileRepoFS(Path(edgar_fs.name), repo_format, watch=True)
+    fs.refresh()
+    yield fs
+    fs.close()
+
+
+def missing(fs: FileRepoFS) -> List[str]:
+    return fs.find_missing(Date('2018-01-29'), Date('2018-01-31'))
+
+
+class TestFileRepoWatcher:
+    def test_events(self, dir_empty: tempfile.TemporaryDirectory) -> None:
+        root: Path = Path(dir_empty.name)
+        with FileRepoWatcher() as watcher:
+            wd: int = watcher.watch(str(root))
+            assert watcher.path(wd) == str(root)
+            (root / 'a').write_text('a')
+            (root / 'a').rename(root / 'b')
+            (root / 'c').mkdir()
+            (root / 'b').unlink()
+
+            events: List[WatchEvent] = list(watcher.events())
+            assert [(e.name, e.mask & ~0x40000000, e.is_dir()) for e in events] == [
+                ('a', IN_CREATE, False), ('a', IN_MOVED_FROM, False), ('b', IN_MOVED_TO, False),
+                ('c', IN_CREATE, True), ('b', IN_DELETE, False)]
+            assert events[1].cookie == events[2].cookie
+            assert list(watcher.events()) == []
+
+    def test_unwatch(self, dir_empty: tempfile.TemporaryDirectory) -> None:
+        root: Path = Path(dir_empty.name)
+        with FileRepoWatcher() as watcher:
+            wd: int = watcher.watch(str(root))
+            watcher.unwatch(wd)
+            (root / 'a').write_text('a')
+            assert all(e.name == '' for e in watcher.events())
+            assert len(watcher) == 0
+
+    def test_watch_missing(self, dir_empty: tempfile.TemporaryDirectory) -> None:
+        with FileRepoWatcher() as watcher:
+            with pytest.raises(FileNotFoundError):
+                watcher.watch(os.path.join(dir_empty.name, 'missing'))
+
+
+class TestFileRepoFSWatch:
+    def test_create_delete(self, watch_fs: FileRepoFS, edgar_fs: tempfile.TemporaryDirectory) -> None:
+        assert DAILY in missing(watch_fs)
+
+        (Path(edgar_fs.name) / DAILY).write_text('data')
+        assert DAILY not in missing(watch_fs)
+        assert watch_fs.get_object(DAILY) is not None
+
+        (Path(edgar_fs.name) / DAILY).unlink()
+        assert DAILY in missing(watch_fs)
+        assert watch_fs.get_object(DAILY) is None
+
+    def test_rename(self, watch_fs: FileRepoFS, edgar_fs: tempfile.TemporaryDirectory) -> None:
+        path: Path = Path(edgar_fs.name) / DAILY
+        path.with_suffix('.new').write_text('data')
+        assert DAILY in missing(watch_fs)
+        path.with_suffix('.new').rename(path)
+        assert DAILY not in missing(watch_fs)
+
+    def test_same_date(self, watch_fs: FileRepoFS, edgar_fs: tempfile.TemporaryDirectory) -> None:
+        # A daily filed under the wrong quarter has the same key as the right one
+        misfiled: str = 'D/2018/QTR2/master20180129.idx'
+        (Path(edgar_fs.name) / DAILY).write_text('data')
+        (Path(edgar_fs.name) / misfiled).parent.mkdir(exist_ok=True)
+        (Path(edgar_fs.name) / misfiled).write_text('data')
+        assert watch_fs.get_object(misfiled) is not None
+
+        (Path(edgar_fs.name) / misfiled).unlink()
+        assert watch_fs.get_object(misfiled) is None
+        assert DAILY not in missing(watch_fs)
+
+        (Path(edgar_fs.name) / DAILY).unlink()
+        assert DAILY in missing(watch_fs)
+
+    def test_new_dirs(self, watch_fs: FileRepoFS, edgar_fs: tempfile.TemporaryDirectory) -> None:
+        qdir: Path = Path(edgar_fs.name) / 'D' / '2021' / 'QTR1'
+        qdir.mkdir(parents=True)
+        (qdir / 'master20210104.idx').write_text('data')
+        assert 'D/2021/QTR1/master20210104.idx' not in \
+            watch_fs.find_missing(Date('2021-01-04'), Date('2021-01-06'))
+        assert watch_fs.find(DatePeriodType.DAY, Date('2021-01-04')) is not None
+
+        os.rename(qdir.parent, Path(edgar_fs.name) / '2021')
+        assert 'D/2021/QTR1/master20210104.idx' in \
+            watch_fs.find_missing(Date('2021-01-04'), Date('2021-01-06'))
+
+    def test_overflow(self, watch_fs: FileRepoFS, edgar_fs: tempfile.TemporaryDirectory,
+            monkeypatch: pytest.MonkeyPatch) -> None:
+        watcher: FileRepoWatcher = watch_fs._FileRepoFS__watcher
+        (Path(edgar_fs.name) / DAILY).write_text('data')
+        (Path(edgar_fs.name) / 'D/2017/QTR4/master20171120.idx').unlink()
+        # The changes are lost, only the overflow is reported
+        list(watcher.events())
+        monkeypatch.setattr(watcher, 'events', lambda: iter([WatchEvent(-1, IN_Q_OVERFLOW, 0, '')]))
+
+        assert DAILY not in missing(watch_fs)
+        assert 'D/2017/QTR4/master20171120.idx' in \
+            watch_fs.find_missing(Date('2017-11-20'), Date('2017-11-21'))
@@ -1,7 +1,7 @@
 import unittest
 from unittest import mock
 from typing import Dict
-from edgar.utils.repo.http_client import HttpClient
+from edgar.utils.repo.http_client import HttpClient, new_session
 
     
 class TestHttpClient(unittest.TestCase):
@@ -45,4 +45,22 @@ class TestHttpClient(unittest.TestCase):
         assert status_code == 404
 
     def mock_http_get(self, *args, **kwargs):
-        return self.route_map[args[0]] if args[0] in self.route_map else mock.Mock(status_code=404)
\ No newline at end of file
+        return self.route_map[args[0]] if args[0] in self.route_map else mock.Mock(status_code=404)
+
+    def test_headers(self):
+        headers: Dict[str, str] = HttpClient.headers()
+        assert headers['User-Agent'].startswith('Mozilla/5.0')
+        assert HttpClient.headers() is headers
+
+    def test_session(self):
+        session = mock.Mock(**{'get.side_effect': self.mock_http_get})
+        http_client: HttpClient = HttpClient('http://test.com/a/', session)
+        assert http_client.get('b/c') == 200
+        assert next(http_client.inp()) == 'abc'
+        session.get.assert_called_once_with('http://test.com/a/b/c', headers=HttpClient.headers(), stream=True)
+
+    def test_new_session(self):
+        session = new_session(4)
+        adapter = session.get_adapter('https://www.sec.gov/')
+        assert adapter._pool_maxsize == 4
+        session.close()
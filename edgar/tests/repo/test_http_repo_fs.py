@@ -1,8 +1,13 @@
-import pytest, unittest
+import pytest, unittest, json
+
+from datetime import datetime
+from typing import Dict, List
+from unittest import mock
 
 from edgar.utils.repo.http_repo_fs import HttpRepoFS
-from edgar.utils.repo.http_repo_object import HttpRepoObject
+from edgar.utils.repo.http_repo_object import CompressedHttpRepoObject, HttpRepoObject
 from edgar.utils.repo.http_tools import get_index_macro
+from edgar.utils.repo.http_repo_listing import RemoteEntry
 from edgar.utils.repo.repo_format import RepoFormat, RepoFormatter
 from edgar.utils.date.date_utils import DatePeriodType, Date
 
@@ -23,4 +28,84 @@ class TestHttpRepoFS:
     def test_find_object(self, period_type, date_str, expected) -> None:
         repo: HttpRepoFS = HttpRepoFS('https://www.sec.gov/Archives/edgar/', self.__formatter)
         obj: HttpRepoObject = repo.find(period_type, Date(date_str))
-        assert obj.as_uri() == expected
\ No newline at end of file
+        assert obj.as_uri() == expected
+
+    @mock.patch('requests.get')
+    def test_listing_cached(self, mock_get) -> None:
+        mock_get.side_effect = mock_http_get
+        repo: HttpRepoFS = HttpRepoFS('https://www.sec.gov/Archives/edgar/', self.__formatter)
+        entry: RemoteEntry = repo.stat(DatePeriodType.DAY, Date('2021-01-04'))
+        assert entry.size == 62 * 1024
+        assert entry.last_modified == datetime(2021, 1, 4, 22, 0, 38)
+        assert repo.exists(DatePeriodType.DAY, Date('2021-01-05'))
+        assert not repo.exists(DatePeriodType.DAY, Date('2021-01-07'))
+        assert mock_get.call_count == 1
+
+        repo.refresh()
+        assert repo.exists(DatePeriodType.DAY, Date('2021-01-05'))
+        assert mock_get.call_count == 2
+
+    @mock.patch('requests.get')
+    def test_listing_unavailable(self, mock_get) -> None:
+        mock_get.return_value = mock.Mock(status_code=503)
+        repo: HttpRepoFS = HttpRepoFS('https://www.sec.gov/Archives/edgar/', self.__formatter)
+        with pytest.raises(OSError):
+            repo.exists(DatePeriodType.DAY, Date('2021-01-04'))
+        # The failure is not cached
+        mock_get.side_effect = mock_http_get
+        assert repo.exists(DatePeriodType.DAY, Date('2021-01-04'))
+        assert mock_get.call_count == 2
+
+    @mock.patch('requests.get')
+    def test_find_missing(self, mock_get) -> None:
+        mock_get.side_effect = mock_http_get
+        repo: HttpRepoFS = HttpRepoFS('https://www.sec.gov/Archives/edgar/', self.__formatter)
+        missing: List[str] = repo.find_missing(Date('2020-12-30'), Date('2021-01-08'))
+        assert missing == [
+            'full-index/2020/QTR4/master.idx',
+            'daily-index/2020/QTR4/master20201230.idx',
+            'daily-index/2020/QTR4/master20201231.idx',
+            'daily-index/2021/QTR1/master20210107.idx',
+            'daily-index/2021/QTR1/master20210108.idx',
+        ]
+        # One listing per directory
+        assert mock_get.call_count == 4
+
+    @mock.patch('requests.get')
+    def test_find_compressed(self, mock_get) -> None:
+        mock_get.side_effect = mock_http_get
+        formatter: RepoFormatter = RepoFormatter(RepoFormat({
+            DatePeriodType.DAY: 'master{y}{m:02}{d:02}.idx', DatePeriodType.QUARTER: 'master.idx'},
+            ['{index}', '{y}', 'QTR{q}'],
+            {DatePeriodType.DAY: 'master{y}{m:02}{d:02}.idx.gz', DatePeriodType.QUARTER: 'master.gz'}))
+        formatter['index'] = get_index_macro()
+        repo: HttpRepoFS = HttpRepoFS('https://www.sec.gov/Archives/edgar/', formatter)
+
+        quarterly = repo.find(DatePeriodType.QUARTER, Date('2021-02-01'))
+        assert isinstance(quarterly, CompressedHttpRepoObject)
+        assert quarterly.as_uri() == 'https://www.sec.gov/Archives/edgar/full-index/2021/QTR1/master.idx'
+        assert quarterly.variant_uri == 'https://www.sec.gov/Archives/edgar/full-index/2021/QTR1/master.gz'
+        # Dailies without a listed variant are downloaded as they are
+        daily = repo.find(DatePeriodType.DAY, Date('2021-01-04'))
+        assert type(daily) is HttpRepoObject
+        # The variant is tried for directories without a listing
+        assert repo.find(DatePeriodType.QUARTER, Date('2020-11-02')).variant_uri.endswith('2020/QTR4/master.gz')
+
+
+LISTINGS: Dict[str, Dict] = {
+    'https://www.sec.gov/Archives/edgar/daily-index/2021/QTR1/index.json': {'directory': {'item': [
+        {'name': 'master20210104.idx', 'type': 'file', 'size': '62 KB', 'last-modified': '01/04/2021 10:00:38 PM'},
+        {'name': 'master20210105.idx', 'type': 'file', 'size': '71 KB', 'last-modified': '01/05/2021 10:00:41 PM'},
+        {'name': 'master20210106.idx', 'type': 'file', 'size': '70 KB', 'last-modified': '01/06/2021 10:00:35 PM'},
+    ]}},
+    'https://www.sec.gov/Archives/edgar/full-index/2021/QTR1/index.json': {'directory': {'item': [
+        {'name': 'master.idx', 'type': 'file', 'size': '43 MB', 'last-modified': '03/31/2021 10:00:38 PM'},
+        {'name': 'master.gz', 'type': 'file', 'size': '9 MB', 'last-modified': '03/31/2021 10:00:38 PM'},
+    ]}},
+}
+
+
+def mock_http_get(*args, **kwargs):
+    if args[0] in LISTINGS:
+        return mock.Mock(status_code=200, **{'iter_content.return_value': [json.dumps(LISTINGS[args[0]])]})
+    return mock.Mock(status_code=404)
@@ -0,0 +1,29 @@
+import pytest
+
+from datetime import datetime
+from typing import Dict
+from edgar.utils.repo.http_repo_listing import RemoteEntry, parse_listing, parse_size
+
+
+class TestHttpRepoListing:
+    @pytest.mark.parametrize("text, expected", [
+        ('62 KB',   62 * 1024),
+        ('1.5 MB',  3 << 19),
+        ('120',     120),
+        ('',        0),
+        ('n/a',     0),
+    ])
+    def test_parse_size(self, text: str, expected: int) -> None:
+        assert parse_size(text) == expected
+
+    def test_parse_listing(self) -> None:
+        listing: Dict[str, RemoteEntry] = parse_listing([
+            b'{"directory": {"name": "daily-index/2021/", "item": [',
+            b'{"name": "QTR1", "type": "dir", "href": "QTR1/", "last-modified": "", "size": ""},',
+            '{"name": "master20210104.idx", "type": "file", "size": "62 KB", "last-modified": "01/04/2021 10:00:38 PM"}',
+            b']}}'
+        ])
+        assert listing == {
+            'QTR1': RemoteEntry('QTR1', 0, None, True),
+            'master20210104.idx': RemoteEntry('master20210104.idx', 62 * 1024, datetime(2021, 1, 4, 22, 0, 38), False),
+        }
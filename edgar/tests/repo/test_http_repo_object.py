@@ -1,7 +1,8 @@
-import unittest
+import gzip, pytest, unittest
 from unittest.mock import MagicMock, Mock, patch, call
-from edgar.utils.repo.http_repo_object import HttpRepoObject
-from typing import Iterator
+from edgar.utils.repo.http_repo_object import CompressedHttpRepoObject, HttpRepoObject
+from edgar.utils.repo.repo_stage import StageError
+from typing import Dict, Iterator, List
 
 class TestHttpRepoObject(unittest.TestCase):
     def setUp(self) -> None:
@@ -52,3 +53,41 @@ class TestHttpRepoObject(unittest.TestCase):
         assert obj.subpath(1) == ['master.idx']
         assert obj.subpath(2) == ['a', 'master.idx']
 
+
+class TestCompressedHttpRepoObject:
+    def setup_method(self) -> None:
+        self.dir = MagicMock()
+        self.dir.as_uri.return_value = 'http://www.site.com/a/'
+
+    def get(self, served: Dict[str, List[bytes]]):
+        def get(url, **kwargs):
+            if url in served:
+                return Mock(status_code=200, **{'iter_content.return_value': served[url]})
+            return Mock(status_code=404, **{'iter_content.return_value': []})
+        return get
+
+    def test_decompress(self):
+        data: bytes = gzip.compress(b'hello world')
+        served = {'http://www.site.com/a/master.gz': [data[:10], data[10:]]}
+        with patch('requests.get', side_effect=self.get(served)) as mock_get:
+            obj = CompressedHttpRepoObject(self.dir, 'master.idx', 'master.gz')
+            assert obj.as_uri() == 'http://www.site.com/a/master.idx'
+            assert b''.join(obj.inp()) == b'hello world'
+            assert mock_get.call_count == 1
+
+    def test_fallback(self):
+        served = {'http://www.site.com/a/master.idx': [b'hello ', b'world']}
+        with patch('requests.get', side_effect=self.get(served)) as mock_get:
+            assert b''.join(CompressedHttpRepoObject(self.dir, 'master.idx', 'master.gz').inp()) == b'hello world'
+            assert [c.args[0] for c in mock_get.call_args_list] == \
+                ['http://www.site.com/a/master.gz', 'http://www.site.com/a/master.idx']
+            # The variant is not requested when it is known to be missing
+            assert b''.join(CompressedHttpRepoObject(self.dir, 'master.idx', None).inp()) == b'hello world'
+            assert mock_get.call_count == 3
+            assert list(CompressedHttpRepoObject(self.dir, 'missing.idx', None).inp()) == []
+
+    def test_corrupt(self):
+        served = {'http://www.site.com/a/master.gz': [gzip.compress(b'hello world')[:-12]]}
+        with patch('requests.get', side_effect=self.get(served)):
+            with pytest.raises(StageError):
+                list(CompressedHttpRepoObject(self.dir, 'master.idx', 'master.gz').inp())
@@ -0,0 +1,68 @@
+import pytest
+
+from datetime import datetime
+from typing import List
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.repo.memory_repo_fs import MemoryEntry, MemoryRepoFS, MemoryRepoObject
+from edgar.utils.repo.repo_format import RepoFormat, RepoFormatter
+
+
+class TestMemoryRepoFS:
+    def setup_method(self) -> None:
+        self.__evicted: List[MemoryEntry] = []
+        self.__repo = MemoryRepoFS(RepoFormatter(RepoFormat(
+            {DatePeriodType.DAY: 'master{y}{m:02}{d:02}.idx', DatePeriodType.QUARTER: 'master.idx'},
+            ['{t}', '{y}', 'QTR{q}'])), max_bytes=2500, on_evict=self.__evicted.append)
+
+    def test_out_inp(self) -> None:
+        obj: MemoryRepoObject = self.__repo.create(DatePeriodType.DAY, Date('2021-05-03'))
+        assert not obj.exists()
+        obj.out(iter(['abc', b'def']))
+        assert obj.exists()
+        assert list(self.__repo.find(DatePeriodType.DAY, Date('2021-05-03')).inp(4)) == [b'abcd', b'ef']
+        assert obj.subpath(2) == ['QTR2', 'master20210503.idx']
+        assert obj.as_uri() == 'memory:D/2021/QTR2/master20210503.idx'
+        with pytest.raises(FileExistsError):
+            obj.out(iter(['x']))
+
+    def test_lru_eviction(self) -> None:
+        days: List[Date] = [Date('2021-05-03'), Date('2021-05-04'), Date('2021-05-05')]
+        for day in days[:2]:
+            self.__repo.create(DatePeriodType.DAY, day).out(iter([b'x' * 1000]))
+        b''.join(self.__repo.find(DatePeriodType.DAY, days[0]).inp())
+        self.__repo.create(DatePeriodType.DAY, days[2]).out(iter([b'y' * 1000]))
+
+        assert [self.__repo.find(DatePeriodType.DAY, d).exists() for d in days] == [True, False, True]
+        assert (len(self.__repo), self.__repo.size) == (2, 2000)
+        assert [(e.period_type, str(e.date), len(e.data)) for e in self.__evicted] == [
+            (DatePeriodType.DAY, '2021-05-04', 1000)]
+
+    def test_too_large(self) -> None:
+        obj: MemoryRepoObject = self.__repo.create(DatePeriodType.QUARTER, Date('2021-05-03'))
+        obj.out(iter([b'x' * 3000]))
+        assert not obj.exists()
+        assert self.__evicted == []
+
+    def test_expiry(self) -> None:
+        now: List[float] = [datetime(2021, 5, 10, 12).timestamp()]
+        repo: MemoryRepoFS = MemoryRepoFS(RepoFormatter(RepoFormat(
+            {DatePeriodType.DAY: 'master{y}{m:02}{d:02}.idx', DatePeriodType.QUARTER: 'master.idx'},
+            ['{t}', '{y}', 'QTR{q}'])), clock=lambda: now[0])
+        current: MemoryRepoObject = repo.create(DatePeriodType.QUARTER, Date('2021-05-03'))
+        current.out(iter([b'old']))
+        closed: MemoryRepoObject = repo.create(DatePeriodType.QUARTER, Date('2021-02-03'))
+        closed.out(iter([b'q1']))
+        daily: MemoryRepoObject = repo.create(DatePeriodType.DAY, Date('2021-05-03'))
+        daily.out(iter([b'day']))
+
+        now[0] += 3600
+        assert b''.join(current.inp()) == b'old'
+        now[0] += 86400
+        # The quarterly object of the current quarter goes stale, the others do not
+        assert not current.exists()
+        assert b''.join(current.inp()) == b''
+        assert (len(repo), repo.size) == (2, 5)
+        assert b''.join(closed.inp()) == b'q1'
+        assert b''.join(daily.inp()) == b'day'
+        current.out(iter([b'new!']))
+        assert b''.join(current.inp()) == b'new!'
@@ -31,4 +31,13 @@ class TestRepoFormatter:
             path_spec: List[str], name_spec: str, expected: str):
         formatter: RepoFormatter = RepoFormatter(RepoFormat({period_type: name_spec}, path_spec))
         formatter['z'] = lambda period_type, date: 'DAY' if period_type == DatePeriodType.DAY else 'QUARTER'
-        assert '/'.join(formatter.format(period_type, Date(date_str)) ) == expected
\ No newline at end of file
+        assert '/'.join(formatter.format(period_type, Date(date_str)) ) == expected
+
+    def test_compressed_name(self):
+        formatter: RepoFormatter = RepoFormatter(RepoFormat(
+            {DatePeriodType.DAY: 'master{y}{m:02}{d:02}.idx', DatePeriodType.QUARTER: 'master.idx'},
+            ['{t}', '{y}', 'QTR{q}'], {DatePeriodType.DAY: 'master{y}{m:02}{d:02}.idx.gz'}))
+        assert formatter.compressed_name(DatePeriodType.DAY, Date('2020-03-07')) == 'master20200307.idx.gz'
+        assert formatter.compressed_name(DatePeriodType.QUARTER, Date('2020-03-07')) is None
+        assert RepoFormatter(RepoFormat({DatePeriodType.DAY: 'master.idx'}, ['{t}'])) \
+            .compressed_name(DatePeriodType.DAY, Date('2020-03-07')) is None
@@ -1,10 +1,11 @@
-import tempfile
+import tempfile, threading, time
 import pytest
 from unittest import mock
 from pathlib import Path
-from typing import Iterator
+from typing import Iterator, List
 from edgar.utils.date.date_utils import Date, DatePeriodType
-from edgar.utils.repo.repo_pipe import RepoPipe
+from edgar.utils.repo.repo_pipe import FanOutPipe, PipeBranch, RepoPipe
+from edgar.utils.repo.repo_stage import RechunkStage, RepoStage
 from edgar.utils.repo.repo_fs import RepoObject
 from edgar.utils.repo.repo_format import RepoObjectPath, RepoFormat
 from edgar.utils.repo.file_repo_fs import FileRepoFS
@@ -92,6 +93,68 @@ class TestRepoPipe:
         tracker.add_expected('error',  [Date('2021-07-13'), repr(FileExistsError())])
         tracker.assertCalls(repo_ledger.mock_calls)
 
+    @mock.patch("edgar.utils.repo.file_repo_fs.FileRepoFS.flush")
+    def test_sync_flush(self, flush, repo_ledger, sink_fs: FileRepoFS, missing: Iterator[RepoObjectPath]) -> None:
+        with mock.patch("edgar.utils.repo.file_repo_fs.FileRepoFS.iterate_missing") as iterate_missing:
+            iterate_missing.return_value = missing
+            src_fs = mock.MagicMock()
+            src_fs.find.side_effect = self.mock_find
+
+            RepoPipe(repo_ledger, src_fs, sink_fs).sync()
+
+        flush.assert_called_once()
+
+    @mock.patch("edgar.utils.repo.file_repo_fs.FileRepoFS.flush")
+    @mock.patch("edgar.utils.repo.file_repo_fs.FileRepoFS.create")
+    def test_sync_flush_on_error(self, create, flush, repo_ledger, sink_fs: FileRepoFS,
+            missing: Iterator[RepoObjectPath]) -> None:
+        with mock.patch("edgar.utils.repo.file_repo_fs.FileRepoFS.iterate_missing") as iterate_missing:
+            iterate_missing.return_value = missing
+            create.side_effect = self.mock_create
+            src_fs = mock.MagicMock()
+            src_fs.find.side_effect = self.mock_find
+
+            RepoPipe(repo_ledger, src_fs, sink_fs).sync()
+
+        # The object written before the error is synced
+        flush.assert_called_once()
+        assert repo_ledger.error.called
+
+    def test_sync_stages(self, repo_ledger, sink_fs: FileRepoFS, missing: Iterator[RepoObjectPath]) -> None:
+        src_fs = mock.MagicMock()
+        src_fs.find.side_effect = self.mock_find
+        seen: List[str] = []
+
+        class UpperStage(RepoStage):
+            def process(self, chunks, path):
+                for chunk in chunks:
+                    seen.append(str(path))
+                    yield chunk.upper()
+
+        with mock.patch("edgar.utils.repo.file_repo_fs.FileRepoFS.iterate_missing") as iterate_missing:
+            iterate_missing.return_value = missing
+            RepoPipe(repo_ledger, src_fs, sink_fs, [UpperStage(), RechunkStage(1024)]).sync()
+
+        o: RepoObject = sink_fs.find(DatePeriodType.DAY, Date('2021-07-12'))
+        assert next(o.inp(bufsize=1024)) == 'D 2021-07-12'
+        assert len(seen) == 9
+        repo_ledger.end.assert_called_once()
+
+    @mock.patch("edgar.utils.repo.file_repo_fs.FileRepoFS.create")
+    def test_sync_commit(self, create, repo_ledger, sink_fs: FileRepoFS, missing: Iterator[RepoObjectPath]) -> None:
+        stage: RecordingStage = RecordingStage()
+        with mock.patch("edgar.utils.repo.file_repo_fs.FileRepoFS.iterate_missing") as iterate_missing:
+            iterate_missing.return_value = missing
+            create.side_effect = lambda pt, d: FailingObject() if str(d) == '2021-07-13' else mock.MagicMock()
+            src_fs = mock.MagicMock()
+            src_fs.find.side_effect = self.mock_find
+
+            RepoPipe(repo_ledger, src_fs, sink_fs, [stage]).sync()
+
+        # Only the stored object is committed to the stages
+        assert stage.committed == ['2021-07-12']
+        assert stage.aborted == ['2021-07-13']
+
     def mock_find(self, *args, **kwargs):
         obj = mock.MagicMock()
         obj.inp.return_value = iter([str(args[0]), ' ', str(args[1])])
@@ -100,4 +163,149 @@ class TestRepoPipe:
     def mock_create(self, *args, **kwargs):
         if str(args[1]) == '2021-07-13':
             raise FileExistsError()
-        return mock.MagicMock()
\ No newline at end of file
+        return mock.MagicMock()
+
+def missing_paths(repo_format: RepoFormat, *days: str) -> List[RepoObjectPath]:
+    return [RepoObjectPath.from_date(DatePeriodType.DAY, Date(d), repo_format) for d in days]
+
+
+class TestFanOutPipe:
+    def setup_method(self) -> None:
+        self.__dirs = [tempfile.TemporaryDirectory(suffix='_fan_out') for _ in range(2)]
+        self.__source = mock.MagicMock()
+        self.__source.find.side_effect = self.mock_find
+
+    def teardown_method(self) -> None:
+        for d in self.__dirs:
+            d.cleanup()
+
+    def branch(self, i: int, repo_format: RepoFormat, paths: List[RepoObjectPath], stages=None) -> PipeBranch:
+        ledger = mock.MagicMock()
+        ledger.next_period.return_value = (Date('2021-07-01'), Date('2021-07-31'))
+        sink: FileRepoFS = FileRepoFS(Path(self.__dirs[i].name), repo_format)
+        sink.iterate_missing = mock.MagicMock(return_value=iter(paths))
+        return PipeBranch(ledger, sink, stages)
+
+    def content(self, branch: PipeBranch, day: str) -> str:
+        obj: RepoObject = branch.sink.find(DatePeriodType.DAY, Date(day))
+        return ''.join(obj.inp(bufsize=1024)) if obj is not None and obj.exists() else None
+
+    def test_sync(self, repo_format: RepoFormat) -> None:
+        branches: List[PipeBranch] = [
+            self.branch(0, repo_format, missing_paths(repo_format, '2021-07-12', '2021-07-13')),
+            self.branch(1, repo_format, missing_paths(repo_format, '2021-07-13', '2021-07-14'), [UpperStage()])]
+        FanOutPipe(self.__source, branches, buffer=2).sync()
+
+        assert [str(c[1][1]) for c in self.__source.find.mock_calls] == ['2021-07-12', '2021-07-13', '2021-07-14']
+        assert self.content(branches[0], '2021-07-13') == 'D 2021-07-13'
+        assert self.content(branches[1], '2021-07-13') == 'D 2021-07-13'.upper()
+        assert self.content(branches[0], '2021-07-14') is None
+
+        for (branch, days) in zip(branches, [['2021-07-12', '2021-07-13'], ['2021-07-13', '2021-07-14']]):
+            assert [c[0] for c in branch.trans.mock_calls] == ['next_period', 'start', 'record', 'record', 'end']
+            assert [str(c[1][0]) for c in branch.trans.record.mock_calls] == days
+
+    def test_sink_error(self, repo_format: RepoFormat) -> None:
+        branches: List[PipeBranch] = [
+            self.branch(0, repo_format, missing_paths(repo_format, '2021-07-12', '2021-07-13', '2021-07-14')),
+            self.branch(1, repo_format, missing_paths(repo_format, '2021-07-12', '2021-07-13', '2021-07-14'))]
+        create = branches[1].sink.create
+        branches[1].sink.create = lambda pt, d: FailingObject() if str(d) == '2021-07-13' else create(pt, d)
+        stage: RecordingStage = RecordingStage()
+        branches[1] = branches[1]._replace(stages=[stage])
+        for branch in branches:
+            branch.sink.flush = mock.MagicMock(wraps=branch.sink.flush)
+        FanOutPipe(self.__source, branches).sync()
+
+        assert [c[0] for c in branches[0].trans.mock_calls] == ['next_period', 'start', 'record', 'record', 'record', 'end']
+        assert [c[0] for c in branches[1].trans.mock_calls] == ['next_period', 'start', 'record', 'error']
+        assert branches[1].trans.error.call_args[0] == (Date('2021-07-13'), repr(IOError('disk full')))
+        assert self.content(branches[1], '2021-07-14') is None
+        assert self.content(branches[0], '2021-07-14') == 'D 2021-07-14'
+        # The failed branch is synced too
+        for branch in branches:
+            branch.sink.flush.assert_called_once()
+        assert stage.committed == ['2021-07-12']
+        assert stage.aborted[0] == '2021-07-13'
+
+    def test_source_error(self, repo_format: RepoFormat) -> None:
+        branches: List[PipeBranch] = [
+            self.branch(i, repo_format, missing_paths(repo_format, '2021-07-12', '2021-07-13')) for i in range(2)]
+        error: ConnectionError = ConnectionError('reset')
+        def find(*args):
+            obj = mock.MagicMock()
+            obj.inp.return_value = self.broken(error) if str(args[1]) == '2021-07-13' else iter(['x'])
+            return obj
+        self.__source.find.side_effect = find
+        FanOutPipe(self.__source, branches).sync()
+
+        for branch in branches:
+            assert [c[0] for c in branch.trans.mock_calls] == ['next_period', 'start', 'record', 'error']
+            assert branch.trans.error.call_args[0] == (Date('2021-07-13'), repr(error))
+            assert self.content(branch, '2021-07-13') is None
+            assert [p.name for p in (Path(branch.sink.find(DatePeriodType.DAY, Date('2021-07-12')).path.parent)).iterdir()
+                if p.name.endswith('.tmp')] == []
+
+    def test_slow_sink(self, repo_format: RepoFormat) -> None:
+        days: List[str] = ['2021-07-12', '2021-07-13', '2021-07-14']
+        branches: List[PipeBranch] = [self.branch(i, repo_format, missing_paths(repo_format, *days)) for i in range(2)]
+        release: threading.Event = threading.Event()
+        class SlowStage(RepoStage):
+            def process(self, chunks, path):
+                release.wait(5)
+                yield from chunks
+
+        branches[1] = branches[1]._replace(stages=[SlowStage()])
+        pipe: threading.Thread = threading.Thread(target=FanOutPipe(self.__source, branches, buffer=16).sync)
+        pipe.start()
+
+        # 3 objects of 3 chunks with begin and end markers fit into the buffer of the slow branch
+        deadline: float = time.time() + 5
+        while self.content(branches[0], days[-1]) is None and time.time() < deadline:
+            time.sleep(0.01)
+        assert [self.content(branches[0], d) for d in days] == ['D ' + d for d in days]
+        assert self.content(branches[1], days[0]) is None
+        release.set()
+        pipe.join()
+        assert [self.content(branches[1], d) for d in days] == ['D ' + d for d in days]
+
+    def broken(self, error: Exception) -> Iterator[str]:
+        yield 'partial'
+        raise error
+
+    def mock_find(self, *args, **kwargs):
+        obj = mock.MagicMock()
+        obj.inp.return_value = iter([str(args[0]), ' ', str(args[1])])
+        return obj
+
+
+class UpperStage(RepoStage):
+    def process(self, chunks, path):
+        for chunk in chunks:
+            yield chunk.upper()
+
+
+def test_branch_stages() -> None:
+    # Branches do not share a mutable default list of stages
+    assert PipeBranch(mock.MagicMock(), mock.MagicMock()).stages is None
+
+
+class RecordingStage(RepoStage):
+    def __init__(self) -> None:
+        self.committed: List[str] = []
+        self.aborted: List[str] = []
+
+    def process(self, chunks, path):
+        yield from chunks
+
+    def commit(self, path) -> None:
+        self.committed.append(str(path.date()))
+
+    def abort(self, path) -> None:
+        self.aborted.append(str(path.date()))
+
+
+class FailingObject:
+    def out(self, iter, override: bool = False) -> None:
+        next(iter)
+        raise IOError('disk full')
@@ -0,0 +1,138 @@
+import gzip, threading, time
+import pytest
+
+from datetime import date
+from typing import Iterator, List
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.index.master_index import INDEX_ENCODING, IndexRow, iter_lines, parse_master_index
+from edgar.utils.repo.repo_format import RepoFormat, RepoObjectPath
+from edgar.utils.repo.repo_stage import CompressStage, DecompressStage, FilterStage, ParseStage, \
+    PrefetchStage, RechunkStage, StageError, ValidateStage, apply_stages, as_bytes, as_text, commit_stages
+from edgar.tests.synthetic import master_index
+
+CONTENT: bytes = master_index(date(2021, 7, 12), 1, 200, seed=7).encode()
+
+
+def chunked(data: bytes, size: int) -> Iterator[bytes]:
+    return iter([data[i:i + size] for i in range(0, len(data), size)])
+
+
+@pytest.fixture
+def path(repo_format: RepoFormat) -> RepoObjectPath:
+    return RepoObjectPath.from_date(DatePeriodType.DAY, Date('2021-07-12'), repo_format)
+
+
+class TestRepoStage:
+    @pytest.mark.parametrize("size", [3, 1000])
+    def test_decompress(self, size, path) -> None:
+        chunks = chunked(gzip.compress(CONTENT), size)
+        assert b''.join(DecompressStage().process(chunks, path)) == CONTENT
+
+    def test_decompress_truncated(self, path) -> None:
+        with pytest.raises(StageError):
+            b''.join(DecompressStage().process(iter([gzip.compress(CONTENT)[:-20]]), path))
+
+    def test_compress(self, path) -> None:
+        assert gzip.decompress(b''.join(CompressStage().process(chunked(CONTENT, 100), path))) == CONTENT
+
+    @pytest.mark.parametrize("chunks", [
+        [],
+        [b'Description: no header\n' * 300],
+        [b'Description: no header\n'],
+    ])
+    def test_validate_error(self, chunks, path) -> None:
+        with pytest.raises(StageError):
+            list(ValidateStage().process(iter(chunks), path))
+
+    def test_validate(self, path) -> None:
+        assert b''.join(ValidateStage().process(chunked(CONTENT, 16), path)) == CONTENT
+
+    @pytest.mark.parametrize("size", [5, 333, len(CONTENT)])
+    def test_parse(self, size, path) -> None:
+        rows: List[IndexRow] = []
+        calls: List = []
+        def on_rows(uri, batch) -> None:
+            calls.append(uri)
+            rows.extend(batch)
+
+        chunks = [chunk.decode() for chunk in chunked(CONTENT, size)]
+        stage: ParseStage = ParseStage(on_rows)
+        assert ''.join(stage.process(iter(chunks), path)) == CONTENT.decode()
+        # Nothing is published before the object is committed
+        assert rows == []
+        stage.commit(path)
+        assert rows == list(parse_master_index(iter_lines([CONTENT])))
+        assert set(calls) == {path}
+        stage.commit(path)
+        assert len(rows) == 200
+
+    def test_parse_abort(self, path) -> None:
+        rows: List[IndexRow] = []
+        stage: ParseStage = ParseStage(lambda _, batch: rows.extend(batch))
+        list(stage.process(chunked(CONTENT, 100), path))
+        stage.abort(path)
+        stage.commit(path)
+        assert rows == []
+
+    @pytest.mark.parametrize("size", [50, len(CONTENT)])
+    def test_filter(self, size, path) -> None:
+        filtered: bytes = b''.join(FilterStage(lambda row: row.form_type == '10-K').process(chunked(CONTENT, size), path))
+        rows: List[IndexRow] = list(parse_master_index(iter_lines([filtered])))
+        assert rows == [row for row in parse_master_index(iter_lines([CONTENT])) if row.form_type == '10-K']
+        assert filtered.startswith(CONTENT[:CONTENT.find(b'\n---')])
+
+    def test_rechunk(self, path) -> None:
+        chunks: List[bytes] = list(RechunkStage(1000).process(chunked(CONTENT, 300), path))
+        assert b''.join(chunks) == CONTENT
+        assert {len(chunk) for chunk in chunks[:-1]} == {1000}
+
+    def test_prefetch(self, path) -> None:
+        read: List[int] = []
+        def source() -> Iterator[bytes]:
+            for (i, chunk) in enumerate(chunked(CONTENT, 100)):
+                read.append(i)
+                yield chunk
+
+        chunks = PrefetchStage(depth=2).process(source(), path)
+        assert next(chunks) == CONTENT[:100]
+        deadline: float = time.time() + 2
+        while len(read) < 4 and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        # One chunk consumed, two queued and one blocked on the full queue
+        assert len(read) == 4
+        assert b''.join(chunks) == CONTENT[100:]
+
+    def test_prefetch_error(self, path) -> None:
+        def source() -> Iterator[bytes]:
+            yield b'abc'
+            raise ConnectionError()
+
+        with pytest.raises(ConnectionError):
+            list(PrefetchStage().process(source(), path))
+
+    def test_prefetch_close(self, path) -> None:
+        closed: threading.Event = threading.Event()
+        def source() -> Iterator[bytes]:
+            try:
+                while True:
+                    yield b'x'
+            finally:
+                closed.set()
+
+        chunks = PrefetchStage(depth=2).process(source(), path)
+        next(chunks)
+        chunks.close()
+        assert closed.is_set()
+
+    def test_apply_stages(self, path) -> None:
+        rows: List[IndexRow] = []
+        stages = [PrefetchStage(), DecompressStage(), ValidateStage(), ParseStage(lambda _, batch: rows.extend(batch)),
+            RechunkStage(4096), CompressStage()]
+        out: bytes = b''.join(apply_stages(chunked(gzip.compress(CONTENT), 512), stages, path))
+        assert gzip.decompress(out) == CONTENT
+        commit_stages(stages, path)
+        assert len(rows) == 200
+
+    def test_as_bytes(self) -> None:
+        assert as_bytes('Société') == as_bytes(as_text('Société'.encode(INDEX_ENCODING))) == 'Société'.encode(INDEX_ENCODING)
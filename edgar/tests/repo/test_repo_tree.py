@@ -0,0 +1,112 @@
+import pytest
+
+from datetime import date
+from typing import List
+from edgar.utils.date.date_utils import DatePeriodType
+from edgar.utils.repo.repo_tree import RepoTree, NO_KEY, pack_key, unpack_key
+
+
+@pytest.fixture
+def tree() -> RepoTree:
+    tree: RepoTree = RepoTree()
+    d: int = tree.add(RepoTree.ROOT, 'D', True)
+    y: int = tree.add(d, '2021', True)
+    q: int = tree.add(y, 'QTR1', True)
+    for day in (5, 4, 6):
+        the_date: date = date(2021, 1, day)
+        tree.add(q, 'master{0:%Y%m%d}.idx'.format(the_date), False,
+                 pack_key(DatePeriodType.DAY, the_date.toordinal()))
+    tree.add(q, 'README', False)
+    return tree
+
+
+class TestRepoTree:
+    @pytest.mark.parametrize("period_type", [DatePeriodType.DAY, DatePeriodType.QUARTER])
+    def test_pack_key(self, period_type: DatePeriodType) -> None:
+        ordinal: int = date(2021, 4, 1).toordinal()
+        assert unpack_key(pack_key(period_type, ordinal)) == (period_type, ordinal)
+
+    def test_find(self, tree: RepoTree) -> None:
+        node: int = tree.find(pack_key(DatePeriodType.DAY, date(2021, 1, 4).toordinal()))
+        assert tree.name(node) == 'master20210104.idx'
+        assert tree.path(node) == ['D', '2021', 'QTR1', 'master20210104.idx']
+        assert not tree.is_dir(node)
+        assert tree.is_dir(tree.parent(node))
+
+    def test_contains(self, tree: RepoTree) -> None:
+        assert pack_key(DatePeriodType.DAY, date(2021, 1, 6).toordinal()) in tree
+        assert pack_key(DatePeriodType.DAY, date(2021, 1, 7).toordinal()) not in tree
+        assert pack_key(DatePeriodType.QUARTER, date(2021, 1, 4).toordinal()) not in tree
+
+    def test_keys_sorted(self, tree: RepoTree) -> None:
+        keys: List[int] = list(tree.keys())
+        assert keys == sorted(keys)
+        assert [unpack_key(k)[1] for k in keys] == [date(2021, 1, d).toordinal() for d in (4, 5, 6)]
+
+    def test_objects(self, tree: RepoTree) -> None:
+        assert len(tree) == 8
+        assert [tree.name(n) for n in tree.objects()] == \
+            ['master20210105.idx', 'master20210104.idx', 'master20210106.idx', 'README']
+
+    def test_clear(self, tree: RepoTree) -> None:
+        tree.clear()
+        assert len(tree) == 1
+        assert list(tree.keys()) == []
+        assert tree.find(NO_KEY) == -1
+
+    def test_child(self, tree: RepoTree) -> None:
+        qdir: int = tree.child(tree.child(tree.child(RepoTree.ROOT, 'D'), '2021'), 'QTR1')
+        assert tree.path(qdir) == ['D', '2021', 'QTR1']
+        assert tree.name(tree.child(qdir, 'README')) == 'README'
+        assert tree.child(qdir, 'missing') == -1
+        assert len(list(tree.children(qdir))) == 4
+
+    def test_remove_object(self, tree: RepoTree) -> None:
+        key: int = pack_key(DatePeriodType.DAY, date(2021, 1, 5).toordinal())
+        tree.remove(tree.find(key))
+        assert key not in tree
+        assert len(tree) == 7
+        assert len(list(tree.keys())) == 2
+        assert 'master20210105.idx' not in [tree.name(n) for n in tree.objects()]
+
+    def test_remove_dir(self, tree: RepoTree) -> None:
+        tree.remove(tree.child(RepoTree.ROOT, 'D'))
+        assert len(tree) == 1
+        assert list(tree.keys()) == []
+        assert list(tree.objects()) == []
+        assert list(tree.children(RepoTree.ROOT)) == []
+
+    def test_readd(self, tree: RepoTree) -> None:
+        qdir: int = tree.child(tree.child(tree.child(RepoTree.ROOT, 'D'), '2021'), 'QTR1')
+        key: int = pack_key(DatePeriodType.DAY, date(2021, 1, 5).toordinal())
+        removed: int = tree.find(key)
+        tree.remove(removed)
+        assert tree.child(qdir, 'master20210105.idx') == -1
+        # The node is reused and the key is found again
+        node: int = tree.add(qdir, 'master20210105.idx', False, key)
+        assert node == removed
+        assert tree.find(key) == node
+        assert tree.child(qdir, 'master20210105.idx') == node
+        assert len(tree) == 8
+        assert [tree.name(n) for n in tree.children(qdir)] == \
+            ['master20210104.idx', 'master20210106.idx', 'README', 'master20210105.idx']
+        assert [unpack_key(k)[1] for k in tree.keys()] == [date(2021, 1, d).toordinal() for d in (4, 5, 6)]
+
+    def test_churn(self) -> None:
+        tree: RepoTree = RepoTree()
+        qdir: int = tree.add(RepoTree.ROOT, 'QTR1', True)
+        first: int = date(2021, 1, 1).toordinal()
+        for day in range(1000):
+            tree.add(qdir, str(day), False, pack_key(DatePeriodType.DAY, first + day))
+        for day in range(0, 1000, 2):
+            tree.remove(tree.child(qdir, str(day)))
+        assert len(tree) == 502
+        assert list(tree.keys()) == [pack_key(DatePeriodType.DAY, first + day) for day in range(1, 1000, 2)]
+        assert pack_key(DatePeriodType.DAY, first) not in tree
+        assert tree.name(tree.find(pack_key(DatePeriodType.DAY, first + 999))) == '999'
+        for day in range(0, 1000, 2):
+            tree.add(qdir, str(day), False, pack_key(DatePeriodType.DAY, first + day))
+        # Removed nodes are reused rather than appended
+        assert max(tree.children(qdir)) == 1001
+        assert list(tree.keys()) == [pack_key(DatePeriodType.DAY, first + day) for day in range(1000)]
+        assert all(tree.name(tree.find(pack_key(DatePeriodType.DAY, first + day))) == str(day) for day in range(1000))
@@ -0,0 +1,79 @@
+import json
+import pytest
+
+from datetime import date
+from typing import List
+from edgar.utils.date.date_utils import Date, DatePeriod, DatePeriodType
+from edgar.utils.repo.db_repo_ledger import EventObject
+from edgar.utils.repo.repo_format import RepoFormat, RepoObjectPath
+from edgar.utils.repo.serdeser import CodecError, DateCodec, DatePeriodCodec, EventObjectCodec, \
+    RepoObjectPathCodec, dataclass_json_dump
+
+
+class TestBinaryCodec:
+    def setup_method(self) -> None:
+        self.__format = RepoFormat(
+            {DatePeriodType.DAY: 'master{y:4}{m:02}{d:02}.idx', DatePeriodType.QUARTER: 'master.idx'},
+            ['{t}', '{y}', 'QTR{q}'])
+
+    def test_date(self) -> None:
+        codec: DateCodec = DateCodec()
+        assert codec.encode(Date('2021-05-03')) == Date('2021-05-03').ordinal().to_bytes(4, 'little')
+        assert codec.decode(codec.encode(Date('2021-05-03'))) == Date('2021-05-03')
+
+        dates: List[Date] = [Date(date.fromordinal(727564 + i)) for i in range(0, 10000, 37)]
+        packed: bytes = codec.encode_many(dates)
+        assert len(packed) == 4 + 4 * len(dates)
+        assert codec.decode_many(packed) == dates
+        assert codec.decode_many(codec.encode_many([])) == []
+
+    def test_date_period(self) -> None:
+        codec: DatePeriodCodec = DatePeriodCodec()
+        periods: List[DatePeriod] = [
+            DatePeriod(DatePeriodType.DAY, Date('2019-02-13'), Date('2019-03-31')),
+            DatePeriod(DatePeriodType.QUARTER, Date('2019-04-01'), Date('2019-06-30')),
+        ]
+        decoded: List[DatePeriod] = codec.decode_many(codec.encode_many(periods))
+        assert [str(p) for p in decoded] == [str(p) for p in periods]
+        assert [p.num_days for p in decoded] == [47, 91]
+        assert len(codec.encode(periods[0])) == 9
+
+    def test_event_object(self) -> None:
+        codec: EventObjectCodec = EventObjectCodec()
+        events: List[EventObject] = [
+            EventObject('D', '2021-05-03', '', 1620000000),
+            EventObject('Q', '2021-04-01', '{"size": 42}', -1),
+            EventObject('D', '2021-05-04', 'dépôt ✓', 1620086400),
+        ]
+        assert codec.decode_many(codec.encode_many(events)) == events
+        assert codec.decode(codec.encode(events[2])) == events[2]
+        # Much smaller than the JSON of the same events
+        assert len(codec.encode_many(events)) < len(dataclass_json_dump(events)) / 2
+
+    def test_repo_object_path(self) -> None:
+        codec: RepoObjectPathCodec = RepoObjectPathCodec(self.__format)
+        paths: List[RepoObjectPath] = [
+            RepoObjectPath.from_date(DatePeriodType.DAY, Date('2021-05-03'), self.__format),
+            RepoObjectPath.from_date(DatePeriodType.QUARTER, Date('2021-05-03'), self.__format),
+        ]
+        decoded: List[RepoObjectPath] = codec.decode_many(codec.encode_many(paths))
+        assert [str(p) for p in decoded] == [str(p) for p in paths]
+        assert decoded[0].date() == Date('2021-05-03')
+        assert [p.date_period_type() for p in decoded] == [DatePeriodType.DAY, DatePeriodType.QUARTER]
+
+    @pytest.mark.parametrize("codec, buffer", [
+        (DateCodec(), b'\x01\x00'),
+        (DateCodec(), b'\x02\x00\x00\x00\x01\x00\x00\x00'),
+        (DateCodec(), b'\x01\x00\x00\x00\x00\x00\x00\x00'),
+        (DatePeriodCodec(), b'\x01\x00\x00\x00\x09\x01\x00\x00\x00\x01\x00\x00\x00'),
+        (EventObjectCodec(), EventObjectCodec().encode_many([EventObject('D', '2021-05-03', 'x', 0)])[:-1]),
+        (EventObjectCodec(), EventObjectCodec().encode_many([EventObject('D', '2021-05-03', 'x', 0)]) + b'\x00'),
+    ])
+    def test_corrupt(self, codec, buffer: bytes) -> None:
+        with pytest.raises(CodecError):
+            codec.decode_many(buffer)
+
+    def test_json_parity(self) -> None:
+        event: EventObject = EventObject('D', '2021-05-03', 'data', 1620000000)
+        codec: EventObjectCodec = EventObjectCodec()
+        assert EventObject(**json.loads(dataclass_json_dump(event))) == codec.decode(codec.encode(event))
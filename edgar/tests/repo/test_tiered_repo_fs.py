@@ -0,0 +1,91 @@
+import tempfile
+
+from datetime import datetime
+from pathlib import Path
+from typing import List
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.repo.file_repo_fs import FileRepoFS
+from edgar.utils.repo.memory_repo_fs import MemoryRepoFS
+from edgar.utils.repo.repo_format import RepoFormat, RepoFormatter
+from edgar.utils.repo.tiered_repo_fs import TieredRepoFS, TierStats
+from edgar.tests.mock import OriginFS
+
+DAYS: List[Date] = [Date('2021-05-03'), Date('2021-05-04'), Date('2021-05-05')]
+
+
+class TestTieredRepoFS:
+    def setup_method(self) -> None:
+        self.__dir = tempfile.TemporaryDirectory(suffix='_tiered')
+        self.__format = RepoFormat(
+            {DatePeriodType.DAY: 'master{y}{m:02}{d:02}.idx', DatePeriodType.QUARTER: 'master.idx'},
+            ['{t}', '{y}', 'QTR{q}'])
+        self.__origin = OriginFS(RepoFormatter(self.__format))
+        for (i, day) in enumerate(DAYS):
+            self.__origin.content[self.__origin.key(DatePeriodType.DAY, day)] = bytes([65 + i]) * 1000
+        self.__disk = FileRepoFS(Path(self.__dir.name), self.__format)
+        self.__repo = TieredRepoFS(MemoryRepoFS(RepoFormatter(self.__format), max_bytes=2500),
+            [self.__disk, self.__origin], ['memory', 'disk', 'http'])
+
+    def teardown_method(self) -> None:
+        self.__dir.cleanup()
+
+    def read(self, the_date: Date) -> bytes:
+        return b''.join(self.__repo.find(DatePeriodType.DAY, the_date).inp(256))
+
+    def test_promote(self) -> None:
+        assert self.read(DAYS[0]) == b'A' * 1000
+        assert self.read(DAYS[0]) == b'A' * 1000
+        assert self.__repo.stats() == [TierStats('memory', 1, 1), TierStats('disk', 0, 1), TierStats('http', 1, 0)]
+        assert len(self.__origin.downloads) == 1
+        # Not demoted yet
+        assert self.__disk.find(DatePeriodType.DAY, DAYS[0]) is None
+
+    def test_demote(self) -> None:
+        for day in DAYS:
+            self.read(day)
+        assert self.__disk.find(DatePeriodType.DAY, DAYS[0]).exists()
+        assert self.__disk.find(DatePeriodType.DAY, DAYS[1]) is None
+
+        assert self.read(DAYS[0]) == b'A' * 1000
+        assert self.__repo.stats() == [TierStats('memory', 0, 4), TierStats('disk', 1, 3), TierStats('http', 3, 0)]
+        assert len(self.__origin.downloads) == 3
+        # Promoting DAYS[0] demoted DAYS[1]
+        assert self.__disk.find(DatePeriodType.DAY, DAYS[1]).exists()
+
+    def test_out(self) -> None:
+        obj = self.__repo.create(DatePeriodType.QUARTER, Date('2021-05-03'))
+        obj.out(iter(['abc']))
+        assert obj.exists()
+        assert self.__disk.find(DatePeriodType.QUARTER, Date('2021-05-03')).exists()
+        assert self.__origin.content['Q/2021/QTR2/master.idx'] == b'abc'
+        assert b''.join(obj.inp()) == b'abc'
+        assert self.__repo.stats()[0] == TierStats('memory', 1, 0)
+
+    def test_stale_not_demoted(self) -> None:
+        now: List[float] = [datetime(2021, 5, 10, 12).timestamp()]
+        quarter: Date = Date('2021-05-03')
+        self.__origin.content[self.__origin.key(DatePeriodType.QUARTER, quarter)] = b'Q' * 1000
+        repo: TieredRepoFS = TieredRepoFS(MemoryRepoFS(RepoFormatter(self.__format), max_bytes=1500,
+            clock=lambda: now[0]), [self.__disk, self.__origin])
+        assert b''.join(repo.find(DatePeriodType.QUARTER, quarter).inp()) == b'Q' * 1000
+        # Evicting the quarterly object of the current quarter does not write it to the disk
+        b''.join(repo.find(DatePeriodType.DAY, DAYS[0]).inp())
+        assert self.__disk.find(DatePeriodType.QUARTER, quarter) is None
+
+        self.__origin.content[self.__origin.key(DatePeriodType.QUARTER, quarter)] = b'R' * 1000
+        now[0] += 3600
+        assert b''.join(repo.find(DatePeriodType.QUARTER, quarter).inp()) == b'R' * 1000
+        now[0] += 3600
+        assert b''.join(repo.find(DatePeriodType.QUARTER, quarter).inp()) == b'R' * 1000
+        now[0] += 86400
+        self.__origin.content[self.__origin.key(DatePeriodType.QUARTER, quarter)] = b'S' * 1000
+        assert b''.join(repo.find(DatePeriodType.QUARTER, quarter).inp()) == b'S' * 1000
+        assert len(self.__origin.downloads) == 4
+
+    def test_missing(self) -> None:
+        repo: TieredRepoFS = TieredRepoFS(MemoryRepoFS(RepoFormatter(self.__format)), [self.__disk], ['memory', 'disk'])
+        obj = repo.find(DatePeriodType.DAY, DAYS[0])
+        assert not obj.exists()
+        assert b''.join(obj.inp()) == b''
+        assert repo.stats() == [TierStats('memory', 0, 1), TierStats('disk', 0, 1)]
+        assert len(repo.memory) == 0
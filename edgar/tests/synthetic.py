@@ -0,0 +1,51 @@
+"""
+    Synthetic EDGAR master index objects for tests and benchmarks
+"""
+from datetime import date, timedelta
+from random import Random
+from typing import List
+
+# The header of EDGAR master index objects
+MASTER_HEADER: str = '\n'.join([
+    'Description:           Master Index of EDGAR Dissemination Feed',
+    'Last Data Received:    {last}',
+    'Comments:              webmaster@sec.gov',
+    'Anonymous FTP:         ftp://ftp.sec.gov/edgar/',
+    'Cloud HTTP:            https://www.sec.gov/Archives/',
+    '',
+    '',
+    '',
+    '',
+    'CIK|Company Name|Form Type|Date Filed|Filename',
+    '-' * 80,
+    ''
+])
+
+FORM_TYPES: List[str] = ['10-K', '10-Q', '8-K', '4', 'SC 13G', 'S-1', 'DEF 14A', '424B2', '13F-HR', 'D']
+
+WORDS: List[str] = ['ACME', 'CAPITAL', 'HOLDINGS', 'TRUST', 'GLOBAL', 'PARTNERS', 'ENERGY', 'BANCORP',
+    'TECHNOLOGIES', 'FUND', 'GROUP', 'PHARMA', 'REALTY', 'INC', 'LLC', 'CORP', 'LP']
+
+
+def master_index(first: date, days: int, rows: int, seed: int = 0, daily: bool = True) -> str:
+    """
+        Generates a master index with the given number of rows filed
+        between `first` and `first + days - 1`. Rows are sorted by CIK as in EDGAR.
+        Daily objects use YYYYMMDD dates, quarterly objects use YYYY-MM-DD
+    """
+    rnd: Random = Random(seed)
+    lines: List[str] = []
+    for seq in range(rows):
+        cik: int = rnd.randint(1000, 1900000)
+        filed: date = first + timedelta(days=rnd.randrange(days))
+        company: str = ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(2, 4)))
+        accession: str = '{0:010}-{1:02}-{2:06}'.format(rnd.randint(1, 1900000), filed.year % 100, seq)
+        lines.append((cik, '|'.join([
+            str(cik), company, rnd.choice(FORM_TYPES),
+            filed.strftime('%Y%m%d' if daily else '%Y-%m-%d'),
+            'edgar/data/{0}/{1}.txt'.format(cik, accession)
+        ])))
+
+    last: date = first + timedelta(days=days - 1)
+    return MASTER_HEADER.format(last=last.strftime('%B %d, %Y')) \
+        + '\n'.join(line for (_, line) in sorted(lines)) + '\n'
@@ -0,0 +1,51 @@
+"""
+    Import time budgets of the package modules and the imports they defer
+"""
+import pytest
+import subprocess
+import sys
+
+from typing import Dict, List
+
+# The budget of cumulative import time in microseconds by module.
+# Budgets are about four times the time measured on a developer machine
+IMPORT_BUDGET_US: Dict[str, int] = {
+    'edgar.utils.date.date_utils'   : 30000,
+    'edgar.utils.date.holidays'     : 30000,
+    'edgar.utils.repo.repo_pipe'    : 50000,
+    'edgar.utils.repo.file_repo_fs' : 90000,
+    'edgar.utils.repo.http_repo_fs' : 90000,
+    'edgar.utils.repo.db_repo_ledger': 90000,
+}
+
+# The modules that are imported on first use only
+DEFERRED_MODULES: List[str] = ['requests', 'parse']
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """
+        Imports the module in a fresh interpreter and returns
+        the cumulative import time of every imported module
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+        stderr=subprocess.PIPE, universal_newlines=True, check=True)
+
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        fields: List[str] = line.split('|')
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            times[fields[2].strip()] = int(fields[1])
+    return times
+
+
+class TestImportTime:
+    @pytest.mark.parametrize("module, budget", IMPORT_BUDGET_US.items())
+    def test_import_budget(self, module: str, budget: int) -> None:
+        times: Dict[str, int] = import_times(module)
+        assert times[module] < budget, "{0} took {1}us to import".format(module, times[module])
+
+    @pytest.mark.parametrize("module", IMPORT_BUDGET_US.keys())
+    def test_deferred_imports(self, module: str) -> None:
+        times: Dict[str, int] = import_times(module)
+        for deferred in DEFERRED_MODULES:
+            assert deferred not in times, "{0} imports {1}".format(module, deferred)
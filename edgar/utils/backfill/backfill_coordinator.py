@@ -0,0 +1,305 @@
+"""
+    Backfill spread over several workers through a shared ledger
+
+    The backfill range is split into shards of whole quarters. Workers lease
+    shards through events in the `repo_ledger` table and run `RepoPipe` on
+    them. A lease expires unless its holder renews it, so the shards of dead
+    workers are handed out again. The events are
+
+        shard   event_date = first date, event_data = last date
+        lease   event_date = first date, event_data = 'worker,expiry timestamp'
+        done    event_date = first date, event_data = worker
+"""
+from dataclasses import asdict
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+import time
+from edgar.utils.date.date_utils import Date, DatePeriod, DatePeriodType
+from edgar.utils.db.db_driver import DbDriver
+from edgar.utils.db.sql_utils import class_columns
+from edgar.utils.repo.db_repo_ledger import DbRepoLedger, EventObject
+from edgar.utils.repo.repo_fs import RepoFS
+from edgar.utils.repo.repo_ledger import RepoLedger
+from edgar.utils.repo.repo_pipe import RepoPipe
+
+
+class Shard(NamedTuple):
+    """
+        A range of dates synced by one worker
+    """
+    beg_date: Date
+    end_date: Date
+
+    @property
+    def key(self) -> str:
+        return str(self.beg_date)
+
+
+class ShardState(NamedTuple):
+    shard: Shard
+    worker: str
+    expiry: float
+    done: bool
+
+
+def backfill_periods(from_date: Date, to_date: Date) -> Iterator[DatePeriod]:
+    """
+        Returns the backfill periods between the dates, one per quarter
+    """
+    return to_date.backfill(from_date)
+
+
+def plan_shards(from_date: Date, to_date: Date, quarters_per_shard: int) -> List[Shard]:
+    """
+        Splits the backfill periods between the dates into shards
+
+        Parameters
+        ----------
+        from_date: Date
+            the first date
+        to_date: Date
+            the last date
+        quarters_per_shard: int
+            the number of backfill periods, i.e. quarters, in a shard
+    """
+    periods: List[DatePeriod] = list(backfill_periods(from_date, to_date))
+    return [Shard(periods[i].start_date, periods[min(i + quarters_per_shard, len(periods)) - 1].end_date)
+            for i in range(0, len(periods), quarters_per_shard)]
+
+
+class BackfillCoordinator:
+    """
+        Hands out backfill shards to workers as leases recorded in the ledger
+
+        Every worker has its own coordinator with a unique worker name. The
+        workers share the database of the ledger, e.g. an SQLite file on a
+        network filesystem, and leases are taken in database transactions.
+
+        Parameters
+        ----------
+        db_driver: DbDriver
+            the driver of the ledger database
+        worker: str
+            the unique name of the worker
+        lease_seconds: float
+            the time a lease is valid unless renewed
+        clock: Callable[[], float]
+            returns the current timestamp in seconds
+    """
+    def __init__(self, db_driver: DbDriver, worker: str, lease_seconds: float = 600,
+            clock: Callable[[], float] = time.time) -> None:
+        self.__db: DbDriver = db_driver
+        self.__worker: str = worker
+        self.__lease_seconds: float = lease_seconds
+        self.__clock: Callable[[], float] = clock
+        self.__failed: Set[str] = set()
+        self.__expiry: Dict[str, float] = {}
+
+        if not self.__db.has_table(DbRepoLedger.TABLE_NAME):
+            self.__db.create_table(DbRepoLedger.TABLE_NAME, class_columns(EventObject))
+
+    @property
+    def worker(self) -> str:
+        return self.__worker
+
+    def insert(self, event: EventObject) -> None:
+        self.__db.insert_row(DbRepoLedger.TABLE_NAME, asdict(event))
+
+    def __states(self) -> Dict[str, ShardState]:
+        """
+            Replays the shard events of the ledger in the order they were written
+        """
+        states: Dict[str, ShardState] = {}
+        for (name, key, data, _) in self.__db.select_rows(
+                DbRepoLedger.TABLE_NAME, {'event_name': ['shard', 'lease', 'done']}, order_by=['rowid']):
+            if name == 'shard':
+                states.setdefault(key, ShardState(Shard(Date(key), Date(data)), '', 0.0, False))
+            elif key in states:
+                if name == 'lease':
+                    (worker, expiry) = data.rsplit(',', 1)
+                    states[key] = states[key]._replace(worker=worker, expiry=float(expiry))
+                else:
+                    states[key] = states[key]._replace(worker=data, done=True)
+        return states
+
+    def __lease(self, shard: Shard, expiry: float) -> None:
+        self.insert(EventObject('lease', shard.key, '{0},{1}'.format(self.__worker, expiry)))
+        self.__expiry[shard.key] = expiry
+
+    def plan(self, from_date: Date, to_date: Date, quarters_per_shard: int = 4) -> int:
+        """
+            Registers the shards of the backfill. Shards registered before are kept,
+            so every worker can call it with the same arguments
+
+            Returns
+            -------
+            int
+                the number of shards added
+        """
+        added: int = 0
+        with self.__db.transaction():
+            states: Dict[str, ShardState] = self.__states()
+            for shard in plan_shards(from_date, to_date, quarters_per_shard):
+                if shard.key not in states:
+                    self.insert(EventObject('shard', shard.key, str(shard.end_date)))
+                    added += 1
+        return added
+
+    def acquire(self) -> Optional[Shard]:
+        """
+            Leases the first shard that is neither done nor leased by a live worker.
+            A shard still leased by this worker is returned first
+
+            Returns
+            -------
+            Shard | None
+                the leased shard or None if there is nothing to do right now
+        """
+        now: float = self.__clock()
+        with self.__db.transaction():
+            states: List[ShardState] = [s for s in self.__states().values()
+                if not s.done and s.shard.key not in self.__failed]
+            candidates: List[ShardState] = [s for s in states if s.worker == self.__worker and s.expiry > now] \
+                + [s for s in states if s.expiry <= now]
+            if not candidates:
+                return None
+            self.__lease(candidates[0].shard, now + self.__lease_seconds)
+        return candidates[0].shard
+
+    def renew(self, shard: Shard, force: bool = False) -> bool:
+        """
+            Extends the lease of the shard. The ledger is not touched
+            until half of the lease time has passed unless forced
+
+            Returns
+            -------
+            bool
+                False if the lease has expired and been taken by another worker
+        """
+        now: float = self.__clock()
+        if not force and now < self.__expiry.get(shard.key, 0) - self.__lease_seconds / 2:
+            return True
+        with self.__db.transaction():
+            state: ShardState = self.__states().get(shard.key)
+            if state is None or state.done or (state.worker != self.__worker and state.expiry > now):
+                return False
+            self.__lease(shard, now + self.__lease_seconds)
+        return True
+
+    def complete(self, shard: Shard) -> bool:
+        """
+            Marks the shard done if this worker still holds its lease
+
+            Returns
+            -------
+            bool
+                False if the lease has been lost
+        """
+        with self.__db.transaction():
+            state: ShardState = self.__states().get(shard.key)
+            if state is None or state.done or state.worker != self.__worker:
+                return False
+            self.insert(EventObject('done', shard.key, self.__worker))
+        return True
+
+    def release(self, shard: Shard) -> None:
+        """
+            Gives up the lease, e.g. after an error. This worker does not lease the shard again
+        """
+        self.__failed.add(shard.key)
+        with self.__db.transaction():
+            state: ShardState = self.__states().get(shard.key)
+            if state is not None and not state.done and state.worker == self.__worker:
+                self.__lease(shard, 0)
+
+    def status(self) -> Tuple[int, int, int]:
+        """
+            Returns
+            -------
+            Tuple[int, int, int]
+                the number of shards that are done, leased and waiting
+        """
+        now: float = self.__clock()
+        states: List[ShardState] = list(self.__states().values())
+        done: int = sum(1 for s in states if s.done)
+        leased: int = sum(1 for s in states if not s.done and s.expiry > now)
+        return (done, leased, len(states) - done - leased)
+
+    def run(self, source: RepoFS, sink: RepoFS, poll: float = None) -> int:
+        """
+            Syncs shards until there are none left
+
+            Parameters
+            ----------
+            source: RepoFS
+                the source repository
+            sink: RepoFS
+                the sink repository
+            poll: float
+                the seconds to wait while other workers hold the remaining leases,
+                so shards of workers that die are taken over. Without it the
+                worker stops when no shard is free
+
+            Returns
+            -------
+            int
+                the number of shards synced by this worker
+        """
+        synced: int = 0
+        while True:
+            shard: Shard = self.acquire()
+            if shard is None:
+                (_, leased, _) = self.status()
+                if poll is None or leased == 0:
+                    return synced
+                time.sleep(poll)
+                continue
+            ledger: ShardLedger = ShardLedger(self, shard)
+            RepoPipe(ledger, source, sink).sync()
+            synced += 1 if ledger.completed else 0
+
+
+class ShardLedger(RepoLedger):
+    """
+        The ledger of one `RepoPipe` sync of a leased shard. Events are written to
+        the shared ledger, and the lease is renewed while objects are recorded
+
+        Parameters
+        ----------
+        coordinator: BackfillCoordinator
+            the coordinator holding the lease
+        shard: Shard
+            the leased shard
+    """
+    def __init__(self, coordinator: BackfillCoordinator, shard: Shard) -> None:
+        self.__coordinator: BackfillCoordinator = coordinator
+        self.__shard: Shard = shard
+        self.completed: bool = False
+
+    def next_period(self) -> Tuple[Date, Date]:
+        return (self.__shard.beg_date, self.__shard.end_date)
+
+    def start(self, date: Date) -> None:
+        self.__coordinator.insert(EventObject('start', str(date), self.__coordinator.worker))
+
+    def record(self, date: Date, period_type: DatePeriodType) -> None:
+        self.__coordinator.insert(EventObject('record', str(date), str(period_type)))
+        if not self.__coordinator.renew(self.__shard):
+            raise LeaseLostError(self.__shard.key)
+
+    def error(self, date: Date, error: str) -> None:
+        self.__coordinator.insert(EventObject('error', str(date), error))
+        self.__coordinator.release(self.__shard)
+
+    def compact(self, date: Date, objects: int) -> None:
+        self.__coordinator.insert(EventObject('compact', str(date), str(objects)))
+
+    def end(self, date: Date) -> None:
+        self.__coordinator.insert(EventObject('end', str(date), self.__coordinator.worker))
+        self.completed = self.__coordinator.complete(self.__shard)
+
+
+class LeaseLostError(Exception):
+    """
+        Raised when another worker has taken over the shard after the lease expired
+    """
+    pass
@@ -0,0 +1,144 @@
+"""
+    Backfill plans of many date ranges at once
+
+    `Date.backfill` builds the periods of one range object by object. The
+    planner computes the periods of all ranges with array operations on date
+    ordinals and quarter ordinals (see `quarter_ordinal`), and builds
+    `DatePeriod` objects only for the periods that are looked at.
+
+    Examples
+    --------
+    >>> plan = plan_backfills([Date('2020-01-10'), Date('2019-11-15')], [Date('2020-07-20'), Date('2020-02-10')])
+    >>> [str(p) for p in plan.owner(1)]
+    ['D,2019-11-15,2019-12-31', 'D,2020-01-01,2020-02-10']
+"""
+from datetime import date
+from typing import Iterator, Sequence, Union
+import numpy as np
+from edgar.utils.date.date_utils import Date, DatePeriod, DatePeriodType
+
+PERIOD_DTYPE: np.dtype = np.dtype([
+    ('period_type', np.uint8),
+    ('start', np.int32),
+    ('end', np.int32),
+    ('owner', np.int32),
+])
+
+# The proleptic ordinal of the numpy datetime epoch
+EPOCH_ORDINAL: int = date(1970, 1, 1).toordinal()
+
+Dates = Union[Sequence[Date], np.ndarray]
+
+
+def as_ordinals(dates: Dates) -> np.ndarray:
+    """
+        Returns the ordinals of the dates as an array
+
+        Parameters
+        ----------
+        dates: Dates
+            a sequence of `Date` or an array of ordinals
+    """
+    if isinstance(dates, np.ndarray):
+        return dates.astype(np.int64, copy=False)
+    return np.fromiter((d.ordinal() for d in dates), dtype=np.int64, count=len(dates))
+
+
+def quarter_ordinals(ordinals: np.ndarray) -> np.ndarray:
+    """
+        Returns the quarter ordinals of the date ordinals
+    """
+    months: np.ndarray = (ordinals - EPOCH_ORDINAL).astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+    # year * 4 + (month - 1) // 3 == (year * 12 + month - 1) // 3
+    return (months + 1970 * 12) // 3
+
+
+def quarter_starts(qords: np.ndarray) -> np.ndarray:
+    """
+        Returns the ordinals of the first dates of the quarters
+    """
+    months: np.ndarray = (qords * 3 - 1970 * 12).astype('datetime64[M]')
+    return months.astype('datetime64[D]').astype(np.int64) + EPOCH_ORDINAL
+
+
+class BackfillPlan:
+    """
+        The backfill periods of several ranges, ordered by range and date
+
+        Parameters
+        ----------
+        periods: np.ndarray
+            the periods as an array of PERIOD_DTYPE sorted by owner
+    """
+    def __init__(self, periods: np.ndarray) -> None:
+        self.__periods: np.ndarray = periods
+
+    @property
+    def periods(self) -> np.ndarray:
+        return self.__periods
+
+    def __len__(self) -> int:
+        return len(self.__periods)
+
+    def __getitem__(self, i: int) -> DatePeriod:
+        (period_type, start, end, _) = self.__periods[i].tolist()
+        return DatePeriod(DatePeriodType(period_type), Date(date.fromordinal(start)), Date(date.fromordinal(end)))
+
+    def __iter__(self) -> Iterator[DatePeriod]:
+        return (self[i] for i in range(len(self.__periods)))
+
+    def owner(self, index: int) -> 'BackfillPlan':
+        """
+            Returns the plan of one range
+
+            Parameters
+            ----------
+            index: int
+                the index of the range in the arrays the plan was made from
+        """
+        (beg, end) = np.searchsorted(self.__periods['owner'], [index, index + 1])
+        return BackfillPlan(self.__periods[beg:end])
+
+
+def plan_backfills(from_dates: Dates, to_dates: Dates) -> BackfillPlan:
+    """
+        Returns the backfill periods of every range as `Date.backfill` does:
+        one period per quarter, whole quarters typed QUARTER and parts of
+        quarters typed DAY. Ranges that end before they start have no periods
+
+        Parameters
+        ----------
+        from_dates: Dates
+            the first dates of the ranges
+        to_dates: Dates
+            the last dates of the ranges
+
+        Returns
+        -------
+        BackfillPlan
+            the periods, whose owner is the index of their range
+    """
+    from_ords: np.ndarray = as_ordinals(from_dates)
+    to_ords: np.ndarray = as_ordinals(to_dates)
+    if from_ords.shape != to_ords.shape:
+        raise ValueError('{0} first dates and {1} last dates'.format(len(from_ords), len(to_ords)))
+
+    from_qords: np.ndarray = quarter_ordinals(from_ords)
+    counts: np.ndarray = np.where(to_ords >= from_ords, quarter_ordinals(to_ords) - from_qords + 1, 0)
+
+    owners: np.ndarray = np.repeat(np.arange(len(counts), dtype=np.int32), counts)
+    # The position of every period within its range
+    firsts: np.ndarray = np.cumsum(counts) - counts
+    steps: np.ndarray = np.arange(len(owners)) - np.repeat(firsts, counts)
+    qords: np.ndarray = from_qords[owners] + steps
+
+    qbegs: np.ndarray = quarter_starts(qords)
+    qends: np.ndarray = quarter_starts(qords + 1) - 1
+
+    periods: np.ndarray = np.empty(len(owners), dtype=PERIOD_DTYPE)
+    periods['owner'] = owners
+    periods['start'] = np.maximum(qbegs, from_ords[owners])
+    periods['end'] = np.minimum(qends, to_ords[owners])
+    periods['period_type'] = np.where((periods['start'] == qbegs) & (periods['end'] == qends),
+        DatePeriodType.QUARTER, DatePeriodType.DAY)
+    return BackfillPlan(periods)
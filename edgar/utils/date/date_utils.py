@@ -1,4 +1,5 @@
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 
 from typing import List, Set, Dict, Tuple, Optional, Generator, Union
 from enum import IntEnum
@@ -12,6 +13,49 @@ def to_timestamp() -> int:
 def from_timestamp(ts: int) -> datetime:
     return datetime.fromtimestamp(ts)
 
+def quarter_ordinal(year: int, quarter: int) -> int:
+    """
+        Returns the quarter ordinal: quarters are numbered consecutively
+        as year * 4 + quarter - 1, so quarter arithmetic is integer arithmetic
+
+        Parameters
+        ----------
+        year: int
+            the year
+        quarter: int
+            the quarter number between 1 and 4
+    """
+    return year * 4 + quarter - 1
+
+def quarter_of(qord: int) -> Tuple[int, int]:
+    """
+        Returns the year and the quarter number of a quarter ordinal
+    """
+    (year, q) = divmod(qord, 4)
+    return (year, q + 1)
+
+@lru_cache(maxsize=4096)
+def quarter_bounds(qord: int) -> Tuple['Date', 'Date']:
+    """
+        Returns the first and the last date of the quarter. The dates are
+        cached and shared between callers, which is safe as `Date` is immutable
+
+        Parameters
+        ----------
+        qord: int
+            the quarter ordinal
+    """
+    (year, q) = divmod(qord, 4)
+    next_begins: date = date(year + 1, 1, 1) if q == 3 else date(year, q * 3 + 4, 1)
+    return (Date(date(year, q * 3 + 1, 1)), Date(next_begins - ONE_DAY))
+
+def quarter_range(from_date: 'Date', to_date: 'Date') -> range:
+    """
+        Returns the ordinals of the quarters between the dates, both included,
+        as a range that takes constant memory whatever the span
+    """
+    return range(from_date.quarter_ordinal(), to_date.quarter_ordinal() + 1)
+
 
 class DatePeriodType(IntEnum):
     UNKNOWN = 0
@@ -218,6 +262,28 @@ class Date(object):
         """
         return self.__the_date.year
 
+    def ordinal(self) -> int:
+        """
+            Returns the proleptic Gregorian ordinal of the date
+
+            Return
+            ------
+            int
+                the ordinal, where January 1 of year 1 has ordinal 1
+        """
+        return self.__the_date.toordinal()
+
+    def quarter_ordinal(self) -> int:
+        """
+            Returns the ordinal of the quarter of the date, see `quarter_ordinal`
+
+            Return
+            ------
+            int
+                the quarter ordinal
+        """
+        return self.__the_date.year * 4 + (self.__the_date.month - 1) // 3
+
     def isoweekday(self):
         return self.__the_date.isoweekday()
 
@@ -235,7 +301,7 @@ class Date(object):
             int
                 the difference between the quarter number of this date and that of from_date
         """
-        return self.quarter() - from_date.quarter()
+        return self.quarter_ordinal() - from_date.quarter_ordinal()
 
     def diff_days(self, from_date: 'Date') -> int:
         """
@@ -263,11 +329,7 @@ class Date(object):
             Tuple[Date, Date]
                 The quarter's start and end dates
         """
-        qbegins: date = None
-        for qdate in [date(self.__the_date.year + m // 12, m % 12, 1) for m in QUARTER_START_MONTH]:
-            if self.__the_date < qdate:
-                return (Date.from_date(qbegins), Date.from_date(qdate - ONE_DAY))
-            qbegins = qdate
+        return quarter_bounds(self.quarter_ordinal())
 
     def backfill(self, from_date: 'Date') -> Generator[DatePeriod, None, None]:
         """
@@ -281,22 +343,14 @@ class Date(object):
         if self.diff_days(from_date) <= 0:
             return
 
-        qnum: int = self.diff_quarters(from_date)
-        (qbeg, qend) = from_date.quarter_dates()
+        quarters: range = quarter_range(from_date, self)
+        for qord in quarters:
+            (qbeg, qend) = quarter_bounds(qord)
+            beg_date: Date = from_date if qord == quarters.start else qbeg
+            end_date: Date = self if qord == quarters.stop - 1 else qend
+            yield DatePeriod(DatePeriodType.QUARTER if beg_date == qbeg and end_date == qend else DatePeriodType.DAY,
+                beg_date, end_date)
 
-        if qnum == 0:
-            yield DatePeriod(DatePeriodType.QUARTER if from_date == qbeg and self == qend else DatePeriodType.DAY, 
-                from_date, self)
-        else:
-            yield DatePeriod(DatePeriodType.QUARTER if from_date == qbeg else DatePeriodType.DAY, from_date, qend)
-
-            for _ in range(2, qnum + 1):
-                (qbeg, qend) = qend.add_days(1).quarter_dates()
-                yield DatePeriod(DatePeriodType.QUARTER, qbeg, qend)
-
-            (qbeg, qend) = qend.add_days(1).quarter_dates()
-            yield DatePeriod(DatePeriodType.QUARTER if self == qend else DatePeriodType.DAY, qbeg, self)
-                
     def copy(self) -> 'Date':
         """
             Creates a copy of this Date instance
@@ -322,8 +376,7 @@ class Date(object):
             Date
                 the new Date (with added days)
         """
-        self.__the_date = self.__the_date + timedelta(days=days)
-        return self
+        return Date(self.__the_date + timedelta(days=days))
         
     def is_weekend(self) -> bool:
         """
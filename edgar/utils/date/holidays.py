@@ -68,12 +68,16 @@ class us_holidays(object):
             self.names[str(d)] = i[3]
             self.list.append(d)
 
-        for i in self.list:
-            wd: int = i.isoweekday()
-            if wd == self.SATURDAY:
-                i += -1
-            elif wd == self.SUNDAY:
-                i += 1
+        # Holidays on a weekend are observed on the nearest weekday
+        self.list = [self.__observed(d) for d in self.list]
+
+    def __observed(self, d: Date) -> Date:
+        wd: int = d.isoweekday()
+        if wd == self.SATURDAY:
+            return d.add_days(-1)
+        elif wd == self.SUNDAY:
+            return d.add_days(1)
+        return d
 
     def __iter__(self):
         return iter(self.list)
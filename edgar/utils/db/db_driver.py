@@ -2,7 +2,7 @@
     The absract driver classes
 """
 import abc
-from typing import Dict, List
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Tuple
 
 class DbDriver(metaclass=abc.ABCMeta):
     """
@@ -24,6 +24,52 @@ class DbDriver(metaclass=abc.ABCMeta):
     def insert_row(self, table_name: str, values: Dict) -> bool:
         pass
 
+    @abc.abstractmethod
+    def iter_rows(self, table_name: str, columns: Iterable[str] = None, where: Dict[str, Any] = None,
+            batch_size: int = 1000, order_by: Iterable[str] = None) -> Iterator[Tuple]:
+        """
+            Streams the rows matching the predicates, reading `batch_size` rows
+            at a time, so tables of any size are scanned in constant memory
+
+            Parameters
+            ----------
+            table_name: str
+                the table
+            columns: Iterable[str]
+                the columns of the rows, all of them if None
+            where: Dict[str, Any]
+                the predicates by column, as in `where_sql`: a column equals the value,
+                is compared with it, e.g. {'event_date >=': '2021-01-01'}, or is one of
+                the items of a list value. Values are passed as parameters
+            batch_size: int
+                the number of rows fetched at once
+            order_by: Iterable[str]
+                the columns the rows are sorted by, e.g. ['rowid'] for the order they
+                were inserted in. The order is undefined without them
+
+            Returns
+            -------
+            Iterator[Tuple]
+                the rows. The query is closed when the iterator is exhausted or closed
+        """
+        pass
+
+    def select_rows(self, table_name: str, where: Dict[str, Any] = None, order_by: Iterable[str] = None) -> List:
+        """
+            Returns the rows whose columns equal the values in where, sorted by
+            the columns of order_by. A list value matches any of its items
+        """
+        return list(self.iter_rows(table_name, where=where, order_by=order_by))
+
+    @abc.abstractmethod
+    def transaction(self) -> ContextManager[None]:
+        """
+            Returns a context manager running its block in one transaction that
+            holds the write lock from the start, so concurrent read-modify-write
+            sequences of several connections are serialized
+        """
+        pass
+
     @abc.abstractmethod
     def close(self) -> None:
         pass
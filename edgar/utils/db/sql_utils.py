@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Tuple
 from dataclasses import dataclass, field, fields, asdict
 
 def dump_sql(table: str, limit = 100) -> str:
@@ -14,6 +14,67 @@ def insert_sql(table: str, values: Dict[str,Any]) -> str:
                     else ''.join(['\'',v,'\'']) for v in values.values()), ')'
     ])
 
+def insert_param_sql(table: str, columns: Iterable[str]) -> str:
+    columns = list(columns)
+    return ''.join([
+            'INSERT INTO ', table,
+            '(', ', '.join(columns), ') ',
+            'VALUES(', ', '.join('?' for _ in columns), ')'
+    ])
+
+# The comparisons a WHERE key may end with, e.g. {'event_date >=': '2021-01-01'}
+OPERATORS: Tuple[str, ...] = ('=', '!=', '<', '<=', '>', '>=', 'LIKE')
+
+def column_name(column: str) -> str:
+    """
+        Returns the column name, which must be an identifier as it is not a parameter
+
+        Raises
+        ------
+        ValueError
+            if the name is not an identifier, e.g. '*' or an expression
+    """
+    if not (isinstance(column, str) and column.isidentifier()):
+        raise ValueError('Bad column name: {0!r}'.format(column))
+    return column
+
+def where_sql(where: Dict[str, Any]) -> Tuple[str, List]:
+    """
+        Builds a parameterized WHERE clause. A key is a column, compared for equality,
+        or a column followed by one of OPERATORS. A list or tuple value matches any of its items
+
+        Raises
+        ------
+        ValueError
+            if a column is not an identifier or the comparison is not supported
+    """
+    if not where:
+        return ('', [])
+    terms: List[str] = []
+    params: List = []
+    for (key, value) in where.items():
+        (column, _, op) = key.strip().partition(' ')
+        column = column_name(column)
+        op = op.strip().upper() or '='
+        if op not in OPERATORS:
+            raise ValueError('Unsupported comparison: {0}'.format(key))
+        if isinstance(value, (list, tuple)):
+            if op != '=':
+                raise ValueError('Lists are matched by equality: {0}'.format(key))
+            terms.append(''.join([column, ' IN (', ', '.join('?' for _ in value), ')']))
+            params.extend(value)
+        else:
+            terms.append(' '.join([column, op, '?']))
+            params.append(value)
+    return (' WHERE ' + ' AND '.join(terms), params)
+
+def select_sql(table: str, where: Dict[str, Any] = None, columns: Iterable[str] = None,
+        order_by: Iterable[str] = None) -> Tuple[str, List]:
+    (clause, params) = where_sql(where)
+    projection: str = ', '.join(column_name(c) for c in columns) if columns else '*'
+    order: str = ' ORDER BY ' + ', '.join(column_name(c) for c in order_by) if order_by else ''
+    return (''.join(['SELECT ', projection, ' FROM ', table, clause, order]), params)
+
 def table_sql(table: str, columns: Dict[str, str]) -> str:
     return ''.join([
         'CREATE TABLE IF NOT EXISTS ', table,
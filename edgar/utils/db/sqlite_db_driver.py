@@ -1,8 +1,9 @@
 from contextlib import contextmanager
 from sqlite3 import connect, Cursor, Error, Connection
-from typing import Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 from edgar.utils.db.db_driver import DbDriver
-from edgar.utils.db.sql_utils import dump_sql, insert_sql, table_sql
+from edgar.utils.db.sql_utils import dump_sql, insert_param_sql, select_sql, table_sql
+from edgar.utils.metrics import metrics
 
 class Executor:
     def __init__(self) -> None:
@@ -17,8 +18,19 @@ class Executor:
             cur.close()
 
 class SqliteDbDriver(DbDriver):
-    def __init__(self, db_path: str) -> None:
-        self.__con: Connection = connect(db_path)
+    """
+        The driver for SQLite databases. Statements outside `transaction` are committed
+        right away, so rows written by one connection are seen by the others
+
+        Parameters
+        ----------
+        db_path: str
+            the path to the database file or ':memory:'
+        timeout: float
+            the number of seconds to wait for a lock held by another connection
+    """
+    def __init__(self, db_path: str, timeout: float = 30.0) -> None:
+        self.__con: Connection = connect(db_path, timeout=timeout, isolation_level=None)
         self.__run: Executor = Executor()
 
     def __del__(self):
@@ -38,14 +50,44 @@ class SqliteDbDriver(DbDriver):
             return False
 
     def fetch_rows(self, table_name: str, limit: int = 100) -> List:
-        with self.__run.cursor(self.__con) as cursor:
+        with metrics.span('db_fetch_seconds', table=table_name), self.__run.cursor(self.__con) as cursor:
             cursor.execute(dump_sql(table_name, limit))
-            return cursor.fetchall()
+            rows: List = cursor.fetchall()
+        metrics.incr('db_rows_read_total', len(rows), table=table_name)
+        return rows
 
-    def insert_row(self, table_name: str, values: Dict) -> bool:
+    def iter_rows(self, table_name: str, columns: Iterable[str] = None, where: Dict[str, Any] = None,
+            batch_size: int = 1000, order_by: Iterable[str] = None) -> Iterator[Tuple]:
+        return metrics.timed_iter(self.__scan(table_name, columns, where, batch_size, order_by),
+            'db_fetch_seconds', table=table_name)
+
+    def __scan(self, table_name: str, columns: Iterable[str], where: Dict[str, Any], batch_size: int,
+            order_by: Iterable[str]) -> Iterator[Tuple]:
         with self.__run.cursor(self.__con) as cursor:
-            cursor.execute(insert_sql(table_name, values))
-            return True
+            cursor.execute(*select_sql(table_name, where, columns, order_by))
+            while True:
+                rows: List = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                metrics.incr('db_rows_read_total', len(rows), table=table_name)
+                yield from rows
+
+    def insert_row(self, table_name: str, values: Dict) -> bool:
+        with metrics.span('db_insert_seconds', table=table_name), self.__run.cursor(self.__con) as cursor:
+            cursor.execute(insert_param_sql(table_name, values.keys()), list(values.values()))
+        metrics.incr('db_rows_written_total', table=table_name)
+        return True
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        self.__con.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self.__con.execute('ROLLBACK')
+            raise
+        else:
+            self.__con.execute('COMMIT')
 
     def close(self) -> None:
         self.__con.close()
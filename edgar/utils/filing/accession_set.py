@@ -0,0 +1,256 @@
+"""
+    Persisted membership set of accession numbers
+
+    An accession number such as 0001564590-21-005399 is encoded as the 64-bit
+    integer 000156459021005399. The set is one file holding a Bloom filter and
+    the sorted array of encoded accessions::
+
+        header | Bloom filter bits | sorted uint64 accessions
+
+    The file is memory-mapped, so only the pages that are looked at are
+    resident. A lookup tests the Bloom filter first, which rules out most
+    accessions that are not in the set, and confirms the rest by binary search.
+    Batches of accessions are looked up with array operations.
+
+    The file is immutable: `AccessionSet.build` writes a new one atomically.
+"""
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, List, Sequence, Union
+import mmap
+import os
+import struct
+import tempfile
+import numpy as np
+
+ACCESSION_LENGTH: int = 20
+
+# The positions of the digits in an accession number
+DIGITS: List[int] = [i for i in range(ACCESSION_LENGTH) if i not in (10, 13)]
+
+POWERS: np.ndarray = 10 ** np.arange(len(DIGITS) - 1, -1, -1, dtype=np.uint64)
+
+MASK64: int = (1 << 64) - 1
+
+
+def is_accession(accession: str) -> bool:
+    """
+        Tells whether the string is an accession number such as 0001564590-21-005399
+    """
+    if len(accession) != ACCESSION_LENGTH or accession[10] != '-' or accession[13] != '-':
+        return False
+    digits: str = accession[:10] + accession[11:13] + accession[14:]
+    return digits.isascii() and digits.isdigit()
+
+
+def encode_accession(accession: str) -> int:
+    """
+        Returns the 64-bit code of the accession number
+
+        Raises
+        ------
+        ValueError
+            if the accession number is not formatted as 0001564590-21-005399
+    """
+    if not is_accession(accession):
+        raise ValueError('Bad accession number: {0}'.format(accession))
+    return int(accession[:10] + accession[11:13] + accession[14:])
+
+
+def decode_accession(code: int) -> str:
+    digits: str = '{0:018}'.format(code)
+    return '{0}-{1}-{2}'.format(digits[:10], digits[10:12], digits[12:])
+
+
+def encode_accessions(accessions: Sequence[str]) -> np.ndarray:
+    """
+        Returns the codes of the accession numbers as an uint64 array
+
+        Raises
+        ------
+        ValueError
+            if an accession number is not formatted as 0001564590-21-005399
+    """
+    if not len(accessions):
+        return np.empty(0, dtype=np.uint64)
+    buffer: bytes = ''.join(accessions).encode('ascii', errors='replace')
+    if len(buffer) != len(accessions) * ACCESSION_LENGTH:
+        raise ValueError('Bad accession numbers')
+    chars: np.ndarray = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, ACCESSION_LENGTH)
+    digits: np.ndarray = chars[:, DIGITS] - np.uint8(ord('0'))
+    if (digits > 9).any() or (chars[:, 10] != ord('-')).any() or (chars[:, 13] != ord('-')).any():
+        raise ValueError('Bad accession numbers')
+    return digits.astype(np.uint64) @ POWERS
+
+
+def _mix(code: int) -> int:
+    # splitmix64 finalizer
+    z: int = (code + 0x9E3779B97F4A7C15) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+def _mix_many(codes: np.ndarray) -> np.ndarray:
+    # The same as `_mix`, integer overflow wraps around
+    z: np.ndarray = codes + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _bit_positions(codes: np.ndarray, num_bits: int, num_hashes: int) -> np.ndarray:
+    """
+        Returns the Bloom filter bits of the codes, one row per hash. A 32-bit
+        hash h is mapped to the bit (h * num_bits) >> 32, which avoids a division
+    """
+    z: np.ndarray = _mix_many(codes)
+    h1: np.ndarray = z & np.uint64(0xFFFFFFFF)
+    h2: np.ndarray = (z >> np.uint64(32)) | np.uint64(1)
+    return np.stack([(((h1 + np.uint64(i) * h2) & np.uint64(0xFFFFFFFF)) * np.uint64(num_bits)) >> np.uint64(32)
+        for i in range(num_hashes)])
+
+
+class AccessionSet:
+    """
+        A memory-mapped set of accession numbers
+
+        Parameters
+        ----------
+        path: Path
+            the file written by `build`
+    """
+    MAGIC: bytes = b'EACC'
+    HEADER: struct.Struct = struct.Struct('<4sIQQQ')
+    BITS_PER_ITEM: int = 10
+    NUM_HASHES: int = 7
+
+    def __init__(self, path: Path) -> None:
+        self.__path: Path = Path(path)
+        with self.__path.open('rb') as f:
+            self.__map: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, _, count, num_bits, num_hashes) = self.HEADER.unpack_from(self.__map, 0)
+        if magic != self.MAGIC:
+            raise ValueError('{0}: not an accession set'.format(path))
+        self.__count: int = count
+        self.__num_bits: int = num_bits
+        self.__num_hashes: int = num_hashes
+        bloom_size: int = num_bits // 8
+        self.__bloom: memoryview = memoryview(self.__map)[self.HEADER.size:self.HEADER.size + bloom_size]
+        self.__codes: memoryview = memoryview(self.__map)[self.HEADER.size + bloom_size:].cast('Q')
+        if len(self.__codes) != count:
+            raise ValueError('{0}: truncated accession set'.format(path))
+
+    @staticmethod
+    def build(path: Path, accessions: Union[Iterable[str], np.ndarray], presorted: bool = False) -> 'AccessionSet':
+        """
+            Writes the set of the accession numbers and opens it. An existing
+            file is replaced atomically, readers keep the version they opened
+
+            Parameters
+            ----------
+            path: Path
+                the file of the set
+            accessions: Iterable[str] | np.ndarray
+                the accession numbers or their codes, duplicates are allowed
+            presorted: bool
+                whether the codes are already sorted and free of duplicates
+        """
+        codes: np.ndarray = accessions if isinstance(accessions, np.ndarray) \
+            else encode_accessions(list(accessions))
+        codes = codes.astype(np.uint64, copy=False)
+        if not presorted:
+            codes = np.unique(codes)
+
+        num_bits: int = max(64, -(-len(codes) * AccessionSet.BITS_PER_ITEM // 64) * 64)
+        bits: np.ndarray = np.zeros(num_bits, dtype=bool)
+        bits[_bit_positions(codes, num_bits, AccessionSet.NUM_HASHES).ravel()] = True
+
+        path = Path(path)
+        (handle, temp_path) = tempfile.mkstemp(prefix='.' + path.name, suffix='.tmp', dir=path.parent)
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                f.write(AccessionSet.HEADER.pack(AccessionSet.MAGIC, 1, len(codes), num_bits, AccessionSet.NUM_HASHES))
+                f.write(np.packbits(bits, bitorder='little').tobytes())
+                f.write(codes.astype('<u8').tobytes())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return AccessionSet(path)
+
+    @property
+    def path(self) -> Path:
+        return self.__path
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __enter__(self) -> 'AccessionSet':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.__bloom.release()
+        self.__codes.release()
+        self.__map.close()
+
+    def __contains__(self, accession: str) -> bool:
+        try:
+            code: int = encode_accession(accession)
+        except ValueError:
+            return False
+        z: int = _mix(code)
+        (h1, h2) = (z & 0xFFFFFFFF, (z >> 32) | 1)
+        bloom: memoryview = self.__bloom
+        for i in range(self.__num_hashes):
+            bit: int = (((h1 + i * h2) & 0xFFFFFFFF) * self.__num_bits) >> 32
+            if not bloom[bit >> 3] & (1 << (bit & 7)):
+                return False
+        codes: memoryview = self.__codes
+        i: int = bisect_left(codes, code)
+        return i < len(codes) and codes[i] == code
+
+    def codes(self) -> np.ndarray:
+        """
+            Returns the sorted codes of the set. The array is a view of the mapped file
+        """
+        return np.frombuffer(self.__codes, dtype='<u8')
+
+    def contains_many(self, accessions: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+        """
+            Looks up a batch of accession numbers
+
+            Parameters
+            ----------
+            accessions: Sequence[str] | np.ndarray
+                the accession numbers or their codes
+
+            Returns
+            -------
+            np.ndarray
+                the boolean array telling which accession numbers are in the set
+        """
+        if isinstance(accessions, np.ndarray):
+            codes: np.ndarray = accessions.astype(np.uint64, copy=False)
+        else:
+            try:
+                codes = encode_accessions(accessions)
+            except ValueError:
+                return np.fromiter((a in self for a in accessions), dtype=bool, count=len(accessions))
+
+        bloom: np.ndarray = np.frombuffer(self.__bloom, dtype=np.uint8)
+        positions: np.ndarray = _bit_positions(codes, self.__num_bits, self.__num_hashes)
+        found: np.ndarray = ((bloom[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1) \
+            .all(axis=0)
+
+        # Only the candidates passing the filter are searched
+        candidates: np.ndarray = np.flatnonzero(found)
+        if len(candidates):
+            sorted_codes: np.ndarray = self.codes()
+            wanted: np.ndarray = codes[candidates]
+            at: np.ndarray = np.minimum(np.searchsorted(sorted_codes, wanted), len(sorted_codes) - 1)
+            found[candidates] = sorted_codes[at] == wanted
+        return found
@@ -0,0 +1,262 @@
+"""
+    Mass download of the filings listed in master index objects
+
+    Rows are queued by priority, the most recent filings first by default,
+    and filings already stored or queued are skipped: stored filings are
+    looked up in batches in the `AccessionSet` of the repository, which is
+    extended with the filings fetched by every run. Worker threads share
+    one pooled session and one token bucket, so the client stays at the rate
+    EDGAR allows while enough requests are in flight to sustain it. Filings
+    are written atomically: a run that is interrupted is resumed by queueing
+    the same rows again.
+
+    Fetched filings are added to the accession set every `record_every`
+    filings and when the run ends, also by an exception. A process that dies
+    loses at most the filings fetched since, which are downloaded again.
+"""
+from typing import Callable, Iterable, List, NamedTuple, Set, Tuple
+import heapq
+import threading
+import time
+from edgar.utils.index.master_index import IndexRow
+from edgar.utils.filing.accession_set import AccessionSet
+from edgar.utils.filing.filing_repo import FilingRepo
+from edgar.utils.filing.rate_limiter import TokenBucket
+from edgar.utils.metrics import metrics
+from edgar.utils.repo.http_client import HttpClient, new_session
+
+EDGAR_ARCHIVES_URL: str = 'https://www.sec.gov/Archives/'
+
+# Throttled and failing requests are retried, missing filings are not
+RETRY_STATUS: Tuple[int, ...] = (403, 429, 500, 502, 503, 504)
+
+(FETCHED, FAILED, RETRY) = range(3)
+
+
+class FilingTask(NamedTuple):
+    """
+        A queued filing
+    """
+    cik: int
+    accession: str
+    filename: str
+    attempt: int = 0
+
+
+class FetchStats(NamedTuple):
+    fetched: int
+    failed: int
+    retried: int
+
+
+def recent_first(row: IndexRow) -> int:
+    return -row.date_filed
+
+
+class FilingFetcher:
+    """
+        Downloads filings into a `FilingRepo`
+
+        Parameters
+        ----------
+        repo: FilingRepo
+            the repository of filings
+        base_url: str
+            the URL the file names of index rows are relative to
+        limiter: TokenBucket
+            paces the requests, 10 per second by default
+        workers: int
+            the number of requests in flight. At a rate R and a latency L
+            at least R * L workers are needed to sustain the rate
+        max_retries: int
+            the number of times a throttled or failed request is retried
+        backoff: float
+            the seconds to wait before the first retry, doubled for every next one
+        priority: Callable[[IndexRow], int]
+            the order of downloads, lower first
+        session: requests.Session
+            the session shared by the workers, a pooled one by default
+        record_every: int
+            the number of fetched filings added to the accession set at once during a run
+    """
+    def __init__(self, repo: FilingRepo, base_url: str = EDGAR_ARCHIVES_URL, limiter: TokenBucket = None,
+            workers: int = 8, max_retries: int = 3, backoff: float = 1.0,
+            priority: Callable[[IndexRow], int] = recent_first, session = None, record_every: int = 1000) -> None:
+        self.__repo: FilingRepo = repo
+        self.__base_url: str = base_url
+        self.__limiter: TokenBucket = limiter if limiter is not None else TokenBucket()
+        self.__workers: int = workers
+        self.__max_retries: int = max_retries
+        self.__backoff: float = backoff
+        self.__priority: Callable[[IndexRow], int] = priority
+        self.__session = session
+        self.__record_every: int = record_every
+        self.__lock: threading.Lock = threading.Lock()
+        self.__record_lock: threading.Lock = threading.Lock()
+        self.__queue: List[Tuple[int, int, FilingTask]] = []
+        self.__seq: int = 0
+        self.__stored: AccessionSet = None
+        self.__queued: Set[str] = set()
+        self.__fetched: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.__queue)
+
+    def __stored_set(self) -> AccessionSet:
+        if self.__stored is None:
+            # Filings stored by an earlier run
+            self.__stored = self.__repo.accession_set()
+        return self.__stored
+
+    def __push(self, priority: int, task: FilingTask) -> None:
+        heapq.heappush(self.__queue, (priority, self.__seq, task))
+        self.__seq += 1
+
+    def add(self, rows: Iterable[IndexRow]) -> int:
+        """
+            Queues the filings of the rows that are neither stored nor queued
+
+            Parameters
+            ----------
+            rows: Iterable[IndexRow]
+                the parsed index rows
+
+            Returns
+            -------
+            int
+                the number of filings queued
+        """
+        added: int = 0
+        batch: List[IndexRow] = list(rows)
+        accessions: List[str] = [row.accession for row in batch]
+        with self.__lock:
+            stored: List[bool] = self.__stored_set().contains_many(accessions).tolist()
+            for (row, accession, is_stored) in zip(batch, accessions, stored):
+                if not is_stored and accession not in self.__queued:
+                    self.__queued.add(accession)
+                    self.__push(self.__priority(row), FilingTask(row.cik, accession, row.filename))
+                    added += 1
+        metrics.incr('filings_queued_total', added)
+        return added
+
+    def __pop(self) -> Tuple[int, FilingTask]:
+        with self.__lock:
+            if not self.__queue:
+                return (0, None)
+            (priority, _, task) = heapq.heappop(self.__queue)
+            return (priority, task)
+
+    def run(self, limit: int = None) -> FetchStats:
+        """
+            Downloads the queued filings until the queue is empty
+
+            Parameters
+            ----------
+            limit: int
+                the number of filings to download at most. The rest stays queued
+
+            Returns
+            -------
+            FetchStats
+                the number of filings fetched, failed and retried requests
+        """
+        session = self.__session if self.__session is not None else new_session(self.__workers)
+        counts: List[int] = [0, 0, 0]
+        budget: List[int] = [limit if limit is not None else len(self.__queue)]
+        counts_lock: threading.Lock = threading.Lock()
+        stop: threading.Event = threading.Event()
+
+        def work() -> None:
+            while True:
+                with counts_lock:
+                    if budget[0] <= 0 or stop.is_set():
+                        return
+                    budget[0] -= 1
+                (priority, task) = self.__pop()
+                if task is None:
+                    return
+                result: int = self.__fetch(session, task)
+                if result == RETRY and task.attempt < self.__max_retries:
+                    time.sleep(self.__backoff * 2 ** task.attempt)
+                    with self.__lock:
+                        self.__push(priority, task._replace(attempt=task.attempt + 1))
+                    with counts_lock:
+                        budget[0] += 1
+                        counts[2] += 1
+                    continue
+                with self.__lock:
+                    if result == FETCHED:
+                        self.__fetched.append(task.accession)
+                    else:
+                        # Queued again when its row is added again
+                        self.__queued.discard(task.accession)
+                    due: bool = len(self.__fetched) >= self.__record_every
+                with counts_lock:
+                    counts[0 if result == FETCHED else 1] += 1
+                if due:
+                    self.__record()
+
+        threads: List[threading.Thread] = [threading.Thread(target=work, name='filing-fetcher-{0}'.format(i))
+            for i in range(self.__workers)]
+        try:
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            # Interrupted runs stop after the filings in flight and keep what they fetched
+            stop.set()
+            for t in threads:
+                if t.is_alive():
+                    t.join()
+            if self.__session is None:
+                session.close()
+            self.__record()
+        return FetchStats(*counts)
+
+    def __record(self) -> None:
+        """
+            Syncs the fetched filings and adds them to the accession set of the repository
+        """
+        with self.__record_lock:
+            with self.__lock:
+                (fetched, self.__fetched) = (self.__fetched, [])
+            if not fetched:
+                return
+            try:
+                self.__repo.flush()
+                stored: AccessionSet = self.__repo.record(fetched)
+            except BaseException:
+                with self.__lock:
+                    self.__fetched[:0] = fetched
+                raise
+            with self.__lock:
+                self.__stored_set().close()
+                self.__stored = stored
+                self.__queued.difference_update(fetched)
+
+    def __fetch(self, session, task: FilingTask) -> int:
+        """
+            Downloads the filing
+
+            Returns
+            -------
+            int
+                FETCHED, FAILED or RETRY if the request may be retried
+        """
+        self.__limiter.acquire()
+        client: HttpClient = HttpClient(self.__base_url, session)
+        try:
+            status_code: int = client.get(task.filename)
+            if status_code == 200:
+                self.__repo.create(task.cik, task.accession).out(client.inp(65536), override=True)
+                metrics.incr('filings_fetched_total')
+                return FETCHED
+            metrics.incr('filings_failed_total', status=status_code)
+            return RETRY if status_code in RETRY_STATUS else FAILED
+        except OSError:
+            # Connection errors of requests are OSErrors too
+            metrics.incr('filings_failed_total', status='error')
+            return RETRY
+        finally:
+            client.close()
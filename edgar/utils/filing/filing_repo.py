@@ -0,0 +1,163 @@
+"""
+    Local store of filing documents
+
+    Filings are sharded by CIK and by the year of their accession number,
+    so no directory grows beyond the filings of one filer in one year::
+
+        <root>/<cik mod 1000>/<cik>/<yy>/<accession>.txt
+
+    e.g. `edgar/data/1000045/0001564590-21-005399.txt` is stored as
+    `045/1000045/21/0001564590-21-005399.txt`.
+
+    The accession numbers of the stored filings are kept in an `AccessionSet`
+    at `<root>/.accessions`, built by listing the repository on first use and
+    extended by `record`. Filings written around `record` are not in the set
+    until it is built again.
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+import os
+import threading
+import numpy as np
+from edgar.utils.filing.accession_set import AccessionSet, encode_accessions, is_accession
+from edgar.utils.repo.file_repo_dir import FileRepoDir
+from edgar.utils.repo.file_repo_object import FileRepoObject
+from edgar.utils.repo.file_repo_sync import FileSyncer, FsyncPolicy
+
+FILING_SUFFIX: str = '.txt'
+ACCESSION_SET: str = '.accessions'
+
+# The number of shard directories kept open for writing
+OPEN_SHARDS: int = 1024
+
+
+def filing_shard(cik: int, accession: str) -> List[str]:
+    """
+        Returns the directories of the filing below the root
+
+        Parameters
+        ----------
+        cik: int
+            the CIK of the filer
+        accession: str
+            the accession number, e.g. 0001564590-21-005399
+    """
+    return ['{0:03}'.format(cik % 1000), str(cik), accession[11:13]]
+
+
+class FilingRepo:
+    """
+        The repository of filing documents
+
+        Parameters
+        ----------
+        root: Path
+            the root directory
+        fsync: FsyncPolicy
+            when written filings are flushed to the storage
+        open_shards: int
+            the number of the most recently written shard directories kept open,
+            so filings of the same filer and year do not list their directory again
+    """
+    def __init__(self, root: Path, fsync: FsyncPolicy = FsyncPolicy.NONE, open_shards: int = OPEN_SHARDS) -> None:
+        self.__root: Path = Path(root)
+        self.__syncer: FileSyncer = FileSyncer(fsync)
+        self.__open_shards: int = open_shards
+        self.__shards: 'OrderedDict[Path, FileRepoDir]' = OrderedDict()
+        self.__lock: threading.Lock = threading.Lock()
+        self.__root.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def root(self) -> Path:
+        return self.__root
+
+    def path(self, cik: int, accession: str) -> Path:
+        return self.__root.joinpath(*filing_shard(cik, accession), accession + FILING_SUFFIX)
+
+    def exists(self, cik: int, accession: str) -> bool:
+        return self.path(cik, accession).exists()
+
+    def create(self, cik: int, accession: str) -> FileRepoObject:
+        """
+            Returns the object to write the filing to. The object is written
+            atomically, so an interrupted download leaves no partial filing
+        """
+        path: Path = self.path(cik, accession)
+        with self.__lock:
+            shard: FileRepoDir = self.__shards.get(path.parent)
+            if shard is None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                shard = FileRepoDir(path.parent, syncer=self.__syncer)
+                self.__shards[path.parent] = shard
+                if len(self.__shards) > self.__open_shards:
+                    self.__shards.popitem(last=False)
+            else:
+                self.__shards.move_to_end(path.parent)
+            # Directories are not thread-safe, the object is added under the lock
+            return FileRepoObject(shard, path.name)
+
+    def filings(self) -> Iterator[Tuple[int, str]]:
+        """
+            Lists the stored filings
+
+            Returns
+            -------
+            Iterator[Tuple[int, str]]
+                the CIKs and the accession numbers of the filings
+        """
+        for shard in _scan_dirs(self.__root):
+            for cik in _scan_dirs(shard.path):
+                for year in _scan_dirs(cik.path):
+                    with os.scandir(year.path) as entries:
+                        for entry in entries:
+                            if entry.name.endswith(FILING_SUFFIX) and not entry.name.startswith('.'):
+                                yield (int(cik.name), entry.name[:-len(FILING_SUFFIX)])
+
+    def accessions(self) -> Iterator[str]:
+        return (accession for (_, accession) in self.filings())
+
+    def accession_set(self, rebuild: bool = False) -> AccessionSet:
+        """
+            Opens the set of the accession numbers of the stored filings
+
+            Parameters
+            ----------
+            rebuild: bool
+                whether to list the repository again rather than open the persisted set
+        """
+        path: Path = self.__root / ACCESSION_SET
+        if rebuild or not path.exists():
+            return AccessionSet.build(path, self.accessions())
+        return AccessionSet(path)
+
+    def record(self, accessions: Iterable[str]) -> AccessionSet:
+        """
+            Adds the accession numbers of filings written since to the persisted set.
+            Strings that are not accession numbers are left out
+
+            Returns
+            -------
+            AccessionSet
+                the updated set
+        """
+        added: np.ndarray = encode_accessions([a for a in accessions if is_accession(a)])
+        with self.accession_set() as current:
+            codes: np.ndarray = _merge_codes(current.codes(), added)
+        return AccessionSet.build(self.__root / ACCESSION_SET, codes, presorted=True)
+
+    def flush(self) -> None:
+        self.__syncer.flush()
+
+
+def _scan_dirs(path: str) -> List[os.DirEntry]:
+    with os.scandir(path) as entries:
+        return sorted((e for e in entries if e.is_dir() and not e.name.startswith('.')), key=lambda e: e.name)
+
+
+def _merge_codes(stored: np.ndarray, added: np.ndarray) -> np.ndarray:
+    # The stored codes are sorted and unique, only the batch is sorted before it is merged in
+    added = np.unique(added.astype(np.uint64, copy=False))
+    if len(stored) > 0 and len(added) > 0:
+        added = added[stored[np.minimum(np.searchsorted(stored, added), len(stored) - 1)] != added]
+    return np.insert(stored, np.searchsorted(stored, added), added)
@@ -0,0 +1,63 @@
+"""
+    Request rate limiting shared by threads
+"""
+from typing import Callable
+import threading
+import time
+from edgar.utils.metrics import metrics
+
+# The request rate EDGAR allows per client
+EDGAR_MAX_RATE: float = 10
+
+
+class TokenBucket:
+    """
+        Paces callers to a sustained rate with bursts of up to `burst` calls.
+        Callers reserve a token under the lock and wait for it outside of it,
+        so waiting threads are released one per 1/rate seconds in arrival order
+
+        Parameters
+        ----------
+        rate: float
+            the tokens added per second
+        burst: int
+            the number of tokens the bucket holds
+        clock: Callable[[], float]
+            returns a monotonic time in seconds
+        sleep: Callable[[float], None]
+            waits for the given seconds
+    """
+    def __init__(self, rate: float = EDGAR_MAX_RATE, burst: int = 1,
+            clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep) -> None:
+        self.__rate: float = rate
+        self.__burst: int = burst
+        self.__clock: Callable[[], float] = clock
+        self.__sleep: Callable[[float], None] = sleep
+        self.__tokens: float = burst
+        self.__last: float = clock()
+        self.__lock: threading.Lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.__rate
+
+    def acquire(self) -> float:
+        """
+            Takes a token, waiting until one is available
+
+            Returns
+            -------
+            float
+                the seconds waited
+        """
+        with self.__lock:
+            now: float = self.__clock()
+            self.__tokens = min(self.__burst, self.__tokens + (now - self.__last) * self.__rate)
+            self.__last = now
+            self.__tokens -= 1
+            # A negative balance is the queue of callers waiting for tokens
+            wait: float = -self.__tokens / self.__rate if self.__tokens < 0 else 0.0
+        if wait > 0:
+            metrics.observe('rate_limit_wait_seconds', wait)
+            self.__sleep(wait)
+        return wait
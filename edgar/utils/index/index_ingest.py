@@ -0,0 +1,114 @@
+"""
+    Parallel ingest of master index objects
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Executor, Future
+from pathlib import Path
+from typing import Deque, Iterable, Iterator, Tuple
+import itertools
+import mmap
+import os
+import tempfile
+from edgar.utils.repo.repo_fs import RepoObject
+from edgar.utils.index.master_index import IndexColumns, parse_master_index_bytes
+
+
+def parse_to_spool(obj_path: str, spool_dir: str) -> Tuple[str, int]:
+    """
+        Parses one index object into a column buffer file in the spool directory.
+        The function is executed in worker processes.
+
+        Parameters
+        ----------
+        obj_path: str
+            the path to the index object
+        spool_dir: str
+            the directory for column buffers
+
+        Returns
+        -------
+        Tuple[str, int]
+            the path to the column buffer and its size in bytes
+    """
+    with open(obj_path, 'rb') as f:
+        columns: IndexColumns = parse_master_index_bytes(f.read())
+
+    size: int = columns.nbytes()
+    (handle, spool_path) = tempfile.mkstemp(suffix='.cols', dir=spool_dir)
+    with os.fdopen(handle, 'r+b') as f:
+        f.truncate(size)
+        with mmap.mmap(f.fileno(), size) as buffer:
+            columns.write_to(buffer)
+    return (spool_path, size)
+
+
+def map_spool(spool_path: str, size: int) -> IndexColumns:
+    """
+        Maps the column buffer written by `parse_to_spool` and removes the file.
+        The returned columns are views into the mapped pages, closing them unmaps the pages.
+    """
+    with open(spool_path, 'rb') as f:
+        buffer: mmap.mmap = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+    os.unlink(spool_path)
+    return IndexColumns.from_buffer(buffer, owned=True)
+
+
+class IndexIngest:
+    """
+        Parses index objects in a pool of worker processes.
+
+        Each worker parses one object (partition) and returns its rows as a
+        memory-mapped column buffer instead of pickled rows, so only the buffer
+        location crosses the process boundary.
+
+        Parameters
+        ----------
+        max_workers: int
+            the number of worker processes
+        spool_dir: Path
+            the directory for column buffers. A temporary directory is used by default
+    """
+    def __init__(self, max_workers: int = None, spool_dir: Path = None) -> None:
+        self.__max_workers: int = max_workers or os.cpu_count()
+        self.__spool_dir: Path = spool_dir
+
+    @property
+    def max_workers(self) -> int:
+        return self.__max_workers
+
+    def ingest(self, objects: Iterable[RepoObject]) -> Iterator[Tuple[RepoObject, IndexColumns]]:
+        """
+            Parses file-backed index objects in parallel
+
+            Parameters
+            ----------
+            objects: Iterable[RepoObject]
+                the objects to parse, e.g. `FileRepoFS.objects()`
+
+            Returns
+            -------
+            Iterator[Tuple[RepoObject, IndexColumns]]
+                the objects with their parsed rows in the order of the input. The caller
+                closes the columns when done with them
+        """
+        it: Iterator[RepoObject] = iter(objects)
+        first: RepoObject = next(it, None)
+        if first is None:
+            return
+
+        with tempfile.TemporaryDirectory(suffix='_ingest', dir=self.__spool_dir) as spool_dir:
+            with self.executor() as executor:
+                # At most `window` objects are parsed or spooled ahead of the consumer
+                window: int = self.__max_workers * 2
+                pending: Deque[Tuple[RepoObject, Future]] = deque()
+                for obj in itertools.chain([first], it):
+                    pending.append((obj, executor.submit(parse_to_spool, str(obj.path), spool_dir)))
+                    if len(pending) >= window:
+                        (done, future) = pending.popleft()
+                        yield (done, map_spool(*future.result()))
+                while pending:
+                    (done, future) = pending.popleft()
+                    yield (done, map_spool(*future.result()))
+
+    def executor(self) -> Executor:
+        return ProcessPoolExecutor(max_workers=self.__max_workers)
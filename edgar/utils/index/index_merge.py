@@ -0,0 +1,164 @@
+"""
+    Consolidated index of filing rows over a date range
+
+    Quarterly and daily master index objects list the same filings: the
+    quarterly object of a closed quarter repeats its dailies, and the open
+    quarter only has dailies. The merge streams one deduplicated stream of
+    rows ordered by date and accession out of both.
+
+    Index objects are sorted by CIK, so every object is first cut into runs
+    of at most `run_rows` rows that are sorted and spooled to files, as in an
+    external sort. The runs of a quarter are then merged through a heap, one
+    buffered cursor per run. Rows with the accession of the previous row are
+    dropped: a duplicate sorts right after its original, so a filing listed
+    under several filers is returned once, under the lowest CIK. Memory is bounded by
+    `run_rows` and by the number of runs of a quarter, not by the row count.
+"""
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import heapq
+import tempfile
+from edgar.utils.date.date_utils import Date, DatePeriodType, quarter_bounds, quarter_range
+from edgar.utils.index.master_index import FIELD_SEPARATOR, INDEX_ENCODING, IndexRow, iter_lines, \
+    parse_master_index, parse_master_line
+from edgar.utils.metrics import metrics
+from edgar.utils.repo.repo_fs import RepoFS, RepoObject
+
+SortKey = Tuple[int, str, int]
+
+
+def sort_key(row: IndexRow) -> SortKey:
+    """
+        Orders rows by date, accession and CIK
+    """
+    return (row.date_filed, row.accession, row.cik)
+
+
+def spool_runs(rows: Iterable[IndexRow], spool_dir: Path, run_rows: int) -> List[Path]:
+    """
+        Cuts the rows into sorted runs written to the spool directory
+
+        Parameters
+        ----------
+        rows: Iterable[IndexRow]
+            the rows in any order
+        spool_dir: Path
+            the directory of the run files
+        run_rows: int
+            the number of rows of a run at most
+
+        Returns
+        -------
+        List[Path]
+            the run files
+    """
+    runs: List[Path] = []
+    run: List[IndexRow] = []
+    for row in rows:
+        run.append(row)
+        if len(run) >= run_rows:
+            runs.append(_write_run(run, spool_dir))
+            run = []
+    if run:
+        runs.append(_write_run(run, spool_dir))
+    return runs
+
+
+def _write_run(run: List[IndexRow], spool_dir: Path) -> Path:
+    run.sort(key=sort_key)
+    (handle, path) = tempfile.mkstemp(suffix='.run', dir=spool_dir)
+    with open(handle, 'w', encoding=INDEX_ENCODING, newline='\n') as f:
+        f.writelines(FIELD_SEPARATOR.join([str(row.cik), row.company, row.form_type,
+            date.fromordinal(row.date_filed).isoformat(), row.filename]) + '\n' for row in run)
+    metrics.incr('index_merge_runs_total')
+    return Path(path)
+
+
+def read_run(path: Path, bufsize: int = 65536) -> Iterator[IndexRow]:
+    """
+        Reads the rows of a run file in order
+    """
+    dates: Dict[str, int] = {}
+    with open(path, 'r', encoding=INDEX_ENCODING, newline='\n', buffering=bufsize) as f:
+        for line in f:
+            row: Optional[IndexRow] = parse_master_line(line[:-1], dates)
+            if row is not None:
+                yield row
+
+
+def merge_runs(runs: List[Iterable[IndexRow]]) -> Iterator[IndexRow]:
+    """
+        Merges sorted runs into one sorted stream without duplicate accessions
+    """
+    last: str = None
+    for row in heapq.merge(*runs, key=sort_key):
+        accession: str = row.accession
+        if accession == last:
+            metrics.incr('index_merge_duplicates_total')
+            continue
+        last = accession
+        yield row
+
+
+class IndexMerge:
+    """
+        Streams the filing rows of a repository in date order
+
+        Parameters
+        ----------
+        repo: RepoFS
+            the repository of master index objects
+        run_rows: int
+            the number of rows sorted in memory at once
+        spool_dir: Path
+            the parent of the temporary run directories, the system default if None
+        bufsize: int
+            the buffer size used to read objects and runs
+    """
+    def __init__(self, repo: RepoFS, run_rows: int = 100000, spool_dir: Path = None, bufsize: int = 65536) -> None:
+        self.__repo: RepoFS = repo
+        self.__run_rows: int = run_rows
+        self.__spool_dir: Path = spool_dir
+        self.__bufsize: int = bufsize
+
+    def rows(self, from_date: Date, to_date: Date) -> Iterator[IndexRow]:
+        """
+            Returns the rows filed between the dates, both included, ordered
+            by date and accession. Quarters are merged one after the other
+
+            Parameters
+            ----------
+            from_date: Date
+                the first date
+            to_date: Date
+                the last date
+
+            Returns
+            -------
+            Iterator[IndexRow]
+                the rows without duplicate accessions
+        """
+        for qord in quarter_range(from_date, to_date):
+            yield from self.__quarter_rows(qord, from_date.ordinal(), to_date.ordinal())
+
+    def __sources(self, qord: int, lo: int, hi: int) -> Iterator[RepoObject]:
+        """
+            Returns the quarterly and the daily objects of the quarter within the range
+        """
+        (qbeg, qend) = quarter_bounds(qord)
+        for (period_type, the_date) in [(DatePeriodType.QUARTER, qbeg)] + \
+                [(DatePeriodType.DAY, Date(date.fromordinal(o)))
+                    for o in range(max(lo, qbeg.ordinal()), min(hi, qend.ordinal()) + 1)]:
+            obj: RepoObject = self.__repo.find(period_type, the_date)
+            if obj is not None and obj.exists():
+                yield obj
+
+    def __quarter_rows(self, qord: int, lo: int, hi: int) -> Iterator[IndexRow]:
+        with tempfile.TemporaryDirectory(suffix='_index_merge', dir=self.__spool_dir) as spool:
+            runs: List[Path] = []
+            for obj in self.__sources(qord, lo, hi):
+                rows: Iterator[IndexRow] = parse_master_index(iter_lines(obj.inp(self.__bufsize)))
+                runs.extend(spool_runs((row for row in rows if lo <= row.date_filed <= hi),
+                    Path(spool), self.__run_rows))
+            yield from merge_runs([read_run(run, self.__bufsize) for run in runs])
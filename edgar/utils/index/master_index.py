@@ -0,0 +1,342 @@
+"""
+    Parsing of EDGAR master index objects
+
+    A master index starts with a free-form header followed by a line of dashes
+    and pipe-delimited rows::
+
+        CIK|Company Name|Form Type|Date Filed|Filename
+        --------------------------------------------------------------------------------
+        1000045|NICHOLAS FINANCIAL INC|10-Q|2021-02-11|edgar/data/1000045/0001564590-21-005399.txt
+
+    Quarterly objects use YYYY-MM-DD dates, daily objects use YYYYMMDD.
+"""
+from array import array
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+import struct
+
+FIELD_SEPARATOR: str = '|'
+HEADER_SEPARATOR: str = '---'
+INDEX_ENCODING: str = 'latin-1'
+
+
+class IndexRow(NamedTuple):
+    """
+        A filing row of a master index
+    """
+    cik: int
+    company: str
+    form_type: str
+    date_filed: int
+    filename: str
+
+    @property
+    def accession(self) -> str:
+        """
+            Returns the accession number, e.g. 0001564590-21-005399
+        """
+        return self.filename[self.filename.rfind('/') + 1:].split('.')[0]
+
+    def filing_date(self) -> date:
+        return date.fromordinal(self.date_filed)
+
+
+def date_ordinal(value: Union[str, bytes]) -> int:
+    """
+        Converts a YYYY-MM-DD or YYYYMMDD date into the proleptic Gregorian ordinal
+
+        Parameters
+        ----------
+        value: str | bytes
+            the date as it appears in the index
+
+        Returns
+        -------
+        int
+            the date ordinal
+    """
+    if len(value) == 8:
+        return date(int(value[0:4]), int(value[4:6]), int(value[6:8])).toordinal()
+    return date(int(value[0:4]), int(value[5:7]), int(value[8:10])).toordinal()
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """
+        Splits a stream of text chunks into lines without the line terminators
+
+        Parameters
+        ----------
+        chunks: Iterable[str]
+            the chunks as returned by `RepoObject.inp`
+
+        Returns
+        -------
+        Iterator[str]
+            the lines
+    """
+    tail: str = ''
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode(INDEX_ENCODING)
+        lines: List[str] = (tail + chunk).split('\n')
+        tail = lines.pop()
+        for line in lines:
+            yield line.rstrip('\r')
+    if tail:
+        yield tail.rstrip('\r')
+
+
+def parse_master_index(lines: Iterable[str]) -> Iterator[IndexRow]:
+    """
+        Parses lines of a master index into rows. The header is skipped.
+
+        Parameters
+        ----------
+        lines: Iterable[str]
+            the lines of the index
+
+        Returns
+        -------
+        Iterator[IndexRow]
+            the filing rows
+    """
+    dates: Dict[str, int] = {}
+    in_header: bool = True
+
+    for line in lines:
+        if in_header:
+            in_header = not line.startswith(HEADER_SEPARATOR)
+            continue
+
+        row: IndexRow = parse_master_line(line, dates)
+        if row is not None:
+            yield row
+
+
+def parse_master_line(line: str, dates: Dict[str, int]) -> Optional[IndexRow]:
+    """
+        Parses one line following the header of a master index
+
+        Parameters
+        ----------
+        line: str
+            the line without the line terminator
+        dates: Dict[str, int]
+            the ordinals of the dates seen so far, updated by the call
+
+        Returns
+        -------
+        IndexRow | None
+            the filing row or None if the line is not a row
+    """
+    fields: List[str] = line.split(FIELD_SEPARATOR)
+    if len(fields) != 5:
+        return None
+
+    date_filed = dates.get(fields[3])
+    if date_filed is None:
+        date_filed = dates[fields[3]] = date_ordinal(fields[3])
+
+    return IndexRow(int(fields[0]), fields[1], fields[2], date_filed, fields[4])
+
+
+class StringColumn:
+    """
+        A string column packed as one byte blob plus the array of row offsets
+    """
+    def __init__(self, offsets: Union[array, memoryview] = None, blob: Union[bytearray, memoryview] = None) -> None:
+        self.__offsets = offsets if offsets is not None else array('I', [0])
+        self.__blob = blob if blob is not None else bytearray()
+
+    def append(self, value: bytes) -> None:
+        self.__blob += value
+        self.__offsets.append(len(self.__blob))
+
+    @property
+    def offsets(self) -> Union[array, memoryview]:
+        return self.__offsets
+
+    @property
+    def blob(self) -> Union[bytearray, memoryview]:
+        return self.__blob
+
+    def raw(self, i: int) -> bytes:
+        return bytes(self.__blob[self.__offsets[i]:self.__offsets[i + 1]])
+
+    def __getitem__(self, i: int) -> str:
+        return self.raw(i).decode(INDEX_ENCODING)
+
+    def __len__(self) -> int:
+        return len(self.__offsets) - 1
+
+
+class IndexColumns:
+    """
+        Column-oriented storage of master index rows.
+
+        The columns serialize into one contiguous buffer that can be memory-mapped
+        and read in place by another process::
+
+            header | cik (q) | date_filed (i) | 3 x offsets (I) | 3 x blobs
+    """
+    MAGIC: bytes = b'EIDX'
+    HEADER: struct.Struct = struct.Struct('<4sIQQQQ')
+    STRINGS: List[str] = ['company', 'form_type', 'filename']
+
+    def __init__(self, cik=None, date_filed=None, strings: List[StringColumn] = None, buffer=None) -> None:
+        self.cik = cik if cik is not None else array('q')
+        self.date_filed = date_filed if date_filed is not None else array('i')
+        (self.company, self.form_type, self.filename) = strings if strings else \
+            [StringColumn() for _ in self.STRINGS]
+        self.__buffer = buffer
+
+    def __enter__(self) -> 'IndexColumns':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+            Releases the views into the buffer and closes the buffer the columns own, if any.
+            The columns cannot be read afterwards
+        """
+        if self.__buffer is None:
+            return
+        strings: List[StringColumn] = [self.company, self.form_type, self.filename]
+        for part in [self.cik, self.date_filed, *[s.offsets for s in strings], *[s.blob for s in strings]]:
+            part.release()
+        self.__buffer.close()
+        self.__buffer = None
+
+    def append(self, cik: int, company: bytes, form_type: bytes, date_filed: int, filename: bytes) -> None:
+        self.cik.append(cik)
+        self.company.append(company)
+        self.form_type.append(form_type)
+        self.date_filed.append(date_filed)
+        self.filename.append(filename)
+
+    def __len__(self) -> int:
+        return len(self.cik)
+
+    def __getitem__(self, i: int) -> IndexRow:
+        return IndexRow(self.cik[i], self.company[i], self.form_type[i], self.date_filed[i], self.filename[i])
+
+    def __iter__(self) -> Iterator[IndexRow]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def nbytes(self) -> int:
+        """
+            Returns the size of the serialized buffer
+        """
+        strings: List[StringColumn] = [self.company, self.form_type, self.filename]
+        return self.HEADER.size + len(self) * (8 + 4 + 3 * 4) + 3 * 4 + sum(len(s.blob) for s in strings)
+
+    def write_to(self, buffer) -> int:
+        """
+            Serializes the columns into a writable buffer, e.g. a memory map
+
+            Parameters
+            ----------
+            buffer
+                a writable buffer of at least `nbytes()` bytes
+
+            Returns
+            -------
+            int
+                the number of bytes written
+        """
+        strings: List[StringColumn] = [self.company, self.form_type, self.filename]
+        self.HEADER.pack_into(buffer, 0, self.MAGIC, 1, len(self), *[len(s.blob) for s in strings])
+
+        pos: int = self.HEADER.size
+        for part in [self.cik, self.date_filed, *[s.offsets for s in strings], *[s.blob for s in strings]]:
+            data: memoryview = memoryview(part).cast('B')
+            buffer[pos:pos + len(data)] = data
+            pos += len(data)
+        return pos
+
+    @staticmethod
+    def from_rows(rows: Iterable[IndexRow]) -> 'IndexColumns':
+        columns: IndexColumns = IndexColumns()
+        for row in rows:
+            columns.append(row.cik, row.company.encode(INDEX_ENCODING), row.form_type.encode(INDEX_ENCODING),
+                row.date_filed, row.filename.encode(INDEX_ENCODING))
+        return columns
+
+    @staticmethod
+    def from_buffer(buffer, owned: bool = False) -> 'IndexColumns':
+        """
+            Creates columns that are views into the buffer. No data is copied.
+
+            Parameters
+            ----------
+            buffer
+                the buffer created by `write_to`
+            owned: bool
+                whether `close` closes the buffer, e.g. a memory map
+
+            Returns
+            -------
+            IndexColumns
+                the columns backed by the buffer
+        """
+        view: memoryview = memoryview(buffer)
+        (magic, _, num_rows, *blob_sizes) = IndexColumns.HEADER.unpack_from(view, 0)
+        if magic != IndexColumns.MAGIC:
+            raise ValueError('Not an index column buffer')
+
+        pos: int = IndexColumns.HEADER.size
+
+        def take(size: int, fmt: str = 'B') -> memoryview:
+            nonlocal pos
+            part: memoryview = view[pos:pos + size]
+            pos += size
+            return part.cast(fmt) if fmt != 'B' else part
+
+        cik: memoryview = take(num_rows * 8, 'q')
+        date_filed: memoryview = take(num_rows * 4, 'i')
+        offsets: List[memoryview] = [take((num_rows + 1) * 4, 'I') for _ in blob_sizes]
+        blobs: List[memoryview] = [take(size) for size in blob_sizes]
+
+        view.release()
+        return IndexColumns(cik, date_filed, [StringColumn(o, b) for (o, b) in zip(offsets, blobs)],
+            buffer if owned else None)
+
+
+def parse_master_index_bytes(content: bytes) -> IndexColumns:
+    """
+        Parses the raw content of a master index straight into columns.
+        This is the CPU-bound step executed by ingest workers.
+
+        Parameters
+        ----------
+        content: bytes
+            the index content
+
+        Returns
+        -------
+        IndexColumns
+            the parsed rows
+    """
+    columns: IndexColumns = IndexColumns()
+    dates: Dict[bytes, int] = {}
+
+    start: int = content.find(b'\n' + HEADER_SEPARATOR.encode())
+    if start < 0:
+        return columns
+    start = content.find(b'\n', start + 1)
+
+    for line in content[start + 1:].splitlines():
+        fields: List[bytes] = line.split(b'|')
+        if len(fields) != 5:
+            continue
+
+        date_filed = dates.get(fields[3])
+        if date_filed is None:
+            date_filed = dates[fields[3]] = date_ordinal(fields[3])
+
+        columns.append(int(fields[0]), fields[1], fields[2], date_filed, fields[4])
+
+    return columns
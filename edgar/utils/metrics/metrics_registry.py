@@ -0,0 +1,79 @@
+"""
+    In-memory metrics registry
+"""
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, Tuple
+from edgar.utils.metrics.metrics import MetricsSink
+
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+@dataclass
+class Summary:
+    """
+        The aggregate of observations
+    """
+    count: int = 0
+    sum: float = 0.0
+    min: float = float('inf')
+    max: float = float('-inf')
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+
+class MetricsRegistry(MetricsSink):
+    """
+        Keeps counters and summaries of observations in memory.
+        Metrics are identified by the name and the label values
+    """
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__counters: Dict[MetricKey, float] = {}
+        self.__summaries: Dict[MetricKey, Summary] = {}
+
+    @staticmethod
+    def key(name: str, labels: Dict[str, str]) -> MetricKey:
+        return (name, tuple(sorted((k, str(v)) for (k, v) in labels.items())))
+
+    def incr(self, name: str, value: float = 1, **labels: str) -> None:
+        key: MetricKey = self.key(name, labels)
+        with self.__lock:
+            self.__counters[key] = self.__counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key: MetricKey = self.key(name, labels)
+        with self.__lock:
+            summary: Summary = self.__summaries.get(key)
+            if summary is None:
+                summary = self.__summaries[key] = Summary()
+            summary.add(value)
+
+    def counter(self, name: str, **labels: str) -> float:
+        """
+            Returns the value of the counter or 0 if nothing was counted
+        """
+        return self.__counters.get(self.key(name, labels), 0)
+
+    def summary(self, name: str, **labels: str) -> Summary:
+        """
+            Returns the summary of observations or an empty summary if nothing was observed
+        """
+        return self.__summaries.get(self.key(name, labels), Summary())
+
+    def counters(self) -> Iterator[Tuple[MetricKey, float]]:
+        with self.__lock:
+            return iter(sorted(self.__counters.items()))
+
+    def summaries(self) -> Iterator[Tuple[MetricKey, Summary]]:
+        with self.__lock:
+            return iter(sorted(self.__summaries.items(), key=lambda item: item[0]))
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__counters.clear()
+            self.__summaries.clear()
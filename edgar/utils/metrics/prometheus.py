@@ -0,0 +1,55 @@
+"""
+    Prometheus text exposition of a metrics registry
+
+    see https://prometheus.io/docs/instrumenting/exposition_formats/
+"""
+from typing import List, Tuple
+from edgar.utils.metrics.metrics_registry import MetricsRegistry
+
+METRIC_PREFIX: str = 'edgar_'
+
+
+def escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def sample(name: str, labels: Tuple[Tuple[str, str], ...], value: float) -> str:
+    label_text: str = ','.join('{0}="{1}"'.format(k, escape(v)) for (k, v) in labels)
+    return '{0}{1} {2}'.format(name, '{' + label_text + '}' if label_text else '', repr(float(value)))
+
+
+def prometheus_text(registry: MetricsRegistry, prefix: str = METRIC_PREFIX) -> str:
+    """
+        Renders counters as Prometheus counters and observations as summaries
+
+        Parameters
+        ----------
+        registry: MetricsRegistry
+            the registry
+        prefix: str
+            the prefix added to metric names
+
+        Returns
+        -------
+        str
+            the exposition text
+    """
+    lines: List[str] = []
+    last_name: str = None
+
+    for ((name, labels), value) in registry.counters():
+        metric: str = prefix + name
+        if metric != last_name:
+            lines.append('# TYPE {0} counter'.format(metric))
+            last_name = metric
+        lines.append(sample(metric, labels, value))
+
+    for ((name, labels), summary) in registry.summaries():
+        metric: str = prefix + name
+        if metric != last_name:
+            lines.append('# TYPE {0} summary'.format(metric))
+            last_name = metric
+        lines.append(sample(metric + '_count', labels, summary.count))
+        lines.append(sample(metric + '_sum', labels, summary.sum))
+
+    return '\n'.join(lines) + '\n' if lines else ''
@@ -0,0 +1,371 @@
+"""
+    Read-through disk cache in front of a remote repository
+
+    Objects are kept in a local directory laid out like the origin. A hit is
+    read from disk; a miss streams the object from the origin to the caller
+    while it is written to the cache. Misses of one object are serialized by
+    the advisory lock of its cache file, so concurrent readers, in this or
+    other processes, wait for the first download and then read the cached copy.
+    A caller that stops reading early does not stop the fill: the rest of the
+    object is still downloaded and cached.
+
+    A stale copy is served when the origin fails or no longer has the object.
+"""
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Generator, Iterator, List, Optional
+import os
+import threading
+import time
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.metrics import metrics
+from edgar.utils.repo.file_repo_sync import object_lock, remove_lock
+from edgar.utils.repo.repo_format import RepoFormatter
+from edgar.utils.repo.repo_fs import RepoFS, RepoObject, RepoURI
+
+ONE_DAY_SECONDS: float = 86400
+
+# Daily objects are published once. The object of the current quarter is rebuilt every night
+DEFAULT_MAX_AGE: Dict[DatePeriodType, Optional[float]] = {
+    DatePeriodType.DAY: None,
+    DatePeriodType.QUARTER: ONE_DAY_SECONDS
+}
+
+
+def expiry(period_type: DatePeriodType, the_date: Date, cached_at: float,
+        max_age: Dict[DatePeriodType, Optional[float]]) -> Optional[float]:
+    """
+        Returns the timestamp the object cached at the timestamp goes stale at,
+        None if it never goes stale
+
+        Parameters
+        ----------
+        period_type: DatePeriodType
+            the period type of the object
+        the_date: Date
+            the date of the object
+        cached_at: float
+            the timestamp the object was cached
+        max_age: Dict[DatePeriodType, Optional[float]]
+            the seconds a cached object stays fresh by period type, None if it never
+            goes stale. The quarterly object of a quarter that had closed when it was
+            cached never goes stale
+    """
+    if period_type == DatePeriodType.QUARTER:
+        (_, quarter_end) = the_date.quarter_dates()
+        if Date(date.fromtimestamp(cached_at)) > quarter_end:
+            return None
+    age: Optional[float] = max_age.get(period_type)
+    return None if age is None else cached_at + age
+
+
+class CacheRepoFS(RepoFS):
+    """
+        The repository that serves the objects of the origin from a size-bounded disk cache
+
+        Parameters
+        ----------
+        origin: RepoFS
+            the repository being cached, e.g. `HttpRepoFS`
+        root: Path
+            the cache directory
+        formatter: RepoFormatter
+            the formatter of object paths in the cache
+        max_bytes: int
+            the size of the cache. The least recently used objects are evicted beyond it
+        max_age: Dict[DatePeriodType, Optional[float]]
+            the seconds a cached object stays fresh by period type, None if it never
+            goes stale. The quarterly object of a quarter that had closed when it was
+            cached never goes stale
+        clock: Callable[[], float]
+            returns the current timestamp in seconds
+    """
+    def __init__(self, origin: RepoFS, root: Path, formatter: RepoFormatter, max_bytes: int = 1 << 30,
+            max_age: Dict[DatePeriodType, Optional[float]] = None,
+            clock: Callable[[], float] = time.time) -> None:
+        self.__origin: RepoFS = origin
+        self.__root: Path = Path(root)
+        self.__formatter: RepoFormatter = formatter
+        self.__max_bytes: int = max_bytes
+        self.__max_age: Dict[DatePeriodType, Optional[float]] = {**DEFAULT_MAX_AGE, **(max_age or {})}
+        self.__clock: Callable[[], float] = clock
+        self.__lock: threading.Lock = threading.Lock()
+        self.__lru: 'OrderedDict[str, int]' = OrderedDict()
+        self.__size: int = 0
+        self.__root.mkdir(parents=True, exist_ok=True)
+        self.__load()
+
+    @property
+    def origin(self) -> RepoFS:
+        return self.__origin
+
+    @property
+    def root(self) -> Path:
+        return self.__root
+
+    def __load(self) -> None:
+        """
+            Rebuilds the LRU order from the access times of the cached files
+        """
+        entries: List = []
+        for (dirpath, dirnames, filenames) in os.walk(self.__root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for name in filenames:
+                if not name.startswith('.'):
+                    path: str = os.path.join(dirpath, name)
+                    try:
+                        st: os.stat_result = os.stat(path)
+                    except FileNotFoundError:
+                        # Evicted by another process
+                        continue
+                    entries.append((st.st_atime_ns, os.path.relpath(path, self.__root), st.st_size))
+        with self.__lock:
+            self.__lru.clear()
+            self.__size = 0
+            for (_, key, size) in sorted(entries):
+                self.__lru[key] = size
+                self.__size += size
+
+    def __len__(self) -> int:
+        return len(self.__lru)
+
+    @property
+    def size(self) -> int:
+        """
+            Returns the bytes held in the cache
+        """
+        return self.__size
+
+    def is_fresh(self, period_type: DatePeriodType, the_date: Date, cached_at: float) -> bool:
+        """
+            Tells whether the object cached at the timestamp can be served
+
+            Parameters
+            ----------
+            period_type: DatePeriodType
+                the period type of the object
+            the_date: Date
+                the date of the object
+            cached_at: float
+                the timestamp the object was written to the cache
+        """
+        expires: Optional[float] = expiry(period_type, the_date, cached_at, self.__max_age)
+        return expires is None or self.__clock() < expires
+
+    def now(self) -> float:
+        return self.__clock()
+
+    def path(self, period_type: DatePeriodType, the_date: Date) -> Path:
+        return self.__root.joinpath(*self.__formatter.format(period_type, the_date))
+
+    def touch(self, path: Path) -> None:
+        """
+            Moves the cached object to the most recently used end
+        """
+        key: str = str(path.relative_to(self.__root))
+        with self.__lock:
+            if key in self.__lru:
+                self.__lru.move_to_end(key)
+        try:
+            # The access time orders the objects when the cache is reopened
+            os.utime(path, ns=(int(self.__clock() * 1e9), path.stat().st_mtime_ns))
+        except FileNotFoundError:
+            pass
+
+    def admit(self, path: Path, size: int) -> None:
+        """
+            Records the object written to the cache and evicts the least recently used ones
+        """
+        key: str = str(path.relative_to(self.__root))
+        evicted: List[str] = []
+        with self.__lock:
+            self.__size += size - self.__lru.pop(key, 0)
+            self.__lru[key] = size
+            while self.__size > self.__max_bytes and len(self.__lru) > 1:
+                (old_key, old_size) = self.__lru.popitem(last=False)
+                self.__size -= old_size
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                os.unlink(self.__root / old_key)
+            except FileNotFoundError:
+                pass
+            remove_lock(self.__root / old_key)
+        if evicted:
+            metrics.incr('cache_evictions_total', len(evicted))
+
+    def discard(self, path: Path) -> None:
+        """
+            Drops the cached object
+        """
+        key: str = str(path.relative_to(self.__root))
+        with self.__lock:
+            self.__size -= self.__lru.pop(key, 0)
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        remove_lock(path)
+
+    def iterate_missing(self, from_date: Date, to_date: Date) -> Iterator[RepoURI]:
+        return self.__origin.iterate_missing(from_date, to_date)
+
+    def find_missing(self, from_date: Date, to_date: Date) -> List[str]:
+        return self.__origin.find_missing(from_date, to_date)
+
+    def find(self, period_type: DatePeriodType, the_date: Date) -> 'CacheRepoObject':
+        return CacheRepoObject(self, period_type, the_date.copy())
+
+    def create(self, period_type: DatePeriodType, the_date: Date) -> 'CacheRepoObject':
+        return self.find(period_type, the_date)
+
+    def refresh(self) -> None:
+        """
+            Refreshes the origin and reloads the cache state written by other processes
+        """
+        self.__origin.refresh()
+        self.__load()
+
+
+class CacheRepoObject(RepoObject):
+    """
+        The object of the origin served through the cache
+
+        Parameters
+        ----------
+        cache: CacheRepoFS
+            the cache
+        period_type: DatePeriodType
+            the period type of the object
+        the_date: Date
+            the date of the object
+    """
+    def __init__(self, cache: CacheRepoFS, period_type: DatePeriodType, the_date: Date) -> None:
+        self.__cache: CacheRepoFS = cache
+        self.__period_type: DatePeriodType = period_type
+        self.__date: Date = the_date
+        self.__path: Path = cache.path(period_type, the_date)
+
+    @property
+    def path(self) -> Path:
+        return self.__path
+
+    def origin(self) -> RepoObject:
+        return self.__cache.origin.find(self.__period_type, self.__date)
+
+    def as_uri(self) -> str:
+        return self.origin().as_uri()
+
+    def subpath(self, levels: int) -> List[str]:
+        return list(self.__path.relative_to(self.__cache.root).parts[-levels:])
+
+    def cached(self) -> bool:
+        """
+            Tells whether a fresh copy of the object is in the cache
+        """
+        try:
+            return self.__cache.is_fresh(self.__period_type, self.__date, self.__path.stat().st_mtime)
+        except FileNotFoundError:
+            return False
+
+    def exists(self) -> bool:
+        return self.cached() or self.origin().exists()
+
+    def inp(self, bufsize: int = 2048) -> Iterator[bytes]:
+        """
+            Reads the object from the cache, or from the origin while caching it.
+            Readers that miss at the same time wait for the first one to download
+            the object. Chunks are bytes either way
+        """
+        if self.cached():
+            try:
+                f: BinaryIO = self.__path.open(mode='rb')
+                metrics.incr('cache_hits_total', period=str(self.__period_type))
+            except FileNotFoundError:
+                f = None
+            if f is not None:
+                self.__cache.touch(self.__path)
+                yield from self.__read(f, bufsize)
+                return
+
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+        with object_lock(self.__path):
+            # Another reader may have cached the object while this one was waiting
+            if self.cached():
+                metrics.incr('cache_hits_total', period=str(self.__period_type))
+            else:
+                metrics.incr('cache_misses_total', period=str(self.__period_type))
+                if (yield from self.__fetch(bufsize)):
+                    return
+                if self.__path.exists():
+                    metrics.incr('cache_stale_total', period=str(self.__period_type))
+            # The copy is opened before the lock is released, so an eviction does not
+            # pull it from under the reader
+            try:
+                f = self.__path.open(mode='rb')
+            except FileNotFoundError:
+                return
+        self.__cache.touch(self.__path)
+        yield from self.__read(f, bufsize)
+
+    def __read(self, f: BinaryIO, bufsize: int) -> Iterator[bytes]:
+        with f:
+            while True:
+                chunk: bytes = f.read(bufsize)
+                if len(chunk) == 0:
+                    break
+                yield chunk
+
+    def __fetch(self, bufsize: int) -> Generator[bytes, None, bool]:
+        """
+            Streams the object from the origin to the caller while it is written to a
+            temporary file, which is renamed into place once complete. If the caller
+            stops early the rest of the object is still written. Nothing is cached if
+            the origin yields nothing, i.e. does not have the object, or fails before
+            the first chunk while a stale copy is cached: the stale copy is kept then
+
+            Returns
+            -------
+            bool
+                whether the object was cached, once the chunks are exhausted
+        """
+        import tempfile
+        (handle, temp) = tempfile.mkstemp(prefix='.' + self.__path.name + '.', suffix='.tmp',
+            dir=self.__path.parent)
+        size: int = 0
+        reading: bool = True
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                try:
+                    for chunk in self.origin().inp(bufsize):
+                        data: bytes = chunk.encode() if isinstance(chunk, str) else chunk
+                        f.write(data)
+                        size += len(data)
+                        if reading:
+                            try:
+                                yield data
+                            except GeneratorExit:
+                                # The caller stopped, the object is cached all the same
+                                reading = False
+                except OSError:
+                    if size > 0 or not self.__path.exists():
+                        raise
+                    return False
+            if size > 0:
+                # The modification time tells when the object was cached
+                now: float = self.__cache.now()
+                os.utime(temp, (now, now))
+                os.replace(temp, self.__path)
+                self.__cache.admit(self.__path, size)
+        finally:
+            if os.path.exists(temp):
+                os.unlink(temp)
+        return size > 0
+
+    def out(self, iter: Iterator[str], override: bool = False) -> None:
+        """
+            Writes the object to the origin and drops the cached copy
+        """
+        self.origin().out(iter, override)
+        self.__cache.discard(self.__path)
@@ -1,5 +1,5 @@
-from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Tuple
+from dataclasses import dataclass, field, fields, asdict
+from typing import Any, Dict, Iterator, List, Tuple
 from edgar.utils.repo.repo_ledger import RepoLedger
 from edgar.utils.date.date_utils import Date, DatePeriodType, to_timestamp
 from edgar.utils.db.db_driver import DbDriver
@@ -42,8 +42,25 @@ class DbRepoLedger(RepoLedger):
     def record(self, date: Date, period_type: DatePeriodType) -> None:
         self.__insert(EventObject('record', str(date), str(period_type)))
 
+    def compact(self, date: Date, objects: int) -> None:
+        self.__insert(EventObject('compact', str(date), str(objects)))
+
     def next_period(self) -> Tuple[Date,Date]:
         pass
 
     def dump(self, limit: int = 10) -> List:
         return self.__db_driver.fetch_rows(self.TABLE_NAME, limit)
+
+    def events(self, where: Dict[str, Any] = None, batch_size: int = 1000) -> Iterator[EventObject]:
+        """
+            Streams the events of the ledger, e.g. to analyze its whole history
+
+            Parameters
+            ----------
+            where: Dict[str, Any]
+                the predicates of `DbDriver.iter_rows`, e.g. {'event_name': 'error'}
+            batch_size: int
+                the number of rows read at once
+        """
+        return (EventObject(*row) for row in self.__db_driver.iter_rows(self.TABLE_NAME,
+            [f.name for f in fields(EventObject)], where, batch_size))
@@ -0,0 +1,180 @@
+"""
+    Compaction of closed quarters in a file-based repository
+
+    Once a quarter is closed its quarterly object lists every filing of its
+    daily objects, so the dailies only cost inodes, directory listings and
+    backup time. The compactor checks that the quarterly object covers the
+    dailies, records the compaction in the ledger, marks the quarter as
+    compacted and then archives or removes the dailies. The marker is written
+    before the dailies are touched, so an interrupted compaction is finished
+    by running it again.
+"""
+from datetime import date
+from pathlib import Path
+from typing import Callable, List, Set
+import os
+import shutil
+import time
+from edgar.utils.date.date_utils import Date, DatePeriodType, quarter_bounds, quarter_range
+from edgar.utils.index.master_index import IndexColumns, parse_master_index_bytes
+from edgar.utils.metrics import metrics
+from edgar.utils.repo.file_repo_dir import FileRepoDir
+from edgar.utils.repo.file_repo_fs import FileRepoFS
+from edgar.utils.repo.file_repo_map import sidecar_path
+from edgar.utils.repo.file_repo_object import FileRepoObject
+from edgar.utils.repo.file_repo_sync import lock_path
+from edgar.utils.repo.repo_ledger import RepoLedger
+
+
+class CompactionError(Exception):
+    """
+        Raised when a quarter can not be compacted
+    """
+    pass
+
+
+class FileRepoCompactor:
+    """
+        Folds the daily objects of closed quarters into their quarterly objects
+
+        Parameters
+        ----------
+        repo: FileRepoFS
+            the repository
+        ledger: RepoLedger
+            records the compacted quarters
+        archive: Path
+            the directory the dailies are moved to, keeping their paths
+            below the repository root. The dailies are removed if None
+        clock: Callable[[], float]
+            returns the current time as a timestamp
+    """
+    def __init__(self, repo: FileRepoFS, ledger: RepoLedger, archive: Path = None,
+            clock: Callable[[], float] = time.time) -> None:
+        self.__repo: FileRepoFS = repo
+        self.__ledger: RepoLedger = ledger
+        self.__archive: Path = Path(archive) if archive is not None else None
+        self.__clock: Callable[[], float] = clock
+
+    def is_closed(self, the_date: Date) -> bool:
+        """
+            Tells whether the quarter of the date has ended
+        """
+        (_, qend) = the_date.quarter_dates()
+        return qend < Date(date.fromtimestamp(self.__clock()))
+
+    def uncovered(self, the_date: Date) -> List[FileRepoObject]:
+        """
+            Returns the daily objects of the quarter with filings missing
+            from the quarterly object, all of them if there is no quarterly object
+
+            Parameters
+            ----------
+            the_date: Date
+                a date of the quarter
+        """
+        dailies: List[FileRepoObject] = self.__dailies(the_date)
+        if not dailies:
+            return []
+        quarterly: FileRepoObject = self.__repo.find(DatePeriodType.QUARTER, the_date)
+        if quarterly is None or not quarterly.exists():
+            return dailies
+        filings: Set[bytes] = _filenames(quarterly.path)
+        return [daily for daily in dailies if not _filenames(daily.path) <= filings]
+
+    def compact(self, the_date: Date) -> int:
+        """
+            Compacts the quarter of the date
+
+            Parameters
+            ----------
+            the_date: Date
+                a date of the quarter
+
+            Returns
+            -------
+            int
+                the number of daily objects archived or removed
+
+            Raises
+            ------
+            CompactionError
+                if the quarter is not closed, has no quarterly object or its quarterly
+                object does not cover the dailies
+        """
+        (qbeg, _) = the_date.quarter_dates()
+        if not self.is_closed(qbeg):
+            raise CompactionError('{0}: the quarter is not closed'.format(qbeg))
+        quarterly: FileRepoObject = self.__repo.find(DatePeriodType.QUARTER, qbeg)
+        if quarterly is None or not quarterly.exists():
+            raise CompactionError('{0}: no quarterly object'.format(qbeg))
+        uncovered: List[FileRepoObject] = self.uncovered(qbeg)
+        if uncovered:
+            raise CompactionError('{0}: {1} dailies are not covered by the quarterly object, e.g. {2}'
+                .format(qbeg, len(uncovered), uncovered[0].path.name))
+
+        dailies: List[FileRepoObject] = self.__dailies(qbeg)
+        marker: Path = self.__repo.compacted_path(qbeg)
+        if not marker.exists():
+            # Recorded first, so a crash before the marker is written records it again on rerun
+            self.__ledger.compact(qbeg, len(dailies))
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.write_text(str(qbeg))
+
+        with metrics.span('repo_compact_seconds'):
+            for daily in dailies:
+                self.__retire(daily.path)
+        if dailies:
+            parent: FileRepoDir = dailies[0].parent
+            parent.refresh()
+        metrics.incr('repo_compacted_total', len(dailies))
+        return len(dailies)
+
+    def compact_range(self, from_date: Date, to_date: Date) -> List[Date]:
+        """
+            Compacts the closed quarters between the dates. Quarters that are
+            not covered are reported to the ledger as errors and left as they are
+
+            Returns
+            -------
+            List[Date]
+                the first dates of the compacted quarters
+        """
+        compacted: List[Date] = []
+        for qord in quarter_range(from_date, to_date):
+            (qbeg, _) = quarter_bounds(qord)
+            if not self.is_closed(qbeg):
+                break
+            if self.__repo.is_compacted(qbeg) and not self.__dailies(qbeg):
+                continue
+            try:
+                self.compact(qbeg)
+                compacted.append(qbeg)
+            except CompactionError as err:
+                self.__ledger.error(qbeg, str(err))
+        return compacted
+
+    def __dailies(self, the_date: Date) -> List[FileRepoObject]:
+        (qbeg, qend) = the_date.quarter_dates()
+        return list(self.__repo.walk(DatePeriodType.DAY, qbeg, qend))
+
+    def __retire(self, path: Path) -> None:
+        """
+            Archives or removes the daily object with its sidecar files
+        """
+        if self.__archive is not None:
+            target: Path = self.__archive / path.relative_to(self.__repo.root)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(path), str(target))
+        else:
+            path.unlink()
+        for extra in [sidecar_path(path), lock_path(path)]:
+            try:
+                os.unlink(extra)
+            except FileNotFoundError:
+                pass
+
+
+def _filenames(path: Path) -> Set[bytes]:
+    columns: IndexColumns = parse_master_index_bytes(path.read_bytes())
+    return {columns.filename.raw(i) for i in range(len(columns))}
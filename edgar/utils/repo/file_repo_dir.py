@@ -1,31 +1,50 @@
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Iterator, Optional, Sequence
+from bisect import bisect_left, bisect_right, insort
 from pathlib import Path
 import datetime
+import os
 from edgar.utils.repo.repo_fs import RepoDir, RepoObject, RepoEntity, RepoDirVisitor
 from edgar.utils.repo.file_repo_object import FileRepoObject
+from edgar.utils.repo.file_repo_sync import FileSyncer
+from edgar.utils.metrics import metrics
 
 class FileRepoDir(RepoDir):
     """The repo directory for a regular file system
 
+    Children are listed with `os.scandir` on first access, so opening
+    a directory does not walk the tree below it. Their names are kept
+    sorted as entries are added and removed, so ordered traversals do not sort.
+
     Parameters
     ----------
     path : Path
         the physical path to the directory
     parent : RepoDir
         the parent directory
+    listed : bool
+        True if the directory is known to exist because the parent has just listed it.
+        Such a directory is not created and its children are listed on first access
+    syncer : FileSyncer
+        the fsync policy of the root directory. Subdirectories share the syncer of the root
     """
-    def __init__(self, path: Path, parent: RepoDir = None) -> None:
-        self.__path: Path = path.resolve()
+    def __init__(self, path: Path, parent: RepoDir = None, listed: bool = False, syncer: FileSyncer = None) -> None:
+        self.__path: Path = path if parent is not None else path.resolve()
         self.__parent: RepoDir = parent
-        self.__children: Dict[str,RepoEntity] = {}
+        self.__children: Dict[str,RepoEntity] = None
+        self.__names: List[str] = []
+        self.__syncer: FileSyncer = parent.syncer if parent is not None else (syncer if syncer is not None else FileSyncer())
 
         if parent is not None:
             parent[self.__path.name] = self
 
-        self.refresh()
-
-        if not self.__path.exists():
-            self.__path.mkdir()
+        if not listed:
+            try:
+                self.__path.mkdir()
+                if parent is not None:
+                    self.__syncer.sync_dir(parent.path)
+            except FileExistsError:
+                pass
+            self.refresh()
 
     def as_uri(self) -> str:
         return self.__path.as_uri()
@@ -34,33 +53,82 @@ class FileRepoDir(RepoDir):
     def path(self) -> Path:
         return self.__path
 
-    def refresh(self) -> None:
-        if not self.__path.exists():
-            return
+    @property
+    def syncer(self) -> FileSyncer:
+        return self.__syncer
 
-        for dir_item in self.__path.iterdir():
-            if dir_item.name not in self:
-                self[dir_item.name] = FileRepoDir(dir_item, self) if dir_item.is_dir() \
-                    else FileRepoObject(self, dir_item.name)
-            else:
-                if dir_item.is_dir():
-                    self[dir_item.name].refresh()
+    def is_loaded(self) -> bool:
+        """
+            Indicates whether the children have been listed
+        """
+        return self.__children is not None
+
+    def refresh(self) -> None:
+        """
+            Lists the directory again. New entries are added, removed entries are dropped
+            and subdirectories that have been listed before are refreshed
+        """
+        children: Dict[str,RepoEntity] = self.__children if self.__children is not None else {}
+        self.__children = children
+        found: Dict[str,bool] = {}
+
+        metrics.incr('repo_stat_calls_total')
+        try:
+            with os.scandir(self.__path) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        # Dot files are repo metadata such as line index sidecars
+                        continue
+                    found[entry.name] = True
+                    child: RepoEntity = children.get(entry.name)
+                    if child is None:
+                        # DirEntry caches the file type, no extra stat call is needed
+                        if entry.is_dir():
+                            FileRepoDir(self.__path / entry.name, self, listed=True)
+                        else:
+                            FileRepoObject(self, entry.name)
+                    elif isinstance(child, FileRepoDir) and child.is_loaded():
+                        child.refresh()
+        except FileNotFoundError:
+            pass
+
+        for name in [name for name in children if name not in found]:
+            del self[name]
+
+    def __entries(self) -> Dict[str,RepoEntity]:
+        if self.__children is None:
+            self.refresh()
+        return self.__children
 
     def __iter__(self):
-        return iter(self.__children.items())
+        return iter(self.__entries().items())
 
     def __len__(self):
-        return len(self.__children)
+        return len(self.__entries())
 
     def __contains__(self, key):
-        return key in self.__children
+        return key in self.__entries()
 
     def __getitem__(self, key):
-        val = self.__children[key]
+        val = self.__entries()[key]
         return val
 
     def __setitem__(self, key, val):
-        self.__children[key] = val
+        children: Dict[str,RepoEntity] = self.__entries()
+        if key not in children:
+            insort(self.__names, key)
+        children[key] = val
+
+    def __delitem__(self, key):
+        del self.__entries()[key]
+        del self.__names[bisect_left(self.__names, key)]
+
+    def names(self) -> List[str]:
+        """
+            Returns the names of the children in ascending order. The list must not be modified
+        """
+        self.__entries()
+        return self.__names
 
     def exists(self) -> bool:
         return self.__path.exists()
@@ -91,7 +159,7 @@ class FileRepoDir(RepoDir):
         return (datetime.datetime.fromtimestamp(timestamp), file)
 
     def sort(self) -> List[str]:
-        return sorted([name for (name, _) in self], reverse = True) if len(self) > 0 else []
+        return self.names()[::-1]
 
     def get(self, path_list: List[str]) -> RepoEntity:
         cur_ent = self
@@ -102,8 +170,8 @@ class FileRepoDir(RepoDir):
                 return None
         return cur_ent
 
-    def visit(self, visitor: RepoDirVisitor) -> None:
-        for name in self.sort():
+    def visit(self, visitor: RepoDirVisitor) -> bool:
+        for name in reversed(self.names()):
             o: RepoEntity = self[name]
             if isinstance(o, RepoObject):
                 if not visitor.visit(o):
@@ -113,6 +181,40 @@ class FileRepoDir(RepoDir):
                     return False
         return True
 
+    def walk(self, lo: Optional[Sequence[str]] = None, hi: Optional[Sequence[str]] = None) -> Iterator[RepoObject]:
+        """
+            Iterates depth-first over the objects below the directory in ascending
+            order of their paths. Only the subtrees that may hold objects with paths
+            in the range are entered
+
+            Parameters
+            ----------
+            lo: Sequence[str] | None
+                the lowest path relative to the directory, unbounded if None
+            hi: Sequence[str] | None
+                the highest path relative to the directory, inclusive, unbounded if None
+
+            Returns
+            -------
+            Iterator[RepoObject]
+                the objects with lo <= path <= hi, comparing paths by their elements
+        """
+        names: List[str] = self.names()
+        start: int = bisect_left(names, lo[0]) if lo else 0
+        stop: int = bisect_right(names, hi[0]) if hi else len(names)
+
+        # Copy the names in range, the directory may change while the caller iterates
+        for name in names[start:stop]:
+            o: RepoEntity = self.__children.get(name)
+            if o is None:
+                continue
+            if isinstance(o, FileRepoDir):
+                yield from o.walk(lo[1:] if lo and name == lo[0] else None,
+                                  hi[1:] if hi and name == hi[0] else None)
+            elif not (lo and name == lo[0] and len(lo) > 1):
+                # An object is lower than the paths below a directory of the same name
+                yield o
+
     def subpath(self, levels: int) -> List[str]:
         if levels <= 0:
             return []
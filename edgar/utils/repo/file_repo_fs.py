@@ -1,23 +1,65 @@
 """
     File-based document repository
 """
-from typing import Dict, List, Iterator
+from typing import Dict, List, Iterator, Tuple
+from datetime import date
+from dataclasses import dataclass
 from pathlib import Path
-from edgar.utils.repo.repo_fs import RepoObject, RepoFS, RepoEntity, RepoDirVisitor, RepoURI
-from edgar.utils.repo.repo_format import RepoObjectPath, RepoFormat
+import os
+import time
+from edgar.utils.repo.repo_fs import RepoObject, RepoFS, RepoEntity, RepoURI
+from edgar.utils.repo.repo_format import RepoObjectPath, RepoFormat, parse_spec
+from edgar.utils.repo.repo_tree import RepoTree, NO_KEY, pack_key
 from edgar.utils.repo.file_repo_dir import FileRepoDir
+from edgar.utils.repo.file_repo_sync import FileSyncer, FsyncPolicy
+from edgar.utils.repo.file_repo_watcher import FileRepoWatcher, IN_ADDED, IN_REMOVED, IN_Q_OVERFLOW
 from edgar.utils.date.date_utils import Date, DatePeriodType
 from edgar.utils.date.holidays import us_holidays
+from edgar.utils.metrics import metrics
 
+# Marks the daily directory of a quarter whose dailies were folded into the quarterly object
+COMPACTED_MARKER: str = '.compacted'
 
-class FileRepoFS(RepoFS, RepoDirVisitor):
+
+class FileRepoFS(RepoFS):
     """
         The class represents a file-based repository
+
+        The index of objects is a `RepoTree`, i.e. flat arrays keyed by
+        the period type and the date of objects. `RepoObject` handles are
+        only created for objects that are looked up.
+
+        In the watch mode the repository directories are watched with inotify
+        after the first refresh, and later refreshes only apply the reported
+        changes, so other processes changing the repository are seen at almost
+        no cost. Linux only.
+
+        Parameters
+        ----------
+        root: Path
+            the root directory
+        repo_format: RepoFormat
+            the repository format
+        watch: bool
+            whether to keep the index current with inotify
+        fsync: FsyncPolicy
+            when written objects and directories are synced to the storage
+
+        Quarters compacted by `FileRepoCompactor` have a marker in their daily
+        directory and count as complete: their dailies are not reported missing.
     """
-    def __init__(self, root: Path, repo_format: RepoFormat) -> None:
-        self.__root     : FileRepoDir = FileRepoDir(root)
+    def __init__(self, root: Path, repo_format: RepoFormat, watch: bool = False,
+            fsync: FsyncPolicy = FsyncPolicy.NONE) -> None:
+        self.__root     : FileRepoDir = FileRepoDir(root, syncer=FileSyncer(fsync))
         self.__format   : RepoFormat = repo_format
-        self.__index    : Dict[str, RepoObject] = {}
+        self.__tree     : RepoTree = RepoTree()
+        self.__watcher  : FileRepoWatcher = FileRepoWatcher() if watch else None
+        self.__watched  : Dict[int, _ScanDir] = {}
+        self.__scanned  : bool = False
+
+    @property
+    def root(self) -> Path:
+        return self.__root.path
 
     def find_missing(self, from_date: Date, to_date: Date) -> List[str]:
         miss_list: List[str] = []
@@ -44,34 +86,96 @@ class FileRepoFS(RepoFS, RepoDirVisitor):
         """
         self.refresh()
 
-        track_year, track_quarter = 0, 0
+        track_year, track_quarter, seen_quarter = 0, 0, 0
         cur_holidays: us_holidays = None
-        cur_date: Date = from_date.copy()
+        cur_date: Date = from_date
 
-        for _ in range(to_date.diff_days(from_date)):
+        while cur_date <= to_date:
             (cur_year, cur_quarter, *_) = cur_date.tuple()
 
             if cur_year != track_year:
                 # Moving to the first or to the next year
                 cur_holidays = us_holidays(cur_year)
-                track_year, track_quarter = cur_year, 0
+                track_year, track_quarter, seen_quarter = cur_year, 0, 0
+
+            if cur_quarter != seen_quarter:
+                seen_quarter = cur_quarter
+                if self.is_compacted(cur_date):
+                    # The quarterly object holds the dailies of the whole quarter
+                    metrics.incr('repo_compacted_skips_total')
+                    cur_date = cur_date.quarter_dates()[1].add_days(1)
+                    continue
 
             if not (cur_date.is_weekend() or cur_date in cur_holidays):
-                obj_path: RepoObjectPath = RepoObjectPath.from_date(
-                    DatePeriodType.DAY, cur_date, self.__format)
-                if str(obj_path) not in self.__index:
+                if pack_key(DatePeriodType.DAY, cur_date.ordinal()) not in self.__tree:
                     if cur_quarter != track_quarter:
                         # Add a quartely file to the update list
                         # only if it has not been added before
+                        metrics.incr('repo_missing_total', period='Q')
                         yield RepoObjectPath.from_date(
                             DatePeriodType.QUARTER, cur_date, self.__format)
                         track_quarter = cur_quarter
 
                     # Add a daily file to the update list
-                    yield obj_path
+                    metrics.incr('repo_missing_total', period='D')
+                    yield RepoObjectPath.from_date(DatePeriodType.DAY, cur_date, self.__format)
             # next date
             cur_date += 1
 
+    def compacted_path(self, the_date: Date) -> Path:
+        """
+            Returns the path of the compaction marker of the quarter of the date
+
+            Parameters
+            ----------
+            the_date: Date
+                a date of the quarter
+        """
+        (qbeg, _) = the_date.quarter_dates()
+        obj_path: RepoObjectPath = RepoObjectPath.from_date(DatePeriodType.DAY, qbeg, self.__format)
+        return self.__root.path.joinpath(*obj_path[:-1], COMPACTED_MARKER)
+
+    def is_compacted(self, the_date: Date) -> bool:
+        """
+            Tells whether the quarter of the date has been compacted
+        """
+        return self.compacted_path(the_date).exists()
+
+    def objects(self) -> Iterator[RepoObject]:
+        """
+            Iterates over all objects in the repository
+
+            Returns
+            -------
+            Iterator[RepoObject]
+                the objects in the order of their paths
+        """
+        self.refresh()
+        return self.__root.walk()
+
+    def walk(self, period_type: DatePeriodType, from_date: Date, to_date: Date) -> Iterator[RepoObject]:
+        """
+            Iterates over the objects of the period type in date order.
+            Directories outside the date range are not listed
+
+            Parameters
+            ----------
+            period_type: DatePeriodType
+                the period type
+            from_date: Date
+                the start date
+            to_date: Date
+                the end date, inclusive
+
+            Returns
+            -------
+            Iterator[RepoObject]
+                the objects between the dates
+        """
+        lo: RepoObjectPath = RepoObjectPath.from_date(period_type, from_date, self.__format)
+        hi: RepoObjectPath = RepoObjectPath.from_date(period_type, to_date, self.__format)
+        return self.__root.walk(list(lo), list(hi))
+
     def get_object(self, obj_uri: str) -> RepoObject:
         """
             Get a repo object at the given relative path
@@ -86,6 +190,9 @@ class FileRepoFS(RepoFS, RepoDirVisitor):
             RepoObject | None
                 the repo objet at the given path. If no object is found then None is returned
         """
+        if self.__watcher is not None and self.__scanned:
+            self.__sync()
+
         obj_path: RepoObjectPath = RepoObjectPath.from_uri(obj_uri, self.__format)
         cur_ent: RepoEntity = self.__root
         for i in obj_path:
@@ -161,13 +268,259 @@ class FileRepoFS(RepoFS, RepoDirVisitor):
 
     def refresh(self) -> None:
         """
-            Synchronizes the FS with physical data
+            Synchronizes the FS with physical data. In the watch mode
+            only the changes reported since the last call are applied
+        """
+        if self.__watcher is not None and self.__scanned:
+            self.__sync()
+            return
+
+        with metrics.span('repo_refresh_seconds'):
+            self.__root.refresh()
+            self.__tree.clear()
+            self.__scan(str(self.__root.path), RepoTree.ROOT, 0, {})
+            self.__scanned = True
+        metrics.observe('repo_objects', len(self.__tree))
+
+    def flush(self) -> None:
+        """
+            Syncs the directories of objects written since the last flush
+            when the fsync policy is BATCH
         """
-        self.__index.clear()
-        self.__root.refresh()
-        self.__root.visit(self)
+        self.__root.syncer.flush()
 
-    def visit(self, obj: RepoObject) -> bool:
-        obj_path: RepoObjectPath = RepoObjectPath.from_object(obj, self.__format)
-        self.__index[str(obj_path)] = obj
-        return True
+    def close(self) -> None:
+        """
+            Stops watching the repository
+        """
+        if self.__watcher is not None:
+            self.__watcher.close()
+            self.__watcher = None
+            self.__watched.clear()
+            self.__scanned = False
+
+    def __scan(self, dir_path: str, node: int, depth: int, params: Dict[str, str]) -> None:
+        """
+            Adds the entries of the directory to the tree
+
+            Parameters
+            ----------
+            dir_path: str
+                the path to the directory
+            node: int
+                the tree node of the directory
+            depth: int
+                the depth of the directory below the root
+            params: Dict[str, str]
+                the macro values parsed from the path to the directory
+        """
+        path_spec: List[str] = self.__format.path_spec
+        scan_dir: _ScanDir = _ScanDir(dir_path, node, depth, params,
+            self.__name_specs(params) if depth == len(path_spec) else [])
+
+        if self.__watcher is not None:
+            # Watch before listing, so entries added meanwhile are reported
+            scan_dir.wd = self.__watcher.watch(dir_path)
+            scan_dir.mtime_ns = _stable_mtime(dir_path)
+            self.__watched[scan_dir.wd] = scan_dir
+
+        metrics.incr('repo_stat_calls_total')
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if not entry.name.startswith('.'):
+                    self.__add_entry(scan_dir, entry.name, entry.is_dir())
+
+    def __add_entry(self, scan_dir: '_ScanDir', name: str, is_dir: bool) -> None:
+        """
+            Adds the entry of the directory to the tree. Directories are scanned
+        """
+        if is_dir:
+            path_spec: List[str] = self.__format.path_spec
+            dir_params: Dict[str, str] = None
+            if scan_dir.depth < len(path_spec):
+                dir_params = parse_spec(path_spec[scan_dir.depth], name)
+            node: int = self.__tree.add(scan_dir.node, name, True)
+            try:
+                self.__scan(os.path.join(scan_dir.path, name), node,
+                            scan_dir.depth + 1, {**scan_dir.params, **(dir_params or {})})
+            except (FileNotFoundError, NotADirectoryError):
+                # The directory is gone before it could be listed
+                self.__remove_entry(scan_dir, name, True)
+        else:
+            key: int = self.__object_key(name, scan_dir.params, scan_dir.name_specs) \
+                if scan_dir.name_specs else NO_KEY
+            self.__tree.add(scan_dir.node, name, False, key)
+
+    def __find_entry(self, scan_dir: '_ScanDir', name: str, is_dir: bool) -> int:
+        """
+            Returns the tree node of the entry of the directory or -1. Objects
+            are looked up by key, the directory is the fallback when another
+            object has the same key, e.g. a daily filed under the wrong quarter
+        """
+        if not is_dir and scan_dir.name_specs:
+            key: int = self.__object_key(name, scan_dir.params, scan_dir.name_specs)
+            if key != NO_KEY:
+                node: int = self.__tree.find(key)
+                if node >= 0 and self.__tree.parent(node) == scan_dir.node and self.__tree.name(node) == name:
+                    return node
+        return self.__tree.child(scan_dir.node, name)
+
+    def __remove_entry(self, scan_dir: '_ScanDir', name: str, is_dir: bool) -> None:
+        """
+            Removes the entry of the directory from the tree and stops watching removed directories
+        """
+        node: int = self.__find_entry(scan_dir, name, is_dir)
+        if node < 0:
+            return
+        if self.__tree.is_dir(node):
+            path: str = os.path.join(scan_dir.path, name)
+            for (wd, sub_dir) in list(self.__watched.items()):
+                if sub_dir.path == path or sub_dir.path.startswith(path + os.path.sep):
+                    self.__watcher.unwatch(wd)
+                    del self.__watched[wd]
+        self.__tree.remove(node)
+
+    def __sync(self) -> None:
+        """
+            Applies the pending change events to the tree and to the listed directories
+        """
+        touched: Dict[int, _ScanDir] = {}
+        overflow: bool = False
+
+        for event in self.__watcher.events():
+            metrics.incr('repo_watch_events_total')
+            if event.mask & IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            scan_dir: _ScanDir = self.__watched.get(event.wd)
+            if scan_dir is None or not event.name or event.name.startswith('.'):
+                continue
+            if event.mask & IN_REMOVED:
+                self.__remove_entry(scan_dir, event.name, event.is_dir())
+            elif event.mask & IN_ADDED:
+                # Entries added while their directory was being listed are already known
+                if self.__find_entry(scan_dir, event.name, event.is_dir()) < 0:
+                    self.__remove_entry(scan_dir, event.name, not event.is_dir())
+                    self.__add_entry(scan_dir, event.name, event.is_dir())
+            touched[scan_dir.wd] = scan_dir
+
+        if overflow:
+            metrics.incr('repo_watch_overflows_total')
+            for scan_dir in self.__rescan():
+                touched[scan_dir.wd] = scan_dir
+
+        for scan_dir in touched.values():
+            if scan_dir.wd in self.__watched:
+                repo_dir: FileRepoDir = self.__listed_dir(self.__tree.path(scan_dir.node))
+                if repo_dir is not None:
+                    repo_dir.refresh()
+
+    def __rescan(self) -> List['_ScanDir']:
+        """
+            Lists again the watched directories modified since they were scanned.
+            Events are lost when the queue overflows, so the tree is reconciled
+            with the directories that changed
+
+            Returns
+            -------
+            List[_ScanDir]
+                the directories listed again
+        """
+        changed: List[_ScanDir] = []
+        for scan_dir in list(self.__watched.values()):
+            if scan_dir.wd not in self.__watched:
+                # Removed while reconciling its parent
+                continue
+            try:
+                mtime_ns: int = _stable_mtime(scan_dir.path)
+                if mtime_ns == scan_dir.mtime_ns != 0:
+                    continue
+                scan_dir.mtime_ns = mtime_ns
+                with os.scandir(scan_dir.path) as entries:
+                    found: Dict[str, bool] = {e.name: e.is_dir() for e in entries if not e.name.startswith('.')}
+            except FileNotFoundError:
+                # The parent directory has changed too
+                continue
+
+            metrics.incr('repo_rescan_dirs_total')
+            changed.append(scan_dir)
+            known: Dict[str, bool] = {
+                self.__tree.name(node): self.__tree.is_dir(node) for node in self.__tree.children(scan_dir.node)}
+            for (name, is_dir) in known.items():
+                if found.get(name) != is_dir:
+                    self.__remove_entry(scan_dir, name, is_dir)
+            for (name, is_dir) in found.items():
+                if known.get(name) != is_dir:
+                    self.__add_entry(scan_dir, name, is_dir)
+        return changed
+
+    def __listed_dir(self, path_list: List[str]) -> FileRepoDir:
+        """
+            Returns the directory at the path if it and all its parents have been listed
+        """
+        cur_dir: FileRepoDir = self.__root
+        for name in path_list:
+            if not cur_dir.is_loaded() or name not in cur_dir:
+                return None
+            cur_dir = cur_dir[name]
+            if not isinstance(cur_dir, FileRepoDir):
+                return None
+        return cur_dir if cur_dir.is_loaded() else None
+
+    def __name_specs(self, params: Dict[str, str]) -> List[Tuple[DatePeriodType, str]]:
+        """
+            Returns the name specifications of objects in a directory with the given path macros
+        """
+        if 't' in params:
+            period_type: DatePeriodType = DatePeriodType.from_string(params['t'])
+            return [(period_type, self.__format.name_spec[period_type])] \
+                if period_type in self.__format.name_spec else []
+        return list(self.__format.name_spec.items())
+
+    @staticmethod
+    def __object_key(name: str, params: Dict[str, str], name_specs: List[Tuple[DatePeriodType, str]]) -> int:
+        """
+            Returns the packed key of the object with the given name and path macros
+            or NO_KEY if the name does not match the repo format
+        """
+        for (period_type, name_spec) in name_specs:
+            name_params: Dict[str, str] = parse_spec(name_spec, name)
+            if name_params is None:
+                continue
+            p: Dict[str, str] = {**params, **name_params} if name_params else params
+            try:
+                if period_type == DatePeriodType.DAY:
+                    the_date: date = date(int(p['y']), int(p['m']), int(p['d']))
+                else:
+                    the_date: date = date(int(p['y']), int(p['q']) * 3 - 2, 1)
+            except (KeyError, ValueError):
+                continue
+            return pack_key(period_type, the_date.toordinal())
+
+        return NO_KEY
+
+
+RACY_NS: int = 2 * 10**9
+
+
+def _stable_mtime(path: str) -> int:
+    """
+        Returns the modification time of the directory, or 0 if it was modified
+        so recently that a later change may leave the coarse timestamp unchanged
+    """
+    mtime_ns: int = os.stat(path).st_mtime_ns
+    return mtime_ns if time.time_ns() - mtime_ns > RACY_NS else 0
+
+
+@dataclass
+class _ScanDir:
+    """
+        A directory of the repo tree with the state needed to add its entries
+    """
+    path: str
+    node: int
+    depth: int
+    params: Dict[str, str]
+    name_specs: List[Tuple[DatePeriodType, str]]
+    wd: int = -1
+    mtime_ns: int = 0
@@ -0,0 +1,204 @@
+"""
+    Memory-mapped random access to file-backed repo objects
+"""
+from array import array
+from pathlib import Path
+from typing import Optional, Tuple, Union
+import mmap
+import os
+import struct
+
+SIDECAR_SUFFIX: str = '.lix'
+
+
+def sidecar_path(path: Path) -> Path:
+    """
+        Returns the path of the line index persisted for the file. The sidecar
+        is a dot file, so repo directories do not list it as an object
+    """
+    return path.parent / ('.' + path.name + SIDECAR_SUFFIX)
+
+
+class LineIndex:
+    """
+        Byte offsets of the lines of a file. The offsets of line i
+        are [offsets[i], offsets[i + 1]) and include the line terminator
+
+        Parameters
+        ----------
+        offsets: array | memoryview
+            the start offsets of all lines followed by the file size
+    """
+    MAGIC: bytes = b'ELIX'
+    HEADER: struct.Struct = struct.Struct('<4sIQQ')
+
+    def __init__(self, offsets: Union[array, memoryview]) -> None:
+        self.__offsets = offsets
+
+    @staticmethod
+    def build(buffer) -> 'LineIndex':
+        """
+            Builds the line index by scanning the buffer for line feeds
+
+            Parameters
+            ----------
+            buffer
+                the file content, e.g. a memory map
+        """
+        offsets: array = array('Q', [0])
+        size: int = len(buffer)
+        pos: int = buffer.find(b'\n')
+        while pos >= 0:
+            offsets.append(pos + 1)
+            pos = buffer.find(b'\n', pos + 1)
+        if offsets[-1] != size:
+            offsets.append(size)
+        return LineIndex(offsets)
+
+    @staticmethod
+    def load(sidecar: Path, size: int, mtime_ns: int) -> Optional['LineIndex']:
+        """
+            Loads the line index from the sidecar if it was built for a file
+            of the given size and modification time
+
+            Returns
+            -------
+            LineIndex | None
+                the line index mapped from the sidecar, or None if the sidecar is
+                missing, unreadable, truncated or stale
+        """
+        try:
+            with sidecar.open('rb') as f:
+                buffer: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        offsets: memoryview = None
+        try:
+            (magic, _, file_size, file_mtime) = LineIndex.HEADER.unpack_from(buffer, 0)
+            if magic == LineIndex.MAGIC and file_size == size and file_mtime == mtime_ns:
+                offsets = memoryview(buffer)[LineIndex.HEADER.size:].cast('Q')
+                # A complete index ends with the file size
+                if len(offsets) and offsets[-1] == size:
+                    return LineIndex(offsets)
+        except (struct.error, TypeError):
+            pass
+        if offsets is not None:
+            offsets.release()
+        buffer.close()
+        return None
+
+    def save(self, sidecar: Path, size: int, mtime_ns: int) -> None:
+        """
+            Persists the line index atomically. Nothing is persisted if the
+            directory is not writable
+        """
+        import tempfile
+        try:
+            (handle, temp) = tempfile.mkstemp(prefix=sidecar.name, dir=sidecar.parent)
+        except OSError:
+            # A read-only repo keeps building the index in memory
+            return
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, 1, size, mtime_ns))
+                f.write(memoryview(self.__offsets).cast('B'))
+            os.replace(temp, sidecar)
+        except OSError:
+            os.unlink(temp)
+
+    def span(self, start: int, stop: int) -> Tuple[int, int]:
+        """
+            Returns the byte range of lines [start, stop)
+        """
+        (start, stop, _) = slice(start, stop).indices(len(self))
+        stop = max(start, stop)
+        return (self.__offsets[start], self.__offsets[stop])
+
+    def __len__(self) -> int:
+        return len(self.__offsets) - 1
+
+
+class FileRepoMap:
+    """
+        A read-only memory map of a repo file with random access by line number
+        or byte range. Slices are memoryviews of the mapped pages, so nothing
+        is copied and processes reading the same file share the page cache.
+
+        Views returned by the map must be released before the map is closed.
+
+        Parameters
+        ----------
+        path: Path
+            the path to the file
+        persist: bool
+            whether to persist the line index next to the file
+    """
+    def __init__(self, path: Path, persist: bool = True) -> None:
+        self.__path: Path = path
+        self.__persist: bool = persist
+        self.__index: LineIndex = None
+
+        with path.open('rb') as f:
+            stat: os.stat_result = os.fstat(f.fileno())
+            self.__stat: Tuple[int, int] = (stat.st_size, stat.st_mtime_ns)
+            self.__map: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) \
+                if stat.st_size > 0 else None
+        self.__view: memoryview = memoryview(self.__map) if self.__map else memoryview(b'')
+
+    def __enter__(self) -> 'FileRepoMap':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.__index = None
+        self.__view.release()
+        if self.__map:
+            self.__map.close()
+
+    @property
+    def line_index(self) -> LineIndex:
+        """
+            The line index. It is loaded from the sidecar or built on first use
+        """
+        if self.__index is None:
+            sidecar: Path = sidecar_path(self.__path)
+            self.__index = LineIndex.load(sidecar, *self.__stat)
+            if self.__index is None:
+                self.__index = LineIndex.build(self.__map if self.__map else b'')
+                if self.__persist:
+                    self.__index.save(sidecar, *self.__stat)
+        return self.__index
+
+    def __len__(self) -> int:
+        """
+            Returns the number of lines
+        """
+        return len(self.line_index)
+
+    def size(self) -> int:
+        return self.__stat[0]
+
+    def line(self, i: int) -> memoryview:
+        """
+            Returns the line i including the line terminator
+        """
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('line index out of range')
+        return self.lines(i, i + 1)
+
+    def lines(self, start: int, stop: int) -> memoryview:
+        """
+            Returns lines [start, stop) as one contiguous view
+        """
+        return self.byte_range(*self.line_index.span(start, stop))
+
+    def byte_range(self, start: int, stop: int) -> memoryview:
+        """
+            Returns bytes [start, stop) of the file
+        """
+        return self.__view[start:stop]
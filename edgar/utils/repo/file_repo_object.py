@@ -1,13 +1,32 @@
 from edgar.utils.repo.repo_fs import RepoObject, RepoDir
+from edgar.utils.repo.file_repo_map import FileRepoMap
+from edgar.utils.repo.file_repo_sync import FileSyncer, object_lock
 from pathlib import Path
-from urllib.parse import urlparse
-from typing import Iterator, List
+from typing import Iterator, List, Tuple
+import errno
 import os
+import secrets
+
+# Link errors of file systems without hard links
+NO_LINK_ERRNOS = (errno.EPERM, errno.EOPNOTSUPP, errno.ENOSYS, errno.EXDEV)
+
+
+def _create_temp(path: Path) -> Tuple[int, str]:
+    """
+        Creates a unique temporary file next to the object. Unlike `tempfile.mkstemp`
+        the file gets the mode open would give the object, 0o666 less the umask
+    """
+    while True:
+        temp: str = str(path.parent / '.{0}.{1}.tmp'.format(path.name, secrets.token_hex(4)))
+        try:
+            return (os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_CLOEXEC, 0o666), temp)
+        except FileExistsError:
+            continue
 
 
 class FileRepoObject(RepoObject):
     def __init__(self, parent: RepoDir, obj_name: str) -> None:
-        self.__path   : Path = Path(urlparse(parent.as_uri()).path) / obj_name
+        self.__path   : Path = parent.path / obj_name
         self.__parent : RepoDir = parent
         parent[obj_name] = self
 
@@ -22,19 +41,73 @@ class FileRepoObject(RepoObject):
                     break
                 yield chunk
 
+    def map(self, persist: bool = True) -> FileRepoMap:
+        """
+            Maps the object into memory for random access by line number or byte range
+
+            Parameters
+            ----------
+            persist: bool
+                whether to persist the line index in a sidecar file
+
+            Returns
+            -------
+            FileRepoMap
+                the read-only map of the object
+        """
+        return FileRepoMap(self.__path, persist)
+
     def out(self, iter: Iterator[str], override: bool = False) -> None:
-        file: Path = self.__path if not override else self.__path.with_suffix('.new')
-        
-        open_flags = (os.O_CREAT | os.O_EXCL | os.O_RDWR)
-        open_mode  = 0o644
-
-        handle = os.open(file, open_flags, open_mode)
-        with os.fdopen(handle, "w") as f:
-            for bytes in iter:
-                f.write(bytes)
-
-        if override:
-            file.rename(self.__path)
+        """
+            Writes the object. The content is written to a unique temporary file
+            in the same directory that is renamed into place once complete, while
+            an advisory lock of the object is held. Readers never see a partial
+            object, and concurrent writers in other processes do not clobber each other
+
+            Parameters
+            ----------
+            iter: Iterator[str]
+                the content, either text or bytes chunks
+            override: bool
+                whether to replace an existing object
+
+            Raises
+            ------
+            FileExistsError
+                if the object exists and override is False
+        """
+        syncer: FileSyncer = self.__parent.syncer
+        with object_lock(self.__path):
+            if not override and self.__path.exists():
+                raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), str(self.__path))
+
+            (handle, temp) = _create_temp(self.__path)
+            try:
+                with os.fdopen(handle, "wb") as f:
+                    for chunk in iter:
+                        # HTTP objects stream bytes, file objects stream text
+                        f.write(chunk.encode() if isinstance(chunk, str) else chunk)
+                    f.flush()
+                    syncer.sync_file(f.fileno())
+
+                if override:
+                    os.replace(temp, self.__path)
+                else:
+                    try:
+                        # Fails if an object has been created by a writer that does not lock
+                        os.link(temp, self.__path)
+                        os.unlink(temp)
+                    except OSError as err:
+                        if err.errno not in NO_LINK_ERRNOS:
+                            raise
+                        # Without hard links only writers that lock are kept from clobbering
+                        os.replace(temp, self.__path)
+            except BaseException:
+                if os.path.exists(temp):
+                    os.unlink(temp)
+                raise
+
+        syncer.sync_dir(self.__path.parent)
 
     def subpath(self, levels: int) -> List[str]:
         p: List[str] = self.__parent.subpath(levels - 1) if levels > 1 else []
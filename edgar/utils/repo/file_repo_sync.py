@@ -0,0 +1,165 @@
+"""
+    Durability and locking for file-based repo writes
+"""
+from contextlib import contextmanager
+from enum import Enum
+from pathlib import Path
+from typing import Iterator, Set
+import os
+import threading
+
+
+class FsyncPolicy(Enum):
+    """
+        When written data is flushed to the storage
+
+        NONE    neither objects nor directories are synced
+        FILE    objects are synced before they are renamed into place
+        ALWAYS  objects and their directories are synced on every write
+        BATCH   objects are synced on every write, directories once per
+                directory when the repository is flushed
+    """
+    NONE = 0
+    FILE = 1
+    ALWAYS = 2
+    BATCH = 3
+
+
+class FileSyncer:
+    """
+        Applies the fsync policy. One syncer is shared by all directories of a repository
+
+        Parameters
+        ----------
+        policy: FsyncPolicy
+            the fsync policy
+    """
+    def __init__(self, policy: FsyncPolicy = FsyncPolicy.NONE) -> None:
+        self.__policy: FsyncPolicy = policy
+        self.__pending: Set[str] = set()
+        self.__lock: threading.Lock = threading.Lock()
+
+    @property
+    def policy(self) -> FsyncPolicy:
+        return self.__policy
+
+    def sync_file(self, fd: int) -> None:
+        """
+            Syncs the content of an object before it is renamed into place
+        """
+        if self.__policy != FsyncPolicy.NONE:
+            os.fsync(fd)
+
+    def sync_dir(self, path: Path) -> None:
+        """
+            Syncs the directory after an entry has been added, or defers it to `flush`
+        """
+        if self.__policy == FsyncPolicy.ALWAYS:
+            fsync_dir(str(path))
+        elif self.__policy == FsyncPolicy.BATCH:
+            with self.__lock:
+                self.__pending.add(str(path))
+
+    def flush(self) -> None:
+        """
+            Syncs the directories deferred by the BATCH policy
+        """
+        with self.__lock:
+            (pending, self.__pending) = (self.__pending, set())
+        for path in sorted(pending, key=len, reverse=True):
+            # Deeper directories first, so a new directory is synced before its parent
+            try:
+                fsync_dir(path)
+            except FileNotFoundError:
+                pass
+
+    def __len__(self) -> int:
+        """
+            Returns the number of directories waiting for `flush`
+        """
+        return len(self.__pending)
+
+
+def fsync_dir(path: str) -> None:
+    fd: int = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def lock_path(path: Path) -> Path:
+    """
+        Returns the path of the lock file of the object. The lock file is a dot file,
+        so repo directories do not list it as an object
+    """
+    return path.parent / ('.' + path.name + '.lock')
+
+
+@contextmanager
+def object_lock(path: Path) -> Iterator[None]:
+    """
+        Holds an exclusive advisory lock of the object while writers in
+        other processes or threads that use the lock wait. The lock file
+        is removed on release, so objects do not leave lock files behind
+
+        Parameters
+        ----------
+        path: Path
+            the path to the object
+    """
+    import fcntl
+    lock: Path = lock_path(path)
+    while True:
+        fd: int = os.open(lock, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o666)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            # The lock file may have been removed by the previous holder while
+            # this writer was waiting, then the lock is taken on the new file
+            if os.stat(lock).st_ino == os.fstat(fd).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        os.close(fd)
+    try:
+        yield
+    finally:
+        # Removed while held, so waiting writers retry on a new lock file
+        try:
+            os.unlink(lock)
+        except FileNotFoundError:
+            pass
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+def remove_lock(path: Path) -> bool:
+    """
+        Removes the lock file of the object unless a writer holds it, e.g. a
+        lock file left behind by a process that died
+
+        Returns
+        -------
+        bool
+            whether the lock file was removed
+    """
+    import fcntl
+    lock: Path = lock_path(path)
+    try:
+        fd: int = os.open(lock, os.O_RDWR | os.O_CLOEXEC)
+    except FileNotFoundError:
+        return False
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        # Removed under the lock, like `object_lock` does on release
+        if os.stat(lock).st_ino != os.fstat(fd).st_ino:
+            return False
+        os.unlink(lock)
+        return True
+    except FileNotFoundError:
+        return False
+    finally:
+        os.close(fd)
@@ -0,0 +1,149 @@
+"""
+    Change notifications for file-based repositories
+
+    The watcher is a thin ctypes binding of Linux inotify. Events are not
+    delivered by a background thread: the owner drains the non-blocking
+    descriptor with `events()` right before it needs a current view.
+"""
+from typing import Dict, Iterator, NamedTuple
+import ctypes
+import errno
+import os
+import struct
+
+IN_MOVED_FROM: int = 0x00000040
+IN_MOVED_TO: int = 0x00000080
+IN_CREATE: int = 0x00000100
+IN_DELETE: int = 0x00000200
+IN_Q_OVERFLOW: int = 0x00004000
+IN_IGNORED: int = 0x00008000
+IN_ONLYDIR: int = 0x01000000
+IN_DONT_FOLLOW: int = 0x02000000
+IN_ISDIR: int = 0x40000000
+
+IN_NONBLOCK: int = os.O_NONBLOCK
+IN_CLOEXEC: int = 0o2000000
+
+IN_ADDED: int = IN_CREATE | IN_MOVED_TO
+IN_REMOVED: int = IN_DELETE | IN_MOVED_FROM
+
+WATCH_MASK: int = IN_ADDED | IN_REMOVED | IN_ONLYDIR | IN_DONT_FOLLOW
+
+EVENT: struct.Struct = struct.Struct('iIII')
+BUFFER_SIZE: int = 65536
+
+
+class WatchEvent(NamedTuple):
+    """
+        An inotify event. The name is empty for events of the watched directory itself
+        and wd is -1 for IN_Q_OVERFLOW
+    """
+    wd: int
+    mask: int
+    cookie: int
+    name: str
+
+    def is_dir(self) -> bool:
+        return self.mask & IN_ISDIR != 0
+
+
+def _libc() -> ctypes.CDLL:
+    libc: ctypes.CDLL = ctypes.CDLL(None, use_errno=True)
+    if not hasattr(libc, 'inotify_init1'):
+        raise OSError(errno.ENOSYS, 'inotify is not supported on this platform')
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+class FileRepoWatcher:
+    """
+        Watches directories for entries being created, deleted or renamed
+
+        Parameters
+        ----------
+        mask: int
+            the events to subscribe to
+
+        Raises
+        ------
+        OSError
+            if inotify is not available
+    """
+    def __init__(self, mask: int = WATCH_MASK) -> None:
+        self.__libc: ctypes.CDLL = _libc()
+        self.__mask: int = mask
+        self.__fd: int = self.__libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.__fd < 0:
+            self.__raise()
+        self.__paths: Dict[int, str] = {}
+
+    def __raise(self, path: str = None) -> None:
+        err: int = ctypes.get_errno()
+        raise OSError(err, os.strerror(err), path)
+
+    def __enter__(self) -> 'FileRepoWatcher':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if getattr(self, '_FileRepoWatcher__fd', -1) >= 0:
+            os.close(self.__fd)
+            self.__fd = -1
+            self.__paths.clear()
+
+    def fileno(self) -> int:
+        return self.__fd
+
+    def watch(self, path: str) -> int:
+        """
+            Starts watching the directory
+
+            Returns
+            -------
+            int
+                the watch descriptor. Events of the directory carry it
+        """
+        wd: int = self.__libc.inotify_add_watch(self.__fd, os.fsencode(path), self.__mask)
+        if wd < 0:
+            self.__raise(path)
+        self.__paths[wd] = path
+        return wd
+
+    def unwatch(self, wd: int) -> None:
+        """
+            Stops watching the directory. Watches of deleted directories
+            are dropped by the kernel, so the call never fails
+        """
+        if self.__paths.pop(wd, None) is not None:
+            self.__libc.inotify_rm_watch(self.__fd, wd)
+
+    def path(self, wd: int) -> str:
+        return self.__paths.get(wd)
+
+    def __len__(self) -> int:
+        return len(self.__paths)
+
+    def events(self) -> Iterator[WatchEvent]:
+        """
+            Reads the pending events without blocking
+        """
+        while True:
+            try:
+                buffer: bytes = os.read(self.__fd, BUFFER_SIZE)
+            except BlockingIOError:
+                return
+            pos: int = 0
+            while pos < len(buffer):
+                (wd, mask, cookie, size) = EVENT.unpack_from(buffer, pos)
+                pos += EVENT.size
+                name: str = os.fsdecode(buffer[pos:pos + size].rstrip(b'\0'))
+                pos += size
+                if mask & IN_IGNORED:
+                    self.__paths.pop(wd, None)
+                yield WatchEvent(wd, mask, cookie, name)
@@ -1,25 +1,41 @@
 from pathlib import Path
 from typing import Dict, Iterator
 from urllib.parse import urljoin
-import requests
+import time
+from edgar.utils.metrics import metrics
 
-def static_init(cls):
-    if getattr(cls, "static_init", None):
-        cls.static_init()
-    return cls
-
-@static_init
 class HttpClient(object):
-    http_headers: Dict[str,str] = {}
+    """
+        HTTP client that streams responses.
+
+        `requests` is imported and the HTTP headers are loaded from
+        `properties/http.properties` on the first request, not on import
 
-    def __init__(self, base_url: str = "") -> None:
+        Parameters
+        ----------
+        base_url: str
+            the URL relative locations are resolved against
+        session: requests.Session
+            the session, e.g. created by `new_session`, to reuse pooled
+            connections. Every request opens a new connection without it
+    """
+    http_headers: Dict[str,str] = None
+
+    def __init__(self, base_url: str = "", session = None) -> None:
         self.__base_url = base_url
+        self.__session = session
         self.__response = None
         super().__init__()
 
+    @classmethod
+    def headers(cls) -> Dict[str,str]:
+        if cls.http_headers is None:
+            cls.static_init()
+        return cls.http_headers
+
     @classmethod
     def static_init(cls):
-        headers = getattr(cls, 'http_headers')
+        headers: Dict[str,str] = {}
         filename = Path(__file__).parent / 'properties' / 'http.properties'
         with open(filename, "rt") as f:
             for line in f:
@@ -27,19 +43,30 @@ class HttpClient(object):
                 if prop and not prop.startswith('#'):
                     a = prop.split('=')
                     headers[a[0].strip()] = '='.join(a[1:]).strip().strip('"') 
+        cls.http_headers = headers
 
     def get(self, loc: str) -> int:
+        import requests
         url = urljoin(self.__base_url, loc)
-        self.__response = requests.get(url, headers=HttpClient.http_headers, stream=True)
+        start: float = time.perf_counter()
+        self.__response = (self.__session or requests).get(url, headers=HttpClient.headers(), stream=True)
+        # With stream=True the call returns once the headers are received
+        metrics.observe('http_ttfb_seconds', time.perf_counter() - start, method='GET')
+        metrics.incr('http_requests_total', method='GET', status=self.__response.status_code)
         return self.__response.status_code
 
     def head(self, loc: str) -> int:
+        import requests
         url = urljoin(self.__base_url, loc)
-        self.__response = requests.head(url, headers=HttpClient.http_headers)
+        start: float = time.perf_counter()
+        self.__response = (self.__session or requests).head(url, headers=HttpClient.headers())
+        metrics.observe('http_ttfb_seconds', time.perf_counter() - start, method='HEAD')
+        metrics.incr('http_requests_total', method='HEAD', status=self.__response.status_code)
         return self.__response.status_code
 
     def inp(self, bufsize: int = 2048) -> Iterator:
-        for chunk in self.__response.iter_content(bufsize):
+        chunks = self.__response.iter_content(bufsize)
+        for chunk in metrics.timed_iter(metrics.counted_iter(chunks, 'http_bytes'), 'http_transfer_seconds'):
             yield chunk
 
         self.close()
@@ -47,4 +74,22 @@ class HttpClient(object):
     def close(self) -> None:
         if self.__response is not None:
             self.__response.close()
-            self.__response = None
\ No newline at end of file
+            self.__response = None
+
+
+def new_session(pool_size: int = 10):
+    """
+        Creates a session that keeps up to `pool_size` connections per host open,
+        e.g. one per thread sharing the session
+
+        Returns
+        -------
+        requests.Session
+            the session
+    """
+    import requests
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
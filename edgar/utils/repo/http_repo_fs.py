@@ -1,31 +1,161 @@
-from edgar.utils.repo.repo_fs import RepoFS, RepoObject
+from edgar.utils.repo.repo_fs import RepoFS, RepoObject, RepoURI
 from edgar.utils.repo.http_repo_dir import HttpRepoDir
-from edgar.utils.repo.http_repo_object import HttpRepoObject
+from edgar.utils.repo.http_repo_object import CompressedHttpRepoObject, HttpRepoObject
+from edgar.utils.repo.http_repo_listing import RemoteEntry, LISTING_NAME, parse_listing
+from edgar.utils.repo.http_client import HttpClient
 from edgar.utils.date.date_utils import DatePeriodType, Date
-from edgar.utils.repo.repo_format import RepoFormatter
+from edgar.utils.date.holidays import us_holidays
+from edgar.utils.repo.repo_format import RepoFormatter, RepoObjectPath
 from edgar.utils.repo.http_tools import make_url
-from typing import List, Iterator
+from edgar.utils.metrics import metrics
+from typing import Dict, List, Iterator, Optional
 
 class HttpRepoFS(RepoFS):
+    """
+        The repository published over HTTP, e.g. the EDGAR archive
+
+        What exists remotely is learned from the `index.json` listings of the
+        quarter directories. A listing is fetched once and cached until `refresh`,
+        so the objects of a whole quarter resolve in one request.
+
+        When the repo format has compressed variants (see `RepoFormat.compressed_spec`)
+        objects are downloaded as the variant listed next to them, which cuts the
+        transfer several-fold, and as the plain object otherwise. Variants are
+        inflated as they stream, so sinks store plain objects.
+
+        Parameters
+        ----------
+        base_url: str
+            the URL of the repository root
+        formatter: RepoFormatter
+            the formatter of object paths
+    """
     def __init__(self, base_url: str, formatter: RepoFormatter) -> None:
         self.__formatter = formatter
         self.__root = HttpRepoDir(base_url)
+        self.__listings: Dict[str, Dict[str, RemoteEntry]] = {}
+
+    def iterate_missing(self, from_date: Date, to_date: Date) -> Iterator[RepoURI]:
+        """
+            Identifies the objects for business days between the dates that are
+            not published, i.e. missing from the listings of their directories
+
+            Parameters
+            ----------
+            from_date: Date
+                the start date
+            to_date: Date
+                the end date
 
-    def iterate_missing(self, from_date: Date, to_date: Date) -> Iterator:
-        yield from ()
+            Returns
+            -------
+            Iterator[RepoURI]
+                the missing objects
+        """
+        track_year, track_quarter = 0, 0
+        cur_holidays: us_holidays = None
+        cur_date: Date = from_date.copy()
+
+        for _ in range(to_date.diff_days(from_date)):
+            (cur_year, cur_quarter, *_) = cur_date.tuple()
+
+            if cur_year != track_year:
+                cur_holidays = us_holidays(cur_year)
+                track_year, track_quarter = cur_year, 0
+
+            if not (cur_date.is_weekend() or cur_date in cur_holidays):
+                if cur_quarter != track_quarter:
+                    track_quarter = cur_quarter
+                    if not self.exists(DatePeriodType.QUARTER, cur_date):
+                        yield self.__path(DatePeriodType.QUARTER, cur_date.copy())
+
+                if not self.exists(DatePeriodType.DAY, cur_date):
+                    yield self.__path(DatePeriodType.DAY, cur_date.copy())
+            cur_date += 1
 
     def find_missing(self, from_date: Date, to_date: Date) -> List[str]:
-        return []
+        return [str(path) for path in self.iterate_missing(from_date, to_date)]
+
+    def __path(self, period_type: DatePeriodType, the_date: Date) -> RepoObjectPath:
+        return RepoObjectPath(self.__formatter.repo_format,
+            list=self.__formatter.format(period_type, the_date), period_type=period_type, date=the_date)
+
+    def listing(self, period_type: DatePeriodType, the_date: Date) -> Dict[str, RemoteEntry]:
+        """
+            Returns the listing of the directory holding the object for the date
+
+            Parameters
+            ----------
+            period_type: DatePeriodType
+                the date period type
+            the_date: Date
+                the date
+
+            Returns
+            -------
+            Dict[str, RemoteEntry]
+                the entries of the directory by name. The listing of a directory
+                that does not exist is empty
+
+            Raises
+            ------
+            OSError
+                if the listing cannot be fetched, e.g. the server is unavailable.
+                Such failures are not cached, the next call fetches again
+        """
+        path: List[str] = self.__formatter.format(period_type, the_date)
+        dir_url: str = make_url(self.__root.as_uri(), '/'.join(path[:-1]) + '/')
+
+        listing: Dict[str, RemoteEntry] = self.__listings.get(dir_url)
+        if listing is None:
+            client: HttpClient = HttpClient()
+            listing_url: str = make_url(dir_url, LISTING_NAME)
+            status_code: int = client.get(listing_url)
+            try:
+                metrics.incr('http_listings_total', status=status_code)
+                if status_code == 200:
+                    listing = parse_listing(client.inp(65536))
+                elif status_code == 404:
+                    listing = {}
+                else:
+                    raise OSError('{0}: HTTP status {1}'.format(listing_url, status_code))
+            finally:
+                client.close()
+            self.__listings[dir_url] = listing
+        return listing
+
+    def stat(self, period_type: DatePeriodType, the_date: Date) -> Optional[RemoteEntry]:
+        """
+            Returns the size and the modification time of the object for the date
+            as listed remotely, or None if the object is not published
+        """
+        return self.listing(period_type, the_date).get(self.__formatter.format(period_type, the_date)[-1])
+
+    def exists(self, period_type: DatePeriodType, the_date: Date) -> bool:
+        return self.stat(period_type, the_date) is not None
 
     def find(self, period_type: DatePeriodType, the_date: Date) -> RepoObject:
         path: List[str] = self.__formatter.format(period_type, the_date)
         dir: HttpRepoDir = self.__root
         for i in path[:-1]:
             dir = HttpRepoDir(make_url(dir.as_uri(), i), dir)
+
+        variant: Optional[str] = self.__formatter.compressed_name(period_type, the_date)
+        if variant is not None:
+            try:
+                listing: Dict[str, RemoteEntry] = self.listing(period_type, the_date)
+            except OSError:
+                listing = {}
+            # Without a listing the variant is tried and the plain object is the fallback
+            if variant in listing or not listing:
+                return CompressedHttpRepoObject(dir, path[-1], variant)
         return HttpRepoObject(dir, path[-1])
 
     def create(self, period_type: DatePeriodType, the_date: Date) -> RepoObject:
         return self.find(period_type, the_date)
 
     def refresh(self) -> None:
-        pass
\ No newline at end of file
+        """
+            Drops the cached listings
+        """
+        self.__listings.clear()
@@ -0,0 +1,71 @@
+"""
+    Directory listings published by EDGAR
+
+    Every directory of the EDGAR archive has an `index.json` listing of its entries:
+
+    >>> {"directory": {"name": "daily-index/2021/QTR1/", "item": [
+    ...     {"name": "master20210104.idx", "type": "file", "size": "62 KB",
+    ...      "last-modified": "01/04/2021 10:00:38 PM", "href": "master20210104.idx"}]}}
+"""
+from datetime import datetime
+from typing import Dict, Iterable, NamedTuple, Optional, Union
+import json
+
+LISTING_NAME: str = 'index.json'
+
+SIZE_UNITS: Dict[str, int] = {'B': 1, 'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30}
+
+
+class RemoteEntry(NamedTuple):
+    """
+        An entry of a remote directory. Sizes are rounded by EDGAR to the unit shown
+    """
+    name: str
+    size: int
+    last_modified: Optional[datetime]
+    is_dir: bool
+
+
+def parse_size(text: str) -> int:
+    """
+        Parses sizes such as '62 KB' or '1024' into bytes
+    """
+    parts = str(text).split()
+    try:
+        value: float = float(parts[0]) if parts else 0
+    except ValueError:
+        return 0
+    return int(value * SIZE_UNITS.get(parts[1].upper(), 1)) if len(parts) > 1 else int(value)
+
+
+def parse_time(text: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(text, '%m/%d/%Y %I:%M:%S %p')
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_listing(chunks: Iterable[Union[bytes, str]]) -> Dict[str, RemoteEntry]:
+    """
+        Parses an `index.json` listing
+
+        Parameters
+        ----------
+        chunks: Iterable[bytes | str]
+            the content of the listing, e.g. as streamed by `HttpClient.inp`
+
+        Returns
+        -------
+        Dict[str, RemoteEntry]
+            the entries by name
+    """
+    content: bytes = b''.join(c.encode() if isinstance(c, str) else c for c in chunks)
+    items = json.loads(content).get('directory', {}).get('item', [])
+    return {
+        item['name']: RemoteEntry(
+            item['name'],
+            parse_size(item.get('size', 0)),
+            parse_time(item.get('last-modified')),
+            item.get('type') == 'dir')
+        for item in items if 'name' in item
+    }
@@ -1,7 +1,9 @@
 from edgar.utils.repo.repo_fs import RepoObject, RepoDir
 from edgar.utils.repo.http_client import HttpClient
 from edgar.utils.repo.http_tools import make_url
-from typing import List, Iterator
+from edgar.utils.repo.repo_stage import DecompressStage
+from edgar.utils.metrics import metrics
+from typing import List, Iterator, Optional
 
 class HttpRepoObject(RepoObject):
 
@@ -31,4 +33,42 @@ class HttpRepoObject(RepoObject):
         client.close()
 
     def out(self, iter: Iterator[str], override: bool = False) -> None:
-        pass
\ No newline at end of file
+        pass
+
+
+class CompressedHttpRepoObject(HttpRepoObject):
+    """
+        The object downloaded as its compressed variant, e.g. `master.gz`
+        for `master.idx`. The variant is inflated as it streams, so readers
+        see the plain object. The plain object is downloaded when the variant
+        is not served
+
+        Parameters
+        ----------
+        parent: RepoDir
+            the directory of the object
+        obj_name: str
+            the name of the plain object
+        variant_name: str
+            the name of the gzip or zlib compressed variant, None if it is known
+            not to be served
+    """
+    def __init__(self, parent: RepoDir, obj_name: str, variant_name: str) -> None:
+        super().__init__(parent, obj_name)
+        self.__variant_url: Optional[str] = make_url(parent.as_uri(), variant_name) if variant_name else None
+
+    @property
+    def variant_uri(self) -> Optional[str]:
+        return self.__variant_url
+
+    def inp(self, bufsize: int = 2048) -> Iterator[bytes]:
+        client: HttpClient = HttpClient()
+        status_code: int = client.get(self.__variant_url) if self.__variant_url is not None else 404
+        if status_code == 200:
+            metrics.incr('http_variant_total', result='compressed')
+            yield from DecompressStage().process(client.inp(bufsize=bufsize), self.__variant_url)
+        else:
+            client.close()
+            metrics.incr('http_variant_total', result='plain')
+            yield from super().inp(bufsize)
+        client.close()
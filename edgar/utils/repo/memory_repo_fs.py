@@ -0,0 +1,191 @@
+"""
+    In-process repository of object bytes with a memory budget
+"""
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+import threading
+import time
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.metrics import metrics
+from edgar.utils.repo.cache_repo_fs import DEFAULT_MAX_AGE, expiry
+from edgar.utils.repo.repo_format import RepoFormatter
+from edgar.utils.repo.repo_fs import RepoFS, RepoObject, RepoURI
+
+
+class MemoryEntry(NamedTuple):
+    """
+        An object held in memory. `expires` is the timestamp it goes stale at,
+        None if it never does, and is set when the object is kept
+    """
+    period_type: DatePeriodType
+    date: Date
+    data: bytes
+    expires: Optional[float] = None
+
+
+class MemoryRepoFS(RepoFS):
+    """
+        The repository that keeps object bytes in memory. The least recently
+        used objects are evicted once the budget is exceeded, and objects that
+        are rebuilt remotely, e.g. the quarterly object of the current quarter,
+        are dropped once they go stale
+
+        Parameters
+        ----------
+        formatter: RepoFormatter
+            the formatter of object paths, i.e. keys
+        max_bytes: int
+            the memory budget. Larger objects are not kept
+        on_evict: Callable[[MemoryEntry], None]
+            called with every evicted object, e.g. to demote it to a slower repository
+        max_age: Dict[DatePeriodType, Optional[float]]
+            the seconds an object stays fresh by period type, see `CacheRepoFS`
+        clock: Callable[[], float]
+            returns the current timestamp in seconds
+    """
+    def __init__(self, formatter: RepoFormatter, max_bytes: int = 256 << 20,
+            on_evict: Callable[[MemoryEntry], None] = None,
+            max_age: Dict[DatePeriodType, Optional[float]] = None,
+            clock: Callable[[], float] = time.time) -> None:
+        self.__formatter: RepoFormatter = formatter
+        self.__max_bytes: int = max_bytes
+        self.__max_age: Dict[DatePeriodType, Optional[float]] = {**DEFAULT_MAX_AGE, **(max_age or {})}
+        self.__clock: Callable[[], float] = clock
+        self.__lock: threading.Lock = threading.Lock()
+        self.__objects: 'OrderedDict[str, MemoryEntry]' = OrderedDict()
+        self.__size: int = 0
+        self.on_evict: Callable[[MemoryEntry], None] = on_evict
+
+    def __len__(self) -> int:
+        return len(self.__objects)
+
+    def __contains__(self, key: str) -> bool:
+        entry: MemoryEntry = self.__objects.get(key)
+        return entry is not None and self.is_fresh(entry)
+
+    def is_fresh(self, entry: MemoryEntry) -> bool:
+        return entry.expires is None or self.__clock() < entry.expires
+
+    @property
+    def size(self) -> int:
+        """
+            Returns the bytes held
+        """
+        return self.__size
+
+    @property
+    def max_bytes(self) -> int:
+        return self.__max_bytes
+
+    def key(self, period_type: DatePeriodType, the_date: Date) -> str:
+        return '/'.join(self.__formatter.format(period_type, the_date))
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+            Returns the object bytes and marks the object most recently used.
+            A stale object is dropped and None is returned
+        """
+        with self.__lock:
+            entry: MemoryEntry = self.__objects.get(key)
+            if entry is None:
+                return None
+            if not self.is_fresh(entry):
+                del self.__objects[key]
+                self.__size -= len(entry.data)
+                metrics.incr('memory_expirations_total')
+                return None
+            self.__objects.move_to_end(key)
+            return entry.data
+
+    def put(self, key: str, entry: MemoryEntry) -> bool:
+        """
+            Keeps the object, evicting the least recently used ones beyond the budget
+
+            Returns
+            -------
+            bool
+                False if the object does not fit into the budget
+        """
+        if len(entry.data) > self.__max_bytes:
+            return False
+        entry = entry._replace(expires=expiry(entry.period_type, entry.date, self.__clock(), self.__max_age))
+        evicted: List[MemoryEntry] = []
+        with self.__lock:
+            prev: MemoryEntry = self.__objects.pop(key, None)
+            self.__size += len(entry.data) - (len(prev.data) if prev is not None else 0)
+            self.__objects[key] = entry
+            while self.__size > self.__max_bytes:
+                (_, old) = self.__objects.popitem(last=False)
+                self.__size -= len(old.data)
+                evicted.append(old)
+        if evicted:
+            metrics.incr('memory_evictions_total', len(evicted))
+        if self.on_evict is not None:
+            # Outside of the lock, as demoting may take a while
+            for old in evicted:
+                self.on_evict(old)
+        return True
+
+    def pop(self, key: str) -> Optional[MemoryEntry]:
+        with self.__lock:
+            entry: MemoryEntry = self.__objects.pop(key, None)
+            if entry is not None:
+                self.__size -= len(entry.data)
+            return entry
+
+    def iterate_missing(self, from_date: Date, to_date: Date) -> Iterator[RepoURI]:
+        return iter(())
+
+    def find_missing(self, from_date: Date, to_date: Date) -> List[str]:
+        return []
+
+    def find(self, period_type: DatePeriodType, the_date: Date) -> 'MemoryRepoObject':
+        return MemoryRepoObject(self, period_type, the_date.copy())
+
+    def create(self, period_type: DatePeriodType, the_date: Date) -> 'MemoryRepoObject':
+        return self.find(period_type, the_date)
+
+    def refresh(self) -> None:
+        """
+            Drops all objects without demoting them
+        """
+        with self.__lock:
+            self.__objects.clear()
+            self.__size = 0
+
+
+class MemoryRepoObject(RepoObject):
+    def __init__(self, repo: MemoryRepoFS, period_type: DatePeriodType, the_date: Date) -> None:
+        self.__repo: MemoryRepoFS = repo
+        self.__period_type: DatePeriodType = period_type
+        self.__date: Date = the_date
+        self.__key: str = repo.key(period_type, the_date)
+
+    def as_uri(self) -> str:
+        return 'memory:' + self.__key
+
+    def exists(self) -> bool:
+        return self.__key in self.__repo
+
+    def subpath(self, levels: int) -> List[str]:
+        return self.__key.split('/')[-levels:]
+
+    def inp(self, bufsize: int = 2048) -> Iterator[bytes]:
+        data: bytes = self.__repo.get(self.__key) or b''
+        view: memoryview = memoryview(data)
+        for i in range(0, len(data), bufsize):
+            yield bytes(view[i:i + bufsize])
+
+    def out(self, iter: Iterator[str], override: bool = False) -> None:
+        """
+            Keeps the content in memory
+
+            Raises
+            ------
+            FileExistsError
+                if the object exists and override is False
+        """
+        if not override and self.exists():
+            raise FileExistsError(self.__key)
+        data: bytes = b''.join(chunk.encode() if isinstance(chunk, str) else chunk for chunk in iter)
+        self.__repo.put(self.__key, MemoryEntry(self.__period_type, self.__date, data))
@@ -1,10 +1,53 @@
 from edgar.utils.repo.repo_fs import RepoObject, RepoURI
 from edgar.utils.date.date_utils import Date, DatePeriodType
 from datetime import date
-from parse import parse
-from typing import Iterator, List, Dict
+from functools import lru_cache
+from typing import Iterator, List, Dict, Optional, Pattern
 from dataclasses import dataclass
 import os
+import re
+
+
+@lru_cache(maxsize=None)
+def spec_parser(spec: str):
+    """
+        Returns the compiled parser for a name or path specification.
+        `parse` is imported on first use to keep the import of the module cheap
+    """
+    from parse import compile
+    return compile(spec)
+
+
+@lru_cache(maxsize=None)
+def spec_regex(spec: str) -> Pattern:
+    """
+        Returns the regular expression matching a name or path specification.
+        Zero-padded macros such as {y:04} match exactly that many digits,
+        other macros match any non-empty text
+    """
+    pattern: List[str] = []
+    pos: int = 0
+    for m in re.finditer(r'\{(\w+)(?::([^}]*))?\}', spec):
+        pattern.append(re.escape(spec[pos:m.start()]))
+        width: Optional[re.Match] = re.fullmatch(r'0(\d+)', m.group(2) or '')
+        pattern.append('(?P<{0}>{1})'.format(m.group(1), r'\d{%s}' % width.group(1) if width else '.+?'))
+        pos = m.end()
+    pattern.append(re.escape(spec[pos:]))
+    return re.compile(''.join(pattern))
+
+
+def parse_spec(spec: str, value: str) -> Optional[Dict[str, str]]:
+    """
+        Parses the value with the name or path specification
+
+        Returns
+        -------
+        Dict[str, str] | None
+            the values of the macros or None if the value does not match the specification
+    """
+    m: Optional[re.Match] = spec_regex(spec).fullmatch(value)
+    return m.groupdict() if m is not None else None
+
 
 @dataclass
 class RepoFormat:
@@ -33,6 +76,17 @@ class RepoFormat:
     """
     path_spec: List[str]
 
+    """
+        The name specifications of compressed variants of the objects, published
+        next to them in the same directory. Variants are gzip or zlib streams,
+        the LZW `.Z` files of EDGAR are not supported
+
+        Examples
+        --------
+        >>> {DatePeriodType.QUARTER: 'master.gz'}
+    """
+    compressed_spec: Optional[Dict[DatePeriodType, str]] = None
+
 
 class RepoFormatter:
     def __init__(self, format: RepoFormat) -> None:
@@ -42,17 +96,34 @@ class RepoFormatter:
     def __setitem__(self, key, val):
         self.__macros[key] = val
 
-    def format(self, period_type: DatePeriodType, the_date: Date, **kwargs) -> List[str]:
-        name_spec = self.__format.name_spec[period_type]
-        path_spec = self.__format.path_spec
+    @property
+    def repo_format(self) -> RepoFormat:
+        return self.__format
 
+    def __eval_macros(self, period_type: DatePeriodType, the_date: Date, **kwargs) -> Dict[str, object]:
         eval_macros = dict(kwargs)
         for name, func in self.__macros.items():
             eval_macros[name] = func(period_type, the_date)
+        return eval_macros
 
+    def format(self, period_type: DatePeriodType, the_date: Date, **kwargs) -> List[str]:
+        name_spec = self.__format.name_spec[period_type]
+        path_spec = self.__format.path_spec
+
+        eval_macros = self.__eval_macros(period_type, the_date, **kwargs)
         return [*[the_date.format(s, period_type, **eval_macros) for s in path_spec], 
             the_date.format(name_spec, period_type, **eval_macros)]
 
+    def compressed_name(self, period_type: DatePeriodType, the_date: Date, **kwargs) -> Optional[str]:
+        """
+            Returns the name of the compressed variant of the object for the date,
+            or None if the format has no compressed variant for the date period type
+        """
+        name_spec: Optional[str] = (self.__format.compressed_spec or {}).get(period_type)
+        if name_spec is None:
+            return None
+        return the_date.format(name_spec, period_type, **self.__eval_macros(period_type, the_date, **kwargs))
+
 
 class RepoObjectPath(RepoURI):
     """
@@ -259,7 +330,7 @@ class RepoObjectPath(RepoURI):
             the date
         """
         if not self.__date:
-            params = parse(self.__format.name_spec[DatePeriodType.DAY], self.__list[-1])
+            params = spec_parser(self.__format.name_spec[DatePeriodType.DAY]).parse(self.__list[-1])
             self.__date = Date(date(int(params['y']), int(params['m']),int(params['d'])))
 
         return self.__date
@@ -282,5 +353,5 @@ class RepoObjectPath(RepoURI):
 
         for i, s in enumerate(self.__format.path_spec):
             if macro in s:
-                return parse(s, self[i])[param_name]
+                return spec_parser(s).parse(self[i])[param_name]
         return None
@@ -77,6 +77,13 @@ class RepoFS(metaclass=abc.ABCMeta):
     def refresh(self) -> None:
         pass
 
+    def flush(self) -> None:
+        """
+            Makes the objects written so far durable. Repositories that
+            write through do nothing
+        """
+        pass
+
 class RepoDirVisitor(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def visit(self, obj: RepoObject) -> bool:
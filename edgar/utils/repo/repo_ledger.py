@@ -19,6 +19,20 @@ class RepoLedger(metaclass=abc.ABCMeta):
     def record(self, date: Date, period_type: DatePeriodType) -> None:
         pass
 
+    def compact(self, date: Date, objects: int) -> None:
+        """
+            Records that the daily objects of the quarter were folded into its quarterly object.
+            Ledgers that do not track compactions ignore it
+
+            Parameters
+            ----------
+            date: Date
+                the first date of the quarter
+            objects: int
+                the number of daily objects removed
+        """
+        pass
+
     @abc.abstractmethod
     def next_period(self) -> Tuple[Date,Date]:
         pass
\ No newline at end of file
@@ -1,19 +1,36 @@
 """
     The classes related to building and managing pipes
 """
-from edgar.utils.repo.repo_fs import RepoFS, RepoObject
+from edgar.utils.repo.repo_fs import RepoFS, RepoObject, RepoURI
 from edgar.utils.repo.repo_ledger import RepoLedger
+from edgar.utils.repo.repo_stage import RepoStage, abort_stages, apply_stages, commit_stages
 from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.metrics import metrics
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+import queue
+import threading
 
 class RepoPipe:
     """
         The class represents a pipe between two repositories
         to sync updates in source to sink
+
+        Parameters
+        ----------
+        trans: RepoLedger
+            the ledger
+        source: RepoFS
+            the source repository
+        sink: RepoFS
+            the sink repository
+        stages: List[RepoStage]
+            the stages applied to the content of every object on its way to the sink
     """
-    def __init__(self, trans: RepoLedger, source: RepoFS, sink: RepoFS) -> None:
+    def __init__(self, trans: RepoLedger, source: RepoFS, sink: RepoFS, stages: List[RepoStage] = None) -> None:
         self.__trans = trans
         self.__source = source
         self.__sink = sink
+        self.__stages = stages or []
 
     def sync(self):
         """
@@ -23,15 +40,242 @@ class RepoPipe:
 
         the_date: Date = None
         try:
-            self.__trans.start(beg_date)
-            for path in self.__sink.iterate_missing(beg_date, end_date):
-                the_date = path.date()
-                period_type: DatePeriodType = path.date_period_type()
-                src_obj: RepoObject = self.__source.find(period_type, the_date)
-                dst_obj: RepoObject = self.__sink.create(period_type, the_date)
-                dst_obj.out(src_obj.inp(), override=True)
-                self.__trans.record(the_date, period_type)
+            try:
+                self.__trans.start(beg_date)
+                missing = metrics.timed_iter(self.__sink.iterate_missing(beg_date, end_date), 'pipe_scan_seconds')
+                for path in missing:
+                    the_date = path.date()
+                    period_type: DatePeriodType = path.date_period_type()
+                    period: str = str(period_type)
+                    with metrics.span('pipe_object_seconds', period=period):
+                        src_obj: RepoObject = self.__source.find(period_type, the_date)
+                        dst_obj: RepoObject = self.__sink.create(period_type, the_date)
+                        chunks = metrics.counted_iter(src_obj.inp(), 'pipe_object_bytes', period=period)
+                        try:
+                            dst_obj.out(apply_stages(chunks, self.__stages, path), override=True)
+                        except BaseException:
+                            abort_stages(self.__stages, path)
+                            raise
+                        commit_stages(self.__stages, path)
+                    with metrics.span('pipe_ledger_seconds'):
+                        self.__trans.record(the_date, period_type)
+                    metrics.incr('pipe_objects_total', period=period)
+            finally:
+                # Objects written before a failure are synced too
+                self.__sink.flush()
         except Exception as any_exp:
+            metrics.incr('pipe_errors_total')
             self.__trans.error(the_date, repr(any_exp))
         else:
             self.__trans.end(end_date)
+
+
+class PipeBranch(NamedTuple):
+    """
+        A sink of `FanOutPipe` with its own ledger and stages, None for no stages
+    """
+    trans: RepoLedger
+    sink: RepoFS
+    stages: List[RepoStage] = None
+
+
+class FanOutPipe:
+    """
+        The pipe that downloads every object once and tees its chunks to several sinks
+
+        Every branch is written by its own thread that reads the chunks from a queue
+        of `buffer` chunks. The download waits only for a branch whose queue is full,
+        so a slow sink holds the others back by no more than the buffer. A branch
+        that fails is dropped with an error in its ledger, and the others go on.
+        Ledgers are written by the calling thread
+
+        Parameters
+        ----------
+        source: RepoFS
+            the source repository
+        branches: List[PipeBranch]
+            the sinks with their ledgers
+        buffer: int
+            the number of chunks queued for a branch
+    """
+    def __init__(self, source: RepoFS, branches: List[PipeBranch], buffer: int = 16) -> None:
+        self.__source = source
+        # Every branch gets its own list of stages
+        self.__branches = [b._replace(stages=list(b.stages or [])) for b in branches]
+        self.__buffer = buffer
+
+    def __missing(self, periods: List[Tuple[Date, Date]]) -> List[Tuple[RepoURI, List[int]]]:
+        """
+            Merges the objects missing in the branches, so each is downloaded once
+        """
+        missing: Dict[Tuple[str, DatePeriodType], Tuple[RepoURI, List[int]]] = {}
+        for (i, (branch, (beg_date, end_date))) in enumerate(zip(self.__branches, periods)):
+            for path in branch.sink.iterate_missing(beg_date, end_date):
+                key: Tuple[str, DatePeriodType] = (str(path.date()), path.date_period_type())
+                missing.setdefault(key, (path, []))[1].append(i)
+        return sorted(missing.values(), key=lambda item: (str(item[0].date()), item[0].date_period_type()))
+
+    def sync(self) -> None:
+        """
+            Synchronizes the source with all sinks
+        """
+        periods: List[Tuple[Date, Date]] = [b.trans.next_period() for b in self.__branches]
+        writers: List[_BranchWriter] = []
+        done: queue.Queue = queue.Queue()
+        failed: Dict[int, str] = {}
+        pending: int = 0
+
+        def collect(block: bool) -> None:
+            nonlocal pending
+            while pending > 0:
+                try:
+                    (i, path, error) = done.get(block=block)
+                except queue.Empty:
+                    return
+                pending -= 1
+                if i in failed or isinstance(error, PipeAbortedError):
+                    # The download error is recorded for all branches below
+                    continue
+                if error is None:
+                    self.__branches[i].trans.record(path.date(), path.date_period_type())
+                    metrics.incr('pipe_objects_total', period=str(path.date_period_type()))
+                else:
+                    metrics.incr('pipe_errors_total')
+                    failed[i] = repr(error)
+                    self.__branches[i].trans.error(path.date(), repr(error))
+
+        the_date: Date = None
+        try:
+            for (branch, (beg_date, _)) in zip(self.__branches, periods):
+                branch.trans.start(beg_date)
+            writers = [_BranchWriter(i, b, self.__buffer, done) for (i, b) in enumerate(self.__branches)]
+
+            for (path, targets) in self.__missing(periods):
+                the_date = path.date()
+                period_type: DatePeriodType = path.date_period_type()
+                targets = [i for i in targets if i not in failed]
+                if not targets:
+                    continue
+                for i in targets:
+                    writers[i].begin(path)
+                pending += len(targets)
+                with metrics.span('pipe_object_seconds', period=str(period_type)):
+                    src_obj: RepoObject = self.__source.find(period_type, the_date)
+                    chunks = metrics.counted_iter(src_obj.inp(), 'pipe_object_bytes', period=str(period_type))
+                    try:
+                        for chunk in chunks:
+                            for i in targets:
+                                writers[i].put(chunk)
+                    except BaseException:
+                        for i in targets:
+                            writers[i].abort()
+                        raise
+                    for i in targets:
+                        writers[i].end()
+                collect(block=False)
+
+            for writer in writers:
+                writer.close()
+            collect(block=True)
+        except Exception as any_exp:
+            metrics.incr('pipe_errors_total')
+            for writer in writers:
+                writer.close()
+            collect(block=True)
+            for (i, branch) in enumerate(self.__branches):
+                if i not in failed:
+                    failed[i] = repr(any_exp)
+                    branch.trans.error(the_date, repr(any_exp))
+        finally:
+            # Objects written before a failure are synced too
+            for branch in self.__branches:
+                branch.sink.flush()
+        for (i, (branch, (_, end_date))) in enumerate(zip(self.__branches, periods)):
+            if i not in failed:
+                branch.trans.end(end_date)
+
+
+class _BranchWriter:
+    """
+        The thread writing the objects of one branch from its chunk queue
+    """
+    BEGIN, CHUNK, END, ABORT, CLOSE = range(5)
+
+    def __init__(self, index: int, branch: PipeBranch, buffer: int, done: queue.Queue) -> None:
+        self.__index = index
+        self.__branch = branch
+        self.__chunks: queue.Queue = queue.Queue(maxsize=buffer)
+        self.__done = done
+        self.__failed: bool = False
+        self.__thread = threading.Thread(target=self.__run, name='fan-out-{0}'.format(index), daemon=True)
+        self.__thread.start()
+
+    def begin(self, path: RepoURI) -> None:
+        self.__chunks.put((self.BEGIN, path))
+
+    def put(self, chunk) -> None:
+        if not self.__failed:
+            self.__chunks.put((self.CHUNK, chunk))
+
+    def end(self) -> None:
+        self.__chunks.put((self.END, None))
+
+    def abort(self) -> None:
+        self.__chunks.put((self.ABORT, None))
+
+    def close(self) -> None:
+        if self.__thread.is_alive():
+            self.__chunks.put((self.CLOSE, None))
+            self.__thread.join()
+
+    def __content(self) -> Iterator:
+        while True:
+            (kind, chunk) = self.__chunks.get()
+            if kind == self.CHUNK:
+                yield chunk
+            elif kind == self.END:
+                return
+            else:
+                raise PipeAbortedError()
+
+    def __run(self) -> None:
+        while True:
+            (kind, path) = self.__chunks.get()
+            if kind == self.CLOSE:
+                return
+            if kind != self.BEGIN:
+                continue
+            error: Exception = None
+            content: Iterator = self.__content()
+            try:
+                if self.__failed:
+                    # The pipe has not seen the failure yet
+                    raise PipeAbortedError()
+                period_type: DatePeriodType = path.date_period_type()
+                dst_obj: RepoObject = self.__branch.sink.create(period_type, path.date())
+                dst_obj.out(apply_stages(content, self.__branch.stages, path), override=True)
+                # Stages may stop reading early, e.g. a filter
+                for _ in content:
+                    pass
+                commit_stages(self.__branch.stages, path)
+            except PipeAbortedError as err:
+                error = err
+            except Exception as err:
+                error = err
+                # Later chunks are dropped, the ones queued are drained here
+                self.__failed = True
+            if error is not None:
+                abort_stages(self.__branch.stages, path)
+                try:
+                    for _ in content:
+                        pass
+                except PipeAbortedError:
+                    pass
+            self.__done.put((self.__index, path, error))
+
+
+class PipeAbortedError(Exception):
+    """
+        Raised in the writers of a `FanOutPipe` when the download fails
+    """
+    pass
@@ -0,0 +1,391 @@
+"""
+    Streaming stages between the source and the sink of `RepoPipe`
+
+    A stage turns the chunk iterator of an object into another chunk iterator,
+    so stages chain like generators and every chunk passes through all of them
+    before the next one is read. Nothing is buffered beyond a chunk, except by
+    `RechunkStage` and `PrefetchStage` whose buffers are bounded. The sink pulls
+    the chunks, so a slow sink slows the download down rather than filling memory.
+
+    Examples
+    --------
+    >>> rows = []
+    >>> stages = [DecompressStage(), ValidateStage(), ParseStage(lambda path, batch: rows.extend(batch))]
+    >>> RepoPipe(ledger, source, sink, stages).sync()
+
+    Once the sink has stored an object the pipe commits it to the stages, or
+    aborts it if the object failed, so stages with side effects, e.g. `ParseStage`,
+    act only on objects that were stored.
+"""
+import abc
+import queue
+import threading
+import zlib
+from typing import Callable, Dict, Iterator, List, Union
+from edgar.utils.index.master_index import HEADER_SEPARATOR, INDEX_ENCODING, IndexRow, parse_master_line
+from edgar.utils.repo.repo_fs import RepoURI
+
+Chunk = Union[str, bytes]
+
+# Accepts both gzip and zlib headers
+AUTO_WBITS: int = 32 + zlib.MAX_WBITS
+GZIP_WBITS: int = 16 + zlib.MAX_WBITS
+
+
+class StageError(Exception):
+    """
+        Raised by a stage that rejects the object
+    """
+    pass
+
+
+class RepoStage(metaclass=abc.ABCMeta):
+    """
+        A step applied to the chunks of every object synced by `RepoPipe`
+    """
+    @abc.abstractmethod
+    def process(self, chunks: Iterator[Chunk], path: RepoURI) -> Iterator[Chunk]:
+        """
+            Transforms the chunks of the object
+
+            Parameters
+            ----------
+            chunks: Iterator[Chunk]
+                the chunks of the object as text or bytes
+            path: RepoURI
+                the object being synced
+
+            Returns
+            -------
+            Iterator[Chunk]
+                the transformed chunks
+        """
+        pass
+
+    def commit(self, path: RepoURI) -> None:
+        """
+            Called once the sink has stored the object processed by the stage
+        """
+        pass
+
+    def abort(self, path: RepoURI) -> None:
+        """
+            Called when the object processed by the stage failed and was not stored
+        """
+        pass
+
+
+def as_bytes(chunk: Chunk) -> bytes:
+    # File objects stream text, HTTP objects stream bytes. Text is encoded as `as_text` decodes it
+    return chunk.encode(INDEX_ENCODING) if isinstance(chunk, str) else chunk
+
+
+def as_text(chunk: Chunk) -> str:
+    # Bytes are decoded as in `iter_lines`
+    return chunk.decode(INDEX_ENCODING) if isinstance(chunk, bytes) else chunk
+
+
+def apply_stages(chunks: Iterator[Chunk], stages: List[RepoStage], path: RepoURI) -> Iterator[Chunk]:
+    """
+        Chains the stages over the chunks in the order of the list
+    """
+    for stage in stages:
+        chunks = stage.process(chunks, path)
+    return chunks
+
+
+def commit_stages(stages: List[RepoStage], path: RepoURI) -> None:
+    """
+        Tells the stages that the sink has stored the object
+    """
+    for stage in stages:
+        stage.commit(path)
+
+
+def abort_stages(stages: List[RepoStage], path: RepoURI) -> None:
+    """
+        Tells the stages that the object was not stored
+    """
+    for stage in stages:
+        stage.abort(path)
+
+
+class DecompressStage(RepoStage):
+    """
+        Inflates gzip or zlib compressed objects
+
+        Parameters
+        ----------
+        wbits: int
+            the zlib window bits, by default both gzip and zlib headers are accepted
+    """
+    def __init__(self, wbits: int = AUTO_WBITS) -> None:
+        self.__wbits: int = wbits
+
+    def process(self, chunks: Iterator[Chunk], path: RepoURI) -> Iterator[bytes]:
+        inflater = zlib.decompressobj(self.__wbits)
+        try:
+            for chunk in chunks:
+                data: bytes = inflater.decompress(as_bytes(chunk))
+                if data:
+                    yield data
+            data = inflater.flush()
+        except zlib.error as err:
+            raise StageError('{0}: {1}'.format(path, err)) from err
+        if data:
+            yield data
+        if not inflater.eof:
+            raise StageError('{0}: truncated compressed stream'.format(path))
+
+
+class CompressStage(RepoStage):
+    """
+        Deflates objects, e.g. to store them compressed
+
+        Parameters
+        ----------
+        level: int
+            the compression level
+        wbits: int
+            the zlib window bits, gzip by default
+    """
+    def __init__(self, level: int = 6, wbits: int = GZIP_WBITS) -> None:
+        self.__level: int = level
+        self.__wbits: int = wbits
+
+    def process(self, chunks: Iterator[Chunk], path: RepoURI) -> Iterator[bytes]:
+        deflater = zlib.compressobj(self.__level, zlib.DEFLATED, self.__wbits)
+        for chunk in chunks:
+            data: bytes = deflater.compress(as_bytes(chunk))
+            if data:
+                yield data
+        yield deflater.flush()
+
+
+class ValidateStage(RepoStage):
+    """
+        Rejects objects that are empty or do not start with a master index header
+
+        Parameters
+        ----------
+        marker: bytes
+            the bytes expected near the start of the object, None to check the size only
+        within: int
+            the number of leading bytes the marker is looked for in
+    """
+    def __init__(self, marker: bytes = b'\n' + HEADER_SEPARATOR.encode(), within: int = 4096) -> None:
+        self.__marker: bytes = marker
+        self.__within: int = within
+
+    def process(self, chunks: Iterator[Chunk], path: RepoURI) -> Iterator[Chunk]:
+        head: bytes = b''
+        pending: List[Chunk] = []
+        for chunk in chunks:
+            if pending is None:
+                yield chunk
+                continue
+            # Chunks are held back until the marker is found, at most `within` bytes
+            pending.append(chunk)
+            head += as_bytes(chunk)
+            if self.__marker is None or self.__marker in head[:self.__within]:
+                yield from pending
+                pending = None
+            elif len(head) >= self.__within:
+                raise StageError('{0}: no index header'.format(path))
+        if pending is not None:
+            raise StageError('{0}: {1}'.format(path, 'no index header' if head else 'empty object'))
+
+
+class ParseStage(RepoStage):
+    """
+        Parses the rows of master index objects as they stream by. Chunks pass
+        through unchanged, so the object is stored and parsed in one pass.
+
+        The rows of an object are held until it is committed, i.e. stored by the
+        sink, and dropped if it is aborted, so they are published only for stored
+        objects. Outside of a pipe, `commit` publishes the rows of the object read
+
+        Parameters
+        ----------
+        on_rows: Callable[[RepoURI, List[IndexRow]], None]
+            called with the rows of every chunk, e.g. to update an index
+    """
+    def __init__(self, on_rows: Callable[[RepoURI, List[IndexRow]], None]) -> None:
+        self.__on_rows: Callable[[RepoURI, List[IndexRow]], None] = on_rows
+        self.__pending: Dict[str, List[List[IndexRow]]] = {}
+        self.__lock: threading.Lock = threading.Lock()
+
+    def process(self, chunks: Iterator[Chunk], path: RepoURI) -> Iterator[Chunk]:
+        batches: List[List[IndexRow]] = []
+        with self.__lock:
+            self.__pending[str(path)] = batches
+        tap: _RowTap = _RowTap()
+        tail: str = ''
+        for chunk in chunks:
+            lines: List[str] = (tail + as_text(chunk)).split('\n')
+            tail = lines.pop()
+            rows: List[IndexRow] = tap.rows(lines)
+            if rows:
+                batches.append(rows)
+            yield chunk
+        rows = tap.rows([tail]) if tail else []
+        if rows:
+            batches.append(rows)
+
+    def commit(self, path: RepoURI) -> None:
+        """
+            Publishes the rows of the stored object
+        """
+        with self.__lock:
+            batches: List[List[IndexRow]] = self.__pending.pop(str(path), [])
+        for rows in batches:
+            self.__on_rows(path, rows)
+
+    def abort(self, path: RepoURI) -> None:
+        """
+            Drops the rows of the object that was not stored
+        """
+        with self.__lock:
+            self.__pending.pop(str(path), None)
+
+
+class FilterStage(RepoStage):
+    """
+        Keeps the header and the rows of master index objects that match the predicate.
+        Bytes chunks are re-encoded in the index encoding
+
+        Parameters
+        ----------
+        predicate: Callable[[IndexRow], bool]
+            tells whether to keep the row
+    """
+    def __init__(self, predicate: Callable[[IndexRow], bool]) -> None:
+        self.__predicate: Callable[[IndexRow], bool] = predicate
+
+    def process(self, chunks: Iterator[Chunk], path: RepoURI) -> Iterator[Chunk]:
+        tap: _RowTap = _RowTap()
+        tail: str = ''
+        is_text: bool = True
+        for chunk in chunks:
+            is_text = isinstance(chunk, str)
+            lines: List[str] = (tail + as_text(chunk)).split('\n')
+            tail = lines.pop()
+            kept: str = ''.join(line + '\n' for line in lines if tap.keep(line, self.__predicate))
+            if kept:
+                yield kept if is_text else kept.encode(INDEX_ENCODING)
+        if tail and tap.keep(tail, self.__predicate):
+            yield tail if is_text else tail.encode(INDEX_ENCODING)
+
+
+class RechunkStage(RepoStage):
+    """
+        Coalesces small chunks and splits large ones into chunks of a fixed size,
+        e.g. to write in large blocks
+
+        Parameters
+        ----------
+        size: int
+            the chunk size. The last chunk may be smaller
+    """
+    def __init__(self, size: int = 65536) -> None:
+        self.__size: int = size
+
+    def process(self, chunks: Iterator[Chunk], path: RepoURI) -> Iterator[bytes]:
+        buffer: bytearray = bytearray()
+        for chunk in chunks:
+            buffer += as_bytes(chunk)
+            if len(buffer) >= self.__size:
+                view: memoryview = memoryview(buffer)
+                full: int = len(buffer) - len(buffer) % self.__size
+                for i in range(0, full, self.__size):
+                    yield bytes(view[i:i + self.__size])
+                view.release()
+                del buffer[:full]
+        if buffer:
+            yield bytes(buffer)
+
+
+class PrefetchStage(RepoStage):
+    """
+        Reads the chunks ahead in a background thread, so the download overlaps
+        with the stages that follow. At most `depth` chunks wait in the queue:
+        the reader blocks when it is full
+
+        Parameters
+        ----------
+        depth: int
+            the number of chunks read ahead
+    """
+    _END = object()
+
+    def __init__(self, depth: int = 8) -> None:
+        self.__depth: int = depth
+
+    def process(self, chunks: Iterator[Chunk], path: RepoURI) -> Iterator[Chunk]:
+        ahead: queue.Queue = queue.Queue(maxsize=self.__depth)
+        stop: threading.Event = threading.Event()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    ahead.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def read() -> None:
+            try:
+                for chunk in chunks:
+                    if not put(chunk):
+                        return
+                put(self._END)
+            except BaseException as err:
+                put(err)
+            finally:
+                close = getattr(chunks, 'close', None)
+                if stop.is_set() and close is not None:
+                    close()
+
+        reader: threading.Thread = threading.Thread(target=read, name='prefetch', daemon=True)
+        reader.start()
+        try:
+            while True:
+                item = ahead.get()
+                if item is self._END:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            reader.join()
+
+
+class _RowTap:
+    """
+        Tracks the header of a master index read line by line
+    """
+    def __init__(self) -> None:
+        self.__in_header: bool = True
+        self.__dates: Dict[str, int] = {}
+
+    def row(self, line: str) -> IndexRow:
+        """
+            Returns the row of the line or None for header lines and lines that are not rows
+        """
+        if self.__in_header:
+            self.__in_header = not line.startswith(HEADER_SEPARATOR)
+            return None
+        return parse_master_line(line.rstrip('\r'), self.__dates)
+
+    def rows(self, lines: List[str]) -> List[IndexRow]:
+        if not self.__in_header:
+            dates: Dict[str, int] = self.__dates
+            return [row for row in (parse_master_line(line.rstrip('\r'), dates) for line in lines) if row is not None]
+        return [row for row in map(self.row, lines) if row is not None]
+
+    def keep(self, line: str, predicate: Callable[[IndexRow], bool]) -> bool:
+        in_header: bool = self.__in_header
+        row: IndexRow = self.row(line)
+        return in_header or (row is not None and predicate(row))
@@ -0,0 +1,273 @@
+"""
+    Compact in-memory representation of a repository tree
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Tuple
+from edgar.utils.date.date_utils import DatePeriodType
+
+NO_KEY: int = -1
+REMOVED: int = -2
+
+
+def pack_key(period_type: DatePeriodType, ordinal: int) -> int:
+    """
+        Packs the period type and the date ordinal into one integer key
+
+        Parameters
+        ----------
+        period_type: DatePeriodType
+            the period type
+        ordinal: int
+            the proleptic Gregorian ordinal of the date
+
+        Returns
+        -------
+        int
+            the key. Keys of the same period type sort in date order
+    """
+    return (ordinal << 2) | int(period_type)
+
+
+def unpack_key(key: int) -> Tuple[DatePeriodType, int]:
+    return (DatePeriodType(key & 3), key >> 2)
+
+
+class RepoTree:
+    """
+        Repository tree stored in flat arrays instead of one Python object per node.
+
+        Every node is an integer. A node has the parent node, the id of its name
+        in the interned name table and a flag telling directories from objects.
+        The children of a directory are linked through sibling arrays, and nodes
+        are found by directory and name through one dict. Objects whose path
+        matches the repo format are also indexed by the packed (period type,
+        date ordinal) key in a sorted array. The root is node 0.
+
+        Changes are cheap, so the tree can follow a watched repository: keys are
+        inserted in place, removed keys are tombstoned and dropped once they are
+        a quarter of the index, and the nodes of removed entries are reused.
+    """
+    ROOT: int = 0
+
+    def __init__(self) -> None:
+        self.__names: List[str] = []
+        self.__name_ids: Dict[str, int] = {}
+        self.__parents: array = array('i')
+        self.__name_refs: array = array('i')
+        self.__is_dir: bytearray = bytearray()
+        self.__node_keys: array = array('q')
+        self.__first_child: array = array('i')
+        self.__last_child: array = array('i')
+        self.__next_sibling: array = array('i')
+        self.__prev_sibling: array = array('i')
+        self.__child_nodes: Dict[int, int] = {}
+        self.__keys: array = array('q')
+        self.__key_nodes: array = array('i')
+        self.__dead_keys: int = 0
+        self.__free: int = -1
+        self.__removed: int = 0
+        self.clear()
+
+    def clear(self) -> None:
+        self.__names.clear()
+        self.__name_ids.clear()
+        self.__parents = array('i', [-1])
+        self.__name_refs = array('i', [self.__intern('')])
+        self.__is_dir = bytearray([1])
+        self.__node_keys = array('q', [NO_KEY])
+        self.__first_child = array('i', [-1])
+        self.__last_child = array('i', [-1])
+        self.__next_sibling = array('i', [-1])
+        self.__prev_sibling = array('i', [-1])
+        self.__child_nodes = {}
+        self.__keys = array('q')
+        self.__key_nodes = array('i')
+        self.__dead_keys = 0
+        self.__free = -1
+        self.__removed = 0
+
+    def __intern(self, name: str) -> int:
+        name_id: int = self.__name_ids.get(name, -1)
+        if name_id < 0:
+            name_id = self.__name_ids[name] = len(self.__names)
+            self.__names.append(name)
+        return name_id
+
+    def add(self, parent: int, name: str, is_dir: bool, key: int = NO_KEY) -> int:
+        """
+            Adds a node
+
+            Parameters
+            ----------
+            parent: int
+                the parent directory node
+            name: str
+                the name of the entry
+            is_dir: bool
+                True for directories, False for objects
+            key: int
+                the packed key of an object, see `pack_key`
+
+            Returns
+            -------
+            int
+                the new node
+        """
+        name_id: int = self.__intern(name)
+        last: int = self.__last_child[parent]
+        node: int = self.__free
+        if node >= 0:
+            # The node of a removed entry is reused
+            self.__free = self.__next_sibling[node]
+            self.__removed -= 1
+            self.__parents[node] = parent
+            self.__name_refs[node] = name_id
+            self.__is_dir[node] = 1 if is_dir else 0
+            self.__node_keys[node] = key
+            self.__first_child[node] = self.__last_child[node] = self.__next_sibling[node] = -1
+            self.__prev_sibling[node] = last
+        else:
+            node = len(self.__parents)
+            self.__parents.append(parent)
+            self.__name_refs.append(name_id)
+            self.__is_dir.append(1 if is_dir else 0)
+            self.__node_keys.append(key)
+            self.__first_child.append(-1)
+            self.__last_child.append(-1)
+            self.__next_sibling.append(-1)
+            self.__prev_sibling.append(last)
+
+        if last >= 0:
+            self.__next_sibling[last] = node
+        else:
+            self.__first_child[parent] = node
+        self.__last_child[parent] = node
+        self.__child_nodes[(parent << 32) | name_id] = node
+
+        if key != NO_KEY:
+            if not self.__keys or key >= self.__keys[-1]:
+                self.__keys.append(key)
+                self.__key_nodes.append(node)
+            else:
+                i: int = bisect_right(self.__keys, key)
+                self.__keys.insert(i, key)
+                self.__key_nodes.insert(i, node)
+        return node
+
+    def find(self, key: int) -> int:
+        """
+            Returns the object node with the key or -1 if there is no such object
+        """
+        keys: array = self.__keys
+        i: int = bisect_left(keys, key)
+        while i < len(keys) and keys[i] == key:
+            if self.__key_nodes[i] != REMOVED:
+                return self.__key_nodes[i]
+            i += 1
+        return -1
+
+    def __contains__(self, key: int) -> bool:
+        return self.find(key) >= 0
+
+    def __len__(self) -> int:
+        return len(self.__parents) - self.__removed
+
+    def remove(self, node: int) -> None:
+        """
+            Removes the node and, for directories, all nodes below it
+        """
+        if node <= self.ROOT or self.__parents[node] == REMOVED:
+            return
+        (prev, following) = (self.__prev_sibling[node], self.__next_sibling[node])
+        parent: int = self.__parents[node]
+        if prev >= 0:
+            self.__next_sibling[prev] = following
+        else:
+            self.__first_child[parent] = following
+        if following >= 0:
+            self.__prev_sibling[following] = prev
+        else:
+            self.__last_child[parent] = prev
+
+        stack: List[int] = [node]
+        while stack:
+            cur: int = stack.pop()
+            stack.extend(self.children(cur))
+            child_key: int = (self.__parents[cur] << 32) | self.__name_refs[cur]
+            if self.__child_nodes.get(child_key) == cur:
+                del self.__child_nodes[child_key]
+            if self.__node_keys[cur] != NO_KEY:
+                self.__drop_key(self.__node_keys[cur], cur)
+            self.__parents[cur] = REMOVED
+            self.__next_sibling[cur] = self.__free
+            self.__free = cur
+            self.__removed += 1
+
+        if self.__dead_keys > 64 and self.__dead_keys * 4 > len(self.__keys):
+            self.__compact_keys()
+
+    def __drop_key(self, key: int, node: int) -> None:
+        i: int = bisect_left(self.__keys, key)
+        while self.__key_nodes[i] != node:
+            i += 1
+        self.__key_nodes[i] = REMOVED
+        self.__dead_keys += 1
+
+    def __compact_keys(self) -> None:
+        live: List[int] = [i for (i, n) in enumerate(self.__key_nodes) if n != REMOVED]
+        self.__keys = array('q', (self.__keys[i] for i in live))
+        self.__key_nodes = array('i', (self.__key_nodes[i] for i in live))
+        self.__dead_keys = 0
+
+    def children(self, node: int) -> Iterator[int]:
+        """
+            Iterates over the nodes in the directory in the order they were added
+        """
+        child: int = self.__first_child[node]
+        while child >= 0:
+            # The next sibling is read first, so the child may be removed meanwhile
+            following: int = self.__next_sibling[child]
+            yield child
+            child = following
+
+    def child(self, node: int, name: str) -> int:
+        """
+            Returns the node with the name in the directory or -1
+        """
+        name_id: int = self.__name_ids.get(name, -1)
+        return self.__child_nodes.get((node << 32) | name_id, -1) if name_id >= 0 else -1
+
+    def parent(self, node: int) -> int:
+        return self.__parents[node]
+
+    def name(self, node: int) -> str:
+        return self.__names[self.__name_refs[node]]
+
+    def is_dir(self, node: int) -> bool:
+        return self.__is_dir[node] == 1
+
+    def path(self, node: int) -> List[str]:
+        """
+            Returns the names from the root to the node
+        """
+        names: List[str] = []
+        while node > self.ROOT:
+            names.append(self.__names[self.__name_refs[node]])
+            node = self.__parents[node]
+        names.reverse()
+        return names
+
+    def objects(self) -> Iterator[int]:
+        """
+            Iterates over object nodes in node order, i.e. the order they were
+            added unless nodes of removed entries have been reused
+        """
+        return (node for node in range(len(self.__parents))
+                if not self.__is_dir[node] and self.__parents[node] != REMOVED)
+
+    def keys(self) -> Iterator[int]:
+        """
+            Iterates over the keys of indexed objects in ascending order
+        """
+        return (key for (key, node) in zip(self.__keys, self.__key_nodes) if node != REMOVED)
@@ -1,4 +1,27 @@
-import json, dataclasses
+"""
+    Serialization of repository objects
+
+    JSON helpers for configuration and compact binary codecs for bulk data.
+    Binary records are packed with `struct` in little-endian byte order:
+
+        - Date           uint32 proleptic ordinal
+        - DatePeriod     uint8 period type, uint32 start and end ordinals
+        - EventObject    int64 event time, uint16 name, uint16 date and uint32 data lengths
+                         followed by the UTF-8 name, date and data
+        - RepoObjectPath uint16 URI length followed by the UTF-8 URI
+
+    A batch is a uint32 record count followed by the records. Batches of fixed
+    size records are packed and unpacked with a single struct call
+"""
+import abc, json, dataclasses, struct
+from datetime import date
+from typing import List, Sequence, Tuple
+from edgar.utils.date.date_utils import Date, DatePeriod, DatePeriodType
+from edgar.utils.repo.db_repo_ledger import EventObject
+from edgar.utils.repo.repo_format import RepoFormat, RepoObjectPath
+
+COUNT: struct.Struct = struct.Struct('<I')
+
 
 class BasicSerializer:
 
@@ -20,3 +43,223 @@ class EnhancedJSONEncoder(json.JSONEncoder):
 
 def dataclass_json_dump(obj: object) -> str:
     return json.dumps(obj, cls=EnhancedJSONEncoder)
+
+
+class CodecError(Exception):
+    """
+        Raised when a buffer does not hold the records it is decoded as
+    """
+    pass
+
+
+class BinaryCodec(metaclass=abc.ABCMeta):
+    """
+        Packs objects of one type into bytes and back
+    """
+    @abc.abstractmethod
+    def pack_into(self, obj: object, parts: List[bytes]) -> None:
+        """
+            Appends the packed object to the parts
+        """
+        pass
+
+    @abc.abstractmethod
+    def unpack_from(self, buffer: bytes, offset: int) -> Tuple[object, int]:
+        """
+            Unpacks an object
+
+            Parameters
+            ----------
+            buffer: bytes
+                the packed records
+            offset: int
+                the offset of the record
+
+            Returns
+            -------
+            Tuple[object, int]
+                the object and the offset of the next record
+        """
+        pass
+
+    def encode(self, obj: object) -> bytes:
+        parts: List[bytes] = []
+        self.pack_into(obj, parts)
+        return b''.join(parts)
+
+    def decode(self, buffer: bytes) -> object:
+        (obj, offset) = self.__unpack(buffer, 0)
+        if offset != len(buffer):
+            raise CodecError('{0} trailing bytes'.format(len(buffer) - offset))
+        return obj
+
+    def encode_many(self, objs: Sequence[object]) -> bytes:
+        """
+            Packs the objects into one batch
+        """
+        parts: List[bytes] = [COUNT.pack(len(objs))]
+        for obj in objs:
+            self.pack_into(obj, parts)
+        return b''.join(parts)
+
+    def decode_many(self, buffer: bytes) -> List[object]:
+        """
+            Unpacks a batch packed by `encode_many`
+        """
+        (count, offset) = self.__count(buffer)
+        objs: List[object] = []
+        for _ in range(count):
+            (obj, offset) = self.__unpack(buffer, offset)
+            objs.append(obj)
+        if offset != len(buffer):
+            raise CodecError('{0} trailing bytes'.format(len(buffer) - offset))
+        return objs
+
+    def __count(self, buffer: bytes) -> Tuple[int, int]:
+        if len(buffer) < COUNT.size:
+            raise CodecError('truncated batch')
+        return (COUNT.unpack_from(buffer)[0], COUNT.size)
+
+    def __unpack(self, buffer: bytes, offset: int) -> Tuple[object, int]:
+        try:
+            return self.unpack_from(buffer, offset)
+        except (struct.error, UnicodeDecodeError, ValueError) as err:
+            raise CodecError('bad record at {0}: {1}'.format(offset, err)) from err
+
+
+class FixedCodec(BinaryCodec):
+    """
+        A codec of records of the same size, whose batches are packed at once
+
+        Parameters
+        ----------
+        fmt: str
+            the struct format of a record without the byte order
+    """
+    def __init__(self, fmt: str) -> None:
+        self.__fmt: str = fmt
+        self.__record: struct.Struct = struct.Struct('<' + fmt)
+
+    @property
+    def size(self) -> int:
+        return self.__record.size
+
+    @abc.abstractmethod
+    def fields(self, obj: object) -> Tuple:
+        """
+            Returns the values of the record of the object
+        """
+        pass
+
+    @abc.abstractmethod
+    def build(self, values: Tuple) -> object:
+        """
+            Returns the object of the record values
+        """
+        pass
+
+    def pack_into(self, obj: object, parts: List[bytes]) -> None:
+        parts.append(self.__record.pack(*self.fields(obj)))
+
+    def unpack_from(self, buffer: bytes, offset: int) -> Tuple[object, int]:
+        return (self.build(self.__record.unpack_from(buffer, offset)), offset + self.__record.size)
+
+    def encode_many(self, objs: Sequence[object]) -> bytes:
+        fields = self.fields
+        values: List = [v for obj in objs for v in fields(obj)]
+        # Repeat counts keep the format short for single field records
+        fmt: str = '{0}{1}'.format(len(objs), self.__fmt) if len(self.__fmt) == 1 else self.__fmt * len(objs)
+        return COUNT.pack(len(objs)) + struct.pack('<' + fmt, *values)
+
+    def decode_many(self, buffer: bytes) -> List[object]:
+        if len(buffer) < COUNT.size:
+            raise CodecError('truncated batch')
+        count: int = COUNT.unpack_from(buffer)[0]
+        if len(buffer) != COUNT.size + count * self.size:
+            raise CodecError('{0} bytes do not hold {1} records'.format(len(buffer), count))
+        build = self.build
+        try:
+            return [build(values) for values in self.__record.iter_unpack(memoryview(buffer)[COUNT.size:])]
+        except ValueError as err:
+            raise CodecError(str(err)) from err
+
+
+class DateCodec(FixedCodec):
+    def __init__(self) -> None:
+        super().__init__('I')
+
+    def fields(self, obj: Date) -> Tuple:
+        return (obj.ordinal(),)
+
+    def build(self, values: Tuple) -> Date:
+        return Date(date.fromordinal(values[0]))
+
+
+class DatePeriodCodec(FixedCodec):
+    def __init__(self) -> None:
+        super().__init__('BII')
+
+    def fields(self, obj: DatePeriod) -> Tuple:
+        return (int(obj.period_type), obj.start_date.ordinal(), obj.end_date.ordinal())
+
+    def build(self, values: Tuple) -> DatePeriod:
+        return DatePeriod(DatePeriodType(values[0]),
+            Date(date.fromordinal(values[1])), Date(date.fromordinal(values[2])))
+
+
+class EventObjectCodec(BinaryCodec):
+    HEADER: struct.Struct = struct.Struct('<qHHI')
+
+    def pack_into(self, obj: EventObject, parts: List[bytes]) -> None:
+        name: bytes = obj.event_name.encode()
+        the_date: bytes = obj.event_date.encode()
+        data: bytes = obj.event_data.encode()
+        parts.append(self.HEADER.pack(obj.event_time, len(name), len(the_date), len(data)))
+        parts.append(name)
+        parts.append(the_date)
+        parts.append(data)
+
+    def unpack_from(self, buffer: bytes, offset: int) -> Tuple[EventObject, int]:
+        (event_time, name_len, date_len, data_len) = self.HEADER.unpack_from(buffer, offset)
+        offset += self.HEADER.size
+        end: int = offset + name_len + date_len + data_len
+        if end > len(buffer):
+            raise CodecError('truncated record at {0}'.format(offset - self.HEADER.size))
+        text: str = bytes(buffer[offset:end]).decode()
+        if len(text) == name_len + date_len + data_len:
+            # ASCII, the usual case: byte lengths are character lengths
+            return (EventObject(text[:name_len], text[name_len:name_len + date_len],
+                text[name_len + date_len:], event_time), end)
+        name_end: int = offset + name_len
+        date_end: int = name_end + date_len
+        return (EventObject(bytes(buffer[offset:name_end]).decode(), bytes(buffer[name_end:date_end]).decode(),
+            bytes(buffer[date_end:end]).decode(), event_time), end)
+
+
+class RepoObjectPathCodec(BinaryCodec):
+    """
+        Packs the URI of object paths. The period type and the date are
+        parsed from the URI on demand, as for paths created by `from_uri`
+
+        Parameters
+        ----------
+        repo_format: RepoFormat
+            the format of the decoded paths
+    """
+    LENGTH: struct.Struct = struct.Struct('<H')
+
+    def __init__(self, repo_format: RepoFormat) -> None:
+        self.__format: RepoFormat = repo_format
+
+    def pack_into(self, obj: RepoObjectPath, parts: List[bytes]) -> None:
+        uri: bytes = str(obj).encode()
+        parts.append(self.LENGTH.pack(len(uri)))
+        parts.append(uri)
+
+    def unpack_from(self, buffer: bytes, offset: int) -> Tuple[RepoObjectPath, int]:
+        (length,) = self.LENGTH.unpack_from(buffer, offset)
+        offset += self.LENGTH.size
+        if offset + length > len(buffer):
+            raise CodecError('truncated record at {0}'.format(offset - self.LENGTH.size))
+        return (RepoObjectPath.from_uri(bytes(buffer[offset:offset + length]).decode(), self.__format),
+            offset + length)
@@ -0,0 +1,164 @@
+"""
+    Repository composed of tiers from the fastest to the slowest, e.g.
+    memory, a local `FileRepoFS` and the remote `HttpRepoFS`
+"""
+from typing import Iterator, List, NamedTuple
+import threading
+from edgar.utils.date.date_utils import Date, DatePeriodType
+from edgar.utils.metrics import metrics
+from edgar.utils.repo.memory_repo_fs import MemoryEntry, MemoryRepoFS
+from edgar.utils.repo.repo_fs import RepoFS, RepoObject, RepoURI
+
+
+class TierStats(NamedTuple):
+    name: str
+    hits: int
+    misses: int
+
+
+class TieredRepoFS(RepoFS):
+    """
+        The repository that reads an object from the fastest tier holding it
+
+        An object read from a slower tier is promoted to memory. An object evicted
+        from memory is demoted to the next tier unless that tier has it, so repeat
+        reads of hot objects touch neither the disk nor the network. The last tier
+        is the origin: it is read without checking that the object exists
+
+        Objects that go stale in memory, e.g. the quarterly object of the current
+        quarter, are read again once stale. They are not demoted, as the next tier
+        would keep serving the stale copy
+
+        Parameters
+        ----------
+        memory: MemoryRepoFS
+            the memory tier
+        tiers: List[RepoFS]
+            the slower tiers from the fastest to the origin
+        names: List[str]
+            the names of the memory and the slower tiers in the counters
+    """
+    def __init__(self, memory: MemoryRepoFS, tiers: List[RepoFS], names: List[str] = None) -> None:
+        self.__memory: MemoryRepoFS = memory
+        self.__tiers: List[RepoFS] = list(tiers)
+        self.__names: List[str] = names or ['memory'] + [type(t).__name__ for t in tiers]
+        self.__lock: threading.Lock = threading.Lock()
+        self.__hits: List[int] = [0] * (len(tiers) + 1)
+        self.__misses: List[int] = [0] * (len(tiers) + 1)
+        memory.on_evict = self.demote
+
+    @property
+    def memory(self) -> MemoryRepoFS:
+        return self.__memory
+
+    @property
+    def tiers(self) -> List[RepoFS]:
+        return self.__tiers
+
+    def count(self, level: int, hit: bool) -> None:
+        with self.__lock:
+            (self.__hits if hit else self.__misses)[level] += 1
+        metrics.incr('tier_hits_total' if hit else 'tier_misses_total', tier=self.__names[level])
+
+    def stats(self) -> List[TierStats]:
+        """
+            Returns the hits and misses of the memory and the slower tiers
+        """
+        with self.__lock:
+            return [TierStats(*s) for s in zip(self.__names, self.__hits, self.__misses)]
+
+    def demote(self, entry: MemoryEntry) -> None:
+        """
+            Writes the object evicted from memory to the next tier unless it has it
+            or the object goes stale
+        """
+        if len(self.__tiers) > 1 and entry.expires is None:
+            tier: RepoFS = self.__tiers[0]
+            obj: RepoObject = tier.find(entry.period_type, entry.date)
+            if obj is None or not obj.exists():
+                tier.create(entry.period_type, entry.date).out([entry.data], override=True)
+                metrics.incr('tier_demotions_total', tier=self.__names[1])
+
+    def iterate_missing(self, from_date: Date, to_date: Date) -> Iterator[RepoURI]:
+        return self.__tiers[-1].iterate_missing(from_date, to_date)
+
+    def find_missing(self, from_date: Date, to_date: Date) -> List[str]:
+        return self.__tiers[-1].find_missing(from_date, to_date)
+
+    def find(self, period_type: DatePeriodType, the_date: Date) -> 'TieredRepoObject':
+        return TieredRepoObject(self, period_type, the_date.copy())
+
+    def create(self, period_type: DatePeriodType, the_date: Date) -> 'TieredRepoObject':
+        return self.find(period_type, the_date)
+
+    def refresh(self) -> None:
+        """
+            Drops the objects in memory and refreshes the slower tiers
+        """
+        self.__memory.refresh()
+        for tier in self.__tiers:
+            tier.refresh()
+
+    def flush(self) -> None:
+        for tier in self.__tiers:
+            tier.flush()
+
+
+class TieredRepoObject(RepoObject):
+    def __init__(self, repo: TieredRepoFS, period_type: DatePeriodType, the_date: Date) -> None:
+        self.__repo: TieredRepoFS = repo
+        self.__period_type: DatePeriodType = period_type
+        self.__date: Date = the_date
+        self.__key: str = repo.memory.key(period_type, the_date)
+
+    def as_uri(self) -> str:
+        return self.__repo.tiers[-1].find(self.__period_type, self.__date).as_uri()
+
+    def subpath(self, levels: int) -> List[str]:
+        return self.__key.split('/')[-levels:]
+
+    def exists(self) -> bool:
+        if self.__key in self.__repo.memory:
+            return True
+        for tier in self.__repo.tiers:
+            obj: RepoObject = tier.find(self.__period_type, self.__date)
+            if obj is not None and obj.exists():
+                return True
+        return False
+
+    def inp(self, bufsize: int = 2048) -> Iterator[bytes]:
+        """
+            Reads the object from the fastest tier holding it and promotes it to memory
+        """
+        data: bytes = self.__repo.memory.get(self.__key)
+        self.__repo.count(0, data is not None)
+        if data is None:
+            data = self.__read()
+            if len(data) > 0:
+                self.__repo.memory.put(self.__key, MemoryEntry(self.__period_type, self.__date, data))
+        view: memoryview = memoryview(data)
+        for i in range(0, len(data), bufsize):
+            yield bytes(view[i:i + bufsize])
+
+    def __read(self) -> bytes:
+        tiers: List[RepoFS] = self.__repo.tiers
+        for (level, tier) in enumerate(tiers, 1):
+            obj: RepoObject = tier.find(self.__period_type, self.__date)
+            # The origin is read without checking that the object exists, unless it is not found
+            if obj is None or (level < len(tiers) and not obj.exists()):
+                self.__repo.count(level, False)
+                continue
+            data: bytes = b''.join(chunk.encode() if isinstance(chunk, str) else chunk
+                for chunk in obj.inp(65536))
+            self.__repo.count(level, len(data) > 0)
+            return data
+        return b''
+
+    def out(self, iter: Iterator[str], override: bool = False) -> None:
+        """
+            Writes the object to memory and through to the slower tiers
+        """
+        data: bytes = b''.join(chunk.encode() if isinstance(chunk, str) else chunk for chunk in iter)
+        for tier in self.__repo.tiers:
+            tier.create(self.__period_type, self.__date).out([data], override)
+        self.__repo.memory.put(self.__key, MemoryEntry(self.__period_type, self.__date, data))
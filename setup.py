@@ -18,7 +18,9 @@ setup(
     install_requires=[
         "pytest",
         "pytest-cov",
+        "pytest-benchmark",
         "faker",
+        "numpy",
         "parse",
         "requests",
         "sphinx",